@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+Control-rate benchmark.
+
+Renders offline a modulation matrix of NUM sources (LFO, Randi and Randh, 
+each scaled by Scale and smoothed by Port) driving NUM sine oscillators, 
+first with every source at audio rate, then in control-rate mode with 
+one value per buffer (held) and with one value every 16 samples (ramped). 
+The script reports the time needed to render each version and the 
+speedup of the control-rate modes.
+
+Usage:
+    python control_rate.py [number of sources] [duration in seconds]
+
+"""
+import sys, os, time, tempfile
+from pyo import *
+
+NUM = 200
+DUR = 10
+if len(sys.argv) > 1:
+    NUM = int(sys.argv[1])
+if len(sys.argv) > 2:
+    DUR = float(sys.argv[2])
+# (label, control rate, period, ramp)
+MODES = [("audio rate", False, 0, False),
+         ("k-rate, held", True, 0, False),
+         ("k-rate 16, ramped", True, 16, True)]
+
+s = Server(audio="offline").boot()
+output = os.path.join(tempfile.mkdtemp(), "krate.wav")
+
+def render(krate, period, ramp):
+    sources = []
+    for i in range(NUM):
+        if i % 3 == 0:
+            src = LFO(freq=.1 + i * .01, sharp=.5, type=i % 8)
+        elif i % 3 == 1:
+            src = Randi(min=-1, max=1, freq=2 + i * .01)
+        else:
+            src = Randh(min=-1, max=1, freq=4 + i * .01)
+        scl = Scale(src, inmin=-1, inmax=1, outmin=200, outmax=800, exp=2)
+        port = Port(scl, risetime=.05, falltime=.05)
+        sources.extend([src, scl, port])
+    for obj in sources:
+        obj.setControlRate(krate, period, ramp)
+    oscs = Sine(freq=sources[2::3], mul=.5 / NUM).mix(1).out()
+    s.recordOptions(dur=DUR, filename=output)
+    start = time.time()
+    s.start()
+    elapsed = time.time() - start
+    oscs.stop()
+    del oscs, sources
+    return elapsed
+
+print "%d sources (LFO/Randi/Randh -> Scale -> Port), %g seconds" % (NUM, DUR)
+reference = None
+for label, krate, period, ramp in MODES:
+    elapsed = render(krate, period, ramp)
+    if reference is None:
+        reference = elapsed
+    print "%20s: %8.3f s   speedup %6.2f" % (label, elapsed, reference / elapsed)
+
+os.remove(output)
+s.shutdown()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+Control-rate envelope timing check.
+
+Renders offline the envelopes (Fader, Adsr, Linseg and Expseg) at audio
+rate, then in control-rate mode with one value per buffer (held) and with
+one value every 16 samples (ramped), and compares the values read at a
+few points in time. In control-rate mode, the envelopes must keep the
+timing of the audio-rate version, the values can only differ by the
+amount the envelope moves during one period.
+
+Then it renders envelopes ending by themselves (Adsr and Fader with a
+`dur`, which stop, and Linseg, which holds its last value) in both 
+control-rate modes, and checks that they are silent, and stopped for 
+Adsr and Fader, once they have reached their end.
+
+The script prints the values and exits with status 1 if one of them
+differs from the audio-rate value by more than TOLERANCE, or if a
+stopped envelope is not silent.
+
+Usage:
+    python control_rate_timing.py
+
+"""
+import sys, os, tempfile
+from pyo import *
+
+DUR = 2.5
+TIMES = [.25, .75, 1.25, 1.75, 2.25]
+TOLERANCE = .05
+# (label, control rate, period, ramp)
+MODES = [("audio rate", False, 0, False),
+         ("k-rate, held", True, 0, False),
+         ("k-rate 16, ramped", True, 16, True)]
+
+s = Server(audio="offline").boot()
+output = os.path.join(tempfile.mkdtemp(), "timing.wav")
+
+def fader():
+    return Fader(fadein=.5, fadeout=.5, dur=1.5)
+
+def adsr():
+    return Adsr(attack=.5, decay=.5, sustain=.5, release=.5, dur=2)
+
+def linseg():
+    return Linseg([(0, 0), (.5, 1), (1.5, .5), (2, 0)])
+
+def expseg():
+    return Expseg([(0, 0), (.5, 1), (1.5, .5), (2, 0)], exp=2)
+
+ENVELOPES = [("Fader", fader), ("Adsr", adsr), ("Linseg", linseg), ("Expseg", expseg)]
+
+def render(envelope, krate, period, ramp):
+    env = envelope()
+    env.setControlRate(krate, period, ramp)
+    table = NewTable(length=DUR)
+    rec = TableRec(env, table=table).play()
+    env.play()
+    s.recordOptions(dur=DUR, filename=output)
+    s.start()
+    samples = table.getTable()
+    values = [samples[int(t * s.getSamplingRate())] for t in TIMES]
+    del rec, env
+    return values
+
+failed = False
+print "%18s %18s | %s" % ("envelope", "mode", " ".join(["%7gs" % t for t in TIMES]))
+for name, envelope in ENVELOPES:
+    reference = None
+    for label, krate, period, ramp in MODES:
+        values = render(envelope, krate, period, ramp)
+        if reference is None:
+            reference = values
+        errors = [abs(v - r) > TOLERANCE for v, r in zip(values, reference)]
+        failed = failed or True in errors
+        print "%18s %18s | %s" % (name, label, " ".join(["%7.3f%s" % (v, " *"[e]) for v, e in zip(values, errors)]))
+
+def ending():
+    # (envelope, stops itself)
+    return [(Adsr(dur=.5, mul=.5), True), (Fader(fadein=.1, fadeout=.1, dur=.5, mul=.5), True), 
+            (Linseg([(0, 0), (.25, .5), (.5, 0)]), False)]
+
+print
+print "%18s %18s | %8s %10s" % ("envelope", "mode", "playing", "max |out|")
+for label, krate, period, ramp in MODES[1:]:
+    for env, stops in ending():
+        env.setControlRate(krate, period, ramp)
+        out = Sine(440, mul=env)
+        table = NewTable(length=.2)
+        # records from .5 seconds after the end of the envelope
+        rec = TableRec(out, table=table)
+        trig = CallAfter(rec.play, 1.)
+        env.play()
+        s.recordOptions(dur=1.2, filename=output)
+        s.start()
+        peak = max([abs(x) for x in table.getTable()])
+        playing = env.isPlaying()
+        error = (stops and playing) or peak > 0
+        failed = failed or error
+        print "%18s %18s | %8s %10g%s" % (env.__class__.__name__, label, playing, peak, " *"[error])
+        del trig, rec, out, env
+
+os.remove(output)
+s.shutdown()
+if failed:
+    print "* differs from the audio-rate value by more than %g, or not stopped and silent" % TOLERANCE
+    sys.exit(1)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+FFT algorithm benchmark.
+
+Renders an FFT -> IFFT resynthesis and a PVAnal -> PVSynth resynthesis
+offline with both FFT algorithms (algo=0, the real split-radix transform,
+and algo=1, the packed real transform with batched butterflies) for FFT
+sizes from 256 to 16384 and overlaps of 1, 2, 4 and 8. The script reports
+the time needed to render each patch and the speedup of algo=1.
+
+Usage:
+    python fft_algorithms.py [duration in seconds]
+
+"""
+import sys, os, time, tempfile
+from pyo import *
+
+DUR = 10
+if len(sys.argv) > 1:
+    DUR = float(sys.argv[1])
+SIZES = [256, 512, 1024, 2048, 4096, 8192, 16384]
+OVERLAPS = [1, 2, 4, 8]
+
+s = Server(audio="offline").boot()
+output = os.path.join(tempfile.mkdtemp(), "fft.wav")
+
+def fft_patch(src, size, olaps, algo):
+    fin = FFT(src, size=size, overlaps=olaps, algo=algo)
+    return IFFT(fin["real"], fin["imag"], size=size, overlaps=olaps, algo=algo).mix(1)
+
+def pv_patch(src, size, olaps, algo):
+    pva = PVAnal(src, size=size, overlaps=olaps, algo=algo)
+    return PVSynth(pva, algo=algo)
+
+def render(patch, size, olaps, algo):
+    src = Noise(.25)
+    out = patch(src, size, olaps, algo).out()
+    s.recordOptions(dur=DUR, filename=output)
+    start = time.time()
+    s.start()
+    elapsed = time.time() - start
+    out.stop()
+    del out, src
+    return elapsed
+
+print "%6s %6s | %10s %10s %7s | %10s %10s %7s" % ("size", "olaps", "fft 0 (s)", "fft 1 (s)", "speedup",
+                                                  "pv 0 (s)", "pv 1 (s)", "speedup")
+for size in SIZES:
+    for olaps in OVERLAPS:
+        f0 = render(fft_patch, size, olaps, 0)
+        f1 = render(fft_patch, size, olaps, 1)
+        p0 = render(pv_patch, size, olaps, 0)
+        p1 = render(pv_patch, size, olaps, 1)
+        print "%6d %6d | %10.3f %10.3f %7.2f | %10.3f %10.3f %7.2f" % (size, olaps, f0, f1, f0 / f1, p0, p1, p0 / p1)
+
+os.remove(output)
+s.shutdown()
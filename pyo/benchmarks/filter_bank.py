@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+Filter bank benchmark.
+
+Renders offline a constant-Q bank of NUM bandpass filters processing the
+same noise, first built with NUM Biquad objects, then with a single
+FilterBank object, with every band in its own stream and with the bands
+summed. The script reports the time needed to render each version and
+the speedup of FilterBank.
+
+Usage:
+    python filter_bank.py [number of bands] [duration in seconds]
+
+"""
+import sys, os, time, tempfile
+from pyo import *
+
+NUM = 100
+DUR = 10
+if len(sys.argv) > 1:
+    NUM = int(sys.argv[1])
+if len(sys.argv) > 2:
+    DUR = float(sys.argv[2])
+FREQS = [50 * pow(2, i * 8. / NUM) for i in range(NUM)]
+
+s = Server(audio="offline").boot()
+output = os.path.join(tempfile.mkdtemp(), "bank.wav")
+
+def biquads(src):
+    return Biquad(src, freq=FREQS, q=20, type=2).mix(1)
+
+def bank(src):
+    return FilterBank(src, FREQS, q=20, type=2).mix(1)
+
+def bank_sum(src):
+    return FilterBank(src, FREQS, q=20, type=2, sum=True)
+
+def render(patch):
+    src = Noise(.1)
+    out = patch(src).out()
+    s.recordOptions(dur=DUR, filename=output)
+    start = time.time()
+    s.start()
+    elapsed = time.time() - start
+    out.stop()
+    del out, src
+    return elapsed
+
+print "%d bands, %g seconds" % (NUM, DUR)
+reference = None
+for label, patch in [("Biquad objects", biquads), ("FilterBank", bank), ("FilterBank, sum", bank_sum)]:
+    elapsed = render(patch)
+    if reference is None:
+        reference = elapsed
+    print "%16s: %8.3f s   speedup %6.2f" % (label, elapsed, reference / elapsed)
+
+os.remove(output)
+s.shutdown()
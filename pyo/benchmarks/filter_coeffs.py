@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+Filter coefficients benchmark.
+
+Renders offline banks of NUM filters (Biquad, EQ, Reson, ButBP and SVF)
+processing the same noise, their frequencies modulated at audio rate,
+with smooth modulations (LFO), where the coefficients change at every
+sample, and with stepped modulations (Randh), where the coefficients
+only need to be computed when the value changes. The script reports the
+time needed to render each bank. Run it with two builds to compare them.
+
+Usage:
+    python filter_coeffs.py [number of filters] [duration in seconds]
+
+"""
+import sys, os, time, tempfile
+from pyo import *
+
+NUM = 50
+DUR = 10
+if len(sys.argv) > 1:
+    NUM = int(sys.argv[1])
+if len(sys.argv) > 2:
+    DUR = float(sys.argv[2])
+
+s = Server(audio="offline").boot()
+output = os.path.join(tempfile.mkdtemp(), "filters.wav")
+
+def biquad(src, freq):
+    return Biquad(src, freq=freq, q=5, type=2)
+
+def eq(src, freq):
+    return EQ(src, freq=freq, q=2, boost=-12)
+
+def reson(src, freq):
+    return Reson(src, freq=freq, q=10)
+
+def butbp(src, freq):
+    return ButBP(src, freq=freq, q=5)
+
+def svf(src, freq):
+    return SVF(src, freq=freq, q=2, type=.5)
+
+FILTERS = [("Biquad", biquad), ("EQ", eq), ("Reson", reson), ("ButBP", butbp), ("SVF", svf)]
+
+def modulation(i, stepped):
+    if stepped:
+        return Randh(min=200, max=5000, freq=5 + i * .1)
+    return LFO(freq=.5 + i * .05, sharp=.5, type=3, mul=2400, add=2600)
+
+def render(filt, stepped):
+    src = Noise(.1)
+    mods = [modulation(i, stepped) for i in range(NUM)]
+    out = filt(src, mods).mix(1).out()
+    s.recordOptions(dur=DUR, filename=output)
+    start = time.time()
+    s.start()
+    elapsed = time.time() - start
+    out.stop()
+    del out, mods, src
+    return elapsed
+
+print "%d filters per bank, %g seconds" % (NUM, DUR)
+print "%8s | %10s %10s" % ("filter", "LFO (s)", "Randh (s)")
+for name, filt in FILTERS:
+    times = [render(filt, stepped) for stepped in [False, True]]
+    print "%8s | %10.3f %10.3f" % (name, times[0], times[1])
+
+os.remove(output)
+s.shutdown()
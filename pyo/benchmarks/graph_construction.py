@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+Graph construction benchmark.
+
+Measures how the time needed to build a pyo graph scales with the number
+of streams (channels/voices) handled by each object. For every channel
+count, the script builds a small additive patch (an LFO modulating a bank
+of Sine and a bank of Osc, then mixed) and an OscBank per voice, and
+reports the construction time per stream.
+
+The argument expansion helpers are also measured alone, comparing the
+per-stream `wrap` calls with the single pass `expandArgs`.
+
+Usage:
+    python graph_construction.py [max channels]
+
+"""
+import sys, time
+from pyo import *
+from pyolib._core import convertArgsToLists, wrap, expandArgs
+
+MAX_CHANNELS = 512
+if len(sys.argv) > 1:
+    MAX_CHANNELS = int(sys.argv[1])
+REPEAT = 5
+
+s = Server(audio="offline").boot()
+
+def counts():
+    n = 1
+    while n <= MAX_CHANNELS:
+        yield n
+        n *= 2
+
+def best_of(func, *args):
+    best = None
+    for i in range(REPEAT):
+        start = time.time()
+        result = func(*args)
+        elapsed = time.time() - start
+        del result
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def build_patch(n):
+    freqs = [100 + i * 1.5 for i in range(n)]
+    lfo = Sine(freq=[.1 + i * .01 for i in range(n)], mul=.02, add=1)
+    table = HarmTable([1, .5, .33, .25])
+    a = Sine(freq=freqs, mul=lfo * .1)
+    b = Osc(table, freq=[f * lfo for f in freqs[:4]] + freqs[4:], mul=.1)
+    mix = Mix([a, b], voices=2)
+    return [lfo, table, a, b, mix]
+
+def build_oscbank(n):
+    table = SquareTable()
+    return [table, OscBank(table, freq=[50 + i for i in range(n)], num=8, mul=.01)]
+
+def legacy_expand(n):
+    lfo = Sine(freq=.1)
+    freq, phase, mul, add, lmax = convertArgsToLists([100 + i for i in range(n)], 0, [lfo] * n, 0)
+    return [(wrap(freq,i), wrap(phase,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
+
+def fast_expand(n):
+    lfo = Sine(freq=.1)
+    return expandArgs([100 + i for i in range(n)], 0, [lfo] * n, 0)
+
+print "%8s | %12s %10s | %12s %10s | %10s %10s" % ("streams", "patch (ms)", "us/stream",
+                                                 "oscbank (ms)", "us/stream", "wrap (ms)", "expand (ms)")
+for n in counts():
+    patch = best_of(build_patch, n)
+    bank = best_of(build_oscbank, n)
+    legacy = best_of(legacy_expand, n)
+    fast = best_of(fast_expand, n)
+    print "%8d | %12.3f %10.2f | %12.3f %10.2f | %10.3f %10.3f" % (n, patch * 1000, patch * 1e6 / n,
+                                                               bank * 1000, bank * 1e6 / n,
+                                                               legacy * 1000, fast * 1000)
+
+s.shutdown()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+Import time benchmark.
+
+Measures, in fresh interpreters, the time needed to import pyo:
+
+    - eager: `from pyo import *` followed by the GUI toolkit detection,
+      which is what every import of pyo used to do.
+    - star: `from pyo import *`, all the pyolib modules are imported but
+      the GUI toolkit is only loaded when a window is created.
+    - lazy: `import pyo` and the few names used by a typical offline
+      render script, only their modules are imported.
+
+Usage:
+    python import_time.py [repeat]
+
+"""
+import os, sys, subprocess
+
+REPEAT = 10
+if len(sys.argv) > 1:
+    REPEAT = int(sys.argv[1])
+
+SCENARIOS = [("eager", "from pyo import *\nimport pyolib._widgets\npyolib._widgets.initToolkit()"),
+             ("star", "from pyo import *"),
+             ("lazy", "import pyo\npyo.Server, pyo.Sine, pyo.Biquad, pyo.Freeverb")]
+
+TEMPLATE = """import time
+start = time.time()
+%s
+elapsed = time.time() - start
+import sys
+print elapsed, len([name for name in sys.modules if name.startswith("pyolib.") and sys.modules[name]])
+"""
+
+folder = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+env = dict(os.environ)
+env["PYTHONPATH"] = os.pathsep.join([folder] + [p for p in env.get("PYTHONPATH", "").split(os.pathsep) if p])
+
+def measure(code):
+    times = []
+    for i in range(REPEAT):
+        out = subprocess.check_output([sys.executable, "-c", TEMPLATE % code], env=env)
+        elapsed, modules = out.split()[-2:]
+        times.append(float(elapsed))
+    times.sort()
+    return times[0], times[len(times) / 2], int(modules)
+
+print "%8s | %10s %10s | %8s" % ("import", "best (ms)", "median (ms)", "modules")
+for name, code in SCENARIOS:
+    best, median, modules = measure(code)
+    print "%8s | %10.1f %10.1f | %8d" % (name, best * 1000, median * 1000, modules)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+Operator fusion benchmark.
+
+Builds the same arithmetic expression twice, once as the usual chain of
+Dummy objects and once compiled with Fuse, and renders both offline.
+For each channel count, the script reports the number of audio streams
+added to the server, the number of block buffers written per block and
+the time needed to render the patch.
+
+Before the benchmark, the script checks that the expression of the
+Fuse docstring compiles down to its three Sine objects, with every
+intermediate object fused, and exits with status 1 otherwise.
+
+Usage:
+    python operator_fusion.py [max channels]
+
+"""
+import sys, os, time, tempfile
+from pyo import *
+
+MAX_CHANNELS = 64
+if len(sys.argv) > 1:
+    MAX_CHANNELS = int(sys.argv[1])
+DUR = 10
+
+s = Server(audio="offline").boot()
+output = os.path.join(tempfile.mkdtemp(), "fusion.wav")
+
+def counts():
+    n = 1
+    while n <= MAX_CHANNELS:
+        yield n
+        n *= 2
+
+def expression(a, b, env):
+    return Tanh((a * 0.5 + b * 0.25) * env - Abs(b) * 0.1) * 0.3 + 0.01
+
+def render(n, fused):
+    a = Sine(freq=[100 + i for i in range(n)])
+    b = Sine(freq=[150 + i * 1.5 for i in range(n)])
+    env = Sine(freq=.25, mul=.5, add=.5)
+    before = s.getNumberOfStreams()
+    if fused:
+        out = Fuse(expression(a, b, env))
+        buffers = len(out) * out[0].getDepth()
+    else:
+        out = expression(a, b, env)
+        buffers = None
+    streams = s.getNumberOfStreams() - before
+    if buffers is None:
+        buffers = streams
+    out.out()
+    s.recordOptions(dur=DUR, filename=output)
+    start = time.time()
+    s.start()
+    elapsed = time.time() - start
+    out.stop()
+    del out
+    return streams, buffers, elapsed
+
+def check():
+    a = Sine(freq=[250,251])
+    b = Sine(freq=[500,502])
+    lf = Sine(freq=.25, mul=.5, add=.5)
+    f = Fuse((a * 0.5 + b * 0.25) * lf - Abs(b) * 0.1, mul=.3)
+    inputs = sorted([type(x).__name__ for x in f._inputs])
+    if inputs != ["Sine", "Sine", "Sine"]:
+        print "Fuse inputs of the docstring expression: %s, expected 3 Sine" % inputs
+        s.shutdown()
+        sys.exit(1)
+
+check()
+print "%8s | %8s %8s %10s | %8s %8s %10s | %7s" % ("channels", "streams", "buffers", "chain (s)",
+                                                  "streams", "buffers", "fused (s)", "speedup")
+for n in counts():
+    chain = render(n, False)
+    fused = render(n, True)
+    print "%8d | %8d %8d %10.3f | %8d %8d %10.3f | %7.2f" % ((n,) + chain + fused + (chain[2] / fused[2],))
+
+os.remove(output)
+s.shutdown()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+This script demonstrates how to render many sound files in parallel,
+faster than real-time, with the BatchRender object.
+
+Each job is rendered by an offline Server living in one of the worker
+processes. Builder functions must be defined at the top level of the
+script because they are sent to the workers.
+
+"""
+import os
+from pyo import *
+
+def synth(note, dur):
+    ### processing goes here ###
+    noteFreq = midiToHz(note)
+    env = Adsr(attack=0.005, decay=0.15, sustain=0.7, release=1.7, dur=dur).play()
+    qenv = Pow(env, 4, mul=0.8)
+    osc1 = SineLoop(freq=noteFreq, feedback=0.075, mul=qenv).out()
+    osc2 = SineLoop(freq=noteFreq*1.01, feedback=0.075, mul=qenv).out(1)
+    # the returned objects are kept alive during the rendering
+    return [env, qenv, osc1, osc2]
+
+if __name__ == "__main__":
+    # output folder
+    output_folder = os.path.join(os.path.expanduser("~"), "pyo_batch_render")
+    if not os.path.isdir(output_folder):
+        os.mkdir(output_folder)
+
+    # output file duration
+    dur = 2
+
+    jobs = []
+    for note in range(48, 84):
+        path = os.path.join(output_folder, "file_%02d.wav" % note)
+        jobs.append((synth, dur+.1, path, (note, dur)))
+
+    def done(report):
+        print "%s done (x%.1f real-time)" % (os.path.basename(report["filename"]), report["ratio"])
+
+    batch = BatchRender(jobs, processes=None)
+    batch.render(callback=done)
+    batch.report()
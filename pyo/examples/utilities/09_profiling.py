@@ -0,0 +1,24 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+This script shows how to find the expensive objects of a processing
+chain with the server's profiler.
+
+Every 5 seconds, the profiler prints the processing time spent in each
+class of audio object and in the most expensive streams, then resets
+its counters. A summary of the whole run can also be retrieved at any
+time with s.getProfile() or printed with s.printProfile().
+
+"""
+from pyo import *
+
+s = Server().boot()
+s.setProfiling(True, interval=5)
+
+src = Noise(mul=.3)
+bank = Biquadx(src, freq=[100 * (i + 1) for i in range(16)], q=20, type=2, stages=4, mul=.1)
+verb = WGVerb(bank.mix(2), feedback=.8, cutoff=5000, bal=.3, mul=.5).out()
+lfo = Sine(freq=[.1, .15], mul=.5, add=.5)
+chorus = Chorus(verb, depth=lfo, feedback=.25, bal=.5).out()
+
+s.gui(locals())
@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+This script shows how to spread independent voices over several CPU
+cores with the parallel scheduler of the Server.
+
+Each voice (a Granulator reading the same sound, with its own pitch,
+position and grain duration, followed by a filter) is assigned to its
+own processing lane with s.setLanes(). With s.setWorkers(4), the lanes
+are computed by four threads (the audio callback thread and three
+worker threads). The shared objects (the tables and the global LFO)
+stay in the callback thread.
+
+The load of every thread is printed every 2 seconds.
+
+"""
+from pyo import *
+
+NUM_VOICES = 16
+
+s = Server().boot()
+s.setWorkers(4)
+
+snd = SndTable(SNDS_PATH + "/transparent.aif")
+env = HannTable()
+lfo = Sine(freq=.05, mul=.5, add=.5)
+
+voices = []
+for i in range(NUM_VOICES):
+    pos = Phasor(snd.getRate() * (.1 + i * .02), i / float(NUM_VOICES), snd.getSize())
+    dur = Noise(.001, .1)
+    gran = Granulator(snd, env, [.5 + i * .1, .501 + i * .1], pos, dur, 32, mul=.02)
+    filt = Tone(gran, freq=lfo * 4000 + 500).out()
+    voices.append([pos, dur, gran, filt])
+
+print "%d lanes" % s.setLanes(voices)
+
+def report():
+    print "load per thread:", ", ".join(["%.1f%%" % (x * 100) for x in s.getWorkerLoad(reset=True)])
+
+pat = Pattern(report, time=2).play()
+
+s.gui(locals())
@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+This script shows how to stream many soundfiles from slow storage
+without reading the disk inside the audio callback.
+
+Each SfPlayer is given a prefetch time with setPrefetch(): a pool of
+threads shared by all the players (two by default, see setDiskThreads)
+keeps that amount of sound loaded ahead of the playback head. Speed,
+loop and offset behave exactly as without prefetch.
+
+The number of underruns (reads the threads did not prepare in time,
+which were done from the audio callback instead) is printed every
+2 seconds. If it keeps growing, raise the prefetch time or the number
+of threads.
+
+"""
+from pyo import *
+
+NUM_PLAYERS = 40
+
+s = Server().boot()
+setDiskThreads(4)
+
+sounds = [SNDS_PATH + "/transparent.aif", SNDS_PATH + "/accord.aif"]
+
+players = []
+for i in range(NUM_PLAYERS):
+    sf = SfPlayer(sounds[i % 2], speed=[.9 + i * .005, .905 + i * .005], loop=True,
+                  offset=i * .05, mul=.5 / NUM_PLAYERS)
+    sf.setPrefetch(2)
+    players.append(sf)
+
+mix = Mix(players, voices=2).out()
+
+def report():
+    print "underruns:", sum([sf.getUnderruns(reset=True) for sf in players])
+
+pat = Pattern(report, time=2).play()
+
+s.gui(locals())
@@ -32,5 +32,122 @@ void irealfft_packed(MYFLT *data, MYFLT *outdata, int size, MYFLT *twiddle);
 /* Prototype for array generation of twiddle factors */
 void fft_compute_split_twiddle(MYFLT **twiddle, int size);
 void fft_compute_radix2_twiddle(MYFLT *twiddle, int size);
-#endif
+/* shared, reference counted twiddle factors */
+MYFLT ** fft_acquire_split_twiddle(int size);
+void fft_release_split_twiddle(MYFLT **twiddle);
+MYFLT * fft_acquire_radix2_twiddle(int size);
+void fft_release_radix2_twiddle(MYFLT *twiddle);
+void fft_cache_stats(long *stats, int reset);
+
+/* real FFT by the packing method, same format as realfft_split/irealfft_split */
+typedef struct {
+    int size;
+    int *bitrev;
+    MYFLT *twiddle_re;
+    MYFLT *twiddle_im;
+    MYFLT *realize_re;
+    MYFLT *realize_im;
+} RealFFTPlan;
+
+RealFFTPlan * fft_acquire_real_plan(int size);
+void fft_release_real_plan(RealFFTPlan *plan);
+void realfft_batched(MYFLT *data, MYFLT *outdata, RealFFTPlan *plan);
+void irealfft_batched(MYFLT *data, MYFLT *outdata, RealFFTPlan *plan);
+
+/* spectra of an impulse response, `num` partitions of `size` samples */
+typedef struct {
+    int size;
+    int num;
+    MYFLT *real; /* partition after partition, `size` bins each */
+    MYFLT *imag;
+} IRSpectra;
+
+/* uniformly partitioned overlap-save convolver */
+typedef struct {
+    int size;
+    int size2;
+    int num;
+    int current;
+    MYFLT *ir_real;
+    MYFLT *ir_imag;
+    MYFLT *inframe;
+    MYFLT *outframe;
+    MYFLT *last_half_frame;
+    MYFLT *real;
+    MYFLT *imag;
+    MYFLT *accum_real;
+    MYFLT *accum_imag;
+    MYFLT **twiddle;
+} ConvStage;
+
+/* non-uniformly partitioned convolver, the tail is computed by a thread pool */
+typedef struct {
+    int hsize;
+    int tsize;
+    int incount;
+    MYFLT *input_buffer;
+    MYFLT *output_buffer;
+    ConvStage head;
+    ConvStage tail;
+    int tail_incount;
+    int tail_read;
+    int tail_wait;
+    int tail_half;
+    MYFLT *tail_in;
+    MYFLT *tail_job;
+    MYFLT *tail_out;
+    volatile int queued;
+    volatile int active;
+} PartConv;
 
+IRSpectra * IRSpectra_new(MYFLT *impulse, int len, int size, int first, int num);
+void IRSpectra_free(IRSpectra *ir);
+PartConv * PartConv_new(IRSpectra *head, IRSpectra *tail, int len);
+void PartConv_free(PartConv *pc);
+void PartConv_process(PartConv *pc, MYFLT *in, MYFLT *out, int num);
+void PartConv_setThreads(int num);
+int PartConv_getThreads(void);
+
+/* additive synthesis of sine partials, by oscillators or inverse FFT */
+#define PARTIAL_SYNTH_IFFT_MIN 256
+#define PARTIAL_LOBE_WIDTH 4
+#define PARTIAL_LOBE_RES 64
+
+typedef struct {
+    int size;
+    MYFLT *lobe; /* main lobe of the window spectrum, PARTIAL_LOBE_RES points per bin */
+    MYFLT *weights; /* overlap-add triangle divided by the window */
+} PartialLobe;
+
+typedef struct {
+    int num;
+    int mode;
+    int ifft;
+    int fresh;
+    MYFLT sr;
+    MYFLT *freq; /* targets, in Hz, written by the caller */
+    MYFLT *amp;
+    /* oscillators */
+    MYFLT *cur_freq;
+    MYFLT *cur_amp;
+    MYFLT *inc_amp;
+    MYFLT *re;
+    MYFLT *im;
+    /* inverse FFT */
+    int size;
+    int hopsize;
+    int count;
+    MYFLT *phase;
+    MYFLT *last_freq;
+    MYFLT *spectrum;
+    MYFLT *frame;
+    MYFLT *accum;
+    PartialLobe *lobe;
+    RealFFTPlan *plan;
+} PartialSynth;
+
+PartialSynth * PartialSynth_new(int num, int mode, MYFLT sr);
+void PartialSynth_free(PartialSynth *ps);
+void PartialSynth_setMode(PartialSynth *ps, int mode);
+void PartialSynth_process(PartialSynth *ps, MYFLT *out, int num);
+#endif
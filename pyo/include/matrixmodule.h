@@ -28,6 +28,8 @@ typedef struct {
     int width;
     int height;
     MYFLT **data;
+    Py_ssize_t shape[2];
+    Py_ssize_t strides[2];
 } MatrixStream;
 
 
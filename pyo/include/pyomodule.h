@@ -29,6 +29,7 @@
 #ifndef USE_DOUBLE
 #define LIB_BASE_NAME "_pyo"
 #define MYFLT float
+#define MYFLT_BUFFER_FORMAT "f"
 #define FLOAT_VALUE f
 #define TYPE_F "f"
 #define TYPE_F_I "f|i"
@@ -49,6 +50,7 @@
 #define TYPE_O_IF "O|if"
 #define TYPE_O_IFS "O|ifs"
 #define TYPE_S_IFF "s|iff"
+#define TYPE_SS_IFF "ss|iff"
 #define TYPE_S_FIFF "s|fiff"
 #define TYPE_S_FFIFF "s|ffiff"
 #define TYPE_S__OIFI "s|Oifi"
@@ -65,6 +67,7 @@
 #define TYPE_OOO_F "OOO|f"
 #define TYPE_OOO_FI "OOO|fi"
 #define TYPE_OO_OF "OO|Of"
+#define TYPE_OO_OFFOO "OO|OffOO"
 #define TYPE_OOO_FFFFII "OOO|ffffii"
 #define TYPE_O_FFFFII "O|ffffii"
 #define TYPE_F_O "f|O"
@@ -111,6 +114,7 @@
 #else
 #define LIB_BASE_NAME "_pyo64"
 #define MYFLT double
+#define MYFLT_BUFFER_FORMAT "d"
 #define FLOAT_VALUE d
 #define TYPE_F "d"
 #define TYPE_F_I "d|i"
@@ -131,6 +135,7 @@
 #define TYPE_O_IF "O|id"
 #define TYPE_O_IFS "O|ids"
 #define TYPE_S_IFF "s|idd"
+#define TYPE_SS_IFF "ss|idd"
 #define TYPE_S_FIFF "s|didd"
 #define TYPE_S_FFIFF "s|ddidd"
 #define TYPE_S__OIFI "s|Oidi"
@@ -147,6 +152,7 @@
 #define TYPE_OOO_F "OOO|d"
 #define TYPE_OOO_FI "OOO|di"
 #define TYPE_OO_OF "OO|Od"
+#define TYPE_OO_OFFOO "OO|OddOO"
 #define TYPE_OOO_FFFFII "OOO|ddddii"
 #define TYPE_O_FFFFII "O|ddddii"
 #define TYPE_F_O "d|O"
@@ -197,6 +203,21 @@
 #include "externalmodule.h"
 #endif
 
+/* Disk streaming thread pool of the soundfile players (sfplayermodule.c) */
+extern void DiskStream_setThreads(int num);
+extern int DiskStream_getThreads(void);
+
+/* Thread pool computing the tails of partitioned convolutions (fft.c) */
+extern void PartConv_setThreads(int num);
+extern int PartConv_getThreads(void);
+
+/* Shared FFT twiddle factors (fft.c) and windows (wind.c) */
+extern void fft_cache_stats(long *stats, int reset);
+extern void window_cache_stats(long *stats, int reset);
+
+/* Value changes scheduled by the server at a sample offset of the next buffer (sigmodule.c) */
+extern void Sig_addEvent(PyObject *self, int offset, MYFLT value);
+
 extern PyTypeObject SineType;
 extern PyTypeObject SineLoopType;
 extern PyTypeObject FmType;
@@ -217,6 +238,7 @@ extern PyTypeObject OscType;
 extern PyTypeObject OscLoopType;
 extern PyTypeObject OscTrigType;
 extern PyTypeObject OscBankType;
+extern PyTypeObject PartialBankType;
 extern PyTypeObject SumOscType;
 extern PyTypeObject PulsarType;
 extern PyTypeObject NoiseType;
@@ -373,6 +395,8 @@ extern PyTypeObject BandSplitterType;
 extern PyTypeObject BandSplitType;
 extern PyTypeObject FourBandMainType;
 extern PyTypeObject FourBandType;
+extern PyTypeObject FilterBankerType;
+extern PyTypeObject FilterBankType;
 extern PyTypeObject HilbertMainType;
 extern PyTypeObject HilbertType;
 extern PyTypeObject FollowerType;
@@ -386,9 +410,13 @@ extern PyTypeObject SwitcherType;
 extern PyTypeObject SwitchType;
 extern PyTypeObject SelectorType;
 extern PyTypeObject VoiceManagerType;
+extern PyTypeObject VoicePoolType;
 extern PyTypeObject MixerType;
 extern PyTypeObject MixerVoiceType;
+extern PyTypeObject ModMatrixType;
+extern PyTypeObject ModMatrixVoiceType;
 extern PyTypeObject PrintType;
+extern PyTypeObject CaptureType;
 extern PyTypeObject SnapType;
 extern PyTypeObject InterpType;
 extern PyTypeObject SampHoldType;
@@ -413,6 +441,7 @@ extern PyTypeObject M_FloorType;
 extern PyTypeObject M_CeilType;
 extern PyTypeObject M_RoundType;
 extern PyTypeObject M_TanhType;
+extern PyTypeObject M_FuseType;
 extern PyTypeObject FFTMainType;
 extern PyTypeObject FFTType;
 extern PyTypeObject IFFTType;
@@ -518,6 +547,7 @@ extern PyTypeObject Pointer2Type;
     int bufsize; \
     int nchnls; \
     double sr; \
+    int kstride; /* distance between the input samples read in control-rate mode */ \
     MYFLT *data; 
 
 #define pyo_table_HEAD \
@@ -525,7 +555,8 @@ extern PyTypeObject Pointer2Type;
     PyObject *server; \
     TableStream *tablestream; \
     int size; \
-    MYFLT *data;
+    MYFLT *data; \
+    int exports;
 
 #define pyo_matrix_HEAD \
     PyObject_HEAD \
@@ -533,7 +564,8 @@ extern PyTypeObject Pointer2Type;
     MatrixStream *matrixstream; \
     int width; \
     int height; \
-    MYFLT **data;
+    MYFLT **data; \
+    int exports;
 
 /* VISIT & CLEAR */
 #define pyo_VISIT \
@@ -581,7 +613,7 @@ extern PyTypeObject Pointer2Type;
     Py_CLEAR(self->matrixstream); \
 
 #define pyo_DEALLOC \
-    if (PyServer_get_server() != NULL) \
+    if (PyServer_get_server() != NULL && self->server != NULL && self->stream != NULL) \
         Server_removeStream((Server *)self->server, Stream_getStreamId(self->stream)); \
     free(self->data); \
 
@@ -619,6 +651,7 @@ extern PyTypeObject Pointer2Type;
     self->bufsize = PyInt_AsLong(PyObject_CallMethod(self->server, "getBufferSize", NULL)); \
     self->sr = PyFloat_AsDouble(PyObject_CallMethod(self->server, "getSamplingRate", NULL)); \
     self->nchnls = PyInt_AsLong(PyObject_CallMethod(self->server, "getNchnls", NULL)); \
+    self->kstride = 1; \
     self->data = (MYFLT *)realloc(self->data, (self->bufsize) * sizeof(MYFLT)); \
     for (i=0; i<self->bufsize; i++) \
         self->data[i] = 0.0; \
@@ -640,16 +673,25 @@ extern PyTypeObject Pointer2Type;
     else if (self->interp == 4) \
         self->interp_func_ptr = cubic; \
 
+/* Refuses to resize or replace the memory of a table or matrix while 
+   buffers sharing it are exported (see getBuffer). */
+#define CHECK_BUFFER_EXPORTS \
+    if (self->exports > 0) { \
+        PyErr_SetString(PyExc_BufferError, "Cannot resize or replace the samples while buffers are exported."); \
+        return NULL; \
+    }
+
 /* Set data */
 #define SET_TABLE_DATA \
     int i; \
+    CHECK_BUFFER_EXPORTS \
     if (! PyList_Check(arg)) { \
         PyErr_SetString(PyExc_TypeError, "The data must be a list of floats."); \
         return PyInt_FromLong(-1); \
     } \
     self->size = PyList_Size(arg)-1; \
     self->data = (MYFLT *)realloc(self->data, (self->size+1) * sizeof(MYFLT)); \
-    TableStream_setSize(self->tablestream, self->size+1); \
+    TableStream_setSize(self->tablestream, self->size); \
  \
     for (i=0; i<(self->size+1); i++) { \
         self->data[i] = PyFloat_AS_DOUBLE(PyNumber_Float(PyList_GET_ITEM(arg, i))); \
@@ -661,17 +703,21 @@ extern PyTypeObject Pointer2Type;
 
 #define SET_MATRIX_DATA \
     int i, j; \
+    MYFLT *block; \
     PyObject *innerlist; \
  \
+    CHECK_BUFFER_EXPORTS \
     if (! PyList_Check(arg)) { \
         PyErr_SetString(PyExc_TypeError, "The data must be a list of list of floats."); \
         return PyInt_FromLong(-1); \
     } \
     self->height = PyList_Size(arg); \
     self->width = PyList_Size(PyList_GetItem(arg, 0)); \
-    self->data = (MYFLT **)realloc(self->data, (self->height + 1) * sizeof(MYFLT)); \
+    block = (self->data == NULL) ? NULL : self->data[0]; \
+    block = (MYFLT *)realloc(block, (self->height + 1) * (self->width + 1) * sizeof(MYFLT)); \
+    self->data = (MYFLT **)realloc(self->data, (self->height + 1) * sizeof(MYFLT *)); \
     for (i=0; i<(self->height+1); i++) { \
-        self->data[i] = (MYFLT *)realloc(self->data[i], (self->width + 1) * sizeof(MYFLT)); \
+        self->data[i] = block + i * (self->width + 1); \
     } \
     MatrixStream_setWidth(self->matrixstream, self->width); \
     MatrixStream_setHeight(self->matrixstream, self->height); \
@@ -28,6 +28,7 @@
 extern "C" {
 #endif
 
+#include <pthread.h>
 #include "portaudio.h"
 #include "portmidi.h"
 #include "sndfile.h"
@@ -62,6 +63,31 @@ typedef struct {
 #endif
 } PyoJackBackendData;
   
+typedef struct {
+    int lane;
+    int index;
+    PyObject *stream;
+} PyoLaneItem;
+
+#define CALL_QUEUE_SIZE 4096
+
+typedef struct {
+    PyObject *callable;
+    PyObject *args;
+    double time; /* when the call was queued */
+} PyoDeferredCall;
+
+typedef struct {
+    unsigned long time; /* in samples since the server was booted */
+    unsigned long order; /* insertion order, keeps simultaneous events in sequence */
+    long id;
+    int index; /* position in the heap */
+    PyObject *callable; /* called with args... */
+    PyObject *args;
+    PyObject *target; /* ...or Sig object receiving value at the exact sample */
+    MYFLT value;
+} PyoEvent;
+
 typedef struct {
     PyObject_HEAD
     PyObject *streams;
@@ -130,6 +156,64 @@ typedef struct {
     int tcount;
     PyObject *TIME;
     
+    /* Profiler */
+    int profiling;
+    unsigned long profileBlocks; /* blocks computed since the profiler was reset */
+    unsigned long profileLate; /* blocks that took longer to compute than their duration */
+    double profileTime;
+    double profileMaxTime;
+    int withPROFILE;
+    int profilePass;
+    int pcount;
+    PyObject *PROFILE;
+    
+    /* Parallel scheduler */
+    int nworkers; /* worker threads, in addition to the callback thread (0 = serial processing) */
+    pthread_t *workers;
+    pthread_mutex_t work_mutex;
+    pthread_cond_t work_cond;
+    pthread_cond_t done_cond;
+    int work_generation; /* incremented for every batch handed to the workers */
+    int work_pending; /* workers still computing the current batch */
+    int work_quit;
+    int work_profiling;
+    PyoLaneItem *lane_items; /* active streams of the current batch, sorted by lane */
+    int *lane_offsets; /* start of each lane in lane_items */
+    int lane_groups;
+    int lane_capacity;
+    int next_group; /* next lane to be claimed by a thread */
+    double *worker_busy; /* busy time per thread, the callback thread is the last one */
+    unsigned long parallel_blocks;
+    
+    /* Bulk changes, callables applied at the start of the next buffer */
+    PyObject *changes;
+    
+    /* Event scheduler, a binary heap of events ordered by time */
+    PyoEvent **events;
+    int event_count;
+    int event_capacity;
+    unsigned long event_order;
+    long event_id;
+    PyObject *event_ids; /* id -> event */
+    int dispatching;
+    unsigned long dispatch_time; /* time of the event being dispatched */
+    
+    /* Deferred calls, made by the call thread instead of the audio callback */
+    PyoDeferredCall calls[CALL_QUEUE_SIZE]; /* ring written by the audio callback */
+    unsigned int call_head;
+    unsigned int call_tail;
+    int call_queued; /* calls queued during the current buffer */
+    pthread_mutex_t call_mutex;
+    pthread_cond_t call_cond;
+    unsigned long call_signal; /* incremented to wake the call thread */
+    unsigned long call_seen;
+    int call_quit;
+    unsigned long call_count;
+    unsigned long call_dropped;
+    unsigned int call_maxdepth;
+    double call_latency;
+    double call_maxlatency;
+    
     /* Properties */
     int verbosity; /* a sum of values to display different levels: 1 = error */
                    /* 2 = message, 4 = warning , 8 = debug. Default 7.*/
@@ -142,6 +226,9 @@ extern MYFLT * Server_getInputBuffer(Server *self);
 extern PmEvent * Server_getMidiEventBuffer(Server *self);    
 extern int Server_getMidiEventCount(Server *self);  
 extern int Server_generateSeed(Server *self, int oid);
+extern long Server_scheduleEvent(Server *self, double time, int absolute, PyObject *callable, PyObject *args);
+extern int Server_cancelEvent(Server *self, long id);
+extern void Server_dispatchCall(Server *self, PyObject *callable, PyObject *args, int deferred);
 extern PyTypeObject ServerType;    
 
 #ifdef __cplusplus
@@ -33,6 +33,19 @@ typedef struct {
     int duration;
     int bufferCountWait;
     int bufferCount;
+    double cpuTime; /* processing time accumulated while the server's profiler is on */
+    unsigned long numCalls;
+    int lane; /* processing lane of the parallel scheduler, 0 means the callback thread */
+    PyObject *sleepinput; /* input stream watched for silence, NULL if the stream never sleeps */
+    MYFLT sleepthresh;
+    int sleepwait; /* silent buffers before going to sleep */
+    int silentcount;
+    int sleeping;
+    unsigned long sleeps;
+    unsigned long wakes;
+    int krate; /* samples per computed value in control-rate mode, 1 means audio rate */
+    int kramp; /* 1 to ramp linearly between the computed values, 0 to hold them */
+    MYFLT klast;
     MYFLT *data;
 } Stream;
 
@@ -44,12 +57,16 @@ extern int Stream_getBufferCountWait(Stream *self);
 extern int Stream_getDuration(Stream *self);
 extern int Stream_getStreamChnl(Stream *self);
 extern int Stream_getStreamToDac(Stream *self);
+extern int Stream_getLane(Stream *self);
 extern MYFLT * Stream_getData(Stream *self);
 extern void Stream_setData(Stream * self, MYFLT *data);
 extern void Stream_setFunctionPtr(Stream *self, void *ptr);
 extern void Stream_callFunction(Stream *self);
 extern void Stream_IncrementBufferCount(Stream *self);
 extern void Stream_IncrementDurationCount(Stream *self);
+extern void Stream_addProfileTime(Stream *self, double elapsed);
+extern void Stream_setAutoSleep(int x);
+extern int Stream_getAutoSleep();
 extern PyTypeObject StreamType;
 
 #define MAKE_NEW_STREAM(self, type, rt_error) \
@@ -57,6 +74,16 @@ extern PyTypeObject StreamType;
   if ((self) == rt_error) { return rt_error; } \
  \
   (self)->sid = (self)->chnl = (self)->todac = (self)->bufferCountWait = (self)->bufferCount = (self)->bufsize = (self)->duration = 0; \
+  (self)->cpuTime = 0.0; \
+  (self)->numCalls = 0; \
+  (self)->lane = 0; \
+  (self)->sleepinput = NULL; \
+  (self)->sleepthresh = 0.0; \
+  (self)->sleepwait = (self)->silentcount = (self)->sleeping = 0; \
+  (self)->sleeps = (self)->wakes = 0; \
+  (self)->krate = 1; \
+  (self)->kramp = 0; \
+  (self)->klast = 0.0; \
   (self)->active = 1;
 
 
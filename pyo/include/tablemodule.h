@@ -28,6 +28,8 @@ typedef struct {
     int size;
     double samplingRate;
     MYFLT *data;
+    Py_ssize_t shape[1];
+    Py_ssize_t strides[1];
 } TableStream;
 
 
@@ -45,3 +47,7 @@ MYFLT * TableStream_getData(PyObject *self);
 extern PyTypeObject TableStreamType;
 
 #endif
+
+/* Bulk copy from any contiguous "f" or "d" buffer into MYFLT memory. */
+int PyoBuffer_getFloatBuffer(PyObject *obj, Py_buffer *view);
+void PyoBuffer_copyToMYFLT(Py_buffer *view, Py_ssize_t start, MYFLT *dest, Py_ssize_t count);
@@ -33,5 +33,9 @@
 #ifndef _WIND_
 #define _WIND_
 void gen_window(MYFLT *window, int size, int wintype);
+/* shared, reference counted windows */
+MYFLT * acquire_window(int size, int wintype);
+void release_window(MYFLT *window);
+void window_cache_stats(long *stats, int reset);
 #endif
 
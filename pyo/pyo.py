@@ -19,9 +19,9 @@ along with pyo.  If not, see <http://www.gnu.org/licenses/>.
 """
 import os
 
-import sys
+import sys, re
 import __builtin__
-from types import IntType, FloatType
+from types import IntType, FloatType, ModuleType
 
 # For Python 2.5-, this will enable the simliar property mechanism as in
 # Python 2.6+/3.0+. The code is based on
@@ -53,51 +53,20 @@ if sys.version_info[:2] <= (2, 5):
     __builtin__.property = property
 
 from pyolib._maps import *
-import pyolib.analysis as analysis
-from pyolib.analysis import *
-import pyolib.controls as controls
-from pyolib.controls import *
-import pyolib.dynamics as dynamics
-from pyolib.dynamics import *
-import pyolib.effects as effects
-from pyolib.effects import *
-import pyolib.filters as filters
-from pyolib.filters import *
-import pyolib.generators as generators
-from pyolib.generators import *
-import pyolib.arithmetic as arithmetic
-from pyolib.arithmetic import *
-import pyolib.midi as midi
-from pyolib.midi import *
-import pyolib.opensndctrl as opensndctrl
-from pyolib.opensndctrl import *
-import pyolib.pan as pan
-from pyolib.pan import *
-import pyolib.pattern as pattern
-from pyolib.pattern import *
-import pyolib.randoms as randoms
-from pyolib.randoms import *
-from pyolib.server import *
-import pyolib.players as players
-from pyolib.players import *
-import pyolib.tableprocess as tableprocess
-from pyolib.tableprocess import *
-import pyolib.matrixprocess as matrixprocess
-from pyolib.matrixprocess import *
-from pyolib.tables import *
-from pyolib.matrix import *
-import pyolib.triggers as triggers
-from pyolib.triggers import *
-import pyolib.utils as utils
-from pyolib.utils import *
-import pyolib.fourier as fourier
-from pyolib.fourier import *
-import pyolib.phasevoc as phasevoc
-from pyolib.phasevoc import *
 from pyolib._core import *
+
+# The pyolib modules are imported on demand, the first time one of their
+# names is requested from the pyo module (see _PyoModule at the end of 
+# this file). The tuples are (module, imported as an attribute of pyo), 
+# in the order of precedence of the names (later modules win).
+PYOLIB_MODULES = [("analysis", True), ("controls", True), ("dynamics", True), ("effects", True), 
+                  ("filters", True), ("generators", True), ("arithmetic", True), ("midi", True), 
+                  ("opensndctrl", True), ("pan", True), ("pattern", True), ("randoms", True), 
+                  ("server", False), ("players", True), ("tableprocess", True), ("matrixprocess", True), 
+                  ("tables", False), ("matrix", False), ("triggers", True), ("utils", True), 
+                  ("fourier", True), ("phasevoc", True), ("asyncserver", False)]
 if WITH_EXTERNALS:
-    import pyolib.external as external
-    from pyolib.external import *
+    PYOLIB_MODULES.append(("external", True))
 
 class FreqShift(PyoObject):
     """
@@ -139,6 +108,8 @@ class FreqShift(PyoObject):
         self._cos_objs = []
         self._mod_objs = []
         self._base_objs = []
+        from pyolib.filters import Hilbert
+        from pyolib.generators import Sine
         for i in range(lmax):
             self._hilb_objs.append(Hilbert(wrap(in_fader,i)))
             self._sin_objs.append(Sine(freq=wrap(shift,i), mul=.707))
@@ -268,6 +239,7 @@ class PartialTable(PyoTableObject):
     def __init__(self, list=[(1,1), (1.33,0.5),(1.67,0.3)], size=65536):
         PyoTableObject.__init__(self, size)
         self._list = list
+        from pyolib.tables import HarmTable
         self._par_table = HarmTable(self._create_list(), size)
         self._base_objs = self._par_table.getBaseObjects()
         self.normalize()
@@ -319,7 +291,8 @@ OBJECTS_TREE = {'functions': sorted(['pa_count_devices', 'pa_get_default_input',
                                      'getVersion', 'reducePoints', 'serverCreated', 'serverBooted', 'distanceToSegment', 'rescale',
                                      'upsamp', 'downsamp', 'linToCosCurve', 'convertStringToSysEncoding', 'savefileFromTable',
                                     'pa_get_input_max_channels', 'pa_get_output_max_channels', 'pa_get_devices_infos', 'pa_get_version',
-                                    'pa_get_version_text']),
+                                    'pa_get_version_text', 'setDiskThreads', 'getDiskThreads',
+                                    'setConvolveThreads', 'getConvolveThreads', 'getFFTCacheStats']),
                 'PyoObjectBase': {
                     'PyoMatrixObject': sorted(['NewMatrix']),                        
                     'PyoTableObject': sorted(['LinTable', 'NewTable', 'SndTable', 'HannTable', 'HarmTable', 'SawTable', 'ParaTable', 'LogTable', 'CosLogTable',
@@ -327,38 +300,128 @@ OBJECTS_TREE = {'functions': sorted(['pa_count_devices', 'pa_get_default_input',
                     'PyoPVObject' : sorted(['PVAnal', 'PVSynth', 'PVTranspose', 'PVVerb', 'PVGate', 'PVAddSynth', 'PVCross', 'PVMult', 'PVMorph', 'PVFilter', 'PVDelay', 'PVBuffer', 'PVShift', 'PVAmpMod', 'PVFreqMod', 'PVBufLoops', 'PVBufTabLoops', 'PVMix']),
                     'PyoObject': {'analysis': sorted(['Follower', 'Follower2', 'ZCross', 'Yin']),
                                   'arithmetic': sorted(['Sin', 'Cos', 'Tan', 'Abs', 'Sqrt', 'Log', 'Log2', 'Log10', 'Pow', 'Atan2', 'Floor', 'Round',
-                                                        'Ceil', 'Tanh']),
+                                                        'Ceil', 'Tanh', 'Fuse']),
                                   'controls': sorted(['Fader', 'Sig', 'SigTo', 'Adsr', 'Linseg', 'Expseg']),
                                   'dynamics': sorted(['Clip', 'Compress', 'Degrade', 'Mirror', 'Wrap', 'Gate', 'Balance', 'Min', 'Max']),
                                   'effects': sorted(['Delay', 'SDelay', 'Disto', 'Freeverb', 'Waveguide', 'Convolve', 'WGVerb', 
                                                      'Harmonizer', 'Chorus', 'AllpassWG', 'FreqShift', 'Vocoder', 'Delay1', 'STRev']),
                                   'filters': sorted(['Biquad', 'BandSplit', 'Port', 'Hilbert', 'Tone', 'DCBlock', 'EQ', 'Allpass',
                                                      'Allpass2', 'Phaser', 'Biquadx', 'IRWinSinc', 'IRAverage', 'IRPulse', 'IRFM', 'FourBand',
-                                                     'Biquada', 'Atone', 'SVF', 'Average', 'Reson', 'Resonx', 'ButLP', 'ButHP', 'ButBP', 'ButBR', 'ComplexRes']),
+                                                     'Biquada', 'Atone', 'SVF', 'Average', 'Reson', 'Resonx', 'ButLP', 'ButHP', 'ButBP', 'ButBR', 'ComplexRes',
+                                                     'FilterBank']),
                                   'generators': sorted(['Noise', 'Phasor', 'Sine', 'Input', 'FM', 'SineLoop', 'Blit', 'PinkNoise', 'CrossFM',
                                                         'BrownNoise', 'Rossler', 'Lorenz', 'LFO', 'SumOsc', 'SuperSaw', 'RCOsc']),
                                   'internals': sorted(['Dummy', 'InputFader', 'Mix', 'VarPort']),
                                   'midi': sorted(['Midictl', 'CtlScan', 'CtlScan2', 'Notein', 'MidiAdsr', 'MidiDelAdsr', 'Bendin', 'Touchin', 'Programin']),
                                   'opensndctrl': sorted(['OscReceive', 'OscSend', 'OscDataSend', 'OscDataReceive', 'OscListReceive']),
-                                  'pan': sorted(['Pan', 'SPan', 'Switch', 'Selector', 'Mixer', 'VoiceManager']),
+                                  'pan': sorted(['Pan', 'SPan', 'Switch', 'Selector', 'Mixer', 'ModMatrix', 'VoiceManager', 'VoicePool']),
                                   'pattern': sorted(['Pattern', 'Score', 'CallAfter']),
                                   'randoms': sorted(['Randi', 'Randh', 'Choice', 'RandInt', 'Xnoise', 'XnoiseMidi', 'RandDur', 'XnoiseDur', 'Urn']),
                                   'players': sorted(['SfMarkerShuffler', 'SfPlayer', 'SfMarkerLooper']),
                                   'tableprocess': sorted(['TableRec', 'Osc', 'Pointer', 'Pointer2', 'Lookup', 'Granulator', 'Pulsar', 'OscLoop', 'Granule',
-                                                        'TableRead', 'TableMorph', 'Looper', 'TableIndex', 'OscBank', 'OscTrig', 'TablePut', 'TableScale']),
+                                                        'TableRead', 'TableMorph', 'Looper', 'TableIndex', 'OscBank', 'PartialBank', 'OscTrig', 'TablePut', 'TableScale']),
                                   'matrixprocess': sorted(['MatrixRec', 'MatrixPointer', 'MatrixMorph', 'MatrixRecLoop']), 
                                   'triggers': sorted(['Metro', 'Beat', 'TrigEnv', 'TrigRand', 'TrigRandInt', 'Select', 'Counter', 'TrigChoice', 
                                                     'TrigFunc', 'Thresh', 'Cloud', 'Trig', 'TrigXnoise', 'TrigXnoiseMidi', 'Timer', 'Count',
                                                     'Change', 'TrigLinseg', 'TrigExpseg', 'Percent', 'Seq', 'TrigTableRec', 'Iter', 'NextTrig',
                                                     'TrigVal']),
-                                  'utils': sorted(['Clean_objects', 'Print', 'Snap', 'Interp', 'SampHold', 'Compare', 'Record', 'Between', 'Denorm',
+                                  'utils': sorted(['Clean_objects', 'Print', 'Capture', 'Snap', 'Interp', 'SampHold', 'Compare', 'Record', 'Between', 'Denorm',
                                                     'ControlRec', 'ControlRead', 'NoteinRec', 'NoteinRead', 'DBToA', 'AToDB', 'Scale', 'CentsToTranspo',
                                                     'TranspoToCents', 'MToF', 'MToT', 'TrackHold']),
                                   'fourier': sorted(['FFT', 'IFFT', 'CarToPol', 'PolToCar', 'FrameDelta', 'FrameAccum', 'Vectral', 'CvlVerb', 'Spectrum'])}},
         'Map': {'SLMap': sorted(['SLMapFreq', 'SLMapMul', 'SLMapPhase', 'SLMapQ', 'SLMapDur', 'SLMapPan'])},
-        'Server': [], 
+        'Server': ['BatchRender', 'AsyncServer'], 
         'Stream': [], 
         'TableStream': []}
 
 DOC_KEYWORDS = ['Attributes', 'Examples', 'Parameters', 'Methods', 'Notes', 'Methods details', 'See also', 'Parentclass']
 DEMOS_PATH = SNDS_PATH
+
+class _PyoModule(ModuleType):
+    """
+    The pyo module, importing the pyolib modules on demand.
+
+    A name missing from the module is looked up in a name-to-module index, 
+    built from the sources of the pyolib modules, and its module is then 
+    imported. Names not found in the index cause the import of all the 
+    modules. `from pyo import *` imports all the modules, as Python must 
+    bind every name.
+
+    """
+    def __init__(self, module):
+        ModuleType.__init__(self, module.__name__, module.__doc__)
+        self.__dict__.update(module.__dict__)
+        # Keeps the real module alive, its globals are used by the functions 
+        # and classes defined in this file.
+        self.__dict__["_module"] = module
+        self.__dict__["_globals"] = module.__dict__
+        self.__dict__["_loaded"] = {}
+        self.__dict__["_index"] = None
+
+    def __getattr__(self, name):
+        if name == "__all__":
+            self._loadAll()
+            return sorted([key for key in self.__dict__ if not key.startswith("_")])
+        if name.startswith("_"):
+            raise AttributeError("'module' object has no attribute '%s'" % name)
+        if self._index is None:
+            self.__dict__["_index"] = _buildIndex()
+        if name in self._index:
+            self._load(self._index[name])
+        if name not in self.__dict__:
+            self._loadAll()
+        if name not in self.__dict__:
+            raise AttributeError("'module' object has no attribute '%s'" % name)
+        return self.__dict__[name]
+
+    def _load(self, position):
+        if position in self._loaded:
+            return
+        self._loaded[position] = True
+        name, alias = PYOLIB_MODULES[position]
+        module = __import__("pyolib.%s" % name, fromlist=["*"])
+        names = getattr(module, "__all__", None)
+        if names is None:
+            names = [key for key in module.__dict__ if not key.startswith("_")]
+        if alias:
+            names = names + [name]
+        for key in names:
+            if key == name and alias:
+                value = module
+            else:
+                value = getattr(module, key)
+            # A name defined in this file, in _core or by a later module wins.
+            if _precedence.get(key, -1) > position:
+                continue
+            _precedence[key] = position
+            self._globals[key] = value
+            self.__dict__[key] = value
+
+    def _loadAll(self):
+        for position in range(len(PYOLIB_MODULES)):
+            self._load(position)
+
+_NAME_RE = re.compile(r"^(?:class|def)\s+([A-Za-z]\w*)|^([A-Za-z]\w*)\s*=[^=]", re.M)
+
+def _buildIndex():
+    # Maps the names defined at the top level of the pyolib modules 
+    # to their position in PYOLIB_MODULES.
+    index = {}
+    folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pyolib")
+    for position, (name, alias) in enumerate(PYOLIB_MODULES):
+        if alias:
+            index[name] = position
+        try:
+            f = open(os.path.join(folder, name + ".py"), "r")
+            source = f.read()
+            f.close()
+        except IOError:
+            continue
+        for match in _NAME_RE.finditer(source):
+            index[match.group(1) or match.group(2)] = position
+    return index
+
+# Names defined by this file and by _core are never replaced.
+_precedence = dict.fromkeys(globals().keys(), len(PYOLIB_MODULES))
+
+sys.modules[__name__] = _PyoModule(sys.modules[__name__])
@@ -20,7 +20,7 @@ along with pyo.  If not, see <http://www.gnu.org/licenses/>.
 
 """
 from types import ListType, SliceType, FloatType, StringType, UnicodeType
-import random, os, sys, inspect, tempfile
+import random, os, sys, inspect, tempfile, math
 from subprocess import call
 
 import __builtin__
@@ -61,6 +61,9 @@ FUNCTIONS_INIT_LINES = {"pa_count_host_apis": "pa_count_host_apis()", "pa_list_h
                         "rescale": "rescale(data, xmin=0.0, xmax=1.0, ymin=0.0, ymax=1.0, xlog=False, ylog=False)",
                         "distanceToSegment": "distanceToSegment(p, p1, p2, xmin=0.0, xmax=1.0, ymin=0.0, ymax=1.0, xlog=False, ylog=False)",
                         "reducePoints": "reducePoints(pointlist, tolerance=0.02)", "serverCreated": "serverCreated()", "serverBooted": "serverBooted()",
+                        "setDiskThreads": "setDiskThreads(x)", "getDiskThreads": "getDiskThreads()",
+                        "setConvolveThreads": "setConvolveThreads(x)", "getConvolveThreads": "getConvolveThreads()",
+                        "getFFTCacheStats": "getFFTCacheStats(reset=False)",
                         "example": "example(cls, dur=5, toprint=True, double=False)", "class_args": "class_args(cls)", "getVersion": "getVersion()",
                         "convertStringToSysEncoding": "convertStringToSysEncoding(str)", "convertArgsToLists": "convertArgsToLists(*args)",
                         "wrap": "wrap(arg, i)"
@@ -90,13 +93,17 @@ def convertArgsToLists(*args):
     
     """
     converted = []
+    max_length = 0
     for i in args:
-        if isinstance(i, PyoObjectBase) or type(i) == ListType:
+        if type(i) is ListType or isinstance(i, PyoObjectBase):
             converted.append(i)
+            if len(i) > max_length:
+                max_length = len(i)
         else:
             converted.append([i])
-            
-    max_length = max(len(i) for i in converted)
+            if max_length == 0:
+                max_length = 1
+
     return tuple(converted + [max_length])
 
 def wrap(arg, i):
@@ -110,6 +117,45 @@ def wrap(arg, i):
     else:
         return x
 
+def expandArgs(*args):
+    """
+    Return the list of per-stream argument tuples for the given arguments.
+
+    Equivalent to calling convertArgsToLists() and then building, for
+    every stream `i`, the tuple of `wrap(arg, i)`, but done in a single
+    pass. Streams of PyoObjects are unwrapped only once per object, no
+    matter how many times they are repeated, and the expansion to the
+    longest argument is done by list repetition and zip.
+
+    """
+    columns = []
+    unwrapped = {}
+    lmax = 0
+    for arg in args:
+        if type(arg) is ListType:
+            column = []
+            for x in arg:
+                if isinstance(x, PyoObjectBase):
+                    key = id(x)
+                    if key not in unwrapped:
+                        unwrapped[key] = x[0]
+                    x = unwrapped[key]
+                column.append(x)
+        elif isinstance(arg, PyoObjectBase):
+            column = [wrap(arg, i) for i in range(len(arg))]
+        else:
+            column = [arg]
+        if len(column) > lmax:
+            lmax = len(column)
+        columns.append(column)
+
+    for i, column in enumerate(columns):
+        size = len(column)
+        if size < lmax:
+            columns[i] = (column * (lmax / size + 1))[:lmax]
+
+    return zip(*columns)
+
 def example(cls, dur=5, toprint=True, double=False):
     """
     Execute the example given in the documentation of the object as an argument.
@@ -400,6 +446,26 @@ class PyoObject(PyoObjectBase):
         self._op_duplicate = 1
         self._map_list = []
         self._zeros = None
+        self._expr = None
+        self._fusable = True
+
+    def _recordExpr(self, dummy, op, left, right, helpers=None):
+        # Remembers the operation that produced `dummy` so that Fuse can
+        # later compile the whole chain into a single object.
+        for obj in (left, right):
+            if isinstance(obj, PyoObject) and obj._op_duplicate != 1:
+                return
+        dummy._expr = (op, left, right)
+        dummy._expr_helpers = helpers or []
+        # `dummy` now holds `self`, so `self` keeps another Dummy sharing 
+        # the same streams in its _keep_trace, to avoid a reference cycle.
+        if self._keep_trace and self._keep_trace[-1] is dummy:
+            self._keep_trace[-1] = Dummy(dummy._base_objs)
+
+    def _getExpr(self):
+        # Returns the (op, left, right) operation recorded by _recordExpr, 
+        # or None if there is none.
+        return self._expr
 
     def __add__(self, x):
         x, lmax = convertArgsToLists(x)
@@ -411,6 +477,7 @@ class PyoObject(PyoObjectBase):
             else:
                 _add_dummy = Dummy([wrap(self._base_objs,i) + obj for i, obj in enumerate(x)])
         self._keep_trace.append(_add_dummy)
+        self._recordExpr(_add_dummy, "+", self, x)
         return _add_dummy
         
     def __radd__(self, x):
@@ -420,6 +487,7 @@ class PyoObject(PyoObjectBase):
         else:
             _add_dummy = Dummy([wrap(self._base_objs,i) + obj for i, obj in enumerate(x)])                
         self._keep_trace.append(_add_dummy)
+        self._recordExpr(_add_dummy, "+", x, self)
         return _add_dummy
             
     def __iadd__(self, x):
@@ -436,15 +504,18 @@ class PyoObject(PyoObjectBase):
             else:
                 _add_dummy = Dummy([wrap(self._base_objs,i) - obj for i, obj in enumerate(x)])
         self._keep_trace.append(_add_dummy)
+        self._recordExpr(_add_dummy, "-", self, x)
         return _add_dummy
 
     def __rsub__(self, x):
         x, lmax = convertArgsToLists(x)
+        helpers = []
         if self.__len__() >= lmax:
             tmp = []
             for i, obj in enumerate(self._base_objs):
                 sub_upsamp = Sig(wrap(x, i/self._op_duplicate))
                 self._keep_trace.append(sub_upsamp)
+                helpers.append(sub_upsamp)
                 tmp.append(sub_upsamp - obj)
             _add_dummy = Dummy(tmp)
         else:
@@ -452,9 +523,11 @@ class PyoObject(PyoObjectBase):
             for i, obj in enumerate(x):
                 sub_upsamp = Sig(obj)
                 self._keep_trace.append(sub_upsamp)
+                helpers.append(sub_upsamp)
                 tmp.append(sub_upsamp - wrap(self._base_objs,i))
             _add_dummy = Dummy(tmp)
         self._keep_trace.append(_add_dummy)
+        self._recordExpr(_add_dummy, "-", x, self, helpers)
         return _add_dummy
 
     def __isub__(self, x):
@@ -471,6 +544,7 @@ class PyoObject(PyoObjectBase):
             else:
                 _mul_dummy = Dummy([wrap(self._base_objs,i) * obj for i, obj in enumerate(x)])  
         self._keep_trace.append(_mul_dummy)
+        self._recordExpr(_mul_dummy, "*", self, x)
         return _mul_dummy
         
     def __rmul__(self, x):
@@ -480,6 +554,7 @@ class PyoObject(PyoObjectBase):
         else:
             _mul_dummy = Dummy([wrap(self._base_objs,i) * obj for i, obj in enumerate(x)])                
         self._keep_trace.append(_mul_dummy)
+        self._recordExpr(_mul_dummy, "*", x, self)
         return _mul_dummy
             
     def __imul__(self, x):
@@ -496,15 +571,18 @@ class PyoObject(PyoObjectBase):
             else:
                 _mul_dummy = Dummy([wrap(self._base_objs,i) / obj for i, obj in enumerate(x)])
         self._keep_trace.append(_mul_dummy)
+        self._recordExpr(_mul_dummy, "/", self, x)
         return _mul_dummy
 
     def __rdiv__(self, x):
         x, lmax = convertArgsToLists(x)
+        helpers = []
         if self.__len__() >= lmax:
             tmp = []
             for i, obj in enumerate(self._base_objs):
                 div_upsamp = Sig(wrap(x, i/self._op_duplicate))
                 self._keep_trace.append(div_upsamp)
+                helpers.append(div_upsamp)
                 tmp.append(div_upsamp / obj)
             _mul_dummy = Dummy(tmp)
         else:
@@ -512,9 +590,11 @@ class PyoObject(PyoObjectBase):
             for i, obj in enumerate(x):
                 div_upsamp = Sig(obj)
                 self._keep_trace.append(div_upsamp)
+                helpers.append(div_upsamp)
                 tmp.append(div_upsamp / wrap(self._base_objs,i))
             _mul_dummy = Dummy(tmp)
         self._keep_trace.append(_mul_dummy)
+        self._recordExpr(_mul_dummy, "/", x, self, helpers)
         return _mul_dummy
 
     def __idiv__(self, x):
@@ -596,6 +676,136 @@ class PyoObject(PyoObjectBase):
             return [obj._getStream().isOutputting() for obj in self._base_objs]
         else:
             return self._base_objs[0]._getStream().isOutputting()
+
+    def setAutoSleep(self, x=True, thresh=-90, time=0.1):
+        """
+        Activate or deactivate the automatic sleep of the object.
+
+        When active, a stream of the object stops computing its samples 
+        when its input and its output stayed under `thresh` for `time` 
+        seconds, plus the length of the object's delay lines if it has 
+        any, so the tail of a delay or a reverb is never cut. The stream 
+        then outputs zeros and wakes up on the first buffer of its input 
+        above the threshold. A sleeping stream only costs the scan of its 
+        input buffer.
+
+        Only objects processing an `input` signal (filters, effects, etc.) 
+        can sleep. Server.setAutoSleep(False) keeps all the streams awake 
+        without changing their settings.
+
+        :Args:
+
+            x : boolean, optional
+                True to activate the automatic sleep, False to deactivate it.
+                Defaults to True.
+            thresh : float, optional
+                Silence threshold, in dB. Defaults to -90.
+            time : float, optional
+                Time, in seconds, the input and the output must stay under 
+                the threshold before the stream sleeps. Defaults to 0.1.
+
+        >>> s = Server().boot()
+        >>> s.start()
+        >>> env = Adsr(dur=.5, mul=.3)
+        >>> src = Noise(mul=env)
+        >>> rev = WGVerb(src, feedback=.8).out()
+        >>> rev.setAutoSleep(True)
+        >>> pat = Pattern(env.play, time=4).play()
+
+        """
+        if not hasattr(self, "_in_fader"):
+            print "Object %s has no input, it can't sleep." % self.__class__.__name__
+            return
+        if x:
+            server = self._base_objs[0].getServer()
+            samples = (time + self._getSleepTail()) * server.getSamplingRate()
+            wait = max(1, int(math.ceil(samples / server.getBufferSize())))
+            thresh = pow(10.0, thresh * 0.05)
+        else:
+            wait = 0
+        for i, obj in enumerate(self._base_objs):
+            input = self._in_fader[i % len(self._in_fader)]._getStream()
+            obj._getStream().setSleep(input, thresh, wait)
+
+    def getSleepStats(self, reset=False):
+        """
+        Returns the counters of the automatic sleep.
+
+        The counters are summed over the streams of the object and 
+        returned as a dictionary with the following keys:
+
+            - 'sleeps' : number of times a stream went to sleep.
+            - 'wakes' : number of times a stream woke up.
+            - 'sleeping' : number of streams currently sleeping.
+
+        :Args:
+
+            reset : boolean, optional
+                If True, the counters are reset after reading. 
+                Defaults to False.
+
+        """
+        sleeps = wakes = sleeping = 0
+        for obj in self._base_objs:
+            stream = obj._getStream()
+            s, w, z = stream.getSleepStats()
+            sleeps += s
+            wakes += w
+            sleeping += z
+            if reset:
+                stream.resetSleepStats()
+        return {"sleeps": sleeps, "wakes": wakes, "sleeping": sleeping}
+
+    def setControlRate(self, x=True, period=0, ramp=False):
+        """
+        Activate or deactivate the control-rate mode of the object.
+
+        In control-rate mode, the object computes one value every `period` 
+        samples instead of one value per sample, and presents them to the 
+        objects using it as a full audio stream, each value being held or 
+        linearly ramped from the previous one. Time keeps running at the 
+        right speed, so a 2 Hz LFO stays a 2 Hz LFO. The processing cost of 
+        the object is divided by about `period`.
+
+        This mode is meant for modulation sources: generators (LFO, Sine, 
+        Phasor, etc.), random objects (Randi, Randh, etc.), envelopes and 
+        ports (Adsr, Linseg, SigTo, Port, etc.) and converters (Scale, MToF, 
+        DBToA, etc.). Converters, Port and SigTo read their input once per 
+        period, other parameters given as audio streams are read at the 
+        start of the buffer. Objects sending triggers or needing sample 
+        accuracy must stay at audio rate. With ramp=True, the output is 
+        one period late.
+
+        :Args:
+
+            x : boolean, optional
+                True for control rate, False for audio rate. Defaults to True.
+            period : int, optional
+                Number of samples per computed value. 0 means one value 
+                per buffer. Defaults to 0.
+            ramp : boolean, optional
+                If True, ramps linearly between the values, otherwise holds 
+                them. Defaults to False.
+
+        >>> s = Server().boot()
+        >>> s.start()
+        >>> lfos = [LFO(freq=.1*(i+1), type=3, mul=200, add=400) for i in range(8)]
+        >>> for lfo in lfos:
+        ...     lfo.setControlRate(True, period=16, ramp=True)
+        >>> a = SineLoop(freq=lfos, feedback=.05, mul=.02).out()
+
+        """
+        if x:
+            if period <= 0:
+                period = self._base_objs[0].getServer().getBufferSize()
+        else:
+            period = 1
+        [obj._getStream().setControlRate(int(period), int(bool(ramp))) for obj in self._base_objs]
+
+    def _getSleepTail(self):
+        # Length, in seconds, of the internal memory (delay lines) of the
+        # object. Objects with delay lines return their maximum delay.
+        return 0
             
     def get(self, all=False):
         """
@@ -767,6 +977,7 @@ class PyoObject(PyoObjectBase):
         
         """
         self._mul = x
+        self._expr = None
         x, lmax = convertArgsToLists(x)
         [obj.setMul(wrap(x,i/self._op_duplicate)) for i, obj in enumerate(self._base_objs)]
         
@@ -781,6 +992,7 @@ class PyoObject(PyoObjectBase):
         
         """
         self._add = x
+        self._expr = None
         x, lmax = convertArgsToLists(x)
         [obj.setAdd(wrap(x,i/self._op_duplicate)) for i, obj in enumerate(self._base_objs)]
 
@@ -795,6 +1007,8 @@ class PyoObject(PyoObjectBase):
         
         """
         self._add = x
+        self._expr = None
+        self._fusable = False
         x, lmax = convertArgsToLists(x)
         [obj.setSub(wrap(x,i/self._op_duplicate)) for i, obj in enumerate(self._base_objs)]
 
@@ -809,6 +1023,8 @@ class PyoObject(PyoObjectBase):
 
         """
         self._mul = x
+        self._expr = None
+        self._fusable = False
         x, lmax = convertArgsToLists(x)
         [obj.setDiv(wrap(x,i/self._op_duplicate)) for i, obj in enumerate(self._base_objs)]
 
@@ -1112,6 +1328,79 @@ class PyoTableObject(PyoObjectBase):
         else:
             return self._base_objs[0].getTable()
 
+    def getBuffer(self, all=False):
+        """
+        Returns a memoryview sharing the memory of the table.
+
+        No sample is copied, reading or writing the memoryview reads
+        or writes the samples used by the audio engine. The item format
+        is "f" (single precision) or "d" (double precision, with pyo64).
+
+        The view keeps the table alive. While views exist, the table
+        can't be resized: `setSize`, `setData`, `read`, `setSound`, etc.
+        raise a BufferError until the views are released.
+
+        :Args:
+
+            all : boolean, optional
+                If True, a list with a view for every sub table is returned.
+
+                If False, only the view of the first sub table (or the
+                only one) is returned.
+
+        """
+        if all:
+            return [memoryview(obj) for obj in self._base_objs]
+        else:
+            return memoryview(self._base_objs[0])
+
+    def getArray(self, all=False):
+        """
+        Returns a numpy array sharing the memory of the table.
+
+        Same as `getBuffer` but the views are wrapped in numpy arrays
+        (float32, or float64 with pyo64). Requires numpy.
+
+        :Args:
+
+            all : boolean, optional
+                If True, a list with an array for every sub table is returned.
+
+                If False, only the array of the first sub table (or the
+                only one) is returned.
+
+        """
+        import numpy
+        if all:
+            return [numpy.asarray(buf) for buf in self.getBuffer(True)]
+        else:
+            return numpy.asarray(self.getBuffer())
+
+    def setBuffer(self, buffer, pos=0):
+        """
+        Copies samples from a contiguous buffer into the table.
+
+        `buffer` can be any object exposing a contiguous array of
+        floats or doubles (numpy array, memoryview, another table's
+        buffer...). When the item format matches the engine's precision,
+        the samples are copied in one pass without conversion. Samples
+        beyond the end of the table are ignored. The table is not resized.
+
+        :Args:
+
+            buffer : buffer object or list of buffer objects
+                Samples to write. If a list is given, each buffer is
+                written into the sub table at the same position.
+            pos : int, optional
+                Position, in samples, where to start writing. Defaults to 0.
+
+        """
+        if type(buffer) == ListType:
+            [obj.getTableStream().fromBuffer(buffer[i%len(buffer)], pos) for i, obj in enumerate(self._base_objs)]
+        else:
+            [obj.getTableStream().fromBuffer(buffer, pos) for obj in self._base_objs]
+        self.refreshView()
+
     def normalize(self):
         """
         Normalize table samples between -1 and 1.
@@ -1441,6 +1730,74 @@ class PyoMatrixObject(PyoObjectBase):
         if len(values) == 1: return values[0]
         else: return values
 
+    def getBuffer(self, all=False):
+        """
+        Returns a memoryview sharing the memory of the matrix.
+
+        The view has a shape of (height, width) and no sample is copied.
+        The item format is "f" (single precision) or "d" (double precision,
+        with pyo64). Rows are padded by one guard point, so the view is
+        strided rather than contiguous.
+
+        The view keeps the matrix alive. While views exist, the matrix
+        can't be resized: `setData` and `read` raise a BufferError until
+        the views are released.
+
+        :Args:
+
+            all : boolean, optional
+                If True, a list with a view for every matrixstream is returned.
+
+                If False, only the view of the first matrixstream (or the
+                only one) is returned.
+
+        """
+        if all:
+            return [memoryview(obj) for obj in self._base_objs]
+        else:
+            return memoryview(self._base_objs[0])
+
+    def getArray(self, all=False):
+        """
+        Returns a 2-D numpy array, of shape (height, width), sharing the
+        memory of the matrix. Requires numpy.
+
+        :Args:
+
+            all : boolean, optional
+                If True, a list with an array for every matrixstream is returned.
+
+                If False, only the array of the first matrixstream (or the
+                only one) is returned.
+
+        """
+        import numpy
+        if all:
+            return [numpy.asarray(buf) for buf in self.getBuffer(True)]
+        else:
+            return numpy.asarray(self.getBuffer())
+
+    def setBuffer(self, buffer):
+        """
+        Copies samples from a contiguous buffer into the matrix.
+
+        `buffer` can be any object exposing a contiguous array of
+        width * height floats or doubles, in row order. When the item
+        format matches the engine's precision, each row is copied
+        without conversion. The matrix is not resized.
+
+        :Args:
+
+            buffer : buffer object or list of buffer objects
+                Samples to write. If a list is given, each buffer is
+                written into the matrixstream at the same position.
+
+        """
+        if type(buffer) == ListType:
+            [obj.getMatrixStream().fromBuffer(buffer[i%len(buffer)]) for i, obj in enumerate(self._base_objs)]
+        else:
+            [obj.getMatrixStream().fromBuffer(buffer) for obj in self._base_objs]
+
     def view(self, title="Matrix viewer", wxnoserver=False):
         """
         Opens a window showing the contents of the matrix.
@@ -1837,10 +2194,20 @@ class Sig(PyoObject):
         self._map_list = [SLMap(0, 1, "lin", "value", self._value)]
         PyoObject.ctrl(self, map_list, title, wxnoserver)
     
+    def _getValue(self):
+        # Values scheduled with Server.scheduleValue are given to the 
+        # C objects only, read them back when they hold numbers.
+        values = [obj.value for obj in self._base_objs]
+        if False in [type(v) == FloatType for v in values]:
+            return self._value
+        if type(self._value) == ListType or values.count(values[0]) != len(values):
+            return values
+        return values[0]
+
     @property
     def value(self):
         """float or PyoObject. Numerical value to convert.""" 
-        return self._value
+        return self._getValue()
     @value.setter
     def value(self, x): self.setValue(x)
 
@@ -21,35 +21,71 @@ along with pyo.  If not, see <http://www.gnu.org/licenses/>.
 from types import ListType, FloatType, IntType
 import math, sys, os, random
 
-try:
-    from PIL import Image, ImageDraw, ImageTk
-    WITH_PIL = True
-except:
-    WITH_PIL = False
+# The GUI toolkit (and PIL) are only imported when the first window is 
+# created, importing wx or Tkinter takes a long time and is not needed 
+# by scripts that don't use any graphical interface.
+WITH_PIL = False
+PYO_USE_WX = None
 
-try:
-    import wxversion
-    if (wxversion.checkInstalled("2.8")):
-        wxversion.ensureMinimal("2.8")
-    import wx
-    from _wxwidgets import *
-    PYO_USE_WX = True
-except:
-    PYO_USE_WX = False
+def _publicNames(module):
+    # Names imported by `from module import *`.
+    names = getattr(module, "__all__", None)
+    if names is None:
+        names = [name for name in module.__dict__ if not name.startswith("_")]
+    return dict([(name, getattr(module, name)) for name in names])
+
+def _importToolkit(module):
+    # Same as `from module import *`, except that the names defined 
+    # in this module are not replaced.
+    space = globals()
+    for name, value in _publicNames(module).items():
+        if name not in space:
+            space[name] = value
+
+def initToolkit():
+    """
+    Imports the GUI toolkit used by pyo's windows, wxPython if available,
+    otherwise Tkinter. Called automatically before creating any window.
+
+    """
+    global WITH_PIL, PYO_USE_WX
+    if PYO_USE_WX is not None:
+        return
 
-if not PYO_USE_WX:
     try:
-        from Tkinter import *
-        from _tkwidgets import *
+        from PIL import Image, ImageDraw, ImageTk
+        globals().update(Image=Image, ImageDraw=ImageDraw, ImageTk=ImageTk)
+        WITH_PIL = True
     except:
-        if sys.platform == "linux2":
-            response = raw_input("""python-tk package is missing! It is needed to use pyo graphical interfaces.
+        WITH_PIL = False
+
+    try:
+        import wxversion
+        if (wxversion.checkInstalled("2.8")):
+            wxversion.ensureMinimal("2.8")
+        import wx
+        import _wxwidgets
+        globals()["wx"] = wx
+        _importToolkit(_wxwidgets)
+        PYO_USE_WX = True
+    except:
+        PYO_USE_WX = False
+
+    if not PYO_USE_WX:
+        try:
+            import Tkinter
+            import _tkwidgets
+            _importToolkit(Tkinter)
+            _importToolkit(_tkwidgets)
+        except:
+            if sys.platform == "linux2":
+                response = raw_input("""python-tk package is missing! It is needed to use pyo graphical interfaces.
 Do you want to install it? (yes/no): """)
-            if response == 'yes':
-                os.system('sudo apt-get install python-tk')
-        else:
-            print "Tkinter is missing! It is needed to use pyo graphical interfaces. Please install it!"
-        sys.exit()
+                if response == 'yes':
+                    os.system('sudo apt-get install python-tk')
+            else:
+                print "Tkinter is missing! It is needed to use pyo graphical interfaces. Please install it!"
+            sys.exit()
 
 X, Y, CURRENT_X, MAX_X, NEXT_Y = 800, 700, 30, 30, 30
 WINDOWS = []
@@ -62,6 +98,7 @@ MATRIXWINDOWS = []
 SPECTRUMWINDOWS = []
 
 def createRootWindow():
+    initToolkit()
     if not PYO_USE_WX:
         if len(WINDOWS) == 0:
             root = Tk()
@@ -175,6 +212,7 @@ def wxCreateDelayedSpectrumWindows():
         wxDisplayWindow(f, title)
     
 def createCtrlWindow(obj, map_list, title, wxnoserver=False):
+    initToolkit()
     if not PYO_USE_WX:
         createRootWindow()
         win = tkCreateToplevelWindow()
@@ -192,6 +230,7 @@ def createCtrlWindow(obj, map_list, title, wxnoserver=False):
             CTRLWINDOWS.append([obj, map_list, title])
 
 def createGraphWindow(obj, mode, xlen, yrange, title, wxnoserver=False):
+    initToolkit()
     if not PYO_USE_WX:
         print "WxPython must be installed to use the 'graph()' method."
     else:
@@ -204,6 +243,7 @@ def createGraphWindow(obj, mode, xlen, yrange, title, wxnoserver=False):
             GRAPHWINDOWS.append([obj, mode, xlen, yrange, title])   
 
 def createDataGraphWindow(obj, yrange, title, wxnoserver=False):
+    initToolkit()
     if not PYO_USE_WX:
         print "WxPython must be installed to use the 'graph()' method."
     else:
@@ -216,6 +256,7 @@ def createDataGraphWindow(obj, yrange, title, wxnoserver=False):
             DATAGRAPHWINDOWS.append([obj, yrange, title])   
         
 def createViewTableWindow(samples, title="Table waveform", wxnoserver=False, tableclass=None, object=None):
+    initToolkit()
     if not PYO_USE_WX:
         createRootWindow()
         win = tkCreateToplevelWindow()
@@ -235,6 +276,7 @@ def createViewTableWindow(samples, title="Table waveform", wxnoserver=False, tab
             TABLEWINDOWS.append([samples, tableclass, title, object])    
 
 def createSndViewTableWindow(obj, title="Table waveform", wxnoserver=False, tableclass=None, mouse_callback=None):
+    initToolkit()
     if not PYO_USE_WX:
         createRootWindow()
         win = tkCreateToplevelWindow()
@@ -253,6 +295,7 @@ def createSndViewTableWindow(obj, title="Table waveform", wxnoserver=False, tabl
             SNDTABLEWINDOWS.append([obj, tableclass, title, mouse_callback])
         
 def createViewMatrixWindow(samples, size, title="Matrix viewer", wxnoserver=False, object=None):
+    initToolkit()
     if not WITH_PIL: print """The Python Imaging Library is not installed. 
 It helps a lot to speed up matrix drawing!"""
     if not PYO_USE_WX:
@@ -274,6 +317,7 @@ It helps a lot to speed up matrix drawing!"""
             MATRIXWINDOWS.append([samples,size,title, object])    
 
 def createSpectrumWindow(object, title, wxnoserver=False):
+    initToolkit()
     if not PYO_USE_WX:
         print "WxPython must be installed to use the Spectrum display."
     else:
@@ -288,6 +332,7 @@ def createSpectrumWindow(object, title, wxnoserver=False):
             SPECTRUMWINDOWS.append([object, title])   
         
 def createServerGUI(nchnls, start, stop, recstart, recstop, setAmp, started, locals, shutdown, meter, timer, amp):
+    initToolkit()
     global X, Y, MAX_X, NEXT_Y
     if not PYO_USE_WX:
         createRootWindow()
@@ -723,3 +723,229 @@ class Tanh(PyoObject):
         return self._input
     @input.setter
     def input(self, x): self.setInput(x)
+
+# Opcodes of a fused expression program, must match the enum in arithmeticmodule.c.
+_FUSE_OPCODES = {"input": 0, "const": 1, "+": 2, "-": 3, "*": 4, "/": 5, "+c": 6, "-c": 7, "c-": 8, "*c": 9,
+                 "pow": 10, "atan2": 11, "wrap": 12, "<": 13, "<=": 14, ">": 15, ">=": 16, "==": 17, "!=": 18,
+                 "sin": 19, "cos": 20, "tan": 21, "abs": 22, "sqrt": 23, "log": 24, "log2": 25, "log10": 26,
+                 "floor": 27, "ceil": 28, "round": 29, "tanh": 30}
+
+_FUSE_UNARY = {Sin: "sin", Cos: "cos", Tan: "tan", Abs: "abs", Sqrt: "sqrt", Log: "log", Log2: "log2",
+               Log10: "log10", Floor: "floor", Ceil: "ceil", Round: "round", Tanh: "tanh"}
+
+_FUSE_NUMBERS = (int, long, float)
+
+class _FuseCompiler:
+    """
+    Compiles an arithmetic expression graph into M_Fuse programs.
+
+    Every node is compiled per stream, exactly as the chain of objects 
+    computes it. Operations are never reordered and constants are never 
+    folded, so the fused stream produces the same samples as the original 
+    graph. Anything that can't be fused becomes an input of the program.
+
+    """
+    def __init__(self):
+        self.fused = {}
+        self.visited = {}
+        self.leaves = {}
+
+    def compile(self, node, i):
+        self.inputs = []
+        self.input_index = {}
+        self.program = []
+        self.operand(node, i)
+        return self.inputs, self.program
+
+    def fusable(self, node):
+        if not isinstance(node, PyoObject) or node._op_duplicate != 1 or not node._fusable:
+            return False
+        if isinstance(node, Dummy):
+            expr = node._getExpr()
+            if expr is None:
+                return False
+            for operand in expr[1:]:
+                if type(operand) is ListType:
+                    for x in operand:
+                        if not isinstance(x, _FUSE_NUMBERS) and not isinstance(x, PyoObject):
+                            return False
+            return True
+        if type(node) is Compare:
+            modes = node._mode
+            if type(modes) is not ListType:
+                modes = [modes]
+            for mode in modes:
+                if mode not in node.comp_dict:
+                    return False
+            return True
+        return type(node) in _FUSE_UNARY or type(node) in [Pow, Atan2, Wrap]
+
+    def node(self, node, i):
+        if not self.fusable(node):
+            self.input(node, i)
+            return
+        self.visited[id(node)] = node
+        i %= len(node)
+        if isinstance(node, Dummy):
+            self.fused[id(node)] = node
+            op, left, right = node._getExpr()
+            self.binary(op, left, right, i)
+            return
+        cls = type(node)
+        if cls in _FUSE_UNARY:
+            self.operand(node._input, i)
+            self.program.append((_FUSE_OPCODES[_FUSE_UNARY[cls]], 0))
+        elif cls is Pow:
+            self.operand(node._base, i)
+            self.operand(node._exponent, i)
+            self.program.append((_FUSE_OPCODES["pow"], 0))
+        elif cls is Atan2:
+            self.operand(node._b, i)
+            self.operand(node._a, i)
+            self.program.append((_FUSE_OPCODES["atan2"], 0))
+        elif cls is Wrap:
+            self.operand(node._input, i)
+            self.operand(node._min, i)
+            self.operand(node._max, i)
+            self.program.append((_FUSE_OPCODES["wrap"], 0))
+        elif cls is Compare:
+            self.operand(node._input, i)
+            self.operand(node._comp, i)
+            modes = node._mode
+            if type(modes) is not ListType:
+                modes = [modes]
+            self.program.append((_FUSE_OPCODES[modes[i % len(modes)]], 0))
+        self.binary("*", None, node._mul, i)
+        self.binary("+", None, node._add, i)
+
+    def constant(self, x, i):
+        if type(x) is ListType:
+            x = x[i % len(x)]
+        if isinstance(x, _FUSE_NUMBERS):
+            return float(x)
+        return None
+
+    def operand(self, x, i):
+        if type(x) is ListType:
+            x = x[i % len(x)]
+            i = 0
+        if isinstance(x, _FUSE_NUMBERS):
+            self.program.append((_FUSE_OPCODES["const"], float(x)))
+        else:
+            self.node(x, i)
+
+    def binary(self, op, left, right, i):
+        # `left` is None when the operation applies to the value already 
+        # on top of the stack (mul and add of a fused object).
+        rconst = self.constant(right, i)
+        lconst = None
+        if left is not None:
+            lconst = self.constant(left, i)
+        if rconst is not None:
+            if left is not None:
+                self.operand(left, i)
+            if op == "+":
+                if rconst != 0 or left is not None:
+                    self.program.append((_FUSE_OPCODES["+c"], rconst))
+            elif op == "-":
+                self.program.append((_FUSE_OPCODES["-c"], rconst))
+            elif op == "*":
+                if rconst != 1 or left is not None:
+                    self.program.append((_FUSE_OPCODES["*c"], rconst))
+            elif rconst != 0:
+                # Same as the division of a stream by a number, which multiplies by the inverse.
+                self.program.append((_FUSE_OPCODES["*c"], 1.0 / rconst))
+        elif lconst is not None and op != "/":
+            self.operand(right, i)
+            self.program.append((_FUSE_OPCODES[{"+": "+c", "-": "c-", "*": "*c"}[op]], lconst))
+        else:
+            if left is not None:
+                self.operand(left, i)
+            self.operand(right, i)
+            self.program.append((_FUSE_OPCODES[op], 0))
+
+    def input(self, obj, i):
+        self.visited[id(obj)] = obj
+        self.leaves[id(obj)] = obj
+        stream = wrap(obj.getBaseObjects(), i)
+        if id(stream) not in self.input_index:
+            self.input_index[id(stream)] = len(self.inputs)
+            self.inputs.append(stream)
+        self.program.append((_FUSE_OPCODES["input"], self.input_index[id(stream)]))
+
+    def release(self):
+        # Intermediate Dummy objects (and the Sig objects created by 
+        # reversed substractions and divisions) are no more needed.
+        # The _keep_trace of an operand holds a Dummy sharing the streams 
+        # of the fused node (see PyoObject._recordExpr).
+        released = {}
+        for node in self.fused.values():
+            released[id(node)] = True
+            for stream in node.getBaseObjects():
+                released[id(stream)] = True
+            for helper in node._expr_helpers:
+                released[id(helper)] = True
+        for obj in self.visited.values():
+            obj._keep_trace = [x for x in obj._keep_trace if id(x) not in released and 
+                               not (type(x) is Dummy and x.getBaseObjects() and id(x.getBaseObjects()[0]) in released)]
+
+class Fuse(PyoObject):
+    """
+    Compiles an arithmetic expression into a single audio object.
+
+    Every arithmetic operation on a PyoObject (+, -, *, /) creates a 
+    new Dummy object, with its own audio stream and buffer. A long 
+    expression such as `(a * 0.5 + b) * env - 0.1` thus adds four 
+    streams to the server's processing list, each one reading and 
+    writing a whole buffer per block.
+
+    Fuse walks the expression given as `input` and compiles it, per 
+    stream, into a small program evaluated by a single object, using 
+    scratch buffers instead of server streams. The operations are 
+    performed in the same order as the original chain of objects, so 
+    the output is identical to the unfused expression.
+
+    Dummy objects created by the four arithmetic operators can be 
+    fused, as well as the following objects: Sin, Cos, Tan, Abs, 
+    Sqrt, Log, Log2, Log10, Floor, Ceil, Round, Tanh, Atan2, Pow, 
+    Wrap and Compare. Any other object in the expression becomes an 
+    input of the fused program and is processed as usual.
+
+    :Parent: :py:class:`PyoObject`
+
+    :Args:
+
+        input : PyoObject
+            Arithmetic expression to compile.
+
+    .. note::
+
+        The expression is compiled as it is when the Fuse object is 
+        created. Later changes to the objects of the expression (setMul, 
+        setInput, etc.) are not reflected in the fused object, except 
+        for the input objects, which are still running.
+
+        The expression holds all its objects, temporary ones included 
+        (`Abs(b)`, `Sine(440)`, etc.), until Fuse has compiled it. The 
+        intermediate objects are then released and stop computing, 
+        unless they are still referenced elsewhere, by a variable for 
+        example, in which case they keep running alongside the Fuse.
+
+    >>> s = Server().boot()
+    >>> s.start()
+    >>> a = Sine(freq=[250,251])
+    >>> b = Sine(freq=[500,502])
+    >>> lf = Sine(freq=.25, mul=.5, add=.5)
+    >>> f = Fuse((a * 0.5 + b * 0.25) * lf - Abs(b) * 0.1, mul=.3).out()
+
+    """
+    def __init__(self, input, mul=1, add=0):
+        PyoObject.__init__(self, mul, add)
+        compiler = _FuseCompiler()
+        input, mul, add, lmax = convertArgsToLists(input, mul, add)
+        self._base_objs = []
+        for i in range(lmax):
+            inputs, program = compiler.compile(input, i)
+            self._base_objs.append(M_Fuse_base(inputs, program, wrap(mul,i), wrap(add,i)))
+        self._inputs = compiler.leaves.values()
+        compiler.release()
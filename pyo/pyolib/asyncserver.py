@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright 2010 Olivier Belanger
+
+This file is part of pyo, a python module to help digital signal
+processing script creation.
+
+pyo is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+pyo is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with pyo.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import collections
+from _core import *
+from triggers import TrigFunc, Change
+from opensndctrl import OscDataReceive
+
+try:
+    import asyncio
+    WITH_ASYNCIO = True
+except ImportError:
+    try:
+        import trollius as asyncio
+        WITH_ASYNCIO = True
+    except ImportError:
+        WITH_ASYNCIO = False
+
+__all__ = ["AsyncServer"]
+
+try:
+    StopAsyncIteration
+except NameError:
+    class StopAsyncIteration(Exception):
+        pass
+
+class _LoopBridge(object):
+    # Hands calls made in the audio or call thread to an event loop. The
+    # calls of a buffer are gathered and made by a single loop callback.
+    def __init__(self, loop):
+        self._loop = loop
+        self._calls = collections.deque()
+        self._waiting = False
+
+    def push(self, function, *args):
+        self._calls.append((function, args))
+        if not self._waiting:
+            self._waiting = True
+            self._loop.call_soon_threadsafe(self._flush)
+
+    def _flush(self):
+        self._waiting = False
+        calls = self._calls
+        while calls:
+            function, args = calls.popleft()
+            function(*args)
+
+class _EventStream(object):
+    # Asynchronous iterator over the events pushed by source objects.
+    def __init__(self, bridge, loop):
+        self._bridge = bridge
+        self._loop = loop
+        self._items = collections.deque()
+        self._waiter = None
+        self._sources = []
+        self._closed = False
+
+    def _push(self, item):
+        if not self._closed:
+            self._bridge.push(self._deliver, item)
+
+    def _deliver(self, item):
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(item)
+            self._waiter = None
+        else:
+            self._items.append(item)
+
+    def _end(self):
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_exception(StopAsyncIteration())
+            self._waiter = None
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        return self.get()
+
+    def get(self):
+        """
+        Returns an awaitable giving the next event.
+
+        Raises StopAsyncIteration once the iterator is closed and all 
+        the received events were given.
+
+        """
+        future = asyncio.Future(loop=self._loop)
+        if self._items:
+            future.set_result(self._items.popleft())
+        elif self._closed:
+            future.set_exception(StopAsyncIteration())
+        else:
+            self._waiter = future
+        return future
+
+    def close(self):
+        """
+        Stops the source objects and ends the iteration.
+
+        """
+        if self._closed:
+            return
+        self._closed = True
+        for source in self._sources:
+            source.stop()
+        self._sources = []
+        self._bridge.push(self._end)
+
+class AsyncServer(object):
+    """
+    asyncio adapter of a Server.
+
+    Gives awaitable versions of the server's blocking methods and
+    asynchronous iterators over the events of audio objects, to drive
+    pyo from an asyncio application without threads or sleeps.
+
+    Events are produced in the audio callback, or in the server's call
+    thread (see Server.getCallStats), and handed to the event loop in
+    batches, at most one loop callback per audio buffer.
+
+    Needs the asyncio module, or trollius with Python 2, where the 
+    awaitables are used with `yield From(...)` in coroutines and the 
+    events are read with the get() method of the iterators.
+
+    :Args:
+
+        server : Server
+            The server to drive.
+        loop : asyncio event loop, optional
+            Loop receiving the events. Defaults to asyncio.get_event_loop().
+
+    >>> import trollius as asyncio
+    >>> from trollius import From
+    >>> @asyncio.coroutine
+    ... def main():
+    ...     s = Server()
+    ...     aserver = AsyncServer(s)
+    ...     yield From(aserver.boot())
+    ...     yield From(aserver.start())
+    ...     met = Metro(.25).play()
+    ...     a = SineLoop(freq=250, feedback=.05, mul=.1).out()
+    ...     trigs = aserver.triggers(met)
+    ...     while True:
+    ...         stream = yield From(trigs.get())
+    ...         a.freq = random.choice([250, 300, 375])
+    >>> asyncio.get_event_loop().run_until_complete(main())
+
+    """
+    def __init__(self, server, loop=None):
+        if not WITH_ASYNCIO:
+            raise ImportError("AsyncServer needs the asyncio module.")
+        if loop is None:
+            loop = asyncio.get_event_loop()
+        self._server = server
+        self._loop = loop
+        self._bridge = _LoopBridge(loop)
+
+    def _run(self, function, *args):
+        return self._loop.run_in_executor(None, function, *args)
+
+    def boot(self):
+        """
+        Boot the server. Returns an awaitable.
+
+        """
+        return self._run(self._server.boot)
+
+    def start(self):
+        """
+        Start the server. Returns an awaitable.
+
+        With offline rendering, it completes when the rendering is done.
+
+        """
+        return self._run(self._server.start)
+
+    def stop(self):
+        """
+        Stop the server. Returns an awaitable.
+
+        """
+        return self._run(self._server.stop)
+
+    def shutdown(self):
+        """
+        Shut down the server. Returns an awaitable.
+
+        """
+        return self._run(self._server.shutdown)
+
+    def after(self, time, function=None, *args):
+        """
+        Returns an awaitable completed after `time` seconds.
+
+        The delay is an event of the server's scheduler, it follows the
+        audio clock. If `function` is given, it is called from the event
+        loop with `args` and the awaitable gives its result. Cancelling
+        the awaitable cancels the event.
+
+        :Args:
+
+            time : float
+                Delay, in seconds.
+            function : Python callable, optional
+                Function called after the delay. Defaults to None.
+            args : any Python objects, optional
+                Arguments given to the function.
+
+        """
+        future = asyncio.Future(loop=self._loop)
+        def resolve():
+            if future.cancelled():
+                return
+            if function is None:
+                future.set_result(None)
+                return
+            try:
+                future.set_result(function(*args))
+            except Exception as e:
+                future.set_exception(e)
+        handle = self._server.schedule(time, self._bridge.push, (resolve,))
+        def cancelled(f):
+            if f.cancelled():
+                self._server.cancel(handle)
+        future.add_done_callback(cancelled)
+        return future
+
+    def triggers(self, obj):
+        """
+        Asynchronous iterator over the triggers of an audio object.
+
+        Gives the index of the stream of every trigger sent by `obj`
+        (Trig, Metro, Change, Thresh or any object sending triggers).
+        Call the iterator's close() method to stop it.
+
+        :Args:
+
+            obj : PyoObject
+                Object sending triggers.
+
+        """
+        stream = _EventStream(self._bridge, self._loop)
+        func = TrigFunc(obj, stream._push, arg=range(len(obj)))
+        func.setDefer(True)
+        stream._sources.append(func)
+        return stream
+
+    def osc(self, port, address):
+        """
+        Asynchronous iterator over received OSC messages.
+
+        Gives a tuple (address, args) for every message.
+        Call the iterator's close() method to stop it.
+
+        :Args:
+
+            port : int
+                Port on which values are received.
+            address : string or list of strings
+                Address(es) to listen to, as in OscDataReceive.
+
+        """
+        stream = _EventStream(self._bridge, self._loop)
+        def received(address, *args):
+            stream._push((address, args))
+        receiver = OscDataReceive(port, address, received)
+        receiver.setDefer(True)
+        stream._sources.append(receiver)
+        return stream
+
+    def notes(self, notein):
+        """
+        Asynchronous iterator over the notes of a Notein object.
+
+        Gives a tuple (voice, pitch, velocity) for every note on and
+        note off (velocity 0), with pitch and velocity as output by
+        `notein`. Call the iterator's close() method to stop it.
+
+        :Args:
+
+            notein : Notein
+                MIDI notes source.
+
+        """
+        stream = _EventStream(self._bridge, self._loop)
+        pitch, velocity = notein["pitch"], notein["velocity"]
+        def changed(voice):
+            stream._push((voice, pitch.get(all=True)[voice], velocity.get(all=True)[voice]))
+        # velocities are scaled between 0 and 1, Change needs integers
+        midivel = Sig(velocity, mul=127, add=.5)
+        change = Change(midivel)
+        func = TrigFunc(change, changed, arg=range(len(change)))
+        func.setDefer(True)
+        stream._sources.extend([func, change, midivel])
+        return stream
@@ -177,6 +177,10 @@ class Delay(PyoObject):
         in_fader, delay, feedback, maxdelay, mul, add, lmax = convertArgsToLists(self._in_fader, delay, feedback, maxdelay, mul, add)
         self._base_objs = [Delay_base(wrap(in_fader,i), wrap(delay,i), wrap(feedback,i), wrap(maxdelay,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
 
+    def _getSleepTail(self):
+        maxdelay, lmax = convertArgsToLists(self._maxdelay)
+        return max(maxdelay)
+
     def setInput(self, x, fadetime=0.05):
         """
         Replace the `input` attribute.
@@ -291,6 +295,10 @@ class SDelay(PyoObject):
         in_fader, delay, maxdelay, mul, add, lmax = convertArgsToLists(self._in_fader, delay, maxdelay, mul, add)
         self._base_objs = [SDelay_base(wrap(in_fader,i), wrap(delay,i), wrap(maxdelay,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
 
+    def _getSleepTail(self):
+        maxdelay, lmax = convertArgsToLists(self._maxdelay)
+        return max(maxdelay)
+
     def setInput(self, x, fadetime=0.05):
         """
         Replace the `input` attribute.
@@ -381,10 +389,15 @@ class Waveguide(PyoObject):
         self._input = input
         self._freq = freq
         self._dur = dur
+        self._minfreq = minfreq
         self._in_fader = InputFader(input)
         in_fader, freq, dur, minfreq, mul, add, lmax = convertArgsToLists(self._in_fader, freq, dur, minfreq, mul, add)
         self._base_objs = [Waveguide_base(wrap(in_fader,i), wrap(freq,i), wrap(dur,i), wrap(minfreq,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
 
+    def _getSleepTail(self):
+        minfreq, lmax = convertArgsToLists(self._minfreq)
+        return 1.0 / min(minfreq)
+
     def setInput(self, x, fadetime=0.05):
         """
         Replace the `input` attribute.
@@ -496,10 +509,15 @@ class AllpassWG(PyoObject):
         self._freq = freq
         self._feed = feed
         self._detune = detune
+        self._minfreq = minfreq
         self._in_fader = InputFader(input)
         in_fader, freq, feed, detune, minfreq, mul, add, lmax = convertArgsToLists(self._in_fader, freq, feed, detune, minfreq, mul, add)
         self._base_objs = [AllpassWG_base(wrap(in_fader,i), wrap(freq,i), wrap(feed,i), wrap(detune,i), wrap(minfreq,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
 
+    def _getSleepTail(self):
+        minfreq, lmax = convertArgsToLists(self._minfreq)
+        return 1.0 / min(minfreq)
+
     def setInput(self, x, fadetime=0.05):
         """
         Replace the `input` attribute.
@@ -749,11 +767,26 @@ class Convolve(PyoObject):
             greater than this value. 
             
             If greater only the first `size` samples will be used.
+        partsize : int {pow-of-two}, optional
+            If greater than 0, the convolution is computed in the frequency 
+            domain, with partitions of `partsize` samples. This adds `partsize` 
+            samples of latency but is much cheaper for long impulse responses. 
+            The table is analysed when it is given to the object, at creation 
+            time and with `setTable`. If not a power-of-2, the object will 
+            use the next power-of-2 greater, at least the server's buffer size. 
+            Available at initialization time only. Defaults to 0.
+        tailsize : int {pow-of-two}, optional
+            If greater than `partsize`, the samples of the impulse response 
+            following the first 2 * `tailsize` ones are convolved with 
+            partitions of `tailsize` samples, by a pool of threads shared by 
+            all Convolve and CvlVerb objects (see `setConvolveThreads`). Used 
+            only when `partsize` is greater than 0. Available at initialization 
+            time only. Defaults to 0.
 
     .. note::
 
         Convolution is very expensive to compute, so the impulse response must
-        be kept very short to run in real time.
+        be kept very short to run in real time, unless `partsize` is used.
 
         Usually convolution generates a high amplitude level, take care of the
         `mul` parameter!
@@ -769,14 +802,20 @@ class Convolve(PyoObject):
     >>> a = Convolve(sf, SndTable(SNDS_PATH+'/accord.aif'), size=512, mul=.2).out()
 
     """
-    def __init__(self, input, table, size, mul=1, add=0):
+    def __init__(self, input, table, size, partsize=0, tailsize=0, mul=1, add=0):
         PyoObject.__init__(self, mul, add)
         self._input = input
         self._table = table
         self._size = size
+        self._partsize = partsize
+        self._tailsize = tailsize
         self._in_fader = InputFader(input)
-        in_fader, table, size, mul, add, lmax = convertArgsToLists(self._in_fader, table, size, mul, add)                     
-        self._base_objs = [Convolve_base(wrap(in_fader,i), wrap(table,i), wrap(size,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
+        in_fader, table, size, partsize, tailsize, mul, add, lmax = convertArgsToLists(self._in_fader, table, size, partsize, tailsize, mul, add)                     
+        self._base_objs = [Convolve_base(wrap(in_fader,i), wrap(table,i), wrap(size,i), wrap(partsize,i), wrap(tailsize,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
+
+    def _getSleepTail(self):
+        size, lmax = convertArgsToLists(self._size)
+        return max(size) / float(self._base_objs[0].getServer().getSamplingRate())
 
     def setInput(self, x, fadetime=0.05):
         """
@@ -1121,6 +1160,10 @@ class Harmonizer(PyoObject):
         in_fader, transpo, feedback, winsize, mul, add, lmax = convertArgsToLists(self._in_fader, transpo, feedback, winsize, mul, add)
         self._base_objs = [Harmonizer_base(wrap(in_fader,i), wrap(transpo,i), wrap(feedback,i), wrap(winsize,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
 
+    def _getSleepTail(self):
+        winsize, lmax = convertArgsToLists(self._winsize)
+        return max(winsize)
+
     def setInput(self, x, fadetime=0.05):
         """
         Replace the `input` attribute.
@@ -37,6 +37,7 @@ along with pyo.  If not, see <http://www.gnu.org/licenses/>.
 """
 from _core import *
 from _maps import *
+from types import ListType
 
 class Biquad(PyoObject):
     """
@@ -1276,6 +1277,204 @@ class FourBand(PyoObject):
     @freq3.setter
     def freq3(self, x): self.setFreq3(x) 
 
+class FilterBank(PyoObject):
+    """
+    Bank of second-order filters processing the same signal.
+
+    FilterBank computes `n` biquadratic filters, one per frequency in 
+    `freqs`, in a single object. The coefficients and the memories of 
+    the filters are stored band after band in contiguous arrays and all 
+    the bands are computed together, sample by sample, in one loop, 
+    which is much faster than `n` independent Biquad objects. Useful 
+    to build large analysis or synthesis banks, like constant-Q or 
+    vocoder filter banks.
+
+    The frequencies and the Q of the bands are fixed values, which can 
+    all be replaced in one call from a list or a table.
+
+    :Parent: :py:class:`PyoObject`
+
+    :Args:
+
+        input : PyoObject
+            Input signal to process.
+        freqs : list of floats or PyoTableObject
+            Cutoff or center frequencies of the filters, one per band. 
+            The number of bands is the length of the list, or the size 
+            of the table, at initialization time.
+        q : float, list of floats or PyoTableObject, optional
+            Q of the filters, defined (for bandpass filters) as 
+            freq/bandwidth. A single value is used for every band, a 
+            list or a table gives one value per band. Defaults to 10.
+        type : int, optional
+            Filter type. Five possible values :
+                0. lowpass
+                1. highpass
+                2. bandpass (default)
+                3. bandstop
+                4. allpass
+        sum : boolean, optional
+            If False, the object outputs one stream per band. If True, 
+            the bands are summed in a single stream. Available at 
+            initialization time only. Defaults to False.
+
+    .. note::
+
+        With a multichannel input, a bank is created for each input 
+        channel. The streams are then ordered band after band (or, if 
+        `sum` is True, one stream per input channel).
+
+    >>> s = Server().boot()
+    >>> s.start()
+    >>> a = Noise(.5)
+    >>> freqs = [100 * pow(2, i / 12.) for i in range(60)]
+    >>> f = FilterBank(a, freqs, q=50, sum=True, mul=.5).out()
+
+    """
+    def __init__(self, input, freqs, q=10, type=2, sum=False, mul=1, add=0):
+        PyoObject.__init__(self, mul, add)
+        self._input = input
+        self._freqs = freqs
+        self._q = q
+        self._type = type
+        self._sum = sum
+        self._in_fader = InputFader(input)
+        in_fader, lmax = convertArgsToLists(self._in_fader)
+        mul, add, lmax2 = convertArgsToLists(mul, add)
+        if isinstance(freqs, PyoTableObject):
+            bands = freqs.getSize()
+        else:
+            bands = len(freqs)
+        self._bands = bands
+        self._base_players = [FilterBanker_base(wrap(in_fader,i), bands, self._bankValues(freqs), 
+                                                self._bankValues(q), type, int(sum)) for i in range(lmax)]
+        self._base_objs = []
+        if sum:
+            for i in range(lmax):
+                self._base_objs.append(FilterBank_base(self._base_players[i], 0, wrap(mul,i), wrap(add,i)))
+        else:
+            for j in range(bands):
+                for i in range(lmax):
+                    k = j * lmax + i
+                    self._base_objs.append(FilterBank_base(self._base_players[i], j, wrap(mul,k), wrap(add,k)))
+
+    def _bankValues(self, x):
+        if isinstance(x, PyoTableObject):
+            return x[0]
+        elif type(x) == ListType:
+            return [float(v) for v in x]
+        return float(x)
+
+    def setInput(self, x, fadetime=0.05):
+        """
+        Replace the `input` attribute.
+
+        :Args:
+
+            x : PyoObject
+                New signal to process.
+            fadetime : float, optional
+                Crossfade time between old and new input. Defaults to 0.05.
+
+        """
+        self._input = x
+        self._in_fader.setInput(x, fadetime)
+
+    def setFreqs(self, x):
+        """
+        Replace the `freqs` attribute.
+
+        A list or a table shorter than the number of bands is repeated.
+
+        :Args:
+
+            x : list of floats or PyoTableObject
+                New `freqs` attribute.
+
+        """
+        self._freqs = x
+        x = self._bankValues(x)
+        [obj.setFreqs(x) for obj in self._base_players]
+
+    def setQ(self, x):
+        """
+        Replace the `q` attribute.
+
+        :Args:
+
+            x : float, list of floats or PyoTableObject
+                New `q` attribute.
+
+        """
+        self._q = x
+        x = self._bankValues(x)
+        [obj.setQ(x) for obj in self._base_players]
+
+    def setType(self, x):
+        """
+        Replace the `type` attribute.
+
+        :Args:
+
+            x : int
+                New `type` attribute. 
+                    0. lowpass
+                    1. highpass
+                    2. bandpass 
+                    3. bandstop 
+                    4. allpass
+
+        """
+        self._type = x
+        [obj.setType(x) for obj in self._base_players]
+
+    def getBands(self):
+        """
+        Returns the number of bands of the bank.
+
+        """
+        return self._bands
+
+    def reset(self):
+        """
+        Resets the memories of the filters.
+
+        """
+        [obj.reset() for obj in self._base_players]
+
+    def ctrl(self, map_list=None, title=None, wxnoserver=False):
+        self._map_list = [SLMap(0, 4, 'lin', 'type', self._type, res="int", dataOnly=True),
+                          SLMapMul(self._mul)]
+        PyoObject.ctrl(self, map_list, title, wxnoserver)
+
+    @property
+    def input(self):
+        """PyoObject. Input signal to process.""" 
+        return self._input
+    @input.setter
+    def input(self, x): self.setInput(x)
+
+    @property
+    def freqs(self):
+        """list of floats or PyoTableObject. Frequencies of the filters.""" 
+        return self._freqs
+    @freqs.setter
+    def freqs(self, x): self.setFreqs(x)
+
+    @property
+    def q(self):
+        """float, list of floats or PyoTableObject. Q of the filters.""" 
+        return self._q
+    @q.setter
+    def q(self, x): self.setQ(x)
+
+    @property
+    def type(self):
+        """int. Filter type.""" 
+        return self._type
+    @type.setter
+    def type(self, x): self.setType(x)
+
 class Hilbert(PyoObject):
     """
     Hilbert transform.
@@ -1438,6 +1637,10 @@ class Allpass(PyoObject):
         in_fader, delay, feedback, maxdelay, mul, add, lmax = convertArgsToLists(self._in_fader, delay, feedback, maxdelay, mul, add)
         self._base_objs = [Allpass_base(wrap(in_fader,i), wrap(delay,i), wrap(feedback,i), wrap(maxdelay,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
 
+    def _getSleepTail(self):
+        maxdelay, lmax = convertArgsToLists(self._maxdelay)
+        return max(maxdelay)
+
     def setInput(self, x, fadetime=0.05):
         """
         Replace the `input` attribute.
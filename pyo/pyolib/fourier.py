@@ -73,6 +73,12 @@ class FFT(PyoObject):
                 6. Blackman-Harris 7-term
                 7. Tuckey (alpha = 0.66)
                 8. Sine (half-sine window)
+        algo : int, optional
+            FFT algorithm. 0 uses the real split-radix transform,
+            1 uses a packed real transform whose butterflies run
+            over contiguous, precomputed twiddle tables (faster,
+            especially for large sizes). Both give the same result.
+            Defaults to 0.
 
     .. note::
     
@@ -99,7 +105,7 @@ class FFT(PyoObject):
     >>> fout = IFFT(re, im, size=1024, overlaps=4, wintype=2).mix(2).out()
 
     """
-    def __init__(self, input, size=1024, overlaps=4, wintype=2):
+    def __init__(self, input, size=1024, overlaps=4, wintype=2, algo=0):
         PyoObject.__init__(self)
         self._real_dummy = []
         self._imag_dummy = []
@@ -108,13 +114,14 @@ class FFT(PyoObject):
         self._size = size
         self._overlaps = overlaps
         self._wintype = wintype
+        self._algo = algo
         self._in_fader = InputFader(input)
-        in_fader, size, wintype, lmax = convertArgsToLists(self._in_fader, size, wintype)
+        in_fader, size, wintype, algo, lmax = convertArgsToLists(self._in_fader, size, wintype, algo)
         self._base_players = []
         for j in range(overlaps):
             for i in range(lmax):
                 hopsize = wrap(size,i) * j / overlaps
-                self._base_players.append(FFTMain_base(wrap(in_fader,i), wrap(size,i), hopsize, wrap(wintype,i)))
+                self._base_players.append(FFTMain_base(wrap(in_fader,i), wrap(size,i), hopsize, wrap(wintype,i), wrap(algo,i)))
         self._real_objs = []
         self._imag_objs = []
         self._bin_objs = []
@@ -228,6 +235,20 @@ class FFT(PyoObject):
         x, lmax = convertArgsToLists(x)
         [obj.setWinType(wrap(x,i)) for i, obj in enumerate(self._base_players)]
 
+    def setAlgo(self, x):
+        """
+        Replace the `algo` attribute.
+        
+        :Args:
+
+            x : int {0, 1}
+                new `algo` attribute.
+        
+        """
+        self._algo = x
+        x, lmax = convertArgsToLists(x)
+        [obj.setAlgo(wrap(x,i)) for i, obj in enumerate(self._base_players)]
+
     @property
     def input(self):
         """PyoObject. Input signal to process.""" 
@@ -249,6 +270,13 @@ class FFT(PyoObject):
     @wintype.setter
     def wintype(self, x): self.setWinType(x)
 
+    @property
+    def algo(self):
+        """int. FFT algorithm."""
+        return self._algo
+    @algo.setter
+    def algo(self, x): self.setAlgo(x)
+
 class IFFT(PyoObject):
     """
     Inverse Fast Fourier Transform.
@@ -291,6 +319,12 @@ class IFFT(PyoObject):
                 6. Blackman-Harris 7-term
                 7. Tuckey (alpha = 0.66)
                 8. Sine (half-sine window)
+        algo : int, optional
+            FFT algorithm. 0 uses the real split-radix transform,
+            1 uses a packed real transform whose butterflies run
+            over contiguous, precomputed twiddle tables (faster,
+            especially for large sizes). Both give the same result.
+            Defaults to 0.
 
     .. note::
     
@@ -314,21 +348,22 @@ class IFFT(PyoObject):
     >>> fout = IFFT(re, im, size=1024, overlaps=4, wintype=2).mix(2).out()
 
     """
-    def __init__(self, inreal, inimag, size=1024, overlaps=4, wintype=2, mul=1, add=0):
+    def __init__(self, inreal, inimag, size=1024, overlaps=4, wintype=2, algo=0, mul=1, add=0):
         PyoObject.__init__(self, mul, add)
         self._inreal = inreal
         self._inimag = inimag
         self._size = size
         self._overlaps = overlaps
         self._wintype = wintype
+        self._algo = algo
         self._in_fader = InputFader(inreal)
         self._in_fader2 = InputFader(inimag)
-        in_fader, in_fader2, size, wintype, mul, add, lmax = convertArgsToLists(self._in_fader, self._in_fader2, size, wintype, mul, add)
+        in_fader, in_fader2, size, wintype, algo, mul, add, lmax = convertArgsToLists(self._in_fader, self._in_fader2, size, wintype, algo, mul, add)
         self._base_objs = []
         ratio = lmax / overlaps
         for i in range(lmax):
             hopsize = wrap(size,i) * ((i/ratio)%overlaps) / overlaps
-            self._base_objs.append(IFFT_base(wrap(in_fader,i), wrap(in_fader2,i), wrap(size,i), hopsize, wrap(wintype,i), wrap(mul,i), wrap(add,i)))
+            self._base_objs.append(IFFT_base(wrap(in_fader,i), wrap(in_fader2,i), wrap(size,i), hopsize, wrap(wintype,i), wrap(algo,i), wrap(mul,i), wrap(add,i)))
 
     def __len__(self):
         return len(self._inreal)
@@ -394,6 +429,20 @@ class IFFT(PyoObject):
         x, lmax = convertArgsToLists(x)
         [obj.setWinType(wrap(x,i)) for i, obj in enumerate(self._base_objs)]
 
+    def setAlgo(self, x):
+        """
+        Replace the `algo` attribute.
+        
+        :Args:
+
+            x : int {0, 1}
+                new `algo` attribute.
+        
+        """
+        self._algo = x
+        x, lmax = convertArgsToLists(x)
+        [obj.setAlgo(wrap(x,i)) for i, obj in enumerate(self._base_objs)]
+
     def ctrl(self, map_list=None, title=None, wxnoserver=False):
         self._map_list = [SLMapMul(self._mul)]
         PyoObject.ctrl(self, map_list, title, wxnoserver)
@@ -426,6 +475,13 @@ class IFFT(PyoObject):
     @wintype.setter
     def wintype(self, x): self.setWinType(x)
 
+    @property
+    def algo(self):
+        """int. FFT algorithm."""
+        return self._algo
+    @algo.setter
+    def algo(self, x): self.setAlgo(x)
+
 class CarToPol(PyoObject):
     """
     Performs the cartesian to polar conversion.
@@ -1147,6 +1203,17 @@ class CvlVerb(PyoObject):
     CvlVerb implements convolution based on a uniformly partitioned overlap-save 
     algorithm. This object can be used to convolve an input signal with an 
     impulse response soundfile to simulate real acoustic spaces.
+
+    With a `tailsize` greater than `size`, the partitions are non-uniform: 
+    the beginning of the impulse response is convolved with partitions of 
+    `size` samples, in the audio callback, and the rest with partitions of 
+    `tailsize` samples, computed by a pool of threads shared by all CvlVerb 
+    and Convolve objects (see `setConvolveThreads`). The latency is still 
+    `size` samples, but long impulse responses cost much less per buffer.
+
+    The spectra of the impulse responses are cached, keyed by file, channel 
+    and partition layout. Objects using the same impulse file and sizes 
+    share the same analysis, which is done only once.
     
     :Parent: :py:class:`PyoObject`
     
@@ -1168,27 +1235,36 @@ class CvlVerb(PyoObject):
         bal : float or PyoObject, optional
             Balance between wet and dry signal, between 0 and 1. 0 means no 
             reverb. Defaults to 0.25.
+        tailsize : int {pow-of-two}, optional
+            The size in samples of the partitions used for the tail of the 
+            impulse response. If greater than `size`, the first 2 * `tailsize` 
+            samples of the impulse are convolved with partitions of `size` 
+            samples and the rest with partitions of `tailsize` samples, in 
+            background threads. If not a power-of-2, the object will use the 
+            next power-of-2 greater. 0 means uniform partitions. Available 
+            at initialization time only. Defaults to 0.
     
     >>> s = Server().boot()
     >>> s.start()
     >>> sf = SfPlayer(SNDS_PATH+"/transparent.aif", loop=True, mul=0.5)
-    >>> cv = CvlVerb(sf, SNDS_PATH+"/IRMediumHallStereo.wav", size=1024, bal=0.4).out()
+    >>> cv = CvlVerb(sf, SNDS_PATH+"/IRMediumHallStereo.wav", size=256, bal=0.4, tailsize=4096).out()
 
     """
-    def __init__(self, input, impulse=SNDS_PATH+"/IRMediumHallStereo.wav", bal=0.25, size=1024, mul=1, add=0):
+    def __init__(self, input, impulse=SNDS_PATH+"/IRMediumHallStereo.wav", bal=0.25, size=1024, tailsize=0, mul=1, add=0):
         PyoObject.__init__(self, mul, add)
         self._input = input
         self._impulse = impulse
         self._bal = bal
         self._size = size
+        self._tailsize = tailsize
         self._in_fader = InputFader(input)
-        in_fader, bal, size, mul, add, lmax = convertArgsToLists(self._in_fader, bal, size, mul, add)
+        in_fader, bal, size, tailsize, mul, add, lmax = convertArgsToLists(self._in_fader, bal, size, tailsize, mul, add)
         impulse, lmax2 = convertArgsToLists(impulse)
         self._base_objs = []
         for file in impulse:
             _size, _dur, _snd_sr, _snd_chnls, _format, _type = sndinfo(file)
             lmax3 = max(lmax, _snd_chnls)
-            self._base_objs.extend([CvlVerb_base(wrap(in_fader,i), file, wrap(bal,i), wrap(size,i), i%_snd_chnls, wrap(mul,i), wrap(add,i)) for i in range(lmax3)])
+            self._base_objs.extend([CvlVerb_base(wrap(in_fader,i), file, wrap(bal,i), wrap(size,i), i%_snd_chnls, wrap(tailsize,i), wrap(mul,i), wrap(add,i)) for i in range(lmax3)])
 
     def setInput(self, x, fadetime=0.05):
         """
@@ -58,8 +58,7 @@ class Sine(PyoObject):
         PyoObject.__init__(self, mul, add)
         self._freq = freq
         self._phase = phase
-        freq, phase, mul, add, lmax = convertArgsToLists(freq, phase, mul, add)
-        self._base_objs = [Sine_base(wrap(freq,i), wrap(phase,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
+        self._base_objs = [Sine_base(*args) for args in expandArgs(freq, phase, mul, add)]
 
     def setFreq(self, x):
         """
@@ -146,8 +145,7 @@ class SineLoop(PyoObject):
         PyoObject.__init__(self, mul, add)
         self._freq = freq
         self._feedback = feedback
-        freq, feedback, mul, add, lmax = convertArgsToLists(freq, feedback, mul, add)
-        self._base_objs = [SineLoop_base(wrap(freq,i), wrap(feedback,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
+        self._base_objs = [SineLoop_base(*args) for args in expandArgs(freq, feedback, mul, add)]
 
     def setFreq(self, x):
         """
@@ -225,8 +223,7 @@ class Phasor(PyoObject):
         PyoObject.__init__(self, mul, add)
         self._freq = freq
         self._phase = phase
-        freq, phase, mul, add, lmax = convertArgsToLists(freq, phase, mul, add)
-        self._base_objs = [Phasor_base(wrap(freq,i), wrap(phase,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
+        self._base_objs = [Phasor_base(*args) for args in expandArgs(freq, phase, mul, add)]
 
     def setFreq(self, x):
         """
@@ -306,8 +303,7 @@ class Input(PyoObject):
     def __init__(self, chnl=0, mul=1, add=0):
         PyoObject.__init__(self, mul, add)
         self._chnl = chnl
-        chnl, mul, add, lmax = convertArgsToLists(chnl, mul, add)
-        self._base_objs = [Input_base(wrap(chnl,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
+        self._base_objs = [Input_base(*args) for args in expandArgs(chnl, mul, add)]
 
     def ctrl(self, map_list=None, title=None, wxnoserver=False):
         self._map_list = [SLMapMul(self._mul)]
@@ -327,8 +323,7 @@ class Noise(PyoObject):
     def __init__(self, mul=1, add=0):
         PyoObject.__init__(self, mul, add)
         self._type = 0
-        mul, add, lmax = convertArgsToLists(mul, add)
-        self._base_objs = [Noise_base(wrap(mul,i), wrap(add,i)) for i in range(lmax)]
+        self._base_objs = [Noise_base(*args) for args in expandArgs(mul, add)]
 
     def setType(self, x):
         """
@@ -375,8 +370,7 @@ class PinkNoise(PyoObject):
     """
     def __init__(self, mul=1, add=0):
         PyoObject.__init__(self, mul, add)
-        mul, add, lmax = convertArgsToLists(mul, add)
-        self._base_objs = [PinkNoise_base(wrap(mul,i), wrap(add,i)) for i in range(lmax)]
+        self._base_objs = [PinkNoise_base(*args) for args in expandArgs(mul, add)]
 
     def ctrl(self, map_list=None, title=None, wxnoserver=False):
         self._map_list = [SLMapMul(self._mul)]
@@ -398,8 +392,7 @@ class BrownNoise(PyoObject):
     """
     def __init__(self, mul=1, add=0):
         PyoObject.__init__(self, mul, add)
-        mul, add, lmax = convertArgsToLists(mul, add)
-        self._base_objs = [BrownNoise_base(wrap(mul,i), wrap(add,i)) for i in range(lmax)]
+        self._base_objs = [BrownNoise_base(*args) for args in expandArgs(mul, add)]
 
     def ctrl(self, map_list=None, title=None, wxnoserver=False):
         self._map_list = [SLMapMul(self._mul)]
@@ -437,8 +430,7 @@ class FM(PyoObject):
         self._carrier = carrier
         self._ratio = ratio
         self._index = index
-        carrier, ratio, index, mul, add, lmax = convertArgsToLists(carrier, ratio, index, mul, add)
-        self._base_objs = [Fm_base(wrap(carrier,i), wrap(ratio,i), wrap(index,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
+        self._base_objs = [Fm_base(*args) for args in expandArgs(carrier, ratio, index, mul, add)]
 
     def setCarrier(self, x):
         """
@@ -551,8 +543,7 @@ class CrossFM(PyoObject):
         self._ratio = ratio
         self._ind1 = ind1
         self._ind2 = ind2
-        carrier, ratio, ind1, ind2, mul, add, lmax = convertArgsToLists(carrier, ratio, ind1, ind2, mul, add)
-        self._base_objs = [CrossFm_base(wrap(carrier,i), wrap(ratio,i), wrap(ind1,i), wrap(ind2,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
+        self._base_objs = [CrossFm_base(*args) for args in expandArgs(carrier, ratio, ind1, ind2, mul, add)]
 
     def setCarrier(self, x):
         """
@@ -673,8 +664,7 @@ class Blit(PyoObject):
         PyoObject.__init__(self, mul, add)
         self._freq = freq
         self._harms = harms
-        freq, harms, mul, add, lmax = convertArgsToLists(freq, harms, mul, add)
-        self._base_objs = [Blit_base(wrap(freq,i), wrap(harms,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
+        self._base_objs = [Blit_base(*args) for args in expandArgs(freq, harms, mul, add)]
 
     def setFreq(self, x):
         """
@@ -969,8 +959,7 @@ class LFO(PyoObject):
         self._freq = freq
         self._sharp = sharp
         self._type = type
-        freq, sharp, type, mul, add, lmax = convertArgsToLists(freq, sharp, type, mul, add)
-        self._base_objs = [LFO_base(wrap(freq,i), wrap(sharp,i), wrap(type,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
+        self._base_objs = [LFO_base(*args) for args in expandArgs(freq, sharp, type, mul, add)]
 
     def setFreq(self, x):
         """
@@ -1107,8 +1096,7 @@ class SumOsc(PyoObject):
         self._freq = freq
         self._ratio = ratio
         self._index = index
-        freq, ratio, index, mul, add, lmax = convertArgsToLists(freq, ratio, index, mul, add)
-        self._base_objs = [SumOsc_base(wrap(freq,i), wrap(ratio,i), wrap(index,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
+        self._base_objs = [SumOsc_base(*args) for args in expandArgs(freq, ratio, index, mul, add)]
 
     def setFreq(self, x):
         """
@@ -1220,8 +1208,7 @@ class SuperSaw(PyoObject):
         self._freq = freq
         self._detune = detune
         self._bal = bal
-        freq, detune, bal, mul, add, lmax = convertArgsToLists(freq, detune, bal, mul, add)
-        self._base_objs = [SuperSaw_base(wrap(freq,i), wrap(detune,i), wrap(bal,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
+        self._base_objs = [SuperSaw_base(*args) for args in expandArgs(freq, detune, bal, mul, add)]
 
     def setFreq(self, x):
         """
@@ -1324,8 +1311,7 @@ class RCOsc(PyoObject):
         PyoObject.__init__(self, mul, add)
         self._freq = freq
         self._sharp = sharp
-        freq, sharp, mul, add, lmax = convertArgsToLists(freq, sharp, mul, add)
-        self._base_objs = [RCOsc_base(wrap(freq,i), wrap(sharp,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
+        self._base_objs = [RCOsc_base(*args) for args in expandArgs(freq, sharp, mul, add)]
 
     def setFreq(self, x):
         """
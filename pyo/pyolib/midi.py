@@ -241,6 +241,7 @@ class CtlScan(PyoObject):
         self._function = function
         self._toprint = toprint
         self._base_objs = [CtlScan_base(self._function, self._toprint)]
+        self._defer = False
 
     def out(self, chnl=0, inc=1, dur=0, delay=0):
         return self.play(dur, delay)
@@ -285,6 +286,19 @@ class CtlScan(PyoObject):
         x, lmax = convertArgsToLists(x)
         [obj.setToprint(wrap(x,i)) for i, obj in enumerate(self._base_objs)]
 
+    def setDefer(self, x):
+        """
+        Replace the `defer` attribute.
+
+        :Args:
+
+            x : boolean
+                new `defer` attribute.
+
+        """
+        self._defer = x
+        [obj.setDefer(x) for obj in self._base_objs]
+
     @property
     def function(self): 
         """Python function. Function to be called."""
@@ -298,7 +312,13 @@ class CtlScan(PyoObject):
         return self._toprint
     @toprint.setter
     def toprint(self, x): 
-        self.setToprint(x)   
+        self.setToprint(x)
+    @property
+    def defer(self):
+        """boolean. If True, the function is called by the server's call thread."""
+        return self._defer
+    @defer.setter
+    def defer(self, x): self.setDefer(x)   
 
 class CtlScan2(PyoObject):
     """
@@ -346,6 +366,7 @@ class CtlScan2(PyoObject):
         self._function = function
         self._toprint = toprint
         self._base_objs = [CtlScan2_base(self._function, self._toprint)]
+        self._defer = False
 
     def out(self, chnl=0, inc=1, dur=0, delay=0):
         return self.play(dur, delay)
@@ -390,6 +411,19 @@ class CtlScan2(PyoObject):
         x, lmax = convertArgsToLists(x)
         [obj.setToprint(wrap(x,i)) for i, obj in enumerate(self._base_objs)]
 
+    def setDefer(self, x):
+        """
+        Replace the `defer` attribute.
+
+        :Args:
+
+            x : boolean
+                new `defer` attribute.
+
+        """
+        self._defer = x
+        [obj.setDefer(x) for obj in self._base_objs]
+
     @property
     def function(self): 
         """Python function. Function to be called."""
@@ -403,7 +437,13 @@ class CtlScan2(PyoObject):
         return self._toprint
     @toprint.setter
     def toprint(self, x): 
-        self.setToprint(x)   
+        self.setToprint(x)
+    @property
+    def defer(self):
+        """boolean. If True, the function is called by the server's call thread."""
+        return self._defer
+    @defer.setter
+    def defer(self, x): self.setDefer(x)   
 
 class Notein(PyoObject):
     """
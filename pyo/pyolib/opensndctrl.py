@@ -500,6 +500,7 @@ class OscDataReceive(PyoObject):
         self._address, lmax = convertArgsToLists(address)
         # self._address is linked with list at C level
         self._base_objs = [OscDataReceive_base(port, self._address, function)]
+        self._defer = False
 
     def setMul(self, x):
         pass
@@ -547,6 +548,26 @@ class OscDataReceive(PyoObject):
             index = self._address.index(p)
             self._base_objs[0].delAddress(index)
 
+    def setDefer(self, x):
+        """
+        Replace the `defer` attribute.
+
+        :Args:
+
+            x : boolean
+                new `defer` attribute.
+
+        """
+        self._defer = x
+        [obj.setDefer(x) for obj in self._base_objs]
+
+    @property
+    def defer(self):
+        """boolean. If True, the function is called by the server's call thread."""
+        return self._defer
+    @defer.setter
+    def defer(self, x): self.setDefer(x)
+
 class OscListReceive(PyoObject):
     """
     Receives list of values over a network via the Open Sound Control protocol.
@@ -26,7 +26,7 @@ along with pyo.  If not, see <http://www.gnu.org/licenses/>.
 import sys, random
 from _core import *
 from _maps import *
-from types import SliceType, IntType
+from types import SliceType, IntType, ListType, TupleType
 
 class Pan(PyoObject):
     """
@@ -532,6 +532,254 @@ class VoiceManager(PyoObject):
     def triggers(self, x): 
         self.setTriggers(x)
 
+class VoicePool(PyoObject):
+    """
+    Polyphonic voice allocator suspending the processing of silent voices.
+
+    Each voice is a complete synthesis graph, created once. A voice stops 
+    being computed when its output stays below a threshold (usually 
+    because its envelope is finished) and resumes when a note is given 
+    to it, so a large number of voices only costs what is sounding.
+
+    Notes are given with noteon() and noteoff(). A note goes to a sleeping 
+    voice if there is one, otherwise to a released voice, otherwise a 
+    voice is stolen according to the stealing `policy`. The `function` 
+    is then called to play or release the note on the voice.
+
+    VoicePool can also follow an external allocator, like Notein, with 
+    the `trigger` argument: a trigger on the stream of a voice wakes it.
+
+    The object outputs, for each voice, 1 while the voice is processed 
+    and 0 while it sleeps.
+
+    :Parent: :py:class:`PyoObject`
+
+    :Args:
+
+        voices : list of PyoObjects or list of lists of PyoObjects
+            The voices of the pool. Each voice gives all the objects of 
+            its graph, they are suspended together. The last object of 
+            a voice is its output, watched for silence.
+        function : Python function, optional
+            Function called as function(voice, pitch, velocity) by noteon() 
+            and noteoff(), with velocity 0 for note offs. Defaults to None.
+        policy : string, optional
+            Voice stealing policy when all the voices hold a note:
+                - "oldest" : steal the voice playing the oldest note.
+                - "quietest" : steal the voice with the lowest output level.
+                - "same" : first reuse the voice playing the same pitch, 
+                  then steal the oldest one.
+            Defaults to "oldest".
+        thresh : float, optional
+            Silence threshold, in dB. Defaults to -80.
+        time : float, optional
+            Time, in seconds, the output of a voice must stay under the 
+            threshold before the voice sleeps. Defaults to 0.1.
+        trigger : PyoObject, optional
+            Triggers, one stream per voice, waking the voices. Available at 
+            initialization time only. Defaults to None.
+
+    .. note::
+
+        Objects created for a voice and not given in its list (arithmetic 
+        on PyoObjects creates Dummy objects) keep running. Objects shared 
+        by all the voices must not be part of a voice.
+
+    >>> s = Server().boot()
+    >>> s.start()
+    >>> voices = []
+    >>> for i in range(32):
+    ...     env = Adsr(attack=.005, decay=.1, sustain=.5, release=.5, dur=0, mul=.05)
+    ...     osc = SineLoop(freq=250, feedback=.05, mul=env).out()
+    ...     voices.append([env, osc])
+    >>> def note(voice, pitch, velocity):
+    ...     env, osc = voices[voice]
+    ...     if velocity > 0:
+    ...         osc.freq = midiToHz(pitch)
+    ...         env.play()
+    ...     else:
+    ...         env.stop()
+    >>> pool = VoicePool(voices, note, policy="oldest")
+    >>> def play():
+    ...     pitch = random.randrange(48, 84)
+    ...     pool.noteon(pitch, 100)
+    ...     CallAfter(pool.noteoff, .25, pitch)
+    >>> pat = Pattern(play, .1).play()
+
+    """
+    def __init__(self, voices, function=None, policy="oldest", thresh=-80, time=.1, trigger=None, mul=1, add=0):
+        PyoObject.__init__(self, mul, add)
+        if policy not in ["oldest", "quietest", "same"]:
+            raise ValueError('VoicePool policy must be "oldest", "quietest" or "same".')
+        self._voices = voices
+        self._function = function
+        self._policy = policy
+        self._thresh = thresh
+        self._time = time
+        self._trigger = trigger
+        num = len(voices)
+        self._pitches = [None] * num
+        self._held = [False] * num
+        self._stamps = [0] * num
+        self._stamp = 0
+        if trigger is not None:
+            triggers = trigger.getBaseObjects()
+        else:
+            triggers = [None]
+        mul, add, lmax = convertArgsToLists(mul, add)
+        self._base_objs = []
+        for i, voice in enumerate(voices):
+            if type(voice) not in [ListType, TupleType]:
+                voice = [voice]
+            streams = [obj._getStream() for pyoObj in voice for obj in pyoObj.getBaseObjects()]
+            outputs = [obj._getStream() for obj in voice[-1].getBaseObjects()]
+            self._base_objs.append(VoicePool_base(outputs, streams, triggers[i % len(triggers)], 
+                                                  pow(10.0, thresh * 0.05), time, wrap(mul,i), wrap(add,i)))
+
+    def noteon(self, pitch, velocity):
+        """
+        Gives a note to a voice and returns the voice number.
+
+        :Args:
+
+            pitch : int
+                Pitch of the note.
+            velocity : int
+                Velocity of the note, greater than 0.
+
+        """
+        voice = self._allocate(pitch)
+        self._base_objs[voice].wake()
+        self._pitches[voice] = pitch
+        self._held[voice] = True
+        self._stamp += 1
+        self._stamps[voice] = self._stamp
+        if self._function is not None:
+            self._function(voice, pitch, velocity)
+        return voice
+
+    def noteoff(self, pitch):
+        """
+        Releases the most recent voice holding `pitch`. Returns the voice 
+        number, or -1 if no voice holds the pitch.
+
+        :Args:
+
+            pitch : int
+                Pitch of the note.
+
+        """
+        voices = [i for i in range(len(self._base_objs)) if self._held[i] and self._pitches[i] == pitch]
+        if not voices:
+            return -1
+        voice = max(voices, key=lambda i: self._stamps[i])
+        self._held[voice] = False
+        if self._function is not None:
+            self._function(voice, pitch, 0)
+        return voice
+
+    def _allocate(self, pitch):
+        voices = range(len(self._base_objs))
+        if self._policy == "same":
+            same = [i for i in voices if self._pitches[i] == pitch and self._base_objs[i].isAwake()]
+            if same:
+                return same[0]
+        candidates = [i for i in voices if not self._base_objs[i].isAwake()]
+        if not candidates:
+            candidates = [i for i in voices if not self._held[i]]
+        if not candidates:
+            candidates = voices
+        if self._policy == "quietest":
+            return min(candidates, key=lambda i: self._base_objs[i].getPeak())
+        return min(candidates, key=lambda i: self._stamps[i])
+
+    def getVoiceStats(self):
+        """
+        Returns a dictionary with the number of voices of the pool 
+        ('voices'), of voices currently processed ('active') and of 
+        voices holding a note ('held').
+
+        """
+        active = sum([obj.isAwake() for obj in self._base_objs])
+        return {"voices": len(self._base_objs), "active": active, "held": self._held.count(True)}
+
+    def setFunction(self, x):
+        """
+        Replace the `function` attribute.
+
+        :Args:
+
+            x : Python function
+                new `function` attribute.
+
+        """
+        self._function = x
+
+    def setPolicy(self, x):
+        """
+        Replace the `policy` attribute.
+
+        :Args:
+
+            x : string
+                new `policy` attribute.
+
+        """
+        if x not in ["oldest", "quietest", "same"]:
+            raise ValueError('VoicePool policy must be "oldest", "quietest" or "same".')
+        self._policy = x
+
+    def setThresh(self, x):
+        """
+        Replace the `thresh` attribute.
+
+        :Args:
+
+            x : float
+                new `thresh` attribute.
+
+        """
+        self._thresh = x
+        [obj.setThresh(pow(10.0, x * 0.05)) for obj in self._base_objs]
+
+    def setTime(self, x):
+        """
+        Replace the `time` attribute.
+
+        :Args:
+
+            x : float
+                new `time` attribute.
+
+        """
+        self._time = x
+        [obj.setTime(x) for obj in self._base_objs]
+
+    @property
+    def function(self):
+        """Python function. Function called by noteon() and noteoff()."""
+        return self._function
+    @function.setter
+    def function(self, x): self.setFunction(x)
+    @property
+    def policy(self):
+        """string. Voice stealing policy."""
+        return self._policy
+    @policy.setter
+    def policy(self, x): self.setPolicy(x)
+    @property
+    def thresh(self):
+        """float. Silence threshold in dB."""
+        return self._thresh
+    @thresh.setter
+    def thresh(self, x): self.setThresh(x)
+    @property
+    def time(self):
+        """float. Time of silence, in seconds, before a voice sleeps."""
+        return self._time
+    @time.setter
+    def time(self, x): self.setTime(x)
+
 class Mixer(PyoObject):
     """
     Audio mixer.
@@ -697,3 +945,166 @@ class Mixer(PyoObject):
         return self._time
     @time.setter
     def time(self, x): self.setTime(x)
+
+class ModMatrix(PyoObject):
+    """
+    Sparse modulation matrix.
+
+    ModMatrix routes any number of inputs (usually modulation sources) 
+    to any number of outputs, with a gain per cell. Only the cells with 
+    a gain are computed, so the cost follows the number of connections, 
+    not the size of the matrix. Gain changes are ramped over `time` 
+    seconds, a cell ramped to 0 is removed from the computation.
+
+    :Parent: :py:class:`PyoObject`
+
+    :Args:
+
+        inputs : list of PyoObject
+            Audio objects to route. Every stream of these objects is one 
+            input (one row) of the matrix, in the order of the list. 
+            Available at initialization time only.
+        outs : int, optional
+            Number of outputs of the matrix. Available at initialization
+            time only. Defaults to 1.
+        time : float, optional
+            Duration, in seconds, of the ramp applied on gain changes.
+            Defaults to 0.025.
+
+    .. note::
+
+        The output streams are retrieved by calling the ModMatrix object 
+        with the desired output between square brackets (see example).
+
+    >>> s = Server().boot()
+    >>> s.start()
+    >>> lfos = [Sine(freq=.1*(i+1)) for i in range(8)]
+    >>> mm = ModMatrix(lfos, outs=16)
+    >>> mm.setCells([(i % 8, i, 100) for i in range(16)])
+    >>> oscs = [SineLoop(freq=200*(i+1)+mm[i], feedback=.05, mul=.02).out() for i in range(16)]
+    >>> mm.setGain(3, 5, 250)
+
+    """
+    def __init__(self, inputs, outs=1, time=0.025, mul=1, add=0):
+        PyoObject.__init__(self, mul, add)
+        if type(outs) != IntType:
+            print >> sys.stderr, 'TypeError: "outs" argument of %s must be an integer.\n' % self.__class__.__name__
+            exit()
+        self._inputs = inputs
+        self._outs = outs
+        self._time = time
+        streams = [obj._getStream() for pyoObj in inputs for obj in pyoObj.getBaseObjects()]
+        self._ins = len(streams)
+        mul, add, lmax = convertArgsToLists(mul, add)
+        self._base_players = [ModMatrix_base(streams, outs, time)]
+        self._base_objs = [ModMatrixVoice_base(self._base_players[0], i, wrap(mul,i), wrap(add,i)) for i in range(outs)]
+
+    def setTime(self, x):
+        """
+        Replace the `time` attribute.
+
+        :Args:
+
+            x : float
+                new `time` attribute.
+
+        """
+        self._time = x
+        self._base_players[0].setTime(x)
+
+    def setGain(self, vin, vout, gain):
+        """
+        Sets the gain of an input toward an output.
+
+        :Args:
+
+            vin : int
+                Input (row) of the cell.
+            vout : int
+                Output (column) of the cell.
+            gain : float
+                New gain of the cell, 0 removes the connection.
+
+        """
+        self._base_players[0].setGain(vin, vout, gain)
+
+    def getGain(self, vin, vout):
+        """
+        Returns the gain of an input toward an output.
+
+        :Args:
+
+            vin : int
+                Input (row) of the cell.
+            vout : int
+                Output (column) of the cell.
+
+        """
+        return self._base_players[0].getGain(vin, vout)
+
+    def setCells(self, cells):
+        """
+        Sets the gains of many cells at once.
+
+        The cells are checked before any gain is changed, so an invalid 
+        cell leaves the matrix untouched.
+
+        :Args:
+
+            cells : list of tuples
+                List of (input, output, gain) tuples.
+
+        """
+        self._base_players[0].setCells(cells)
+
+    def setMatrix(self, matrix):
+        """
+        Sets the gains of all the cells at once.
+
+        :Args:
+
+            matrix : buffer object or list of lists
+                The gains of the whole matrix, in rows of `outs` values, 
+                one row per input. A buffer object (numpy array, memoryview, 
+                etc.) must expose a contiguous array of inputs * outs 
+                floats or doubles, it is read without Python conversion.
+
+        """
+        if type(matrix) == ListType:
+            self.setCells([(i, j, float(gain)) for i, row in enumerate(matrix) for j, gain in enumerate(row)])
+        else:
+            self._base_players[0].setMatrix(matrix)
+
+    def getCells(self):
+        """
+        Returns the list of (input, output, gain) tuples of the cells with a gain.
+
+        """
+        return self._base_players[0].getCells()
+
+    def getCellCount(self):
+        """
+        Returns the number of cells currently computed, including the 
+        ones ramping to 0.
+
+        """
+        return self._base_players[0].getCellCount()
+
+    def clear(self):
+        """
+        Ramps the gains of all the cells to 0.
+
+        """
+        self._base_players[0].clearCells()
+
+    def ctrl(self, map_list=None, title=None, wxnoserver=False):
+        self._map_list = [SLMap(0, 10, 'lin', 'time', self._time, dataOnly=True),
+                          SLMapMul(self._mul)]
+        PyoObject.ctrl(self, map_list, title, wxnoserver)
+
+    @property
+    def time(self):
+        """float. Duration of the gain ramps."""
+        return self._time
+    @time.setter
+    def time(self, x): self.setTime(x)
@@ -75,6 +75,7 @@ class Pattern(PyoObject):
         self._time = time
         function, time, lmax = convertArgsToLists(function, time)
         self._base_objs = [Pattern_base(wrap(function,i), wrap(time,i)) for i in range(lmax)]
+        self._defer = False
 
     def setFunction(self, x):
         """
@@ -123,6 +124,19 @@ class Pattern(PyoObject):
         self._map_list = [SLMap(0.125, 4., 'lin', 'time', self._time)]
         PyoObject.ctrl(self, map_list, title, wxnoserver)
          
+    def setDefer(self, x):
+        """
+        Replace the `defer` attribute.
+
+        :Args:
+
+            x : boolean
+                new `defer` attribute.
+
+        """
+        self._defer = x
+        [obj.setDefer(x) for obj in self._base_objs]
+
     @property
     def function(self):
         """Python function. Function to be called.""" 
@@ -136,6 +150,12 @@ class Pattern(PyoObject):
         return self._time
     @time.setter
     def time(self, x): self.setTime(x)
+    @property
+    def defer(self):
+        """boolean. If True, the function is called by the server's call thread."""
+        return self._defer
+    @defer.setter
+    def defer(self, x): self.setDefer(x)
 
 class Score(PyoObject):
     """
@@ -191,6 +211,7 @@ class Score(PyoObject):
         self._in_fader = InputFader(input)
         in_fader, fname, lmax = convertArgsToLists(self._in_fader, fname)
         self._base_objs = [Score_base(wrap(in_fader,i), wrap(fname,i)) for i in range(lmax)]
+        self._defer = False
 
     def out(self, chnl=0, inc=1, dur=0, delay=0):
         return self.play(dur, delay)
@@ -216,6 +237,19 @@ class Score(PyoObject):
         self._input = x
         self._in_fader.setInput(x, fadetime)
 
+    def setDefer(self, x):
+        """
+        Replace the `defer` attribute.
+
+        :Args:
+
+            x : boolean
+                new `defer` attribute.
+
+        """
+        self._defer = x
+        [obj.setDefer(x) for obj in self._base_objs]
+
     @property
     def input(self): 
         """PyoObject. Audio signal sending integer numbers."""
@@ -223,6 +257,12 @@ class Score(PyoObject):
     @input.setter
     def input(self, x): 
         self.setInput(x)
+    @property
+    def defer(self):
+        """boolean. If True, the function is called by the server's call thread."""
+        return self._defer
+    @defer.setter
+    def defer(self, x): self.setDefer(x)
 
 class CallAfter(PyoObject):
     """
@@ -247,6 +287,11 @@ class CallAfter(PyoObject):
         
         The object is not deleted after the call. The User must delete it himself.
 
+        The call is an event of the server's scheduler (see Server.schedule), 
+        it happens at the start of the buffer containing the call time. 
+        play() schedules the call again, `time` seconds later, and stop() 
+        cancels it.
+
     >>> s = Server().boot()
     >>> s.start()
     >>> # Start an oscillator with a frequency of 250 Hz
@@ -73,6 +73,12 @@ class PVAnal(PyoPVObject):
                 6. Blackman-Harris 7-term
                 7. Tuckey (alpha = 0.66)
                 8. Sine (half-sine window)
+        algo : int, optional
+            FFT algorithm. 0 uses the real split-radix transform,
+            1 uses a packed real transform whose butterflies run
+            over contiguous, precomputed twiddle tables (faster,
+            especially for large sizes). Both give the same result.
+            Defaults to 0.
 
     >>> s = Server().boot()
     >>> s.start()
@@ -81,15 +87,16 @@ class PVAnal(PyoPVObject):
     >>> pvs = PVSynth(pva).mix(2).out()
 
     """
-    def __init__(self, input, size=1024, overlaps=4, wintype=2):
+    def __init__(self, input, size=1024, overlaps=4, wintype=2, algo=0):
         PyoPVObject.__init__(self)
         self._input = input
         self._size = size
         self._overlaps = overlaps
         self._wintype = wintype
+        self._algo = algo
         self._in_fader = InputFader(input)
-        in_fader, size, overlaps, wintype, lmax = convertArgsToLists(self._in_fader, size, overlaps, wintype)
-        self._base_objs = [PVAnal_base(wrap(in_fader,i), wrap(size,i), wrap(overlaps,i), wrap(wintype,i)) for i in range(lmax)]
+        in_fader, size, overlaps, wintype, algo, lmax = convertArgsToLists(self._in_fader, size, overlaps, wintype, algo)
+        self._base_objs = [PVAnal_base(wrap(in_fader,i), wrap(size,i), wrap(overlaps,i), wrap(wintype,i), wrap(algo,i)) for i in range(lmax)]
  
     def setInput(self, x, fadetime=0.05):
         """
@@ -148,6 +155,20 @@ class PVAnal(PyoPVObject):
         x, lmax = convertArgsToLists(x)
         [obj.setWinType(wrap(x,i)) for i, obj in enumerate(self._base_objs)]
 
+    def setAlgo(self, x):
+        """
+        Replace the `algo` attribute.
+        
+        :Args:
+
+            x : int {0, 1}
+                new `algo` attribute.
+        
+        """
+        self._algo = x
+        x, lmax = convertArgsToLists(x)
+        [obj.setAlgo(wrap(x,i)) for i, obj in enumerate(self._base_objs)]
+
     @property
     def input(self):
         """PyoObject. Input signal to process.""" 
@@ -176,6 +197,13 @@ class PVAnal(PyoPVObject):
     @wintype.setter
     def wintype(self, x): self.setWinType(x)
 
+    @property
+    def algo(self):
+        """int. FFT algorithm."""
+        return self._algo
+    @algo.setter
+    def algo(self, x): self.setAlgo(x)
+
 class PVSynth(PyoObject):
     """
     Phase Vocoder synthesis object.
@@ -203,6 +231,12 @@ class PVSynth(PyoObject):
                 6. Blackman-Harris 7-term
                 7. Tuckey (alpha = 0.66)
                 8. Sine (half-sine window)
+        algo : int, optional
+            FFT algorithm. 0 uses the real split-radix transform,
+            1 uses a packed real transform whose butterflies run
+            over contiguous, precomputed twiddle tables (faster,
+            especially for large sizes). Both give the same result.
+            Defaults to 0.
 
     >>> s = Server().boot()
     >>> s.start()
@@ -211,12 +245,13 @@ class PVSynth(PyoObject):
     >>> pvs = PVSynth(pva).mix(2).out()
 
     """
-    def __init__(self, input, wintype=2, mul=1, add=0):
+    def __init__(self, input, wintype=2, algo=0, mul=1, add=0):
         PyoObject.__init__(self, mul, add)
         self._input = input
         self._wintype = wintype
-        input, wintype, mul, add, lmax = convertArgsToLists(self._input, wintype, mul, add)
-        self._base_objs = [PVSynth_base(wrap(input,i), wrap(wintype,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
+        self._algo = algo
+        input, wintype, algo, mul, add, lmax = convertArgsToLists(self._input, wintype, algo, mul, add)
+        self._base_objs = [PVSynth_base(wrap(input,i), wrap(wintype,i), wrap(algo,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
  
     def setInput(self, x):
         """
@@ -246,6 +281,20 @@ class PVSynth(PyoObject):
         x, lmax = convertArgsToLists(x)
         [obj.setWinType(wrap(x,i)) for i, obj in enumerate(self._base_objs)]
 
+    def setAlgo(self, x):
+        """
+        Replace the `algo` attribute.
+        
+        :Args:
+
+            x : int {0, 1}
+                new `algo` attribute.
+        
+        """
+        self._algo = x
+        x, lmax = convertArgsToLists(x)
+        [obj.setAlgo(wrap(x,i)) for i, obj in enumerate(self._base_objs)]
+
     def ctrl(self, map_list=None, title=None, wxnoserver=False):
         self._map_list = [SLMapMul(self._mul)]
         PyoObject.ctrl(self, map_list, title, wxnoserver)
@@ -264,6 +313,13 @@ class PVSynth(PyoObject):
     @wintype.setter
     def wintype(self, x): self.setWinType(x)
 
+    @property
+    def algo(self):
+        """int. FFT algorithm."""
+        return self._algo
+    @algo.setter
+    def algo(self, x): self.setAlgo(x)
+
 class PVAddSynth(PyoObject):
     """
     Phase Vocoder additive synthesis object.
@@ -290,6 +346,12 @@ class PVAddSynth(PyoObject):
         inc : int, optional
             Starting from bin `first`, resynthesize bins 
             `inc` apart. Defaults to 1. 
+        mode : int, optional
+            Synthesis method. 0 uses a bank of table-lookup oscillators.
+            1 uses the vectorised oscillators of PartialBank, faster
+            with many partials. 2 uses inverse FFT synthesis, much
+            cheaper for large numbers of partials but adding 128
+            samples of latency (at 44.1 or 48 kHz). Defaults to 0.
             
 
     >>> s = Server().boot()
@@ -299,15 +361,16 @@ class PVAddSynth(PyoObject):
     >>> pvs = PVAddSynth(pva, pitch=1.25, num=100, first=0, inc=2).out()
 
     """
-    def __init__(self, input, pitch=1, num=100, first=0, inc=1, mul=1, add=0):
+    def __init__(self, input, pitch=1, num=100, first=0, inc=1, mode=0, mul=1, add=0):
         PyoObject.__init__(self, mul, add)
         self._input = input
         self._pitch = pitch
         self._num = num
         self._first = first
         self._inc = inc
-        input, pitch, num, first, inc, mul, add, lmax = convertArgsToLists(self._input, pitch, num, first, inc, mul, add)
-        self._base_objs = [PVAddSynth_base(wrap(input,i), wrap(pitch,i), wrap(num,i), wrap(first,i), wrap(inc,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
+        self._mode = mode
+        input, pitch, num, first, inc, mode, mul, add, lmax = convertArgsToLists(self._input, pitch, num, first, inc, mode, mul, add)
+        self._base_objs = [PVAddSynth_base(wrap(input,i), wrap(pitch,i), wrap(num,i), wrap(first,i), wrap(inc,i), wrap(mode,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
  
     def setInput(self, x):
         """
@@ -379,6 +442,20 @@ class PVAddSynth(PyoObject):
         x, lmax = convertArgsToLists(x)
         [obj.setInc(wrap(x,i)) for i, obj in enumerate(self._base_objs)]
 
+    def setMode(self, x):
+        """
+        Replace the `mode` attribute.
+        
+        :Args:
+
+            x : int {0, 1, 2}
+                new `mode` attribute.
+        
+        """
+        self._mode = x
+        x, lmax = convertArgsToLists(x)
+        [obj.setMode(wrap(x,i)) for i, obj in enumerate(self._base_objs)]
+
     def ctrl(self, map_list=None, title=None, wxnoserver=False):
         self._map_list = [SLMap(0.25, 4, "lin", "pitch", self._pitch),
                           SLMapMul(self._mul)]
@@ -419,6 +496,13 @@ class PVAddSynth(PyoObject):
     @inc.setter
     def inc(self, x): self.setInc(x)
 
+    @property
+    def mode(self):
+        """int. Synthesis method."""
+        return self._mode
+    @mode.setter
+    def mode(self, x): self.setMode(x)
+
 class PVTranspose(PyoPVObject):
     """
     Transpose the frequency components of a pv stream.
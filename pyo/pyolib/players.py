@@ -85,6 +85,7 @@ class SfPlayer(PyoObject):
     def __init__(self, path, speed=1, loop=False, offset=0, interp=2, mul=1, add=0):
         PyoObject.__init__(self, mul, add)
         self._path = path
+        self._prefetch = 0
         self._speed = speed
         self._loop = loop
         self._offset = offset
@@ -207,6 +208,46 @@ class SfPlayer(PyoObject):
         x, lmax = convertArgsToLists(x)
         [obj.setInterp(wrap(x,i)) for i, obj in enumerate(self._base_players)]
 
+    def setPrefetch(self, x):
+        """
+        Streams the sound from disk with read-ahead threads.
+
+        By default, the sound is read from disk inside the audio callback,
+        which can cause dropouts with slow (network) storage or many players.
+        With a prefetch time greater than 0, a pool of threads shared by all
+        soundfile players (see `setDiskThreads`) keeps `x` seconds of sound 
+        loaded ahead of the playback head. The output is the same in both 
+        modes.
+        
+        :Args:
+
+            x : float
+                Amount of sound, in seconds, to load ahead. 0 means no 
+                read-ahead.
+        
+        """
+        self._prefetch = x
+        x, lmax = convertArgsToLists(x)
+        [obj.setPrefetch(wrap(x,i)) for i, obj in enumerate(self._base_players)]
+
+    def getUnderruns(self, reset=False):
+        """
+        Returns the number of reads the read-ahead threads did not prepare in 
+        time, summed over all streams. These reads were done from the audio 
+        callback, as without prefetch.
+
+        :Args:
+
+            reset : boolean, optional
+                If True, the counters are reset to 0 after the reading.
+                Defaults to False.
+
+        """
+        count = sum([obj.getUnderruns() for obj in self._base_players])
+        if reset:
+            [obj.resetUnderruns() for obj in self._base_players]
+        return count
+
     def ctrl(self, map_list=None, title=None, wxnoserver=False):
         self._map_list = [SLMap(-2., 2., 'lin', 'speed', self._speed), 
                           SLMap(1, 4, 'lin', 'interp', self._interp, res="int", dataOnly=True),
@@ -255,6 +296,13 @@ class SfPlayer(PyoObject):
     @interp.setter
     def interp(self, x): self.setInterp(x)
 
+    @property
+    def prefetch(self): 
+        """float. Amount of sound, in seconds, loaded ahead by the read-ahead threads."""
+        return self._prefetch
+    @prefetch.setter
+    def prefetch(self, x): self.setPrefetch(x)
+
 class SfMarkerShuffler(PyoObject):
     """
     AIFF with markers soundfile shuffler.
@@ -301,6 +349,7 @@ class SfMarkerShuffler(PyoObject):
     """
     def __init__(self, path, speed=1, interp=2, mul=1, add=0):
         PyoObject.__init__(self, mul, add)
+        self._prefetch = 0
         self._speed = speed
         self._interp = interp
         path, speed, interp, mul, add, lmax = convertArgsToLists(path, speed, interp, mul, add)
@@ -355,6 +404,46 @@ class SfMarkerShuffler(PyoObject):
         """
         return self._markers
         
+    def setPrefetch(self, x):
+        """
+        Streams the sound from disk with read-ahead threads.
+
+        By default, the sound is read from disk inside the audio callback,
+        which can cause dropouts with slow (network) storage or many players.
+        With a prefetch time greater than 0, a pool of threads shared by all
+        soundfile players (see `setDiskThreads`) keeps `x` seconds of sound 
+        loaded ahead of the playback head. The output is the same in both 
+        modes.
+        
+        :Args:
+
+            x : float
+                Amount of sound, in seconds, to load ahead. 0 means no 
+                read-ahead.
+        
+        """
+        self._prefetch = x
+        x, lmax = convertArgsToLists(x)
+        [obj.setPrefetch(wrap(x,i)) for i, obj in enumerate(self._base_players)]
+
+    def getUnderruns(self, reset=False):
+        """
+        Returns the number of reads the read-ahead threads did not prepare in 
+        time, summed over all streams. These reads were done from the audio 
+        callback, as without prefetch.
+
+        :Args:
+
+            reset : boolean, optional
+                If True, the counters are reset to 0 after the reading.
+                Defaults to False.
+
+        """
+        count = sum([obj.getUnderruns() for obj in self._base_players])
+        if reset:
+            [obj.resetUnderruns() for obj in self._base_players]
+        return count
+
     def ctrl(self, map_list=None, title=None, wxnoserver=False):
         self._map_list = [SLMap(0.01, 2., 'lin', 'speed', self._speed), 
                           SLMap(1, 4, 'lin', 'interp', self._interp, res="int", dataOnly=True),
@@ -375,6 +464,13 @@ class SfMarkerShuffler(PyoObject):
     @interp.setter
     def interp(self, x): self.setInterp(x)
 
+    @property
+    def prefetch(self): 
+        """float. Amount of sound, in seconds, loaded ahead by the read-ahead threads."""
+        return self._prefetch
+    @prefetch.setter
+    def prefetch(self, x): self.setPrefetch(x)
+
 class SfMarkerLooper(PyoObject):
     """
     AIFF with markers soundfile looper.
@@ -424,6 +520,7 @@ class SfMarkerLooper(PyoObject):
     """
     def __init__(self, path, speed=1, mark=0, interp=2, mul=1, add=0):
         PyoObject.__init__(self, mul, add)
+        self._prefetch = 0
         self._speed = speed
         self._mark = mark
         self._interp = interp
@@ -493,6 +590,46 @@ class SfMarkerLooper(PyoObject):
         """
         return self._markers
 
+    def setPrefetch(self, x):
+        """
+        Streams the sound from disk with read-ahead threads.
+
+        By default, the sound is read from disk inside the audio callback,
+        which can cause dropouts with slow (network) storage or many players.
+        With a prefetch time greater than 0, a pool of threads shared by all
+        soundfile players (see `setDiskThreads`) keeps `x` seconds of sound 
+        loaded ahead of the playback head. The output is the same in both 
+        modes.
+        
+        :Args:
+
+            x : float
+                Amount of sound, in seconds, to load ahead. 0 means no 
+                read-ahead.
+        
+        """
+        self._prefetch = x
+        x, lmax = convertArgsToLists(x)
+        [obj.setPrefetch(wrap(x,i)) for i, obj in enumerate(self._base_players)]
+
+    def getUnderruns(self, reset=False):
+        """
+        Returns the number of reads the read-ahead threads did not prepare in 
+        time, summed over all streams. These reads were done from the audio 
+        callback, as without prefetch.
+
+        :Args:
+
+            reset : boolean, optional
+                If True, the counters are reset to 0 after the reading.
+                Defaults to False.
+
+        """
+        count = sum([obj.getUnderruns() for obj in self._base_players])
+        if reset:
+            [obj.resetUnderruns() for obj in self._base_players]
+        return count
+
     def ctrl(self, map_list=None, title=None, wxnoserver=False):
         self._map_list = [SLMap(0.01, 2., 'lin', 'speed', self._speed), 
                           SLMap(0, len(self._markers)-1, 'lin', 'mark', self._mark, 'int'),
@@ -520,3 +657,10 @@ class SfMarkerLooper(PyoObject):
         return self._interp
     @interp.setter
     def interp(self, x): self.setInterp(x)
+
+    @property
+    def prefetch(self): 
+        """float. Amount of sound, in seconds, loaded ahead by the read-ahead threads."""
+        return self._prefetch
+    @prefetch.setter
+    def prefetch(self, x): self.setPrefetch(x)
@@ -18,7 +18,8 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with pyo.  If not, see <http://www.gnu.org/licenses/>.
 """
-import os, time
+import os, time, threading, traceback, atexit
+from types import ListType, TupleType, IntType, FloatType
 from _core import *
 from _widgets import createServerGUI
         
@@ -109,6 +110,9 @@ class Server(object):
         self._filename = None
         self._fileformat = 0
         self._sampletype = 0
+        self._profile_function = None
+        self._lanes = 0
+        self._call_thread = None
         self._server = Server_base(sr, nchnls, buffersize, duplex, audio, jackname)
         self._server._setDefaultRecPath(os.path.join(os.path.expanduser("~"), "pyo_rec.wav"))
 
@@ -439,6 +443,11 @@ class Server(object):
         Start the audio callback loop and begin processing.
         
         """
+        if self._call_thread is None or not self._call_thread.isAlive():
+            self._call_thread = threading.Thread(target=_callLoop, args=(self._server, _call_loops_quit), name="pyo calls")
+            self._call_thread.daemon = True
+            self._call_thread.start()
+            _call_threads[:] = [thread for thread in _call_threads if thread.isAlive()] + [self._call_thread]
         self._server.start()
         return self
     
@@ -449,6 +458,186 @@ class Server(object):
         """
         self._server.stop()
 
+    def applyChanges(self, changes, port=0):
+        """
+        Apply many attribute changes at once, at the start of an audio buffer.
+
+        Attributes set one after the other from a script can be spread 
+        over several buffers, as the audio callback runs between the calls. 
+        applyChanges queues all the changes and the server applies them 
+        together, before computing the next buffer. If the server is not 
+        started, the changes are applied immediately.
+
+        :Args:
+
+            changes : dict
+                Dictionary of {object: {attribute: value}}. Any attribute 
+                that can be assigned on the object (`freq`, `mul`, `table`, 
+                ...) can be given.
+            port : float, optional
+                If greater than 0, time, in seconds, for floats and lists of 
+                floats to reach their new value, as with PyoObject.set(). 
+                Attributes currently assigned to a PyoObject, and values other 
+                than floats, are replaced without portamento. Defaults to 0.
+
+        >>> s = Server().boot()
+        >>> s.start()
+        >>> a = Sine(freq=[200, 300], mul=.1).out()
+        >>> b = Sine(freq=250, mul=.1).out()
+        >>> s.applyChanges({a: {"freq": [220, 330]}, b: {"freq": 275, "mul": .05}}, port=.05)
+
+        """
+        items = []
+        for obj, attrs in changes.items():
+            for attr, value in attrs.items():
+                if not hasattr(obj, attr):
+                    raise AttributeError("%s object has no attribute '%s'" % (obj.__class__.__name__, attr))
+                items.append((obj, attr, value))
+
+        def isFloats(x):
+            if type(x) in [ListType, TupleType]:
+                return len(x) > 0 and False not in [type(y) in [IntType, FloatType] for y in x]
+            return type(x) in [IntType, FloatType]
+
+        def apply():
+            for obj, attr, value in items:
+                if port > 0 and isinstance(obj, PyoObject) and isFloats(value):
+                    current = getattr(obj, attr)
+                    if isFloats(current) or isinstance(current, VarPort):
+                        obj.set(attr, value, port)
+                        continue
+                setattr(obj, attr, value)
+
+        if self.getIsStarted():
+            self._server.addChanges(apply)
+        else:
+            apply()
+
+    def schedule(self, time, function, args=(), absolute=False):
+        """
+        Schedule a call of a Python function.
+
+        Events are kept, sorted by time, in a single queue owned by the 
+        server. At the start of every buffer, all the events falling 
+        inside the buffer are called in time order, before any audio 
+        object is computed. 
+
+        Relative times start at the beginning of the next buffer, or, 
+        when `schedule` is called from a scheduled function, at the 
+        time of the event being called. Sequences that reschedule 
+        themselves from their callback therefore never drift.
+
+        Returns a handle that can be given to `cancel` and `reschedule`.
+
+        :Args:
+
+            time : float
+                Time, in seconds, of the call.
+            function : Python callable
+                Function to call.
+            args : tuple, optional
+                Arguments given to the function. Defaults to ().
+            absolute : boolean, optional
+                If True, `time` is the time since the server was booted 
+                instead of a delay from now. Defaults to False.
+
+        >>> s = Server().boot()
+        >>> s.start()
+        >>> a = Sine(mul=.1).out()
+        >>> def tick(freq):
+        ...     a.freq = freq
+        ...     s.schedule(.125, tick, (random.choice([250, 300, 375]),))
+        >>> h = s.schedule(.125, tick, (250,))
+
+        """
+        if not callable(function):
+            raise TypeError("schedule: function argument must be callable.")
+        return self._server.schedule(time, function, args, int(absolute))
+
+    def scheduleValue(self, time, obj, value, absolute=False):
+        """
+        Schedule a sample accurate value change of a Sig object.
+
+        The value is handed to the Sig object by the server, without any 
+        Python call, and the signal switches to it at the exact sample 
+        of the event. The `value` attribute of the Sig returns the new 
+        value once the buffer containing the event has started.
+
+        Returns a handle, or a list of handles if `obj` has more than one 
+        stream, that can be given to `cancel` and `reschedule`.
+
+        :Args:
+
+            time : float
+                Time, in seconds, of the change. See `schedule`.
+            obj : Sig
+                Sig object receiving the value.
+            value : float or list of floats
+                New value. A list gives one value per stream of `obj`.
+            absolute : boolean, optional
+                If True, `time` is the time since the server was booted 
+                instead of a delay from now. Defaults to False.
+
+        >>> s = Server().boot()
+        >>> s.start()
+        >>> fr = Sig(250)
+        >>> a = Sine(freq=fr, mul=.1).out()
+        >>> for i in range(16):
+        ...     h = s.scheduleValue(i * .125, fr, 250 * (1 + i % 4))
+
+        """
+        bases = obj.getBaseObjects()
+        if type(value) not in [ListType, TupleType]:
+            value = [value]
+        handles = [self._server.scheduleValue(time, base, value[i % len(value)], int(absolute)) for i, base in enumerate(bases)]
+        if len(handles) == 1:
+            return handles[0]
+        return handles
+
+    def cancel(self, handle):
+        """
+        Cancel scheduled events.
+
+        Returns True if all the events were still pending.
+
+        :Args:
+
+            handle : int or list of ints
+                Handle(s) returned by `schedule` or `scheduleValue`.
+
+        """
+        if type(handle) not in [ListType, TupleType]:
+            handle = [handle]
+        return False not in [self._server.cancel(h) for h in handle]
+
+    def reschedule(self, handle, time, absolute=False):
+        """
+        Move scheduled events to a new time.
+
+        Returns True if all the events were still pending.
+
+        :Args:
+
+            handle : int or list of ints
+                Handle(s) returned by `schedule` or `scheduleValue`.
+            time : float
+                New time, in seconds. See `schedule`.
+            absolute : boolean, optional
+                If True, `time` is the time since the server was booted 
+                instead of a delay from now. Defaults to False.
+
+        """
+        if type(handle) not in [ListType, TupleType]:
+            handle = [handle]
+        return False not in [self._server.reschedule(h, time, int(absolute)) for h in handle]
+
+    def getPendingEvents(self):
+        """
+        Return the number of events waiting in the scheduler.
+
+        """
+        return self._server.getPendingEvents()
+
     def recordOptions(self, dur=-1, filename=None, fileformat=0, sampletype=0):
         """
         Sets options for soundfile created by offline rendering or global recording.
@@ -631,6 +820,402 @@ class Server(object):
         """
         return len(self._server.getStreams())
 
+    def setProfiling(self, x=True, interval=0, function=None):
+        """
+        Activate or deactivate the profiler.
+
+        When the profiler is active, the server measures the time spent 
+        computing each audio stream, the number of times it was called, 
+        and the time taken by each block. When it is not active, the 
+        callback loop is left untouched and the profiler costs nothing.
+
+        :Args:
+
+            x : boolean, optional
+                True to activate the profiler, False to deactivate it.
+                Defaults to True.
+            interval : float, optional
+                If greater than 0, the profile is dumped every `interval` 
+                seconds of audio, then the counters are reset. Defaults to 0.
+            function : callable, optional
+                Function called by the periodic dump with the snapshot 
+                returned by getProfile() as argument. If None, the report 
+                is printed. Defaults to None.
+
+        >>> s.setProfiling(True, interval=5)
+
+        """
+        self._profile_function = function
+        if x and interval > 0:
+            self._server.setProfileCallable(self, interval)
+        else:
+            self._server.setProfileCallable(None, 0)
+        self._server.setProfiling(int(bool(x)))
+
+    def getProfile(self):
+        """
+        Returns a snapshot of the numbers recorded by the profiler.
+
+        The snapshot is a dictionary with the following keys:
+
+            - 'blocks' : number of blocks computed.
+            - 'late' : number of blocks that took longer to compute than 
+              their duration (buffer size / sampling rate).
+            - 'time' : total processing time, in seconds.
+            - 'maxtime' : processing time of the longest block, in seconds.
+            - 'load' : processing time as a fraction of the audio duration.
+            - 'streams' : list of dictionaries, one per stream, with keys 
+              'id', 'class', 'time' and 'calls', sorted by decreasing time.
+            - 'classes' : dictionary of the time, calls and number of 
+              streams ('time', 'calls', 'streams') per audio object class.
+
+        """
+        blocks, late, total, maxtime = self._server.getProfile()
+        duration = blocks * self.getBufferSize() / float(self.getSamplingRate())
+        streams = []
+        classes = {}
+        for stream in self._server.getStreams():
+            cputime, calls = stream.getProfile()
+            name = _profileClassName(stream.getStreamObject())
+            streams.append({"id": stream.getId(), "class": name, "time": cputime, "calls": calls})
+            if name not in classes:
+                classes[name] = {"time": 0.0, "calls": 0, "streams": 0}
+            classes[name]["time"] += cputime
+            classes[name]["calls"] += calls
+            classes[name]["streams"] += 1
+        streams.sort(key=lambda x: x["time"], reverse=True)
+        if duration > 0:
+            load = total / duration
+        else:
+            load = 0.0
+        return {"blocks": blocks, "late": late, "time": total, "maxtime": maxtime, "load": load,
+                "streams": streams, "classes": classes}
+
+    def resetProfile(self):
+        """
+        Resets all the counters of the profiler.
+
+        """
+        self._server.resetProfile()
+
+    def printProfile(self, num=10):
+        """
+        Prints a report of the numbers recorded by the profiler.
+
+        :Args:
+
+            num : int, optional
+                Number of streams and classes to show, the most expensive 
+                first. Defaults to 10.
+
+        """
+        print _formatProfile(self.getProfile(), num)
+
+    def _dumpProfile(self):
+        # Called by the server every `interval` seconds when profiling.
+        profile = self.getProfile()
+        self.resetProfile()
+        if self._profile_function is not None:
+            self._profile_function(profile)
+        else:
+            print _formatProfile(profile)
+
+    def setWorkers(self, x):
+        """
+        Set the number of threads computing the processing lanes.
+
+        By default, the server computes every audio stream, one after 
+        the other, in the audio callback thread. When more than one 
+        worker is used, the streams assigned to processing lanes with 
+        setLanes() are dispatched to a pool of threads, one lane per 
+        thread at a time, while the other streams are still computed 
+        in the callback thread. The outputs are mixed in the order of 
+        the server's stream list, so the result is the same as with 
+        serial processing.
+
+        The number of workers can't be changed while the server is running.
+
+        :Args:
+
+            x : int
+                Number of threads, including the callback thread. 1 means 
+                serial processing (the default).
+
+        >>> s = Server().boot()
+        >>> s.setWorkers(4)
+
+        """
+        self._server.setWorkers(x)
+
+    def getWorkers(self):
+        """
+        Returns the number of threads computing the processing lanes.
+
+        """
+        return self._server.getWorkers()
+
+    def getCallStats(self, reset=False):
+        """
+        Returns the counters of the deferred calls queue.
+
+        Objects calling a Python function from the audio callback 
+        (Pattern, Score, TrigFunc, OscDataReceive, CtlScan and CtlScan2) 
+        have a `defer` attribute. When it is True, the call is not made 
+        by the audio callback but queued, without locking, and made by a 
+        thread of the server. A slow function then no longer delays the 
+        audio, at the cost of a small latency. The queue holds 4096 calls, 
+        calls arriving when it is full are dropped.
+
+        The counters are returned as a dictionary with the following keys:
+
+            - 'calls' : number of deferred calls made.
+            - 'dropped' : number of calls dropped because the queue was full.
+            - 'depth' : number of calls currently waiting in the queue.
+            - 'maxdepth' : highest number of calls waiting in the queue.
+            - 'latency' : mean time, in seconds, spent by a call in the queue.
+            - 'maxlatency' : longest time, in seconds, spent by a call in the queue.
+
+        :Args:
+
+            reset : boolean, optional
+                If True, the counters are reset after reading. 
+                Defaults to False.
+
+        """
+        calls, dropped, depth, maxdepth, latency, maxlatency = self._server.getCallStats()
+        if reset:
+            self._server.resetCallStats()
+        if calls > 0:
+            latency /= calls
+        return {"calls": calls, "dropped": dropped, "depth": depth, "maxdepth": maxdepth,
+                "latency": latency, "maxlatency": maxlatency}
+
+    def setAutoSleep(self, x=True):
+        """
+        Allow or forbid the automatic sleep of silent streams.
+
+        Objects processing an input signal can stop computing their 
+        samples while their input and their output are silent (see the 
+        setAutoSleep() method of PyoObject). This is the global switch: 
+        when False, all the streams are kept awake, their settings are 
+        left untouched and apply again when it is set back to True. 
+        Defaults to True.
+
+        :Args:
+
+            x : boolean, optional
+                True to allow the automatic sleep, False to forbid it.
+                Defaults to True.
+
+        """
+        self._server.setAutoSleep(int(bool(x)))
+
+    def getAutoSleep(self):
+        """
+        Returns True if silent streams are allowed to sleep.
+
+        """
+        return bool(self._server.getAutoSleep())
+
+    def getSleepStats(self, reset=False):
+        """
+        Returns the counters of the automatic sleep of all the streams.
+
+        The counters are returned as a dictionary with the following keys:
+
+            - 'sleeps' : number of times a stream went to sleep.
+            - 'wakes' : number of times a stream woke up.
+            - 'sleeping' : number of streams currently sleeping.
+            - 'streams' : number of streams running.
+
+        :Args:
+
+            reset : boolean, optional
+                If True, the sleep and wake counters are reset after 
+                reading. Defaults to False.
+
+        """
+        sleeps = wakes = sleeping = 0
+        streams = self._server.getStreams()
+        for stream in streams:
+            s, w, z = stream.getSleepStats()
+            sleeps += s
+            wakes += w
+            sleeping += z
+            if reset:
+                stream.resetSleepStats()
+        return {"sleeps": sleeps, "wakes": wakes, "sleeping": sleeping, "streams": len(streams)}
+
+    def getWorkerLoad(self, reset=False):
+        """
+        Returns the load of every thread of the parallel scheduler.
+
+        The load is the time spent computing lanes as a fraction of the 
+        duration of the audio computed. The first value is the callback 
+        thread, followed by the worker threads.
+
+        :Args:
+
+            reset : boolean, optional
+                If True, the counters are reset after reading. 
+                Defaults to False.
+
+        """
+        blocks, busy = self._server.getWorkerLoad()
+        if reset:
+            self._server.resetWorkerLoad()
+        duration = blocks * self.getBufferSize() / float(self.getSamplingRate())
+        if duration <= 0:
+            return [0.0 for x in busy]
+        return [x / duration for x in busy]
+
+    def setLanes(self, voices):
+        """
+        Assign independent voices to processing lanes.
+
+        Each element of `voices` is a PyoObject, or a list of PyoObjects, 
+        computing one voice of a patch (ie. one voice of a polyphonic 
+        synth, one input of a Mixer, etc.). The internal objects of these 
+        PyoObjects (input faders and the results of arithmetic operations 
+        on them) follow their owner.
+
+        Voices are meant to be independent from each other. When an object 
+        of a voice uses an object of another voice as input, or when an 
+        object is given in more than one voice, the voices are merged in 
+        the same lane, so lanes are always independent. Objects that call 
+        Python functions while computing their samples (TrigFunc, Pattern, 
+        SfPlayer, TableRead, etc.) are left in the callback thread.
+
+        The lanes are computed in parallel only when more than one worker 
+        is used (see setWorkers()). Shared objects, like a global LFO, 
+        should not be given in the voices, they stay in the callback thread. 
+        Random generators of different lanes draw from the same global 
+        generator, so their sequences are not reproducible in parallel.
+
+        :Args:
+
+            voices : list
+                List of PyoObjects or list of lists of PyoObjects.
+
+        Returns the number of lanes created.
+
+        >>> s = Server().boot()
+        >>> s.setWorkers(4)
+        >>> lfo = Sine(.1, mul=.01, add=1)
+        >>> voices = []
+        >>> for i in range(16):
+        ...     src = SuperSaw(freq=[100*(i+1), 100.5*(i+1)]*lfo, mul=.02)
+        ...     voices.append([src, Biquad(src, freq=1000+i*100).out()])
+        >>> n = s.setLanes(voices)
+        >>> s.start()
+
+        """
+        parent = range(len(voices))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        def union(i, j):
+            parent[find(i)] = find(j)
+
+        members = []
+        membership = {}
+        for i, voice in enumerate(voices):
+            objs = {}
+            _laneMembers(voice, objs)
+            members.append(objs)
+            for key in objs:
+                membership[key] = i
+
+        def adopt(i, x):
+            # Adds `x` to voice `i` if it doesn't use objects of another voice.
+            objs = members[i]
+            others = [ref for ref in _memberReferences(x) if id(ref) not in objs and id(ref) in membership]
+            if others:
+                return False
+            _laneMembers(x, objs)
+            membership[id(x)] = i
+            return True
+
+        # Results of arithmetic operations follow their voice, either 
+        # when they are computed from the voice's objects or when they 
+        # are used by this voice only.
+        changed = True
+        while changed:
+            changed = False
+            users = {}
+            for i, objs in enumerate(members):
+                for obj in objs.values():
+                    if isinstance(obj, PyoObject):
+                        for x in obj._keep_trace:
+                            if id(x) not in objs and _isAudioObject(x) and adopt(i, x):
+                                changed = True
+                    for ref in _memberReferences(obj):
+                        if isinstance(ref, Dummy) and id(ref) not in membership:
+                            users.setdefault(id(ref), (ref, {}))[1][i] = True
+            for ref, voices_using in users.values():
+                if len(voices_using) == 1 and id(ref) not in membership and adopt(voices_using.keys()[0], ref):
+                    changed = True
+
+        owners = {}
+        streams = {}
+        serial = {}
+        for i, objs in enumerate(members):
+            for obj in objs.values():
+                for stream in _memberStreams(obj):
+                    sid = stream.getId()
+                    streams[sid] = stream
+                    if _callbackThreadOnly(obj):
+                        serial[sid] = True
+                    if sid in owners:
+                        union(owners[sid], i)
+                    else:
+                        owners[sid] = i
+        for i, objs in enumerate(members):
+            for obj in objs.values():
+                for ref in _memberReferences(obj):
+                    for stream in _memberStreams(ref):
+                        sid = stream.getId()
+                        if sid in owners:
+                            union(owners[sid], i)
+
+        lanes = {}
+        for sid, stream in streams.items():
+            if sid in serial:
+                stream.setLane(0)
+                continue
+            root = find(owners[sid])
+            if root not in lanes:
+                self._lanes += 1
+                lanes[root] = self._lanes
+            stream.setLane(lanes[root])
+        return len(lanes)
+
+    def resetLanes(self, voices=None):
+        """
+        Move objects back to the callback thread.
+
+        :Args:
+
+            voices : list, optional
+                PyoObjects, or lists of PyoObjects, to move back to the 
+                callback thread. If None, all the streams of the server 
+                are moved back. Defaults to None.
+
+        """
+        if voices is None:
+            for stream in self._server.getStreams():
+                stream.setLane(0)
+            return
+        objs = {}
+        _laneMembers(voices, objs, True)
+        for obj in objs.values():
+            for stream in _memberStreams(obj):
+                stream.setLane(0)
+
     def setServer(self):
         """
         Sets this server as the one to use for new objects when using the embedded device
@@ -708,3 +1293,341 @@ class Server(object):
             self.setGlobalSeed(x)
         else:
             raise Exception("global seed must be an integer")
+
+# Threads making the deferred calls, and the event ending them at exit.
+_call_threads = []
+_call_loops_quit = threading.Event()
+
+def _callLoop(server, quit):
+    # Makes the calls deferred by the audio callback, until the server is shut down.
+    # Only holds the C server, so the Server object can still be deleted.
+    # print_exc is bound here, the module globals are cleared at exit.
+    print_exc = traceback.print_exc
+    while not quit.isSet():
+        calls = server._waitCalls(0.1)
+        if calls is None:
+            break
+        for function, args in calls:
+            if quit.isSet():
+                break
+            try:
+                function(*args)
+            except:
+                print_exc()
+
+def _stopCallLoops():
+    # Ends the call threads before the interpreter tears down the modules, 
+    # the calls still queued are dropped.
+    _call_loops_quit.set()
+    for thread in _call_threads:
+        thread.join(1.0)
+
+atexit.register(_stopCallLoops)
+
+def _profileClassName(obj):
+    # Name of the audio object owning a stream, without the C type decorations.
+    name = obj.__class__.__name__
+    if name.endswith("_base"):
+        name = name[:-5]
+    if name.startswith("M_"):
+        name = name[2:]
+    return name
+
+# Objects calling back into Python while computing their samples, 
+# they must stay in the callback thread (see Server.setLanes).
+_CALLBACK_THREAD_ONLY = ["TrigFunc", "Pattern", "CallAfter", "Score", "TableRead", "Looper", "SfPlayer", 
+                         "SfMarkerShuffler", "SfMarkerLooper", "Record", "ControlRec", "ControlRead", 
+                         "NoteinRec", "NoteinRead", "OscDataReceive", "OscListReceive", "OscReceive"]
+
+def _callbackThreadOnly(obj):
+    for cls in obj.__class__.__mro__:
+        if cls.__name__ in _CALLBACK_THREAD_ONLY:
+            return True
+    return False
+
+def _isAudioObject(obj):
+    return isinstance(obj, PyoObjectBase) and not isinstance(obj, PyoTableObject) and not isinstance(obj, PyoMatrixObject)
+
+def _laneMembers(obj, members, derived=False):
+    # Collects `obj` and its input faders. If `derived` is True, the 
+    # results of arithmetic operations on `obj` are collected too.
+    if type(obj) in [ListType, TupleType]:
+        for x in obj:
+            _laneMembers(x, members, derived)
+        return
+    if not _isAudioObject(obj) or id(obj) in members:
+        return
+    members[id(obj)] = obj
+    for value in obj.__dict__.values():
+        if isinstance(value, InputFader):
+            _laneMembers(value, members, derived)
+    if derived and isinstance(obj, PyoObject):
+        for x in obj._keep_trace:
+            _laneMembers(x, members, derived)
+
+def _memberStreams(obj):
+    # Audio streams of an object, including its hidden main objects.
+    objs = list(obj.getBaseObjects())
+    for value in obj.__dict__.values():
+        if type(value) is not ListType:
+            value = [value]
+        for x in value:
+            if not isinstance(x, PyoObjectBase) and hasattr(x, "_getStream"):
+                objs.append(x)
+    streams = {}
+    for x in objs:
+        if hasattr(x, "_getStream"):
+            stream = x._getStream()
+            streams[stream.getId()] = stream
+    return streams.values()
+
+def _memberReferences(obj):
+    # Audio objects used by `obj` (inputs, parameters, operands).
+    refs = []
+    for key, value in obj.__dict__.items():
+        if key == "_keep_trace":
+            continue
+        if type(value) not in [ListType, TupleType]:
+            value = [value]
+        for x in value:
+            if _isAudioObject(x):
+                refs.append(x)
+    return refs
+
+def _formatProfile(profile, num=10):
+    # Text report of a snapshot returned by Server.getProfile().
+    lines = ["Profile: %d blocks, %d late, %.3f sec (%.1f%% load, longest block %.3f ms)" % (profile["blocks"], 
+             profile["late"], profile["time"], profile["load"] * 100, profile["maxtime"] * 1000)]
+    total = profile["time"]
+    if total <= 0:
+        total = 1.0
+    classes = sorted(profile["classes"].items(), key=lambda x: x[1]["time"], reverse=True)
+    lines.append("%-20s %8s %12s %8s" % ("class", "streams", "time (ms)", "share"))
+    for name, c in classes[:num]:
+        lines.append("%-20s %8d %12.3f %7.1f%%" % (name, c["streams"], c["time"] * 1000, c["time"] * 100 / total))
+    lines.append("%-20s %8s %12s %8s" % ("stream", "calls", "time (ms)", "share"))
+    for st in profile["streams"][:num]:
+        lines.append("%-20s %8d %12.3f %7.1f%%" % ("%s #%d" % (st["class"], st["id"]), st["calls"], 
+                     st["time"] * 1000, st["time"] * 100 / total))
+    return "\n".join(lines)
+
+######################################################################
+### Parallel offline rendering
+######################################################################
+# Offline server owned by the current worker process (see BatchRender).
+_batch_server = None
+
+def _batch_worker_init(sr, nchnls, buffersize, verbosity):
+    # Called once in each worker process of a BatchRender pool.
+    global _batch_server
+    _batch_server = Server(sr=sr, nchnls=nchnls, buffersize=buffersize, duplex=0, audio="offline")
+    _batch_server.setVerbosity(verbosity)
+
+def _batch_worker_render(job):
+    # Renders one job in the current worker process and returns its report.
+    index, builder, dur, filename, args, fileformat, sampletype = job
+    s = _batch_server
+    error = None
+    start = time.time()
+    try:
+        s.boot()
+        s.recordOptions(dur=dur, filename=filename, fileformat=fileformat, sampletype=sampletype)
+        objs = builder(*args)
+        s.start()
+        del objs
+    except Exception, e:
+        error = "%s: %s" % (e.__class__.__name__, e)
+    if s.getIsBooted():
+        s.shutdown()
+    walltime = time.time() - start
+    if walltime > 0:
+        ratio = dur / walltime
+    else:
+        ratio = 0.0
+    return {"index": index, "filename": filename, "dur": dur, "walltime": walltime,
+            "ratio": ratio, "pid": os.getpid(), "error": error}
+
+class BatchRender(object):
+    """
+    Renders many offline jobs in parallel across worker processes.
+
+    An offline Server renders only one graph at a time in a given process.
+    BatchRender distributes a list of jobs to a pool of worker processes, 
+    each owning its own offline Server. In every worker, a job boots the 
+    server, calls the job's graph-builder function, renders `dur` seconds 
+    of sound (samples are written to the output file block by block, as 
+    they are computed) and shuts the server down.
+
+    Each job is a tuple `(builder, dur, filename)` or `(builder, dur, filename, args)`:
+
+        builder : Python function
+            Function that creates the processing chain. It is called without
+            arguments (or with the arguments in `args`) once the server is 
+            booted. It must return the objects to keep alive during the 
+            rendering (ie. a list of PyoObjects).
+        dur : float
+            Duration, in seconds, of the rendered file.
+        filename : string
+            Full path of the file to create. The file format is taken from
+            the extension if possible.
+        args : tuple, optional
+            Arguments given to the builder function.
+
+    The builder functions and their arguments are sent to the workers with
+    the pickle module, they must be defined at the top level of a module.
+
+    :Args:
+
+        jobs : list of tuples
+            The jobs to render. See above.
+        processes : int, optional
+            Number of worker processes. If None, the number of CPUs is used.
+            Defaults to None.
+        sr : int, optional
+            Sampling rate of the offline servers. Defaults to 44100.
+        nchnls : int, optional
+            Number of channels of the offline servers. Defaults to 2.
+        buffersize : int, optional
+            Buffer size of the offline servers. Defaults to 256.
+        fileformat : int, optional
+            Format of the files, used when the extension does not tell it.
+            See Server.recordOptions. Defaults to 0.
+        sampletype : int, optional
+            Bit depth encoding of the files. See Server.recordOptions. 
+            Defaults to 0.
+        verbosity : int, optional
+            Verbosity of the servers running in the workers. Defaults to 1 
+            (errors only).
+
+    .. note::
+
+        The jobs must be rendered from a process in which no Server has been 
+        created yet, because a child process inherits the Server of its parent.
+
+    >>> from pyo import *
+    >>> def synth(freq):
+    ...     env = Adsr(attack=0.005, decay=0.15, sustain=0.7, release=1.7, dur=2).play()
+    ...     osc = SineLoop(freq=[freq, freq*1.01], feedback=0.075, mul=env).out()
+    ...     return [env, osc]
+    >>> jobs = [(synth, 2.1, "/tmp/note_%02d.wav" % i, (midiToHz(60+i),)) for i in range(12)]
+    >>> results = BatchRender(jobs, processes=4).render()
+
+    """
+    def __init__(self, jobs, processes=None, sr=44100, nchnls=2, buffersize=256, fileformat=0, sampletype=0, verbosity=1):
+        self._jobs = jobs
+        self._processes = processes
+        self._sr = sr
+        self._nchnls = nchnls
+        self._buffersize = buffersize
+        self._fileformat = fileformat
+        self._sampletype = sampletype
+        self._verbosity = verbosity
+        self._results = []
+        self._walltime = 0.0
+
+    def _prepareJobs(self):
+        # Expands job tuples into the records sent to the workers.
+        prepared = []
+        for i, job in enumerate(self._jobs):
+            if len(job) == 4:
+                builder, dur, filename, args = job
+            else:
+                builder, dur, filename = job
+                args = ()
+            if dur <= 0:
+                raise ValueError("BatchRender job %d: duration must be positive." % i)
+            fileformat = self._fileformat
+            ext = filename.rsplit('.')
+            if len(ext) >= 2:
+                ext = ext[-1].lower()
+                if FILE_FORMATS.has_key(ext):
+                    fileformat = FILE_FORMATS[ext]
+            prepared.append((i, builder, dur, filename, tuple(args), fileformat, self._sampletype))
+        return prepared
+
+    def render(self, callback=None):
+        """
+        Renders all the jobs and returns the list of reports, in job order.
+
+        Each report is a dictionary with the following keys:
+            - index : position of the job in the list.
+            - filename : path of the rendered file.
+            - dur : duration of the rendered file, in seconds.
+            - walltime : time, in seconds, spent rendering the job.
+            - ratio : real-time ratio (`dur` / `walltime`). Values above 1
+              mean faster than real-time.
+            - pid : process id of the worker that rendered the job.
+            - error : None on success, otherwise the error message.
+
+        :Args:
+
+            callback : Python callable, optional
+                If provided, it is called with the report of each job as soon
+                as the job is done (in completion order, not in job order).
+                Defaults to None.
+
+        """
+        if serverCreated():
+            raise PyoServerStateException("BatchRender can't be used in a process that already owns a Server.")
+        import multiprocessing
+        jobs = self._prepareJobs()
+        processes = self._processes
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        processes = max(1, min(processes, len(jobs)))
+        results = [None] * len(jobs)
+        start = time.time()
+        pool = multiprocessing.Pool(processes, _batch_worker_init,
+                                    (self._sr, self._nchnls, self._buffersize, self._verbosity))
+        try:
+            for report in pool.imap_unordered(_batch_worker_render, jobs):
+                results[report["index"]] = report
+                if callback is not None:
+                    callback(report)
+            pool.close()
+        except:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+        self._walltime = time.time() - start
+        self._results = results
+        return results
+
+    def getResults(self):
+        """
+        Returns the list of reports of the last call to `render`.
+
+        """
+        return self._results
+
+    def getWallTime(self):
+        """
+        Returns the total time, in seconds, spent by the last call to `render`.
+
+        """
+        return self._walltime
+
+    def getRatio(self):
+        """
+        Returns the global real-time ratio of the last call to `render`.
+
+        This is the sum of the rendered durations divided by the total 
+        elapsed time.
+
+        """
+        if self._walltime <= 0:
+            return 0.0
+        return sum([r["dur"] for r in self._results if r["error"] is None]) / self._walltime
+
+    def report(self):
+        """
+        Prints a summary of the last call to `render`.
+
+        """
+        for r in self._results:
+            if r["error"] is None:
+                print "%s: %.2f sec rendered in %.3f sec (x%.1f real-time, pid %d)" % (r["filename"], r["dur"], r["walltime"], r["ratio"], r["pid"])
+            else:
+                print "%s: failed (%s)" % (r["filename"], r["error"])
+        print "Total: %d jobs in %.3f sec (x%.1f real-time)" % (len(self._results), self._walltime, self.getRatio())
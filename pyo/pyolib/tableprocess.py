@@ -67,8 +67,7 @@ class Osc(PyoObject):
         self._freq = freq
         self._phase = phase
         self._interp = interp
-        table, freq, phase, interp, mul, add, lmax = convertArgsToLists(table, freq, phase, interp, mul, add)
-        self._base_objs = [Osc_base(wrap(table,i), wrap(freq,i), wrap(phase,i), wrap(interp,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
+        self._base_objs = [Osc_base(*args) for args in expandArgs(table, freq, phase, interp, mul, add)]
 
     def setTable(self, x):
         """
@@ -205,8 +204,7 @@ class OscLoop(PyoObject):
         self._table = table
         self._freq = freq
         self._feedback = feedback
-        table, freq, feedback, mul, add, lmax = convertArgsToLists(table, freq, feedback, mul, add)
-        self._base_objs = [OscLoop_base(wrap(table,i), wrap(freq,i), wrap(feedback,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
+        self._base_objs = [OscLoop_base(*args) for args in expandArgs(table, freq, feedback, mul, add)]
 
     def setTable(self, x):
         """
@@ -321,8 +319,7 @@ class OscTrig(PyoObject):
         self._freq = freq
         self._phase = phase
         self._interp = interp
-        table, trig, freq, phase, interp, mul, add, lmax = convertArgsToLists(table, trig, freq, phase, interp, mul, add)
-        self._base_objs = [OscTrig_base(wrap(table,i), wrap(trig,i), wrap(freq,i), wrap(phase,i), wrap(interp,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
+        self._base_objs = [OscTrig_base(*args) for args in expandArgs(table, trig, freq, phase, interp, mul, add)]
 
     def setTable(self, x):
         """
@@ -502,7 +499,7 @@ class OscBank(PyoObject):
 
     .. seealso:: 
         
-        :py:class:`Osc`
+        :py:class:`Osc`, :py:class:`PartialBank`
 
     .. note::
 
@@ -531,8 +528,7 @@ class OscBank(PyoObject):
         self._arnda = arnda
         self._fjit = fjit
         self._num = num
-        table, freq, spread, slope, frndf, frnda, arndf, arnda, num, fjit, mul, add, lmax = convertArgsToLists(table, freq, spread, slope, frndf, frnda, arndf, arnda, num, fjit, mul, add)
-        self._base_objs = [OscBank_base(wrap(table,i), wrap(freq,i), wrap(spread,i), wrap(slope,i), wrap(frndf,i), wrap(frnda,i), wrap(arndf,i), wrap(arnda,i), wrap(num,i), wrap(fjit,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
+        self._base_objs = [OscBank_base(*args) for args in expandArgs(table, freq, spread, slope, frndf, frnda, arndf, arnda, num, fjit, mul, add)]
 
     def setTable(self, x):
         """
@@ -734,6 +730,160 @@ class OscBank(PyoObject):
     @fjit.setter
     def fjit(self, x): self.setFjit(x)
 
+class PartialBank(PyoObject):
+    """
+    Additive synthesis of any number of sine partials.
+
+    PartialBank synthesizes one sine wave per partial, whose frequency
+    and amplitude are read, at the beginning of each buffer, from two
+    tables. The tables can be rewritten while the object is playing
+    (with DataTable.replace, TableRec, TablePut, ...) to animate the
+    partials. Amplitudes are interpolated over the buffer.
+
+    Thousands of partials can be synthesized. Up to a few hundreds, a
+    bank of oscillators is computed by blocks of partials. Beyond, the
+    partials are synthesized in the spectral domain and converted back
+    with an inverse FFT, whose cost hardly depends on the number of
+    partials.
+
+    :Parent: :py:class:`PyoObject`
+
+    :Args:
+
+        freqs : PyoTableObject
+            Table containing the frequency, in cycles per second, of
+            each partial.
+        amps : PyoTableObject
+            Table containing the amplitude of each partial.
+        pitch : float or PyoObject, optional
+            Transposition factor applied to all frequencies. Defaults to 1.
+        num : int, optional
+            Number of partials. If 0, the size of the `freqs` table is
+            used. Partials beyond the size of a table have a frequency,
+            or an amplitude, of 0. Available at initialization only.
+            Defaults to 0.
+        mode : int, optional
+            Synthesis method. 1 uses a bank of sine oscillators, 2 uses
+            inverse FFT synthesis, much cheaper for large numbers of
+            partials but adding 128 samples of latency (at 44.1 or 48
+            kHz) and reading the tables every 128 samples. 0 chooses
+            the inverse FFT from 256 partials. Defaults to 0.
+
+    .. seealso:: 
+        
+        :py:class:`OscBank`, :py:class:`PVAddSynth`
+
+    .. note::
+
+        Partials above the Nyquist frequency are muted.
+
+    >>> s = Server().boot()
+    >>> s.start()
+    >>> import random
+    >>> num = 2000
+    >>> fr = DataTable(num, init=[random.uniform(50, 8000) for i in range(num)])
+    >>> am = DataTable(num, init=[1./num for i in range(num)])
+    >>> a = PartialBank(fr, am, pitch=Sine(.1, mul=.05, add=1), mul=.5).out()
+
+    """
+    def __init__(self, freqs, amps, pitch=1, num=0, mode=0, mul=1, add=0):
+        PyoObject.__init__(self, mul, add)
+        self._freqs = freqs
+        self._amps = amps
+        self._pitch = pitch
+        self._num = num
+        self._mode = mode
+        self._base_objs = [PartialBank_base(*args) for args in expandArgs(freqs, amps, pitch, num, mode, mul, add)]
+
+    def setFreqs(self, x):
+        """
+        Replace the `freqs` attribute.
+
+        :Args:
+
+            x : PyoTableObject
+                new `freqs` attribute.
+
+        """
+        self._freqs = x
+        x, lmax = convertArgsToLists(x)
+        [obj.setFreqs(wrap(x,i)) for i, obj in enumerate(self._base_objs)]
+
+    def setAmps(self, x):
+        """
+        Replace the `amps` attribute.
+
+        :Args:
+
+            x : PyoTableObject
+                new `amps` attribute.
+
+        """
+        self._amps = x
+        x, lmax = convertArgsToLists(x)
+        [obj.setAmps(wrap(x,i)) for i, obj in enumerate(self._base_objs)]
+
+    def setPitch(self, x):
+        """
+        Replace the `pitch` attribute.
+
+        :Args:
+
+            x : float or PyoObject
+                new `pitch` attribute.
+
+        """
+        self._pitch = x
+        x, lmax = convertArgsToLists(x)
+        [obj.setPitch(wrap(x,i)) for i, obj in enumerate(self._base_objs)]
+
+    def setMode(self, x):
+        """
+        Replace the `mode` attribute.
+
+        :Args:
+
+            x : int {0, 1, 2}
+                new `mode` attribute.
+
+        """
+        self._mode = x
+        x, lmax = convertArgsToLists(x)
+        [obj.setMode(wrap(x,i)) for i, obj in enumerate(self._base_objs)]
+
+    def ctrl(self, map_list=None, title=None, wxnoserver=False):
+        self._map_list = [SLMap(0.25, 4, "lin", "pitch", self._pitch),
+                          SLMapMul(self._mul)]
+        PyoObject.ctrl(self, map_list, title, wxnoserver)
+
+    @property
+    def freqs(self):
+        """PyoTableObject. Frequencies of the partials.""" 
+        return self._freqs
+    @freqs.setter
+    def freqs(self, x): self.setFreqs(x)
+
+    @property
+    def amps(self):
+        """PyoTableObject. Amplitudes of the partials.""" 
+        return self._amps
+    @amps.setter
+    def amps(self, x): self.setAmps(x)
+
+    @property
+    def pitch(self):
+        """float or PyoObject. Transposition factor.""" 
+        return self._pitch
+    @pitch.setter
+    def pitch(self, x): self.setPitch(x)
+
+    @property
+    def mode(self):
+        """int. Synthesis method.""" 
+        return self._mode
+    @mode.setter
+    def mode(self, x): self.setMode(x)
+
 class TableRead(PyoObject):
     """
     Simple waveform table reader.
@@ -944,8 +1094,7 @@ class Pulsar(PyoObject):
         self._frac = frac
         self._phase = phase
         self._interp = interp
-        table, env, freq, frac, phase, interp, mul, add, lmax = convertArgsToLists(table, env, freq, frac, phase, interp, mul, add)
-        self._base_objs = [Pulsar_base(wrap(table,i), wrap(env,i), wrap(freq,i), wrap(frac,i), wrap(phase,i), wrap(interp,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
+        self._base_objs = [Pulsar_base(*args) for args in expandArgs(table, env, freq, frac, phase, interp, mul, add)]
 
     def setTable(self, x):
         """
@@ -1110,8 +1259,7 @@ class Pointer(PyoObject):
         PyoObject.__init__(self, mul, add)
         self._table = table
         self._index = index
-        table, index, mul, add, lmax = convertArgsToLists(table, index, mul, add)
-        self._base_objs = [Pointer_base(wrap(table,i), wrap(index,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
+        self._base_objs = [Pointer_base(*args) for args in expandArgs(table, index, mul, add)]
 
     def setTable(self, x):
         """
@@ -1198,8 +1346,7 @@ class Pointer2(PyoObject):
         self._index = index
         self._interp = interp
         self._autosmooth = autosmooth
-        table, index, interp, autosmooth, mul, add, lmax = convertArgsToLists(table, index, interp, autosmooth, mul, add)
-        self._base_objs = [Pointer2_base(wrap(table,i), wrap(index,i), wrap(interp,i), wrap(autosmooth,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
+        self._base_objs = [Pointer2_base(*args) for args in expandArgs(table, index, interp, autosmooth, mul, add)]
 
     def setTable(self, x):
         """
@@ -1325,8 +1472,7 @@ class TableIndex(PyoObject):
         PyoObject.__init__(self, mul, add)
         self._table = table
         self._index = index
-        table, index, mul, add, lmax = convertArgsToLists(table, index, mul, add)
-        self._base_objs = [TableIndex_base(wrap(table,i), wrap(index,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
+        self._base_objs = [TableIndex_base(*args) for args in expandArgs(table, index, mul, add)]
 
     def setTable(self, x):
         """
@@ -1405,8 +1551,7 @@ class Lookup(PyoObject):
         PyoObject.__init__(self, mul, add)
         self._table = table
         self._index = index
-        table, index, mul, add, lmax = convertArgsToLists(table, index, mul, add)
-        self._base_objs = [Lookup_base(wrap(table,i), wrap(index,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
+        self._base_objs = [Lookup_base(*args) for args in expandArgs(table, index, mul, add)]
 
     def setTable(self, x):
         """
@@ -2681,8 +2826,7 @@ class TableScale(PyoObject):
         PyoObject.__init__(self, mul, add)
         self._table = table
         self._outtable = outtable
-        table, outtable, mul, add, lmax = convertArgsToLists(table, outtable, mul, add)
-        self._base_objs = [TableScale_base(wrap(table,i), wrap(outtable,i), wrap(mul,i), wrap(add,i)) for i in range(lmax)]
+        self._base_objs = [TableScale_base(*args) for args in expandArgs(table, outtable, mul, add)]
 
     def setTable(self, x):
         """
@@ -22,6 +22,7 @@ from _maps import *
 from _widgets import createGraphWindow, createDataGraphWindow, createSndViewTableWindow
 from types import ListType
 from math import pi
+import hashlib
 
 ######################################################################
 ### Tables
@@ -1318,6 +1319,22 @@ class ExpTable(PyoTableObject):
     @list.setter
     def list(self, x): self.replace(x)
 
+def _sndCachePath(path, chnl, start, stop):
+    # Cache file holding the decoded samples of one channel of a sound,
+    # used by SndTable(mmap=True). The key includes the size and the
+    # modification time of the sound, so an edited file gets a new cache,
+    # and the sample size (sizeof(MYFLT)), so pyo and pyo64 keep their own.
+    folder = os.environ.get("PYO_SND_CACHE", os.path.join(tempfile.gettempdir(), "pyo_sndcache"))
+    if not os.path.isdir(folder):
+        try:
+            os.makedirs(folder)
+        except OSError:
+            pass
+    info = os.stat(path)
+    size = [4, 8][USE_DOUBLE]
+    key = "%s:%d:%d:%d:%s:%s:%d" % (os.path.abspath(path), info.st_size, int(info.st_mtime), chnl, start, stop, size)
+    return os.path.join(folder, hashlib.md5(key).hexdigest() + ".raw")
+
 class SndTable(PyoTableObject):
     """
     Transfers data from a soundfile into a function table.
@@ -1342,6 +1359,25 @@ class SndTable(PyoTableObject):
             Stops reading at `stop` seconds into the file. Available at 
             initialization time only. The default (None) means the end of 
             the file.
+        initchnls : int, optional
+            Number of channels of an empty table. Defaults to 1.
+        mmap : boolean, optional
+            If True, the samples are not loaded in memory. Each channel is 
+            decoded once to a cache file which is then memory-mapped, so
+            the operating system reads the sound from disk as the table 
+            is played. Use it for sounds too large to fit in RAM. Available
+            at initialization time only. Defaults to False.
+
+    .. note::
+
+        Cache files are written in the folder given by the PYO_SND_CACHE 
+        environment variable, or in a "pyo_sndcache" folder in the system's
+        temporary directory. A cache file is reused as long as the sound
+        file is not modified.
+
+        Processing methods (normalize, reverse, fadein, ...) work on a 
+        private copy of the pages they touch and never alter the cache. 
+        `append` and `insert` load a mapped table in RAM.
 
     >>> s = Server().boot()
     >>> s.start()
@@ -1351,12 +1387,13 @@ class SndTable(PyoTableObject):
     >>> a = Osc(table=t, freq=[freq, freq*.995], mul=.3).out()
 
     """
-    def __init__(self, path=None, chnl=None, start=0, stop=None, initchnls=1):
+    def __init__(self, path=None, chnl=None, start=0, stop=None, initchnls=1, mmap=False):
         PyoTableObject.__init__(self)
         self._path = path
         self._chnl = chnl
         self._start = start
         self._stop = stop
+        self._mmap = mmap
         self._size = []
         self._dur = []
         self._base_objs = []
@@ -1366,7 +1403,16 @@ class SndTable(PyoTableObject):
         else:
             for p in path:
                 _size, _dur, _snd_sr, _snd_chnls, _format, _type = sndinfo(p)
-                if chnl == None:
+                if mmap:
+                    if chnl == None:
+                        chnls = range(_snd_chnls)
+                    else:
+                        chnls = [chnl]
+                    for i in chnls:
+                        obj = SndTable_base("", 0, 0)
+                        self._loadSound(obj, p, i, start, stop)
+                        self._base_objs.append(obj)
+                elif chnl == None:
                     if stop == None:
                         self._base_objs.extend([SndTable_base(p, i, start) for i in range(_snd_chnls)])
                     else:
@@ -1412,20 +1458,32 @@ class SndTable(PyoTableObject):
                 _size, _dur, _snd_sr, _snd_chnls, _format, _type = sndinfo(p)
                 self._size.append(_size)
                 self._dur.append(_dur)
-                if stop == None:
-                    obj.setSound(p, 0, start)
-                else:
-                    obj.setSound(p, 0, start, stop)
+                self._loadSound(obj, p, 0, start, stop)
         else:
             _size, _dur, _snd_sr, _snd_chnls, _format, _type = sndinfo(path)
             self._size = _size
             self._dur = _dur
-            if stop == None:
-                [obj.setSound(path, (i%_snd_chnls), start) for i, obj in enumerate(self._base_objs)]
-            else:
-                [obj.setSound(path, (i%_snd_chnls), start, stop) for i, obj in enumerate(self._base_objs)]
+            [self._loadSound(obj, path, (i%_snd_chnls), start, stop) for i, obj in enumerate(self._base_objs)]
         self.refreshView()
 
+    def _loadSound(self, obj, path, chnl, start, stop):
+        if stop == None:
+            stop = -1
+        if self._mmap:
+            obj.mapSound(path, _sndCachePath(path, chnl, start, stop), chnl, start, stop)
+        else:
+            obj.setSound(path, chnl, start, stop)
+
+    def isMapped(self):
+        """
+        Returns True if the samples of every channel are memory-mapped.
+
+        A mapped table falls back to RAM after a call to `append` or
+        `insert`.
+
+        """
+        return False not in [bool(obj.isMapped()) for obj in self._base_objs]
+
     def append(self, path, crossfade=0, start=0, stop=None):
         """
         Append a sound to the one already in the table with crossfade.
@@ -1117,6 +1117,7 @@ class TrigFunc(PyoObject):
         self._in_fader = InputFader(input)
         in_fader, function, arg, lmax = convertArgsToLists(self._in_fader, function, arg)
         self._base_objs = [TrigFunc_base(wrap(in_fader,i), wrap(function,i), wrap(arg,i)) for i in range(lmax)]
+        self._defer = False
 
     def out(self, chnl=0, inc=1, dur=0, delay=0):
         return self.play(dur, delay)
@@ -1170,6 +1171,19 @@ class TrigFunc(PyoObject):
         x, lmax = convertArgsToLists(x)
         [obj.setArg(wrap(x,i)) for i, obj in enumerate(self._base_objs)]
 
+    def setDefer(self, x):
+        """
+        Replace the `defer` attribute.
+
+        :Args:
+
+            x : boolean
+                new `defer` attribute.
+
+        """
+        self._defer = x
+        [obj.setDefer(x) for obj in self._base_objs]
+
     @property
     def input(self): 
         """PyoObject. Audio trigger signal."""
@@ -1191,6 +1205,12 @@ class TrigFunc(PyoObject):
     @arg.setter
     def arg(self, x): 
         self.setArg(x)
+    @property
+    def defer(self):
+        """boolean. If True, the function is called by the server's call thread."""
+        return self._defer
+    @defer.setter
+    def defer(self, x): self.setDefer(x)
      
 class TrigEnv(PyoObject):
     """
@@ -25,7 +25,8 @@ along with pyo.  If not, see <http://www.gnu.org/licenses/>.
 from _core import *
 from _maps import *
 from types import SliceType
-import threading, time
+import threading, time, struct, zlib, array
+import __builtin__
 
 class Clean_objects(threading.Thread):
     """
@@ -195,6 +196,152 @@ class Print(PyoObject):
     @message.setter
     def message(self, x): self.setMessage(x)
 
+class Capture(PyoObject):
+    """
+    Captures every buffer of a PyoObject into a ring buffer.
+
+    Unlike polling `get()`, which only returns the first sample of the
+    current buffer, Capture copies the whole signal, one block at a time,
+    into a ring buffer owned by the audio engine. Python code then drains
+    the captured samples in blocks, as numpy arrays, at its own pace.
+
+    If the ring is full when a new buffer arrives (the consumer is too
+    slow), the buffer is dropped and the overrun counter is incremented.
+
+    :Parent: :py:class:`PyoObject`
+
+    :Args:
+
+        input : PyoObject
+            Input signal to capture.
+        length : float, optional
+            Minimum duration, in seconds, of the ring buffer. The real
+            size is rounded up to a power of two samples. Defaults to 1.
+
+    .. note::
+
+        The out() method is bypassed. Capture's signal can not be sent to
+        audio outs.
+
+        Capture has no `mul` and `add` attributes.
+
+        The `read` method requires numpy.
+
+    >>> s = Server().boot()
+    >>> s.start()
+    >>> a = SfPlayer(SNDS_PATH + '/transparent.aif', loop=True, mul=.3).out()
+    >>> c = Capture(a, length=2)
+    >>> def analyse():
+    ...     block = c.read()
+    ...     if block.shape[1] > 0:
+    ...         print "peak:", abs(block).max(), "overruns:", c.getOverruns()
+    >>> pat = Pattern(analyse, time=0.5).play()
+
+    """
+    def __init__(self, input, length=1.0):
+        PyoObject.__init__(self)
+        self._input = input
+        self._length = length
+        self._in_fader = InputFader(input)
+        in_fader, length, lmax = convertArgsToLists(self._in_fader, length)
+        self._base_objs = [Capture_base(wrap(in_fader,i), wrap(length,i)) for i in range(lmax)]
+
+    def setInput(self, x, fadetime=0.05):
+        """
+        Replace the `input` attribute.
+
+        :Args:
+
+            x : PyoObject
+                New signal to capture.
+            fadetime : float, optional
+                Crossfade time between old and new input. Default to 0.05.
+
+        """
+        self._input = x
+        self._in_fader.setInput(x, fadetime)
+
+    def available(self):
+        """
+        Returns the number of samples, per stream, waiting to be read.
+
+        """
+        return min([obj.getAvailable() for obj in self._base_objs])
+
+    def read(self, size=None):
+        """
+        Moves the oldest captured samples out of the ring buffer.
+
+        Returns a numpy array of shape (number of streams, samples),
+        of dtype float32 (or float64 with pyo64). The array has zero
+        length on the second axis if nothing was captured since the
+        last call.
+
+        :Args:
+
+            size : int, optional
+                Maximum number of samples, per stream, to read. If None,
+                everything available is read. Defaults to None.
+
+        """
+        import numpy
+        if hasattr(__builtin__, 'pyo_use_double'):
+            dtype = numpy.float64
+        else:
+            dtype = numpy.float32
+        count = self.available()
+        if size is not None and size < count:
+            count = size
+        block = numpy.empty((len(self._base_objs), count), dtype=dtype)
+        [obj.readInto(block[i]) for i, obj in enumerate(self._base_objs)]
+        return block
+
+    def getOverruns(self, all=False):
+        """
+        Returns the number of buffers dropped because the ring was full.
+
+        :Args:
+
+            all : boolean, optional
+                If True, returns a list with the counter of every stream.
+                Otherwise, returns the highest counter. Defaults to False.
+
+        """
+        overruns = [obj.getOverruns() for obj in self._base_objs]
+        if all:
+            return overruns
+        else:
+            return max(overruns)
+
+    def getCapacity(self):
+        """
+        Returns the size, in samples, of the ring buffer.
+
+        """
+        return self._base_objs[0].getCapacity()
+
+    def reset(self):
+        """
+        Discards every pending sample and clears the overrun counters.
+
+        """
+        [obj.reset() for obj in self._base_objs]
+
+    def out(self, chnl=0, inc=1, dur=0, delay=0):
+        return self.play(dur, delay)
+
+    @property
+    def input(self):
+        """PyoObject. Input signal."""
+        return self._input
+    @input.setter
+    def input(self, x): self.setInput(x)
+
+    @property
+    def length(self):
+        """float. Minimum duration, in seconds, of the ring buffer."""
+        return self._length
+
 class Snap(PyoObject):
     """
     Snap input values on a user's defined midi scale.
@@ -669,6 +816,218 @@ class Denorm(PyoObject):
     @input.setter
     def input(self, x): self.setInput(x)
 
+######################################################################
+### Binary recording files
+######################################################################
+# Multi-stream container written by ControlRec and NoteinRec when 
+# `fileformat` is 1 or 2, and read back by ControlRead and NoteinRead.
+# Everything is little-endian.
+#
+#   header  : magic, number of columns (uint16), number of streams 
+#             (uint16), codec (uint8, 0 = raw, 1 = zlib), type of the 
+#             values ("f" for float32, "d" for float64), sampling rate
+#             (float64, 0 for notes).
+#   chunk   : "CHNK", stream (uint16), number of points (uint32), payload
+#             size (uint32), then the payload: the times as a float64 
+#             array followed by one array of values per other column,
+#             compressed as a whole with the codec.
+#   index   : "INDX", number of chunks (uint32), then, for each chunk, 
+#             its offset (uint64), stream (uint16), number of points
+#             (uint32), first and last time (float64).
+#   trailer : offset of the index (uint64), "PEND".
+#
+# Chunks are appended while recording. The index is written when the
+# recording ends; a file without index is read by scanning its chunks.
+_REC_MAGIC = "PYOREC\x00\x01"
+_REC_HEADER = "<8sHHBc2xd"
+_REC_CHUNK = "<4sH2xII"
+_REC_INDEX = "<4sI"
+_REC_ENTRY = "<QH2xIdd"
+_REC_TRAILER = "<Q4s"
+
+def _isRecFile(path):
+    if not os.path.isfile(path):
+        return False
+    f = open(path, "rb")
+    magic = f.read(len(_REC_MAGIC))
+    f.close()
+    return magic == _REC_MAGIC
+
+class _RecWriter:
+    """
+    Appends chunks of columns to a binary recording file.
+
+    """
+    def __init__(self, path, columns, streams, rate=0, compress=False):
+        self._codec = int(bool(compress))
+        # Values are stored with the precision of the audio engine.
+        if hasattr(__builtin__, 'pyo_use_double'):
+            self._typecode = "d"
+        else:
+            self._typecode = "f"
+        self._index = []
+        self._file = open(path, "wb")
+        self._file.write(struct.pack(_REC_HEADER, _REC_MAGIC, columns, streams, self._codec, self._typecode, rate))
+
+    def append(self, stream, columns):
+        npoints = len(columns[0])
+        if npoints == 0:
+            return
+        times = array.array("d", columns[0])
+        values = array.array(self._typecode)
+        for column in columns[1:]:
+            values.extend(column)
+        if sys.byteorder == "big":
+            times.byteswap()
+            values.byteswap()
+        payload = times.tostring() + values.tostring()
+        if self._codec == 1:
+            payload = zlib.compress(payload)
+        offset = self._file.tell()
+        self._file.write(struct.pack(_REC_CHUNK, "CHNK", stream, npoints, len(payload)))
+        self._file.write(payload)
+        self._file.flush()
+        self._index.append((offset, stream, npoints, columns[0][0], columns[0][-1]))
+
+    def close(self):
+        offset = self._file.tell()
+        self._file.write(struct.pack(_REC_INDEX, "INDX", len(self._index)))
+        for entry in self._index:
+            self._file.write(struct.pack(_REC_ENTRY, *entry))
+        self._file.write(struct.pack(_REC_TRAILER, offset, "PEND"))
+        self._file.close()
+
+class _RecReader:
+    """
+    Reads the streams of a binary recording file.
+
+    Only the chunks of the requested stream, and within the requested 
+    time range, are read and decoded.
+
+    """
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        magic, self.columns, self.streams, self._codec, self._typecode, self.rate = \
+            struct.unpack(_REC_HEADER, self._file.read(struct.calcsize(_REC_HEADER)))
+        self._index = self._readIndex()
+        if self._index is None:
+            self._index = self._scan()
+
+    def _readIndex(self):
+        size = struct.calcsize(_REC_TRAILER)
+        self._file.seek(0, 2)
+        if self._file.tell() < struct.calcsize(_REC_HEADER) + size:
+            return None
+        self._file.seek(-size, 2)
+        offset, tag = struct.unpack(_REC_TRAILER, self._file.read(size))
+        if tag != "PEND":
+            return None
+        self._file.seek(offset)
+        tag, count = struct.unpack(_REC_INDEX, self._file.read(struct.calcsize(_REC_INDEX)))
+        if tag != "INDX":
+            return None
+        size = struct.calcsize(_REC_ENTRY)
+        data = self._file.read(size * count)
+        return [struct.unpack(_REC_ENTRY, data[i*size:(i+1)*size]) for i in range(count)]
+
+    def _scan(self):
+        # Recording interrupted before the index was written.
+        index = []
+        size = struct.calcsize(_REC_CHUNK)
+        offset = struct.calcsize(_REC_HEADER)
+        while True:
+            self._file.seek(offset)
+            header = self._file.read(size)
+            if len(header) < size:
+                break
+            tag, stream, npoints, nbytes = struct.unpack(_REC_CHUNK, header)
+            if tag != "CHNK":
+                break
+            columns = self._decode(self._file.read(nbytes), npoints)
+            if columns is None:
+                break
+            index.append((offset, stream, npoints, columns[0][0], columns[0][-1]))
+            offset += size + nbytes
+        return index
+
+    def _decode(self, payload, npoints):
+        try:
+            if self._codec == 1:
+                payload = zlib.decompress(payload)
+            times = array.array("d")
+            times.fromstring(payload[:npoints*times.itemsize])
+            values = array.array(self._typecode)
+            values.fromstring(payload[npoints*times.itemsize:])
+        except (zlib.error, ValueError):
+            return None
+        if len(times) != npoints or len(values) != npoints * (self.columns - 1):
+            return None
+        if sys.byteorder == "big":
+            times.byteswap()
+            values.byteswap()
+        return [times.tolist()] + [values[i*npoints:(i+1)*npoints].tolist() for i in range(self.columns - 1)]
+
+    def read(self, stream, start=0, end=None):
+        """
+        Returns the columns of `stream` as lists, keeping the points
+        whose time is between `start` and `end` seconds.
+
+        """
+        columns = [[] for i in range(self.columns)]
+        size = struct.calcsize(_REC_CHUNK)
+        for offset, num, npoints, first, last in self._index:
+            if num != stream or last < start or (end is not None and first > end):
+                continue
+            self._file.seek(offset)
+            tag, num, npoints, nbytes = struct.unpack(_REC_CHUNK, self._file.read(size))
+            chunk = self._decode(self._file.read(nbytes), npoints)
+            if first < start or (end is not None and last > end):
+                keep = [i for i, t in enumerate(chunk[0]) if t >= start and (end is None or t <= end)]
+                chunk = [[column[i] for i in keep] for column in chunk]
+            for i in range(self.columns):
+                columns[i].extend(chunk[i])
+        return columns
+
+    def close(self):
+        self._file.close()
+
+class _RecStreamer(threading.Thread):
+    """
+    Moves the points recorded by ControlRec or NoteinRec base objects 
+    to a _RecWriter every `interval` seconds, out of the audio callback.
+
+    The file is completed when `finish` is called, or when every stream
+    has stopped by itself (ControlRec with a duration).
+
+    """
+    def __init__(self, objs, writer, interval=1.):
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self._objs = objs
+        self._writer = writer
+        self._interval = interval
+        self._done = threading.Event()
+
+    def run(self):
+        started = False
+        while not self._done.isSet():
+            self._done.wait(self._interval)
+            self._flush()
+            playing = True in [obj._getStream().isPlaying() for obj in self._objs]
+            if started and not playing:
+                break
+            started = started or playing
+        self._flush()
+        self._writer.close()
+
+    def _flush(self):
+        for i, obj in enumerate(self._objs):
+            self._writer.append(i, obj.popData())
+
+    def finish(self):
+        self._done.set()
+        self.join()
+
 class ControlRec(PyoObject):
     """
     Records control values and writes them in a text file.
@@ -705,13 +1064,20 @@ class ControlRec(PyoObject):
             
             If greater than 0.0, the `stop` method is automatically called 
             at the end of the recording.
+        fileformat : int, optional
+            Format of the recording. Defaults to 0.
+                0. one text file per stream, created by the `write` method.
+                1. one binary file, named `filename`, holding all streams.
+                   The values are written in the file during the recording.
+                2. same as 1, with compressed data.
 
     .. note::
 
         All parameters can only be set at intialization time.    
 
-        The write() method must be called on the object to write the files 
-        on the disk.
+        With fileformat 0, the write() method must be called on the object 
+        to write the files on the disk. With fileformat 1 or 2, the file 
+        is completed when the object is stopped or when write() is called.
 
         The out() method is bypassed. ControlRec's signal can not be sent to 
         audio outs.
@@ -735,25 +1101,51 @@ class ControlRec(PyoObject):
     >>> call = CallAfter(function=write_files, time=4.5)
 
     """
-    def __init__(self, input, filename, rate=1000, dur=0.0):
+    def __init__(self, input, filename, rate=1000, dur=0.0, fileformat=0):
         PyoObject.__init__(self)
         self._input = input
         self._filename = filename
         self._path, self._name = os.path.split(filename)
         self._rate = rate
         self._dur = dur
+        self._fileformat = fileformat
+        self._streamer = None
         self._in_fader = InputFader(input)
         in_fader, lmax = convertArgsToLists(self._in_fader)
         self._base_objs = [ControlRec_base(wrap(in_fader,i), rate, dur) for i in range(lmax)]
 
+    def play(self, dur=0, delay=0):
+        if self._fileformat > 0:
+            self._finish()
+            writer = _RecWriter(self._filename, 2, len(self._base_objs), self._rate, self._fileformat == 2)
+            self._streamer = _RecStreamer(self._base_objs, writer)
+            self._streamer.start()
+        return PyoObject.play(self, dur, delay)
+
+    def stop(self):
+        PyoObject.stop(self)
+        self._finish()
+        return self
+
     def out(self, chnl=0, inc=1, dur=0, delay=0):
         return self.play(dur, delay)
 
+    def _finish(self):
+        if self._streamer is not None:
+            self._streamer.finish()
+            self._streamer = None
+
     def write(self):
         """
         Writes recorded values in text files on the disk.
+
+        With fileformat 1 or 2, stops the recording and completes
+        the binary file.
         
         """
+        if self._fileformat > 0:
+            self.stop()
+            return
         for i, obj in enumerate(self._base_objs):
             f = open(os.path.join(self._path, "%s_%03d" % (self._name, i)), "w")
             [f.write("%f %f\n" % p) for p in obj.getData()]
@@ -775,7 +1167,9 @@ class ControlRead(PyoObject):
             Usually the same filename as the one given to a ControlRec 
             object to record automation. 
             
-            The directory will be scaned and all files
+            If `filename` is a binary file written by ControlRec (fileformat
+            1 or 2), each of its streams adds a new stream in the object. 
+            Otherwise, the directory will be scaned and all files
             named "filename_xxx" will add a new stream in the object.
         rate : int, optional
             Rate at which the values are sampled. Defaults to 1000.
@@ -822,15 +1216,22 @@ class ControlRead(PyoObject):
         self._rate = rate
         self._loop = loop
         self._interp = interp
-        files = sorted([f for f in os.listdir(self._path) if self._name+"_" in f])
         mul, add, lmax = convertArgsToLists(mul, add)
         self._base_objs = []
-        for i in range(len(files)):
-            path = os.path.join(self._path, files[i])
-            f = open(path, "r")
-            values = [float(l.split()[1]) for l in f.readlines()]
-            f.close()
-            self._base_objs.append(ControlRead_base(values, rate, loop, interp, wrap(mul,i), wrap(add,i)))
+        if _isRecFile(filename):
+            reader = _RecReader(filename)
+            for i in range(reader.streams):
+                values = reader.read(i)[1]
+                self._base_objs.append(ControlRead_base(values, rate, loop, interp, wrap(mul,i), wrap(add,i)))
+            reader.close()
+        else:
+            files = sorted([f for f in os.listdir(self._path) if self._name+"_" in f])
+            for i in range(len(files)):
+                path = os.path.join(self._path, files[i])
+                f = open(path, "r")
+                values = [float(l.split()[1]) for l in f.readlines()]
+                f.close()
+                self._base_objs.append(ControlRead_base(values, rate, loop, interp, wrap(mul,i), wrap(add,i)))
         self._trig_objs = Dummy([TriggerDummy_base(obj) for obj in self._base_objs])
 
     def out(self, chnl=0, inc=1, dur=0, delay=0):
@@ -927,13 +1328,20 @@ class NoteinRec(PyoObject):
             
             The same filename can be passed to a NoteinRead object to read 
             all related files.
+        fileformat : int, optional
+            Format of the recording. Defaults to 0.
+                0. one text file per stream, created by the `write` method.
+                1. one binary file, named `filename`, holding all streams.
+                   The notes are written in the file during the recording.
+                2. same as 1, with compressed data.
 
     .. note::
 
         All parameters can only be set at intialization time.    
 
-        The `write` method must be called on the object to write the files 
-        on the disk.
+        With fileformat 0, the `write` method must be called on the object 
+        to write the files on the disk. With fileformat 1 or 2, the file 
+        is completed when the object is stopped or when `write` is called.
 
         The out() method is bypassed. NoteinRec's signal can not be sent to 
         audio outs.
@@ -952,24 +1360,50 @@ class NoteinRec(PyoObject):
     >>> # call rec.write() to save "test_000" and "test_001" in the home directory.
 
     """
-    def __init__(self, input, filename):
+    def __init__(self, input, filename, fileformat=0):
         PyoObject.__init__(self)
         self._input = input
         self._filename = filename
         self._path, self._name = os.path.split(filename)
+        self._fileformat = fileformat
+        self._streamer = None
         self._in_pitch = self._input["pitch"]
         self.in_velocity = self._input["velocity"]
         in_pitch, in_velocity, lmax = convertArgsToLists(self._in_pitch, self.in_velocity)
         self._base_objs = [NoteinRec_base(wrap(in_pitch,i), wrap(in_velocity,i)) for i in range(lmax)]
 
+    def play(self, dur=0, delay=0):
+        if self._fileformat > 0:
+            self._finish()
+            writer = _RecWriter(self._filename, 3, len(self._base_objs), 0, self._fileformat == 2)
+            self._streamer = _RecStreamer(self._base_objs, writer)
+            self._streamer.start()
+        return PyoObject.play(self, dur, delay)
+
+    def stop(self):
+        PyoObject.stop(self)
+        self._finish()
+        return self
+
     def out(self, chnl=0, inc=1, dur=0, delay=0):
         return self.play(dur, delay)
 
+    def _finish(self):
+        if self._streamer is not None:
+            self._streamer.finish()
+            self._streamer = None
+
     def write(self):
         """
         Writes recorded values in text files on the disk.
 
+        With fileformat 1 or 2, stops the recording and completes
+        the binary file.
+
         """
+        if self._fileformat > 0:
+            self.stop()
+            return
         for i, obj in enumerate(self._base_objs):
             f = open(os.path.join(self._path, "%s_%03d" % (self._name, i)), "w")
             [f.write("%f %f %f\n" % p) for p in obj.getData()]
@@ -989,7 +1423,9 @@ class NoteinRead(PyoObject):
             Usually the same filename as the one given to a NoteinRec 
             object to record automation. 
             
-            The directory will be scaned and all files
+            If `filename` is a binary file written by NoteinRec (fileformat
+            1 or 2), each of its streams adds a new voice in the object.
+            Otherwise, the directory will be scaned and all files
             named "filename_xxx" will add a new stream in the object.
         loop : boolean, optional
             Looping mode, False means off, True means on. 
@@ -1028,19 +1464,24 @@ class NoteinRead(PyoObject):
         self._filename = filename
         self._path, self._name = os.path.split(filename)
         self._loop = loop
-        files = sorted([f for f in os.listdir(self._path) if self._name+"_" in f])
         mul, add, lmax = convertArgsToLists(mul, add)
         self._base_objs = []
         _trig_objs_tmp = []
-        self._poly = len(files)
+        if _isRecFile(filename):
+            reader = _RecReader(filename)
+            voices = [reader.read(i) for i in range(reader.streams)]
+            reader.close()
+        else:
+            voices = []
+            files = sorted([f for f in os.listdir(self._path) if self._name+"_" in f])
+            for file in files:
+                f = open(os.path.join(self._path, file), "r")
+                vals = [l.split() for l in f.readlines()]
+                f.close()
+                voices.append([[float(v[j]) for v in vals] for j in range(3)])
+        self._poly = len(voices)
         for i in range(self._poly):
-            path = os.path.join(self._path, files[i])
-            f = open(path, "r")
-            vals = [l.split() for l in f.readlines()]
-            timestamps = [float(v[0]) for v in vals]
-            pitches = [float(v[1]) for v in vals]
-            amps = [float(v[2]) for v in vals]
-            f.close()
+            timestamps, pitches, amps = voices[i]
             self._base_objs.append(NoteinRead_base(pitches, timestamps, loop))
             self._base_objs.append(NoteinRead_base(amps, timestamps, loop, wrap(mul,i), wrap(add,i)))
             _trig_objs_tmp.append(TriggerDummy_base(self._base_objs[-1]))
@@ -21,6 +21,10 @@
 #include "fft.h"
 #include "pyomodule.h"
 #include <math.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <pthread.h>
 
 void fft_compute_split_twiddle(MYFLT **twiddle, int size) {
     /* pre-compute split-radix twiddle factors in 2d array of length [4][size>>3] */
@@ -563,3 +567,935 @@ void irealfft_packed(MYFLT *data, MYFLT *outdata, int size, MYFLT *twiddle) {
 	    outdata[i] = data[i] * 2;
 }
 
+
+/* *****************************************************
+** Shared twiddle factors
+**
+** Twiddle tables depend only on the FFT size, so the
+** objects of the same size share them. Tables no longer
+** used are kept for the next object asking for them, there
+** is one at most per size and kind. Used with the GIL held.
+******************************************************* */
+
+enum { FFT_PLAN_SPLIT = 0, FFT_PLAN_RADIX2, FFT_PLAN_REAL };
+
+typedef struct {
+    int kind;
+    int size;
+    int refcount;
+    void *table;
+} FFTPlan;
+
+static FFTPlan *fft_plans = NULL;
+static int fft_plans_len = 0;
+static long fft_plan_hits = 0;
+static long fft_plan_misses = 0;
+
+static FFTPlan *
+fft_find_plan(int kind, int size) {
+    int i;
+
+    for (i=0; i<fft_plans_len; i++) {
+        if (fft_plans[i].kind == kind && fft_plans[i].size == size) {
+            fft_plans[i].refcount++;
+            fft_plan_hits++;
+            return &fft_plans[i];
+        }
+    }
+    fft_plan_misses++;
+    return NULL;
+}
+
+static void
+fft_add_plan(int kind, int size, void *table) {
+    fft_plans = (FFTPlan *)realloc(fft_plans, (fft_plans_len + 1) * sizeof(FFTPlan));
+    fft_plans[fft_plans_len].kind = kind;
+    fft_plans[fft_plans_len].size = size;
+    fft_plans[fft_plans_len].refcount = 1;
+    fft_plans[fft_plans_len].table = table;
+    fft_plans_len++;
+}
+
+static void
+fft_release_plan(void *table) {
+    int i;
+
+    if (table == NULL)
+        return;
+    for (i=0; i<fft_plans_len; i++) {
+        if (fft_plans[i].table == table) {
+            fft_plans[i].refcount--;
+            return;
+        }
+    }
+}
+
+MYFLT ** fft_acquire_split_twiddle(int size) {
+    int i;
+    MYFLT **twiddle;
+    FFTPlan *plan = fft_find_plan(FFT_PLAN_SPLIT, size);
+
+    if (plan != NULL)
+        return (MYFLT **)plan->table;
+    twiddle = (MYFLT **)malloc(4 * sizeof(MYFLT *));
+    for (i=0; i<4; i++)
+        twiddle[i] = (MYFLT *)malloc((size >> 3) * sizeof(MYFLT));
+    fft_compute_split_twiddle(twiddle, size);
+    fft_add_plan(FFT_PLAN_SPLIT, size, twiddle);
+    return twiddle;
+}
+
+void fft_release_split_twiddle(MYFLT **twiddle) {
+    fft_release_plan(twiddle);
+}
+
+MYFLT * fft_acquire_radix2_twiddle(int size) {
+    MYFLT *twiddle;
+    FFTPlan *plan = fft_find_plan(FFT_PLAN_RADIX2, size);
+
+    if (plan != NULL)
+        return (MYFLT *)plan->table;
+    twiddle = (MYFLT *)malloc(size * sizeof(MYFLT));
+    fft_compute_radix2_twiddle(twiddle, size);
+    fft_add_plan(FFT_PLAN_RADIX2, size, twiddle);
+    return twiddle;
+}
+
+void fft_release_radix2_twiddle(MYFLT *twiddle) {
+    fft_release_plan(twiddle);
+}
+
+RealFFTPlan * fft_acquire_real_plan(int size) {
+    int i, j, k, h, bits, m = size / 2;
+    RealFFTPlan *plan;
+    FFTPlan *entry = fft_find_plan(FFT_PLAN_REAL, size);
+
+    if (entry != NULL)
+        return (RealFFTPlan *)entry->table;
+    plan = (RealFFTPlan *)malloc(sizeof(RealFFTPlan));
+    plan->size = size;
+    plan->bitrev = (int *)malloc(m * sizeof(int));
+    for (bits=0; (1 << bits) < m; bits++);
+    for (i=0; i<m; i++) {
+        for (j=0, k=0; k<bits; k++) {
+            if ((i >> k) & 1)
+                j |= 1 << (bits - 1 - k);
+        }
+        plan->bitrev[i] = j;
+    }
+    /* the stage of span 2h uses the h twiddles starting at index h-1 */
+    plan->twiddle_re = (MYFLT *)malloc(m * sizeof(MYFLT));
+    plan->twiddle_im = (MYFLT *)malloc(m * sizeof(MYFLT));
+    for (h=1; h<m; h*=2) {
+        for (k=0; k<h; k++) {
+            plan->twiddle_re[h-1+k] = MYCOS(PI * k / h);
+            plan->twiddle_im[h-1+k] = -MYSIN(PI * k / h);
+        }
+    }
+    plan->realize_re = (MYFLT *)malloc((m / 2 + 1) * sizeof(MYFLT));
+    plan->realize_im = (MYFLT *)malloc((m / 2 + 1) * sizeof(MYFLT));
+    for (k=0; k<=m/2; k++) {
+        plan->realize_re[k] = MYCOS(TWOPI * k / size);
+        plan->realize_im[k] = -MYSIN(TWOPI * k / size);
+    }
+    fft_add_plan(FFT_PLAN_REAL, size, plan);
+    return plan;
+}
+
+void fft_release_real_plan(RealFFTPlan *plan) {
+    fft_release_plan(plan);
+}
+
+/* stats: number of tables, tables in use, hits and misses. */
+void fft_cache_stats(long *stats, int reset) {
+    int i;
+
+    stats[0] = fft_plans_len;
+    stats[1] = 0;
+    for (i=0; i<fft_plans_len; i++) {
+        if (fft_plans[i].refcount > 0)
+            stats[1]++;
+    }
+    stats[2] = fft_plan_hits;
+    stats[3] = fft_plan_misses;
+    if (reset)
+        fft_plan_hits = fft_plan_misses = 0;
+}
+
+/* *****************************************************
+** Real FFT by the packing method, with batched butterflies
+**
+** The n real samples are seen as n/2 complex ones, whose
+** FFT is computed on separate real and imaginary arrays,
+** then split into the spectrum of the real signal. Each
+** stage runs its butterflies over contiguous blocks with
+** precomputed twiddles, loops that compilers vectorize.
+**
+** Input, output, scaling and sign are the ones of
+** realfft_split/irealfft_split, so both can be swapped:
+** re(0),re(1),...,re(n/2),im(n/2-1),...,im(1)
+****************************************************** */
+
+/* in-place complex FFT of m points, in bit-reversed order */
+static void
+fft_batched_butterflies(MYFLT *re, MYFLT *im, int m, RealFFTPlan *plan, MYFLT sign) {
+    int h, j, k;
+    MYFLT tr, ti, wr, wi;
+    MYFLT *r0, *i0, *r1, *i1, *twr, *twi;
+
+    for (k=0; k<m; k+=2) {
+        tr = re[k+1];
+        ti = im[k+1];
+        re[k+1] = re[k] - tr;
+        im[k+1] = im[k] - ti;
+        re[k] += tr;
+        im[k] += ti;
+    }
+    for (h=2; h<m; h*=2) {
+        twr = plan->twiddle_re + h - 1;
+        twi = plan->twiddle_im + h - 1;
+        for (j=0; j<m; j+=2*h) {
+            r0 = re + j;
+            i0 = im + j;
+            r1 = r0 + h;
+            i1 = i0 + h;
+            for (k=0; k<h; k++) {
+                wr = twr[k];
+                wi = twi[k] * sign;
+                tr = r1[k] * wr - i1[k] * wi;
+                ti = r1[k] * wi + i1[k] * wr;
+                r1[k] = r0[k] - tr;
+                i1[k] = i0[k] - ti;
+                r0[k] += tr;
+                i0[k] += ti;
+            }
+        }
+    }
+}
+
+void realfft_batched(MYFLT *data, MYFLT *outdata, RealFFTPlan *plan) {
+    int j, k, q, n = plan->size, m = n / 2;
+    MYFLT er, ei, or, oi, wr, wi, scl = 1.0 / n;
+    MYFLT *re = outdata, *im = outdata + m;
+
+    for (k=0; k<m; k++) {
+        j = plan->bitrev[k];
+        re[k] = data[2*j];
+        im[k] = data[2*j+1];
+    }
+    fft_batched_butterflies(re, im, m, plan, 1.0);
+
+    /* X[k] = E[k] + W^k O[k] and X[m-k] = conj(E[k]) - conj(W^k O[k]) */
+    data[0] = (re[0] + im[0]) * scl;
+    data[m] = (re[0] - im[0]) * scl;
+    for (k=1; k<=m/2; k++) {
+        q = m - k;
+        er = (re[k] + re[q]) * 0.5;
+        ei = (im[k] - im[q]) * 0.5;
+        or = (im[k] + im[q]) * 0.5;
+        oi = (re[q] - re[k]) * 0.5;
+        wr = plan->realize_re[k];
+        wi = plan->realize_im[k];
+        data[k] = (er + wr * or - wi * oi) * scl;
+        data[n-k] = (ei + wr * oi + wi * or) * scl;
+        if (q != k) {
+            data[q] = (er - wr * or + wi * oi) * scl;
+            data[n-q] = (-ei + wr * oi + wi * or) * scl;
+        }
+    }
+    for (k=0; k<n; k++)
+        outdata[k] = data[k];
+}
+
+void irealfft_batched(MYFLT *data, MYFLT *outdata, RealFFTPlan *plan) {
+    int k, q, n = plan->size, m = n / 2;
+    MYFLT xr, xi, yr, yi, er, ei, dr, di, or, oi, wr, wi;
+    MYFLT *zre = outdata, *zim = outdata + m, *re = data, *im = data + m;
+
+    /* Z[k] = E[k] + i O[k], E[k] = (X[k] + conj(X[m-k])) / 2, O[k] = (X[k] - conj(X[m-k])) / (2 W^k) */
+    zre[0] = (data[0] + data[m]) * 0.5;
+    zim[0] = (data[0] - data[m]) * 0.5;
+    for (k=1; k<=m/2; k++) {
+        q = m - k;
+        xr = data[k];
+        xi = data[n-k];
+        yr = data[q];
+        yi = data[n-q];
+        wr = plan->realize_re[k];
+        wi = -plan->realize_im[k];
+        er = (xr + yr) * 0.5;
+        ei = (xi - yi) * 0.5;
+        dr = (xr - yr) * 0.5;
+        di = (xi + yi) * 0.5;
+        or = dr * wr - di * wi;
+        oi = dr * wi + di * wr;
+        zre[k] = er - oi;
+        zim[k] = ei + or;
+        /* E[m-k] = conj(E[k]) and O[m-k] = conj(O[k]) */
+        if (q != k) {
+            zre[q] = er + oi;
+            zim[q] = or - ei;
+        }
+    }
+
+    for (k=0; k<m; k++) {
+        re[k] = zre[plan->bitrev[k]];
+        im[k] = zim[plan->bitrev[k]];
+    }
+    fft_batched_butterflies(re, im, m, plan, -1.0);
+    for (k=0; k<m; k++) {
+        outdata[2*k] = re[k] * 2;
+        outdata[2*k+1] = im[k] * 2;
+    }
+}
+
+/* *****************************************************
+** Partitioned convolution
+**
+** An impulse response is cut in partitions whose spectra
+** are computed once (IRSpectra). A ConvStage is a uniformly
+** partitioned overlap-save convolver: it takes `size` input
+** samples and gives `size` output samples.
+**
+** PartConv combines a head stage, computed in the audio
+** callback, with an optional tail stage using partitions of
+** `tsize` samples, computed by a pool of threads shared by
+** all convolvers. The head covers the first 2 * tsize
+** samples of the impulse response, so a tail block has a
+** full block period to be computed before its output is
+** needed. The audio thread only waits for the tail thread
+** when it is late.
+******************************************************* */
+
+IRSpectra *
+IRSpectra_new(MYFLT *impulse, int len, int size, int first, int num) {
+    int i, j, pos, size2;
+    MYFLT *inframe, *outframe, *real, *imag;
+    MYFLT **twiddle;
+    IRSpectra *ir;
+
+    size2 = size * 2;
+    ir = (IRSpectra *)malloc(sizeof(IRSpectra));
+    ir->size = size;
+    ir->num = num;
+    ir->real = (MYFLT *)malloc(num * size * sizeof(MYFLT));
+    ir->imag = (MYFLT *)malloc(num * size * sizeof(MYFLT));
+    inframe = (MYFLT *)malloc(size2 * sizeof(MYFLT));
+    outframe = (MYFLT *)malloc(size2 * sizeof(MYFLT));
+    twiddle = fft_acquire_split_twiddle(size2);
+
+    for (j=0; j<num; j++) {
+        pos = (first + j) * size;
+        for (i=0; i<size; i++) {
+            inframe[i] = (pos + i) < len ? impulse[pos+i] : 0.0;
+        }
+        for (i=size; i<size2; i++) {
+            inframe[i] = 0.0;
+        }
+        realfft_split(inframe, outframe, size2, twiddle);
+        real = ir->real + j * size;
+        imag = ir->imag + j * size;
+        real[0] = outframe[0];
+        imag[0] = 0.0;
+        for (i=1; i<size; i++) {
+            real[i] = outframe[i];
+            imag[i] = outframe[size2 - i];
+        }
+    }
+
+    fft_release_split_twiddle(twiddle);
+    free(inframe);
+    free(outframe);
+    return ir;
+}
+
+void
+IRSpectra_free(IRSpectra *ir) {
+    if (ir == NULL)
+        return;
+    free(ir->real);
+    free(ir->imag);
+    free(ir);
+}
+
+static void
+ConvStage_init(ConvStage *st, IRSpectra *ir, int num) {
+
+    st->size = ir->size;
+    st->size2 = st->size * 2;
+    st->num = num;
+    st->current = 0;
+    st->ir_real = ir->real;
+    st->ir_imag = ir->imag;
+    st->inframe = (MYFLT *)calloc(st->size2, sizeof(MYFLT));
+    st->outframe = (MYFLT *)calloc(st->size2, sizeof(MYFLT));
+    st->last_half_frame = (MYFLT *)calloc(st->size, sizeof(MYFLT));
+    st->real = (MYFLT *)calloc(st->size, sizeof(MYFLT));
+    st->imag = (MYFLT *)calloc(st->size, sizeof(MYFLT));
+    st->accum_real = (MYFLT *)calloc(num * st->size, sizeof(MYFLT));
+    st->accum_imag = (MYFLT *)calloc(num * st->size, sizeof(MYFLT));
+    st->twiddle = fft_acquire_split_twiddle(st->size2);
+}
+
+static void
+ConvStage_free(ConvStage *st) {
+    if (st->num == 0)
+        return;
+    fft_release_split_twiddle(st->twiddle);
+    free(st->inframe);
+    free(st->outframe);
+    free(st->last_half_frame);
+    free(st->real);
+    free(st->imag);
+    free(st->accum_real);
+    free(st->accum_imag);
+    st->num = 0;
+}
+
+/* Convolves `size` samples of `in`, the result goes in `out`. */
+static void
+ConvStage_process(ConvStage *st, MYFLT *in, MYFLT *out) {
+    int i, j, k, size = st->size, size2 = st->size2;
+    MYFLT *ac_real, *ac_imag, *ir_real, *ir_imag;
+
+    k = st->current - 1;
+    if (k < 0)
+        k += st->num;
+    ac_real = st->accum_real + k * size;
+    ac_imag = st->accum_imag + k * size;
+    for (i=0; i<size; i++) {
+        ac_real[i] = ac_imag[i] = 0.0;
+        st->inframe[i] = st->last_half_frame[i];
+        st->inframe[i+size] = st->last_half_frame[i] = in[i];
+    }
+    realfft_split(st->inframe, st->outframe, size2, st->twiddle);
+    st->real[0] = st->outframe[0];
+    st->imag[0] = 0.0;
+    for (i=1; i<size; i++) {
+        st->real[i] = st->outframe[i];
+        st->imag[i] = st->outframe[size2 - i];
+    }
+    for (j=0; j<st->num; j++) {
+        k = st->current + j;
+        if (k >= st->num)
+            k -= st->num;
+        ac_real = st->accum_real + k * size;
+        ac_imag = st->accum_imag + k * size;
+        ir_real = st->ir_real + j * size;
+        ir_imag = st->ir_imag + j * size;
+        for (i=0; i<size; i++) {
+            ac_real[i] += st->real[i] * ir_real[i] - st->imag[i] * ir_imag[i];
+            ac_imag[i] += st->real[i] * ir_imag[i] + st->imag[i] * ir_real[i];
+        }
+    }
+    ac_real = st->accum_real + st->current * size;
+    ac_imag = st->accum_imag + st->current * size;
+    st->inframe[0] = ac_real[0];
+    st->inframe[size] = 0.0;
+    for (i=1; i<size; i++) {
+        st->inframe[i] = ac_real[i];
+        st->inframe[size2 - i] = ac_imag[i];
+    }
+    irealfft_split(st->inframe, st->outframe, size2, st->twiddle);
+    for (i=0; i<size; i++) {
+        out[i] = st->outframe[i+size];
+    }
+
+    st->current++;
+    if (st->current == st->num)
+        st->current = 0;
+}
+
+static pthread_mutex_t conv_mutex = PTHREAD_MUTEX_INITIALIZER;
+static pthread_cond_t conv_work_cond = PTHREAD_COND_INITIALIZER;
+static pthread_cond_t conv_idle_cond = PTHREAD_COND_INITIALIZER;
+static PartConv **conv_queue = NULL;
+static int conv_queue_len = 0;
+static int conv_users = 0; /* convolvers with a tail, the queue never holds more */
+static int conv_threads = 2; /* size of the thread pool */
+static int conv_running = 0;
+
+static void
+PartConv_processTail(PartConv *pc) {
+    ConvStage_process(&pc->tail, pc->tail_job, pc->tail_out + pc->tail_half * pc->tsize);
+}
+
+static void *
+PartConv_worker(void *arg) {
+    PartConv *pc;
+
+    pthread_mutex_lock(&conv_mutex);
+    while (conv_running <= conv_threads) {
+        if (conv_queue_len == 0) {
+            pthread_cond_wait(&conv_work_cond, &conv_mutex);
+            continue;
+        }
+        pc = conv_queue[0];
+        memmove(&conv_queue[0], &conv_queue[1], (conv_queue_len - 1) * sizeof(PartConv *));
+        conv_queue_len--;
+        pc->queued = 0;
+        pc->active = 1;
+        pthread_mutex_unlock(&conv_mutex);
+        PartConv_processTail(pc);
+        pthread_mutex_lock(&conv_mutex);
+        pc->active = 0;
+        pthread_cond_broadcast(&conv_idle_cond);
+    }
+    conv_running--;
+    pthread_mutex_unlock(&conv_mutex);
+    return NULL;
+}
+
+/* Must be called with conv_mutex held. */
+static void
+PartConv_startThreads(void) {
+    pthread_t thread;
+
+    while (conv_running < conv_threads) {
+        if (pthread_create(&thread, NULL, PartConv_worker, NULL) != 0) {
+            printf("Failed to start a convolution thread.\n");
+            break;
+        }
+        pthread_detach(thread);
+        conv_running++;
+    }
+}
+
+void
+PartConv_setThreads(int num) {
+    pthread_mutex_lock(&conv_mutex);
+    conv_threads = num < 1 ? 1 : num;
+    if (conv_users > 0)
+        PartConv_startThreads();
+    /* Extra threads exit as soon as they are idle. */
+    pthread_cond_broadcast(&conv_work_cond);
+    pthread_mutex_unlock(&conv_mutex);
+}
+
+int
+PartConv_getThreads(void) {
+    return conv_threads;
+}
+
+/* `head` holds the first partitions of `hsize` samples of the impulse 
+   response, at least 2 * tsize samples if there is a tail. `tail`, if not 
+   NULL, holds the partitions of `tsize` samples starting 2 * tsize samples 
+   into the impulse response. `len` is the length of the impulse response. */
+PartConv *
+PartConv_new(IRSpectra *head, IRSpectra *tail, int len) {
+    int hnum, tnum;
+    PartConv *pc = (PartConv *)calloc(1, sizeof(PartConv));
+
+    pc->hsize = head->size;
+    hnum = (len + pc->hsize - 1) / pc->hsize;
+    if (hnum < 1)
+        hnum = 1;
+    tnum = 0;
+    if (tail != NULL) {
+        pc->tsize = tail->size;
+        hnum = 2 * pc->tsize / pc->hsize;
+        tnum = tail->num;
+    }
+    if (hnum > head->num)
+        hnum = head->num;
+    ConvStage_init(&pc->head, head, hnum);
+    pc->input_buffer = (MYFLT *)calloc(pc->hsize, sizeof(MYFLT));
+    pc->output_buffer = (MYFLT *)calloc(pc->hsize, sizeof(MYFLT));
+
+    if (tnum > 0) {
+        ConvStage_init(&pc->tail, tail, tnum);
+        pc->tail_in = (MYFLT *)calloc(pc->tsize, sizeof(MYFLT));
+        pc->tail_job = (MYFLT *)calloc(pc->tsize, sizeof(MYFLT));
+        pc->tail_out = (MYFLT *)calloc(2 * pc->tsize, sizeof(MYFLT));
+        pc->tail_wait = 2 * pc->tsize / pc->hsize;
+        pc->tail_half = 1; /* the first block goes in the first half */
+        pthread_mutex_lock(&conv_mutex);
+        conv_users++;
+        conv_queue = (PartConv **)realloc(conv_queue, conv_users * sizeof(PartConv *));
+        PartConv_startThreads();
+        pthread_mutex_unlock(&conv_mutex);
+    }
+    return pc;
+}
+
+/* Removes the convolver from the queue and waits for the thread 
+   computing its tail, if any. Never called from the audio thread. */
+void
+PartConv_free(PartConv *pc) {
+    int i;
+
+    if (pc == NULL)
+        return;
+    if (pc->tail.num > 0) {
+        pthread_mutex_lock(&conv_mutex);
+        for (i=0; i<conv_queue_len; i++) {
+            if (conv_queue[i] == pc) {
+                memmove(&conv_queue[i], &conv_queue[i+1], (conv_queue_len - i - 1) * sizeof(PartConv *));
+                conv_queue_len--;
+                break;
+            }
+        }
+        while (pc->active)
+            pthread_cond_wait(&conv_idle_cond, &conv_mutex);
+        conv_users--;
+        pthread_mutex_unlock(&conv_mutex);
+        ConvStage_free(&pc->tail);
+        free(pc->tail_in);
+        free(pc->tail_job);
+        free(pc->tail_out);
+    }
+    ConvStage_free(&pc->head);
+    free(pc->input_buffer);
+    free(pc->output_buffer);
+    free(pc);
+}
+
+/* Called each time the head has a full block of input. */
+static void
+PartConv_block(PartConv *pc) {
+    int i;
+    MYFLT gain, *tmp, *tail_out;
+
+    ConvStage_process(&pc->head, pc->input_buffer, pc->output_buffer);
+    if (pc->tail.num == 0)
+        return;
+
+    /* The tail output starts 2 * tsize samples after the first input. */
+    if (pc->tail_wait > 0)
+        pc->tail_wait--;
+    else {
+        /* The transforms scale the output by 1 / (2 * size). */
+        gain = (MYFLT)pc->tsize / pc->hsize;
+        tail_out = pc->tail_out + pc->tail_read;
+        for (i=0; i<pc->hsize; i++)
+            pc->output_buffer[i] += tail_out[i] * gain;
+    }
+    pc->tail_read += pc->hsize;
+    if (pc->tail_read == 2 * pc->tsize)
+        pc->tail_read = 0;
+
+    memcpy(pc->tail_in + pc->tail_incount, pc->input_buffer, pc->hsize * sizeof(MYFLT));
+    pc->tail_incount += pc->hsize;
+    if (pc->tail_incount == pc->tsize) {
+        pc->tail_incount = 0;
+        pthread_mutex_lock(&conv_mutex);
+        /* The previous block must be done before its output is read. */
+        while (pc->queued || pc->active)
+            pthread_cond_wait(&conv_idle_cond, &conv_mutex);
+        tmp = pc->tail_job;
+        pc->tail_job = pc->tail_in;
+        pc->tail_in = tmp;
+        pc->tail_half = 1 - pc->tail_half;
+        pc->queued = 1;
+        conv_queue[conv_queue_len++] = pc;
+        pthread_cond_signal(&conv_work_cond);
+        pthread_mutex_unlock(&conv_mutex);
+    }
+}
+
+/* Convolves `num` samples of `in`. The output is delayed by `hsize` samples 
+   and, as the one of a single stage, scaled by 1 / (2 * hsize). */
+void
+PartConv_process(PartConv *pc, MYFLT *in, MYFLT *out, int num) {
+    int i;
+
+    for (i=0; i<num; i++) {
+        pc->input_buffer[pc->incount] = in[i];
+        out[i] = pc->output_buffer[pc->incount];
+        pc->incount++;
+        if (pc->incount == pc->hsize) {
+            pc->incount = 0;
+            PartConv_block(pc);
+        }
+    }
+}
+
+/* Additive synthesis of sine partials. With few partials, quadrature 
+   oscillators are rotated by blocks of partials stored as arrays. With many 
+   partials, each one adds the main lobe of the window spectrum to a frame 
+   which is inverse transformed and overlap-added (FFT-1 synthesis, Rodet 
+   and Depalle, 1992). */
+#define PARTIAL_BLOCK 32
+#define PARTIAL_GROUP 128
+#define PARTIAL_LOBES_MAX 4
+
+static PartialLobe partial_lobes[PARTIAL_LOBES_MAX];
+static int partial_lobes_len = 0;
+
+/* Periodic Blackman-Harris 4-term window centered on 0, `m` in [-size/2, size/2). */
+static MYFLT
+partial_window(int m, int size) {
+    MYFLT arg = TWOPI * m / size;
+    return 0.35875 + 0.48829*MYCOS(arg) + 0.14128*MYCOS(2*arg) + 0.01168*MYCOS(3*arg);
+}
+
+static PartialLobe *
+partial_get_lobe(int size) {
+    int i, m, hop = size / 4;
+    MYFLT x, sum;
+    PartialLobe *pl;
+
+    for (i=0; i<partial_lobes_len; i++) {
+        if (partial_lobes[i].size == size)
+            return &partial_lobes[i];
+    }
+    if (partial_lobes_len == PARTIAL_LOBES_MAX)
+        return NULL;
+    pl = &partial_lobes[partial_lobes_len++];
+    pl->size = size;
+    /* spectrum of the window, scaled for the inverse transform */
+    pl->lobe = (MYFLT *)malloc((PARTIAL_LOBE_WIDTH * PARTIAL_LOBE_RES + 2) * sizeof(MYFLT));
+    for (i=0; i<(PARTIAL_LOBE_WIDTH * PARTIAL_LOBE_RES + 2); i++) {
+        x = TWOPI * i / PARTIAL_LOBE_RES / size;
+        sum = 0.0;
+        for (m=-size/2; m<size/2; m++)
+            sum += partial_window(m, size) * MYCOS(x * m);
+        pl->lobe[i] = sum * 0.5 / size;
+    }
+    /* triangle over the central half of the frame, divided by the window */
+    pl->weights = (MYFLT *)malloc(2 * hop * sizeof(MYFLT));
+    for (i=0; i<(2*hop); i++) {
+        m = i - hop;
+        pl->weights[i] = (1.0 - MYFABS((MYFLT)m) / hop) / partial_window(m, size);
+    }
+    return pl;
+}
+
+PartialSynth *
+PartialSynth_new(int num, int mode, MYFLT sr) {
+    int i;
+    PartialSynth *ps = (PartialSynth *)malloc(sizeof(PartialSynth));
+
+    if (num < 1)
+        num = 1;
+    ps->num = num;
+    ps->sr = sr;
+    ps->fresh = 1;
+    ps->freq = (MYFLT *)calloc(num, sizeof(MYFLT));
+    ps->amp = (MYFLT *)calloc(num, sizeof(MYFLT));
+    ps->cur_freq = (MYFLT *)calloc(num, sizeof(MYFLT));
+    ps->cur_amp = (MYFLT *)calloc(num, sizeof(MYFLT));
+    ps->inc_amp = (MYFLT *)calloc(num, sizeof(MYFLT));
+    ps->re = (MYFLT *)malloc(num * sizeof(MYFLT));
+    ps->im = (MYFLT *)calloc(num, sizeof(MYFLT));
+    for (i=0; i<num; i++)
+        ps->re[i] = 1.0;
+
+    /* frames of 512 samples up to 48 kHz, scaled with higher rates */
+    ps->size = 512;
+    while ((ps->size * 48000.0) < (sr * 512))
+        ps->size *= 2;
+    ps->hopsize = ps->size / 4;
+    ps->count = ps->hopsize;
+    ps->phase = (MYFLT *)calloc(num, sizeof(MYFLT));
+    ps->last_freq = (MYFLT *)calloc(num, sizeof(MYFLT));
+    ps->spectrum = (MYFLT *)calloc(ps->size, sizeof(MYFLT));
+    ps->frame = (MYFLT *)calloc(ps->size, sizeof(MYFLT));
+    ps->accum = (MYFLT *)calloc(2 * ps->hopsize, sizeof(MYFLT));
+    ps->lobe = partial_get_lobe(ps->size);
+    ps->plan = fft_acquire_real_plan(ps->size);
+
+    ps->ifft = 0;
+    PartialSynth_setMode(ps, mode);
+    return ps;
+}
+
+void
+PartialSynth_free(PartialSynth *ps) {
+    if (ps == NULL)
+        return;
+    free(ps->freq);
+    free(ps->amp);
+    free(ps->cur_freq);
+    free(ps->cur_amp);
+    free(ps->inc_amp);
+    free(ps->re);
+    free(ps->im);
+    free(ps->phase);
+    free(ps->last_freq);
+    free(ps->spectrum);
+    free(ps->frame);
+    free(ps->accum);
+    fft_release_real_plan(ps->plan);
+    free(ps);
+}
+
+/* 0 = inverse FFT from PARTIAL_SYNTH_IFFT_MIN partials, 1 = oscillators, 2 = inverse FFT */
+void
+PartialSynth_setMode(PartialSynth *ps, int mode) {
+    int i, ifft;
+
+    if (mode == 1)
+        ifft = 0;
+    else if (mode == 2)
+        ifft = 1;
+    else
+        ifft = ps->num >= PARTIAL_SYNTH_IFFT_MIN;
+    ps->mode = mode;
+    if (ps->lobe == NULL)
+        ifft = 0;
+    if (ifft != ps->ifft) {
+        ps->fresh = 1;
+        if (ifft) {
+            ps->count = ps->hopsize;
+            for (i=0; i<(2*ps->hopsize); i++)
+                ps->accum[i] = 0.0;
+        }
+    }
+    ps->ifft = ifft;
+}
+
+static void
+PartialSynth_oscillators(PartialSynth *ps, MYFLT *out, int num) {
+    int i, j, k, n, kend, len, blocks;
+    MYFLT a, f, x, y, s0, s1, s2, s3, ratio;
+    MYFLT nyquist = ps->sr * 0.5, w = TWOPI / ps->sr;
+    /* a group of partials is copied to local arrays, which the compiler 
+       knows are not aliased, so that the inner loop is vectorized */
+    MYFLT re[PARTIAL_GROUP], im[PARTIAL_GROUP], rot_re[PARTIAL_GROUP], rot_im[PARTIAL_GROUP];
+    MYFLT amp[PARTIAL_GROUP], inc[PARTIAL_GROUP], lane[PARTIAL_GROUP];
+
+    if (ps->fresh) {
+        for (k=0; k<ps->num; k++)
+            ps->cur_freq[k] = ps->freq[k];
+        ps->fresh = 0;
+    }
+    for (k=0; k<ps->num; k++) {
+        a = MYFABS(ps->freq[k]) < nyquist ? ps->amp[k] : 0.0;
+        ps->inc_amp[k] = (a - ps->cur_amp[k]) / num;
+    }
+    for (i=0; i<num; i++)
+        out[i] = 0.0;
+
+    /* frequencies are interpolated by steps of PARTIAL_BLOCK samples */
+    blocks = (num + PARTIAL_BLOCK - 1) / PARTIAL_BLOCK;
+    for (j=0; j<blocks; j++) {
+        ratio = (MYFLT)(j + 1) / blocks;
+        len = num - j * PARTIAL_BLOCK;
+        if (len > PARTIAL_BLOCK)
+            len = PARTIAL_BLOCK;
+        for (k=0; k<ps->num; k+=PARTIAL_GROUP) {
+            kend = ps->num - k < PARTIAL_GROUP ? ps->num - k : PARTIAL_GROUP;
+            for (i=0; i<kend; i++) {
+                f = ps->cur_freq[k+i] + (ps->freq[k+i] - ps->cur_freq[k+i]) * ratio;
+                rot_re[i] = MYCOS(w * f);
+                rot_im[i] = MYSIN(w * f);
+                re[i] = ps->re[k+i];
+                im[i] = ps->im[k+i];
+                amp[i] = ps->cur_amp[k+i];
+                inc[i] = ps->inc_amp[k+i];
+            }
+            for (n=0; n<len; n++) {
+                for (i=0; i<kend; i++) {
+                    x = re[i];
+                    y = im[i];
+                    lane[i] = amp[i] * y;
+                    re[i] = x * rot_re[i] - y * rot_im[i];
+                    im[i] = x * rot_im[i] + y * rot_re[i];
+                    amp[i] += inc[i];
+                }
+                s0 = s1 = s2 = s3 = 0.0;
+                for (i=0; i<(kend-3); i+=4) {
+                    s0 += lane[i];
+                    s1 += lane[i+1];
+                    s2 += lane[i+2];
+                    s3 += lane[i+3];
+                }
+                for (; i<kend; i++)
+                    s0 += lane[i];
+                out[j*PARTIAL_BLOCK+n] += (s0 + s1) + (s2 + s3);
+            }
+            for (i=0; i<kend; i++) {
+                ps->re[k+i] = re[i];
+                ps->im[k+i] = im[i];
+                ps->cur_amp[k+i] = amp[i];
+            }
+        }
+    }
+    /* keeps the oscillators on the unit circle */
+    for (k=0; k<ps->num; k++) {
+        a = 1.5 - 0.5 * (ps->re[k] * ps->re[k] + ps->im[k] * ps->im[k]);
+        ps->re[k] *= a;
+        ps->im[k] *= a;
+        ps->cur_freq[k] = ps->freq[k];
+    }
+}
+
+static void
+PartialSynth_frame(PartialSynth *ps) {
+    int i, k, b, b1, size = ps->size, hsize = ps->size / 2, hop = ps->hopsize;
+    MYFLT a, c, f, x, ph, re, im, wl;
+    MYFLT *spec = ps->spectrum, *lobe = ps->lobe->lobe, *weights = ps->lobe->weights;
+    MYFLT limit = hsize - PARTIAL_LOBE_WIDTH - 1, scl = size / ps->sr, adv = PI * hop / ps->sr;
+
+    for (i=0; i<size; i++)
+        spec[i] = 0.0;
+    for (k=0; k<ps->num; k++) {
+        f = ps->freq[k];
+        if (ps->fresh)
+            ps->last_freq[k] = f;
+        /* phase at the center of the frame */
+        ph = ps->phase[k] + adv * (ps->last_freq[k] + f);
+        ph -= TWOPI * MYFLOOR(ph / TWOPI);
+        ps->phase[k] = ph;
+        ps->last_freq[k] = f;
+        a = ps->amp[k];
+        c = f * scl;
+        if (c < 0.0) {
+            c = -c;
+            ph = -ph;
+        }
+        if (a == 0.0 || c >= limit)
+            continue;
+        /* sine phase, as the oscillators */
+        re = a * MYSIN(ph);
+        im = -a * MYCOS(ph);
+        b1 = (int)(c + PARTIAL_LOBE_WIDTH);
+        for (b=(int)MYCEIL(c - PARTIAL_LOBE_WIDTH); b<=b1; b++) {
+            x = MYFABS(b - c) * PARTIAL_LOBE_RES;
+            i = (int)x;
+            wl = lobe[i] + (lobe[i+1] - lobe[i]) * (x - i);
+            if (b & 1)
+                wl = -wl;
+            if (b > 0) {
+                spec[b] += re * wl;
+                spec[size-b] += im * wl;
+            }
+            else if (b == 0)
+                spec[0] += 2.0 * re * wl;
+            else {
+                /* negative frequency image */
+                spec[-b] += re * wl;
+                spec[size+b] -= im * wl;
+            }
+        }
+    }
+    ps->fresh = 0;
+    irealfft_batched(spec, ps->frame, ps->plan);
+    for (i=0; i<hop; i++) {
+        ps->accum[i] = ps->accum[i+hop];
+        ps->accum[i+hop] = 0.0;
+    }
+    for (i=0; i<(2*hop); i++)
+        ps->accum[i] += ps->frame[hsize-hop+i] * weights[i];
+}
+
+/* Synthesizes `num` samples from the `freq` and `amp` targets. The oscillators
+   reach the targets at the end of the call, the inverse FFT reads them at the 
+   start of each frame and delays the output by `hopsize` samples. */
+void
+PartialSynth_process(PartialSynth *ps, MYFLT *out, int num) {
+    int i;
+
+    if (ps->ifft == 0) {
+        PartialSynth_oscillators(ps, out, num);
+        return;
+    }
+    for (i=0; i<num; i++) {
+        if (ps->count == ps->hopsize) {
+            ps->count = 0;
+            PartialSynth_frame(ps);
+        }
+        out[i] = ps->accum[ps->count++];
+    }
+}
@@ -2054,6 +2054,91 @@ secToSamps(PyObject *self, PyObject *arg) {
         Py_RETURN_NONE;
 }                         
 
+/************* Disk streaming *************/
+#define setDiskThreads_info \
+"\nSets the number of threads reading sounds ahead of the soundfile players.\n\n\
+The threads are shared by every SfPlayer, SfMarkerShuffler and SfMarkerLooper \
+with a prefetch time greater than 0 (see their `setPrefetch` method). Defaults to 2.\n\n:Args:\n\n    \
+x : int\n        Number of disk streaming threads.\n\n\
+>>> setDiskThreads(4)\n\n"
+
+static PyObject *
+setDiskThreads(PyObject *self, PyObject *arg) {
+    if (PyNumber_Check(arg))
+        DiskStream_setThreads(PyInt_AsLong(arg));
+    Py_RETURN_NONE;
+}
+
+#define getDiskThreads_info \
+"\nReturns the number of threads reading sounds ahead of the soundfile players.\n\n\
+>>> print getDiskThreads()\n\
+2\n\n"
+
+static PyObject *
+getDiskThreads(PyObject *self) {
+    return PyInt_FromLong(DiskStream_getThreads());
+}
+
+/************* Partitioned convolution *************/
+#define setConvolveThreads_info \
+"\nSets the number of threads computing the tails of partitioned convolutions.\n\n\
+The threads are shared by every CvlVerb and Convolve object with a `tailsize` \
+greater than their partition size. Defaults to 2.\n\n:Args:\n\n    \
+x : int\n        Number of convolution threads.\n\n\
+>>> setConvolveThreads(4)\n\n"
+
+static PyObject *
+setConvolveThreads(PyObject *self, PyObject *arg) {
+    if (PyNumber_Check(arg))
+        PartConv_setThreads(PyInt_AsLong(arg));
+    Py_RETURN_NONE;
+}
+
+#define getConvolveThreads_info \
+"\nReturns the number of threads computing the tails of partitioned convolutions.\n\n\
+>>> print getConvolveThreads()\n\
+2\n\n"
+
+static PyObject *
+getConvolveThreads(PyObject *self) {
+    return PyInt_FromLong(PartConv_getThreads());
+}
+
+/************* FFT tables cache *************/
+#define getFFTCacheStats_info \
+"\nReturns statistics about the tables shared by the spectral objects.\n\n\
+FFT, IFFT, Spectrum, PVAnal, PVSynth, CvlVerb and Convolve objects of the same \
+size share their twiddle factors (the FFT plans) and, if the window type is also \
+the same, their windows. The tables are computed the first time they are needed \
+and kept for the next objects.\n\n\
+The returned dictionary has a 'plans' and a 'windows' entry, each one a dictionary \
+giving the number of tables ('tables'), the number of tables in use ('in use'), and \
+how many requests found a table already computed ('hits') or had to compute it \
+('misses').\n\n:Args:\n\n    \
+reset : boolean, optional\n        If True, hits and misses are reset to 0 after the call. \
+Defaults to False.\n\n\
+>>> s = Server().boot()\n\
+>>> a = Noise()\n\
+>>> ffts = [FFT(a, size=1024) for i in range(10)]\n\
+>>> print getFFTCacheStats()['plans']['hits']\n\
+18\n\n"
+
+static PyObject *
+getFFTCacheStats(PyObject *self, PyObject *args, PyObject *kwds) {
+    int reset = 0;
+    long plans[4], windows[4];
+    static char *kwlist[] = {"reset", NULL};
+
+    if (! PyArg_ParseTupleAndKeywords(args, kwds, "|i", kwlist, &reset))
+        return PyInt_FromLong(-1);
+
+    fft_cache_stats(plans, reset);
+    window_cache_stats(windows, reset);
+    return Py_BuildValue("{s:{s:l,s:l,s:l,s:l},s:{s:l,s:l,s:l,s:l}}",
+                         "plans", "tables", plans[0], "in use", plans[1], "hits", plans[2], "misses", plans[3],
+                         "windows", "tables", windows[0], "in use", windows[1], "hits", windows[2], "misses", windows[3]);
+}
+
 /************* Server quieries *************/
 #define serverCreated_info \
 "\nReturns True if a Server object is already created, otherwise, returns False.\n\n\
@@ -2132,6 +2217,11 @@ static PyMethodDef pyo_functions[] = {
 {"midiToTranspo", (PyCFunction)midiToTranspo, METH_O, midiToTranspo_info},
 {"sampsToSec", (PyCFunction)sampsToSec, METH_O, sampsToSec_info},
 {"secToSamps", (PyCFunction)secToSamps, METH_O, secToSamps_info},
+{"setDiskThreads", (PyCFunction)setDiskThreads, METH_O, setDiskThreads_info},
+{"getDiskThreads", (PyCFunction)getDiskThreads, METH_NOARGS, getDiskThreads_info},
+{"setConvolveThreads", (PyCFunction)setConvolveThreads, METH_O, setConvolveThreads_info},
+{"getConvolveThreads", (PyCFunction)getConvolveThreads, METH_NOARGS, getConvolveThreads_info},
+{"getFFTCacheStats", (PyCFunction)getFFTCacheStats, METH_VARARGS|METH_KEYWORDS, getFFTCacheStats_info},
 {"serverCreated", (PyCFunction)serverCreated, METH_NOARGS, serverCreated_info},
 {"serverBooted", (PyCFunction)serverBooted, METH_NOARGS, serverBooted_info},
 {NULL, NULL, 0, NULL},
@@ -2247,6 +2337,7 @@ init_pyo64(void)
     module_add_object(m, "OscLoop_base", &OscLoopType);
     module_add_object(m, "OscTrig_base", &OscTrigType);
     module_add_object(m, "OscBank_base", &OscBankType);
+    module_add_object(m, "PartialBank_base", &PartialBankType);
     module_add_object(m, "SumOsc_base", &SumOscType);
     module_add_object(m, "TableRead_base", &TableReadType);
     module_add_object(m, "Pulsar_base", &PulsarType);
@@ -2328,6 +2419,8 @@ init_pyo64(void)
     module_add_object(m, "BandSplit_base", &BandSplitType);
     module_add_object(m, "FourBandMain_base", &FourBandMainType);
     module_add_object(m, "FourBand_base", &FourBandType);
+    module_add_object(m, "FilterBanker_base", &FilterBankerType);
+    module_add_object(m, "FilterBank_base", &FilterBankType);
     module_add_object(m, "HilbertMain_base", &HilbertMainType);
     module_add_object(m, "Hilbert_base", &HilbertType);
     module_add_object(m, "Follower_base", &FollowerType);
@@ -2341,8 +2434,11 @@ init_pyo64(void)
     module_add_object(m, "Switch_base", &SwitchType);
     module_add_object(m, "Selector_base", &SelectorType);
     module_add_object(m, "VoiceManager_base", &VoiceManagerType);
+    module_add_object(m, "VoicePool_base", &VoicePoolType);
     module_add_object(m, "Mixer_base", &MixerType);
     module_add_object(m, "MixerVoice_base", &MixerVoiceType);
+    module_add_object(m, "ModMatrix_base", &ModMatrixType);
+    module_add_object(m, "ModMatrixVoice_base", &ModMatrixVoiceType);
     module_add_object(m, "Counter_base", &CounterType);
     module_add_object(m, "Count_base", &CountType);
     module_add_object(m, "Thresh_base", &ThreshType);
@@ -2363,6 +2459,7 @@ init_pyo64(void)
     module_add_object(m, "Looper_base", &LooperType);
     module_add_object(m, "Harmonizer_base", &HarmonizerType);
     module_add_object(m, "Print_base", &PrintType);
+    module_add_object(m, "Capture_base", &CaptureType);
     module_add_object(m, "M_Sin_base", &M_SinType);
     module_add_object(m, "M_Cos_base", &M_CosType);
     module_add_object(m, "M_Tan_base", &M_TanType);
@@ -2377,6 +2474,7 @@ init_pyo64(void)
     module_add_object(m, "M_Ceil_base", &M_CeilType);
     module_add_object(m, "M_Round_base", &M_RoundType);
     module_add_object(m, "M_Tanh_base", &M_TanhType);
+    module_add_object(m, "M_Fuse_base", &M_FuseType);
     module_add_object(m, "Snap_base", &SnapType);
     module_add_object(m, "Interp_base", &InterpType);
     module_add_object(m, "SampHold_base", &SampHoldType);
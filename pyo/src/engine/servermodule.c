@@ -29,6 +29,11 @@
 #include <time.h>
 #include <stdlib.h>
 #include <pthread.h>
+#if defined(_WIN32)
+#include <windows.h>
+#else
+#include <sys/time.h>
+#endif
 
 #include "structmember.h"
 #include "portaudio.h"
@@ -50,6 +55,10 @@ static PyObject *Server_stop(Server *self);
 static void Server_process_gui(Server *server);
 static void Server_process_time(Server *server);
 static inline void Server_process_buffers(Server *server);
+static void Server_process_profile(Server *server, double elapsed);
+static void Server_process_changes(Server *server);
+static void Server_process_events(Server *server);
+static void Server_wake_call_thread(Server *self);
 static int Server_start_rec_internal(Server *self, char *filename);
 
 /* random objects count and multiplier to assign different seed to each instance. */
@@ -1266,6 +1275,199 @@ Server_embedded_stop(Server *self)
 /***************************************************/
 /*  Main Processing functions                      */
 
+/* Monotonic clock, in seconds, used by the profiler. */
+static inline double
+Server_profile_clock()
+{
+#if defined(_WIN32)
+    LARGE_INTEGER count, freq;
+    QueryPerformanceCounter(&count);
+    QueryPerformanceFrequency(&freq);
+    return (double)count.QuadPart / (double)freq.QuadPart;
+#elif defined(CLOCK_MONOTONIC)
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return ts.tv_sec + ts.tv_nsec * 1e-9;
+#else
+    struct timeval tv;
+    gettimeofday(&tv, NULL);
+    return tv.tv_sec + tv.tv_usec * 1e-6;
+#endif
+}
+
+/* Parallel scheduler: streams with a lane (> 0) are independent from the 
+   streams of the other lanes. Every run of consecutive lane streams in the 
+   server's list is computed by the worker threads, one lane per thread at 
+   a time, keeping the order of the list inside a lane. The outputs are then 
+   mixed in the order of the list by the callback thread, as in serial mode. */
+
+static int
+Server_compare_lane_items(const void *a, const void *b)
+{
+    const PyoLaneItem *x = (const PyoLaneItem *)a;
+    const PyoLaneItem *y = (const PyoLaneItem *)b;
+    if (x->lane != y->lane)
+        return x->lane < y->lane ? -1 : 1;
+    return x->index - y->index;
+}
+
+static void
+Server_run_lanes(Server *server, int thread)
+{
+    int g, k;
+    double start, callstart;
+    Stream *stream;
+
+    start = Server_profile_clock();
+    while ((g = __sync_fetch_and_add(&server->next_group, 1)) < server->lane_groups) {
+        for (k=server->lane_offsets[g]; k<server->lane_offsets[g+1]; k++) {
+            stream = (Stream *)server->lane_items[k].stream;
+            if (server->work_profiling) {
+                callstart = Server_profile_clock();
+                Stream_callFunction(stream);
+                Stream_addProfileTime(stream, Server_profile_clock() - callstart);
+            }
+            else
+                Stream_callFunction(stream);
+        }
+    }
+    server->worker_busy[thread] += Server_profile_clock() - start;
+}
+
+typedef struct {
+    Server *server;
+    int thread;
+    int generation; /* last batch generation seen when the thread was created */
+} PyoWorkerArgs;
+
+static void *
+Server_worker_thread(void *arg)
+{
+    PyoWorkerArgs *args = (PyoWorkerArgs *)arg;
+    Server *server = args->server;
+    int thread = args->thread;
+    int generation = args->generation;
+    free(args);
+
+    pthread_mutex_lock(&server->work_mutex);
+    while (1) {
+        while (server->work_generation == generation && server->work_quit == 0)
+            pthread_cond_wait(&server->work_cond, &server->work_mutex);
+        if (server->work_quit)
+            break;
+        generation = server->work_generation;
+        pthread_mutex_unlock(&server->work_mutex);
+
+        Server_run_lanes(server, thread);
+
+        pthread_mutex_lock(&server->work_mutex);
+        server->work_pending--;
+        if (server->work_pending == 0)
+            pthread_cond_signal(&server->done_cond);
+    }
+    pthread_mutex_unlock(&server->work_mutex);
+    return NULL;
+}
+
+static void
+Server_stop_workers(Server *self)
+{
+    int i;
+
+    if (self->nworkers == 0)
+        return;
+
+    pthread_mutex_lock(&self->work_mutex);
+    self->work_quit = 1;
+    pthread_cond_broadcast(&self->work_cond);
+    pthread_mutex_unlock(&self->work_mutex);
+    for (i=0; i<self->nworkers; i++) {
+        pthread_join(self->workers[i], NULL);
+    }
+    free(self->workers);
+    self->workers = NULL;
+    self->nworkers = 0;
+    self->work_quit = 0;
+}
+
+static int
+Server_start_workers(Server *self, int num)
+{
+    int i;
+    PyoWorkerArgs *args;
+
+    self->workers = (pthread_t *)malloc(num * sizeof(pthread_t));
+    self->worker_busy = (double *)realloc(self->worker_busy, (num + 1) * sizeof(double));
+    for (i=0; i<=num; i++) {
+        self->worker_busy[i] = 0.0;
+    }
+    self->parallel_blocks = 0;
+    self->work_quit = 0;
+    for (i=0; i<num; i++) {
+        args = (PyoWorkerArgs *)malloc(sizeof(PyoWorkerArgs));
+        args->server = self;
+        args->thread = i;
+        args->generation = self->work_generation;
+        if (pthread_create(&self->workers[i], NULL, Server_worker_thread, args) != 0) {
+            free(args);
+            self->nworkers = i;
+            return -1;
+        }
+        self->nworkers = i + 1;
+    }
+    return 0;
+}
+
+/* Computes the active streams of the lane run [first, last) with the workers. */
+static void
+Server_process_lanes(Server *server, int first, int last, int profiling)
+{
+    int i, num = 0;
+    Stream *stream;
+
+    if ((last - first) > server->lane_capacity) {
+        server->lane_capacity = last - first;
+        server->lane_items = (PyoLaneItem *)realloc(server->lane_items, server->lane_capacity * sizeof(PyoLaneItem));
+        server->lane_offsets = (int *)realloc(server->lane_offsets, (server->lane_capacity + 1) * sizeof(int));
+    }
+
+    for (i=first; i<last; i++) {
+        stream = (Stream *)PyList_GET_ITEM(server->streams, i);
+        if (Stream_getStreamActive(stream) == 1) {
+            server->lane_items[num].lane = Stream_getLane(stream);
+            server->lane_items[num].index = i;
+            server->lane_items[num].stream = (PyObject *)stream;
+            num++;
+        }
+    }
+    if (num == 0)
+        return;
+
+    qsort(server->lane_items, num, sizeof(PyoLaneItem), Server_compare_lane_items);
+    server->lane_groups = 0;
+    for (i=0; i<num; i++) {
+        if (i == 0 || server->lane_items[i].lane != server->lane_items[i-1].lane)
+            server->lane_offsets[server->lane_groups++] = i;
+    }
+    server->lane_offsets[server->lane_groups] = num;
+    server->next_group = 0;
+    server->work_profiling = profiling;
+
+    pthread_mutex_lock(&server->work_mutex);
+    server->work_pending = server->nworkers;
+    server->work_generation++;
+    pthread_cond_broadcast(&server->work_cond);
+    pthread_mutex_unlock(&server->work_mutex);
+
+    /* The callback thread takes its share of the lanes. */
+    Server_run_lanes(server, server->nworkers);
+
+    pthread_mutex_lock(&server->work_mutex);
+    while (server->work_pending > 0)
+        pthread_cond_wait(&server->done_cond, &server->work_mutex);
+    pthread_mutex_unlock(&server->work_mutex);
+}
+
 static inline void
 Server_process_buffers(Server *server)
 {
@@ -1273,16 +1475,41 @@ Server_process_buffers(Server *server)
     MYFLT buffer[server->nchnls][server->bufferSize];
     int i, j, chnl;
     int nchnls = server->nchnls;
+    int profiling = server->profiling;
+    int lanes_end = 0;
+    double blockstart = 0.0, callstart;
     MYFLT amp = server->amp;
     Stream *stream_tmp;
     MYFLT *data;
 
     memset(&buffer, 0, sizeof(buffer));
     PyGILState_STATE s = PyGILState_Ensure();
+    if (profiling)
+        blockstart = Server_profile_clock();
+    if (PyList_GET_SIZE(server->changes) > 0)
+        Server_process_changes(server);
+    if (server->event_count > 0)
+        Server_process_events(server);
     for (i=0; i<server->stream_count; i++) {
         stream_tmp = (Stream *)PyList_GET_ITEM(server->streams, i);
+        if (server->nworkers > 0 && Stream_getLane(stream_tmp) > 0 && i >= lanes_end) {
+            /* Computes a whole run of lane streams, the loop then only mixes them. */
+            lanes_end = i + 1;
+            while (lanes_end < server->stream_count && 
+                   Stream_getLane((Stream *)PyList_GET_ITEM(server->streams, lanes_end)) > 0)
+                lanes_end++;
+            Server_process_lanes(server, i, lanes_end, profiling);
+        }
         if (Stream_getStreamActive(stream_tmp) == 1) {
-            Stream_callFunction(stream_tmp);
+            if (i < lanes_end)
+                ;
+            else if (profiling) {
+                callstart = Server_profile_clock();
+                Stream_callFunction(stream_tmp);
+                Stream_addProfileTime(stream_tmp, Server_profile_clock() - callstart);
+            }
+            else
+                Stream_callFunction(stream_tmp);
             if (Stream_getStreamToDac(stream_tmp) != 0) {
                 data = Stream_getData(stream_tmp);
                 chnl = Stream_getStreamChnl(stream_tmp);
@@ -1303,7 +1530,17 @@ Server_process_buffers(Server *server)
     if (server->withTIME == 1) {
         Server_process_time(server);
     }
+    if (server->nworkers > 0) {
+        server->parallel_blocks++;
+    }
+    if (profiling) {
+        Server_process_profile(server, Server_profile_clock() - blockstart);
+    }
     server->elapsedSamples += server->bufferSize;
+    if (server->call_queued) {
+        server->call_queued = 0;
+        Server_wake_call_thread(server);
+    }
     PyGILState_Release(s);
     if (amp != server->lastAmp) {
         server->timeCount = 0;
@@ -1325,6 +1562,272 @@ Server_process_buffers(Server *server)
 
 }
 
+/* Calls the queued changes, all of them before the first stream of the buffer 
+   is computed. Changes queued meanwhile wait for the next buffer. */
+static void
+Server_process_changes(Server *server)
+{
+    int i;
+    PyObject *changes = server->changes, *result;
+
+    server->changes = PyList_New(0);
+    for (i=0; i<PyList_GET_SIZE(changes); i++) {
+        result = PyObject_CallObject(PyList_GET_ITEM(changes, i), NULL);
+        if (result == NULL)
+            PyErr_Print();
+        else
+            Py_DECREF(result);
+    }
+    Py_DECREF(changes);
+}
+
+/* Calls a Python function from the audio callback. Deferred calls are queued 
+   in a ring buffer (the GIL, already held by the callback, protects it) and 
+   made by the server's call thread. The thread is woken once per buffer. 
+   Blocking offline rendering never releases the GIL, its calls are made 
+   immediately. */
+void
+Server_dispatchCall(Server *self, PyObject *callable, PyObject *args, int deferred)
+{
+    PyObject *result;
+    PyoDeferredCall *call;
+
+    if (deferred && self->audio_be_type != PyoOffline) {
+        if ((self->call_head - self->call_tail) >= CALL_QUEUE_SIZE) {
+            self->call_dropped++;
+            return;
+        }
+        call = &self->calls[self->call_head % CALL_QUEUE_SIZE];
+        Py_INCREF(callable);
+        call->callable = callable;
+        Py_INCREF(args);
+        call->args = args;
+        call->time = Server_profile_clock();
+        self->call_head++;
+        if ((self->call_head - self->call_tail) > self->call_maxdepth)
+            self->call_maxdepth = self->call_head - self->call_tail;
+        self->call_queued = 1;
+    }
+    else {
+        result = PyObject_Call(callable, args, NULL);
+        if (result == NULL)
+            PyErr_Print();
+        else
+            Py_DECREF(result);
+    }
+}
+
+static void
+Server_wake_call_thread(Server *self)
+{
+    pthread_mutex_lock(&self->call_mutex);
+    self->call_signal++;
+    pthread_cond_signal(&self->call_cond);
+    pthread_mutex_unlock(&self->call_mutex);
+}
+
+static void
+Server_clear_calls(Server *self)
+{
+    PyoDeferredCall *call;
+    while (self->call_tail != self->call_head) {
+        call = &self->calls[self->call_tail++ % CALL_QUEUE_SIZE];
+        Py_DECREF(call->callable);
+        Py_DECREF(call->args);
+    }
+}
+
+/* Event scheduler. Events wait in a binary heap ordered by time (and by 
+   insertion order for simultaneous events). At the start of every buffer, 
+   all the events falling inside the buffer are popped and dispatched in time 
+   order: callables are called, values are handed to their Sig object, which 
+   switches to the new value at the event's sample offset. */
+static int
+Server_event_before(PyoEvent *a, PyoEvent *b)
+{
+    return a->time < b->time || (a->time == b->time && a->order < b->order);
+}
+
+static void
+Server_event_place(Server *self, PyoEvent *ev, int index)
+{
+    self->events[index] = ev;
+    ev->index = index;
+}
+
+static void
+Server_event_up(Server *self, int index)
+{
+    int parent;
+    PyoEvent *ev = self->events[index];
+    while (index > 0) {
+        parent = (index - 1) / 2;
+        if (! Server_event_before(ev, self->events[parent]))
+            break;
+        Server_event_place(self, self->events[parent], index);
+        index = parent;
+    }
+    Server_event_place(self, ev, index);
+}
+
+static void
+Server_event_down(Server *self, int index)
+{
+    int child;
+    PyoEvent *ev = self->events[index];
+    while ((child = 2 * index + 1) < self->event_count) {
+        if ((child + 1) < self->event_count && Server_event_before(self->events[child+1], self->events[child]))
+            child++;
+        if (! Server_event_before(self->events[child], ev))
+            break;
+        Server_event_place(self, self->events[child], index);
+        index = child;
+    }
+    Server_event_place(self, ev, index);
+}
+
+/* Takes the event out of the heap and of the id table, the caller frees it. */
+static void
+Server_event_remove(Server *self, PyoEvent *ev)
+{
+    int index = ev->index;
+    PyoEvent *last;
+    PyObject *key = PyInt_FromLong(ev->id);
+    PyDict_DelItem(self->event_ids, key);
+    Py_DECREF(key);
+    self->event_count--;
+    if (index < self->event_count) {
+        last = self->events[self->event_count];
+        Server_event_place(self, last, index);
+        Server_event_up(self, index);
+        Server_event_down(self, last->index);
+    }
+}
+
+static void
+Server_event_free(PyoEvent *ev)
+{
+    Py_XDECREF(ev->callable);
+    Py_XDECREF(ev->args);
+    Py_XDECREF(ev->target);
+    free(ev);
+}
+
+static PyoEvent *
+Server_event_find(Server *self, long id)
+{
+    PyObject *key = PyInt_FromLong(id);
+    PyObject *ptr = PyDict_GetItem(self->event_ids, key);
+    Py_DECREF(key);
+    if (ptr == NULL)
+        return NULL;
+    return (PyoEvent *)PyLong_AsVoidPtr(ptr);
+}
+
+/* Converts a time in seconds to samples. Relative times start at the event 
+   being dispatched, if any, so that events scheduled from a callback don't 
+   drift, otherwise at the start of the next buffer. */
+static unsigned long
+Server_event_time(Server *self, double time, int absolute)
+{
+    double start = 0.0;
+    if (! absolute)
+        start = self->dispatching ? (double)self->dispatch_time : (double)self->elapsedSamples;
+    time = start + time * self->samplingRate;
+    if (time < 0.0)
+        time = 0.0;
+    return (unsigned long)(time + 0.5);
+}
+
+static long
+Server_event_add(Server *self, double time, int absolute, PyObject *callable, PyObject *args, PyObject *target, MYFLT value)
+{
+    PyObject *key, *ptr;
+    PyoEvent *ev;
+
+    if (self->event_count == self->event_capacity) {
+        self->event_capacity = self->event_capacity ? self->event_capacity * 2 : 64;
+        self->events = (PyoEvent **)realloc(self->events, self->event_capacity * sizeof(PyoEvent *));
+    }
+    ev = (PyoEvent *)malloc(sizeof(PyoEvent));
+    ev->time = Server_event_time(self, time, absolute);
+    ev->order = self->event_order++;
+    ev->id = ++self->event_id;
+    Py_XINCREF(callable);
+    ev->callable = callable;
+    Py_XINCREF(args);
+    ev->args = args;
+    Py_XINCREF(target);
+    ev->target = target;
+    ev->value = value;
+
+    key = PyInt_FromLong(ev->id);
+    ptr = PyLong_FromVoidPtr(ev);
+    PyDict_SetItem(self->event_ids, key, ptr);
+    Py_DECREF(key);
+    Py_DECREF(ptr);
+
+    Server_event_place(self, ev, self->event_count++);
+    Server_event_up(self, ev->index);
+    return ev->id;
+}
+
+long
+Server_scheduleEvent(Server *self, double time, int absolute, PyObject *callable, PyObject *args)
+{
+    return Server_event_add(self, time, absolute, callable, args, NULL, 0.0);
+}
+
+int
+Server_cancelEvent(Server *self, long id)
+{
+    PyoEvent *ev = Server_event_find(self, id);
+    if (ev == NULL)
+        return 0;
+    Server_event_remove(self, ev);
+    Server_event_free(ev);
+    return 1;
+}
+
+static void
+Server_clear_events(Server *self)
+{
+    int i;
+    for (i=0; i<self->event_count; i++) {
+        Server_event_free(self->events[i]);
+    }
+    self->event_count = 0;
+    if (self->event_ids != NULL)
+        PyDict_Clear(self->event_ids);
+}
+
+static void
+Server_process_events(Server *server)
+{
+    PyoEvent *ev;
+    PyObject *result;
+    unsigned long start = server->elapsedSamples;
+    unsigned long end = start + server->bufferSize;
+
+    server->dispatching = 1;
+    while (server->event_count > 0 && server->events[0]->time < end) {
+        ev = server->events[0];
+        Server_event_remove(server, ev);
+        server->dispatch_time = ev->time;
+        if (ev->target != NULL)
+            Sig_addEvent(ev->target, ev->time > start ? (int)(ev->time - start) : 0, ev->value);
+        else {
+            result = PyObject_Call(ev->callable, ev->args, NULL);
+            if (result == NULL)
+                PyErr_Print();
+            else
+                Py_DECREF(result);
+        }
+        Server_event_free(ev);
+    }
+    server->dispatching = 0;
+}
+
 static void
 Server_process_gui(Server *server)
 {
@@ -1404,6 +1907,27 @@ Server_process_time(Server *server)
     }
 }
 
+static void
+Server_process_profile(Server *server, double elapsed)
+{
+    server->profileBlocks++;
+    server->profileTime += elapsed;
+    if (elapsed > server->profileMaxTime)
+        server->profileMaxTime = elapsed;
+    if (elapsed > (server->bufferSize / server->samplingRate))
+        server->profileLate++;
+
+    if (server->withPROFILE == 1) {
+        if (server->pcount < server->profilePass) {
+            server->pcount++;
+        }
+        else {
+            PyObject_CallMethod((PyObject *)server->PROFILE, "_dumpProfile", NULL);
+            server->pcount = 0;
+        }
+    }
+}
+
 /***************************************************/
 
 /* Global function called by any new audio object to 
@@ -1457,6 +1981,8 @@ Server_shut_down(Server *self)
             break;    
     }
     self->server_booted = 0;
+    self->call_quit = 1;
+    Server_wake_call_thread(self);
     if (ret < 0) {
         Server_error(self, "Error closing audio backend.\n");
     }
@@ -1469,6 +1995,8 @@ static int
 Server_traverse(Server *self, visitproc visit, void *arg)
 {
     Py_VISIT(self->streams);
+    Py_VISIT(self->changes);
+    Py_VISIT(self->event_ids);
     return 0;
 }
 
@@ -1476,6 +2004,9 @@ static int
 Server_clear(Server *self)
 {    
     Py_CLEAR(self->streams);
+    Py_CLEAR(self->changes);
+    Server_clear_events(self);
+    Py_CLEAR(self->event_ids);
     return 0;
 }
 
@@ -1484,7 +2015,13 @@ Server_dealloc(Server* self)
 {  
     if (self->server_booted == 1)
         Server_shut_down(self);
+    Server_stop_workers(self);
+    free(self->lane_items);
+    free(self->lane_offsets);
+    free(self->worker_busy);
     Server_clear(self);
+    free(self->events);
+    Server_clear_calls(self);
     free(self->input_buffer);
     free(self->output_buffer);
     free(self->serverName);
@@ -1549,6 +2086,32 @@ Server_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
     self->currentAmp = self->lastAmp = 0.;
     self->withGUI = 0;
     self->withTIME = 0;
+    self->profiling = 0;
+    self->withPROFILE = 0;
+    self->profileBlocks = self->profileLate = 0;
+    self->profileTime = self->profileMaxTime = 0.0;
+    self->nworkers = 0;
+    self->work_generation = self->work_pending = self->work_quit = 0;
+    pthread_mutex_init(&self->work_mutex, NULL);
+    pthread_cond_init(&self->work_cond, NULL);
+    pthread_cond_init(&self->done_cond, NULL);
+    self->changes = PyList_New(0);
+    self->events = NULL;
+    self->event_count = self->event_capacity = 0;
+    self->event_order = 0;
+    self->event_id = 0;
+    self->event_ids = PyDict_New();
+    self->dispatching = 0;
+    self->dispatch_time = 0;
+    self->call_head = self->call_tail = 0;
+    self->call_queued = 0;
+    pthread_mutex_init(&self->call_mutex, NULL);
+    pthread_cond_init(&self->call_cond, NULL);
+    self->call_signal = self->call_seen = 0;
+    self->call_quit = 0;
+    self->call_count = self->call_dropped = 0;
+    self->call_maxdepth = 0;
+    self->call_latency = self->call_maxlatency = 0.0;
     self->verbosity = 7;
     self->recdur = -1;
     self->recformat = 0;
@@ -2159,6 +2722,7 @@ Server_start(Server *self)
 
     self->server_stopped = 0;
     self->server_started = 1;
+    self->call_quit = 0;
     self->timeStep = (int)(0.01 * self->samplingRate);
 
     if (self->audio_be_type != PyoOffline && self->audio_be_type != PyoOfflineNB && self->audio_be_type != PyoEmbedded) {
@@ -2549,6 +3113,336 @@ Server_getMidiActive(Server *self)
     return PyInt_FromLong(self->withPortMidi);
 }
 
+static PyObject *
+Server_setProfiling(Server *self, PyObject *arg)
+{
+    if (arg != NULL && PyInt_Check(arg))
+        self->profiling = PyInt_AsLong(arg) != 0;
+
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject *
+Server_setProfileCallable(Server *self, PyObject *args)
+{
+    double interval;
+    PyObject *tmp;
+
+    if (! PyArg_ParseTuple(args, "Od", &tmp, &interval)) {
+        return NULL;
+    }
+
+    Py_XDECREF(self->PROFILE);
+    self->PROFILE = NULL;
+    self->withPROFILE = 0;
+    if (tmp != Py_None && interval > 0.0) {
+        Py_INCREF(tmp);
+        self->PROFILE = tmp;
+        self->profilePass = (int)(interval * self->samplingRate / self->bufferSize) - 1;
+        if (self->profilePass < 0)
+            self->profilePass = 0;
+        self->pcount = 0;
+        self->withPROFILE = 1;
+    }
+
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject *
+Server_addChanges(Server *self, PyObject *arg)
+{
+    if (arg == NULL || ! PyCallable_Check(arg)) {
+        Server_error(self, "Server changes must be callable.\n");
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+    PyList_Append(self->changes, arg);
+
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject *
+Server_schedule(Server *self, PyObject *args, PyObject *kwds)
+{
+    double time;
+    int absolute = 0;
+    long id;
+    PyObject *callable, *argstmp=NULL, *tuple;
+
+    static char *kwlist[] = {"time", "callable", "args", "absolute", NULL};
+
+    if (! PyArg_ParseTupleAndKeywords(args, kwds, "dO|Oi", kwlist, &time, &callable, &argstmp, &absolute))
+        return PyInt_FromLong(-1);
+
+    if (! PyCallable_Check(callable)) {
+        Server_error(self, "Server schedule: callable argument must be callable.\n");
+        return PyInt_FromLong(-1);
+    }
+    if (argstmp == NULL || argstmp == Py_None)
+        tuple = PyTuple_New(0);
+    else
+        tuple = PySequence_Tuple(argstmp);
+    if (tuple == NULL)
+        return NULL;
+
+    id = Server_scheduleEvent(self, time, absolute, callable, tuple);
+    Py_DECREF(tuple);
+    return PyInt_FromLong(id);
+}
+
+static PyObject *
+Server_scheduleValue(Server *self, PyObject *args, PyObject *kwds)
+{
+    double time, value;
+    int absolute = 0;
+    PyObject *target;
+
+    static char *kwlist[] = {"time", "target", "value", "absolute", NULL};
+
+    if (! PyArg_ParseTupleAndKeywords(args, kwds, "dOd|i", kwlist, &time, &target, &value, &absolute))
+        return PyInt_FromLong(-1);
+
+    if (! PyObject_TypeCheck(target, &SigType)) {
+        Server_error(self, "Server scheduleValue: target must be a Sig object.\n");
+        return PyInt_FromLong(-1);
+    }
+
+    return PyInt_FromLong(Server_event_add(self, time, absolute, NULL, NULL, target, (MYFLT)value));
+}
+
+static PyObject *
+Server_cancel(Server *self, PyObject *arg)
+{
+    if (arg == NULL || ! PyInt_Check(arg)) {
+        Server_error(self, "Server cancel: event handle must be an integer.\n");
+        Py_RETURN_FALSE;
+    }
+    if (Server_cancelEvent(self, PyInt_AsLong(arg)))
+        Py_RETURN_TRUE;
+    Py_RETURN_FALSE;
+}
+
+static PyObject *
+Server_reschedule(Server *self, PyObject *args, PyObject *kwds)
+{
+    long id;
+    double time;
+    int absolute = 0;
+    unsigned long old;
+    PyoEvent *ev;
+
+    static char *kwlist[] = {"id", "time", "absolute", NULL};
+
+    if (! PyArg_ParseTupleAndKeywords(args, kwds, "ld|i", kwlist, &id, &time, &absolute))
+        Py_RETURN_FALSE;
+
+    ev = Server_event_find(self, id);
+    if (ev == NULL)
+        Py_RETURN_FALSE;
+
+    old = ev->time;
+    ev->time = Server_event_time(self, time, absolute);
+    ev->order = self->event_order++;
+    if (ev->time < old)
+        Server_event_up(self, ev->index);
+    else
+        Server_event_down(self, ev->index);
+    Py_RETURN_TRUE;
+}
+
+static PyObject *
+Server_getPendingEvents(Server *self)
+{
+    return PyInt_FromLong(self->event_count);
+}
+
+/* Waits, with the GIL released, until the audio callback queues calls, then 
+   returns them as a list of (callable, args) tuples. Returns None once the 
+   server is shut down. */
+static PyObject *
+Server_waitCalls(Server *self, PyObject *arg)
+{
+    int quit;
+    double timeout, now, latency;
+    struct timespec ts;
+#if !defined(_WIN32)
+    struct timeval tv;
+#endif
+    PyObject *calls, *item;
+    PyoDeferredCall *call;
+
+    timeout = PyFloat_AsDouble(arg);
+    if (PyErr_Occurred())
+        return NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    pthread_mutex_lock(&self->call_mutex);
+    if (self->call_signal == self->call_seen && ! self->call_quit) {
+#if defined(_WIN32)
+        timeout += (double)time(NULL);
+#else
+        gettimeofday(&tv, NULL);
+        timeout += tv.tv_sec + tv.tv_usec * 1e-6;
+#endif
+        ts.tv_sec = (time_t)timeout;
+        ts.tv_nsec = (long)((timeout - ts.tv_sec) * 1e9);
+        pthread_cond_timedwait(&self->call_cond, &self->call_mutex, &ts);
+    }
+    self->call_seen = self->call_signal;
+    quit = self->call_quit;
+    pthread_mutex_unlock(&self->call_mutex);
+    Py_END_ALLOW_THREADS
+
+    calls = PyList_New(0);
+    now = Server_profile_clock();
+    while (self->call_tail != self->call_head) {
+        call = &self->calls[self->call_tail % CALL_QUEUE_SIZE];
+        item = PyTuple_Pack(2, call->callable, call->args);
+        PyList_Append(calls, item);
+        Py_DECREF(item);
+        Py_DECREF(call->callable);
+        Py_DECREF(call->args);
+        latency = now - call->time;
+        self->call_latency += latency;
+        if (latency > self->call_maxlatency)
+            self->call_maxlatency = latency;
+        self->call_count++;
+        self->call_tail++;
+    }
+    if (quit && PyList_GET_SIZE(calls) == 0) {
+        Py_DECREF(calls);
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+    return calls;
+}
+
+static PyObject *
+Server_getCallStats(Server *self)
+{
+    return Py_BuildValue("kkIIdd", self->call_count, self->call_dropped, self->call_head - self->call_tail, 
+                         self->call_maxdepth, self->call_latency, self->call_maxlatency);
+}
+
+static PyObject *
+Server_resetCallStats(Server *self)
+{
+    self->call_count = self->call_dropped = 0;
+    self->call_maxdepth = 0;
+    self->call_latency = self->call_maxlatency = 0.0;
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject *
+Server_setWorkers(Server *self, PyObject *arg)
+{
+    int num;
+
+    if (arg == NULL || ! PyInt_Check(arg)) {
+        Server_error(self, "The number of workers must be an integer.\n");
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+    if (self->server_started == 1) {
+        Server_error(self, "The number of workers can't be changed while the Server is running.\n");
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+
+    /* The callback thread counts as a worker. */
+    num = PyInt_AsLong(arg) - 1;
+    if (num < 0)
+        num = 0;
+    Server_stop_workers(self);
+    if (num > 0 && Server_start_workers(self, num) < 0) {
+        Server_error(self, "Only %d worker threads could be started.\n", self->nworkers);
+    }
+
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject *
+Server_getWorkers(Server *self)
+{
+    return PyInt_FromLong(self->nworkers + 1);
+}
+
+static PyObject *
+Server_setAutoSleep(Server *self, PyObject *arg)
+{
+    if (arg != NULL && PyInt_Check(arg))
+        Stream_setAutoSleep(PyInt_AsLong(arg) != 0);
+
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject *
+Server_getAutoSleep(Server *self)
+{
+    return PyInt_FromLong(Stream_getAutoSleep());
+}
+
+static PyObject *
+Server_getWorkerLoad(Server *self)
+{
+    int i;
+    PyObject *busy;
+
+    if (self->nworkers == 0)
+        return Py_BuildValue("kN", self->parallel_blocks, PyList_New(0));
+
+    /* The callback thread first, then the worker threads. */
+    busy = PyList_New(self->nworkers + 1);
+    PyList_SET_ITEM(busy, 0, PyFloat_FromDouble(self->worker_busy[self->nworkers]));
+    for (i=0; i<self->nworkers; i++) {
+        PyList_SET_ITEM(busy, i+1, PyFloat_FromDouble(self->worker_busy[i]));
+    }
+    return Py_BuildValue("kN", self->parallel_blocks, busy);
+}
+
+static PyObject *
+Server_resetWorkerLoad(Server *self)
+{
+    int i;
+
+    if (self->nworkers > 0) {
+        for (i=0; i<=self->nworkers; i++) {
+            self->worker_busy[i] = 0.0;
+        }
+    }
+    self->parallel_blocks = 0;
+
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject *
+Server_getProfile(Server *self)
+{
+    return Py_BuildValue("kkdd", self->profileBlocks, self->profileLate, self->profileTime, self->profileMaxTime);
+}
+
+static PyObject *
+Server_resetProfile(Server *self)
+{
+    int i;
+
+    self->profileBlocks = self->profileLate = 0;
+    self->profileTime = self->profileMaxTime = 0.0;
+    for (i=0; i<self->stream_count; i++) {
+        PyObject_CallMethod(PyList_GET_ITEM(self->streams, i), "resetProfile", NULL);
+    }
+
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
 static PyObject *
 Server_getStreams(Server *self)
 {
@@ -2637,6 +3531,25 @@ static PyMethodDef Server_methods[] = {
     {"setAmp", (PyCFunction)Server_setAmp, METH_O, "Sets the overall amplitude."},
     {"setAmpCallable", (PyCFunction)Server_setAmpCallable, METH_O, "Sets the Server's GUI callable object."},
     {"setTimeCallable", (PyCFunction)Server_setTimeCallable, METH_O, "Sets the Server's TIME callable object."},
+    {"setProfiling", (PyCFunction)Server_setProfiling, METH_O, "Activates or deactivates the profiler."},
+    {"setProfileCallable", (PyCFunction)Server_setProfileCallable, METH_VARARGS, "Sets the object called periodically by the profiler, and the period in seconds."},
+    {"addChanges", (PyCFunction)Server_addChanges, METH_O, "Queues a callable applied at the start of the next buffer."},
+    {"schedule", (PyCFunction)Server_schedule, METH_VARARGS|METH_KEYWORDS, "Schedules a call, returns the event handle."},
+    {"scheduleValue", (PyCFunction)Server_scheduleValue, METH_VARARGS|METH_KEYWORDS, "Schedules a sample accurate value change of a Sig object, returns the event handle."},
+    {"cancel", (PyCFunction)Server_cancel, METH_O, "Cancels a scheduled event."},
+    {"reschedule", (PyCFunction)Server_reschedule, METH_VARARGS|METH_KEYWORDS, "Moves a scheduled event to a new time."},
+    {"getPendingEvents", (PyCFunction)Server_getPendingEvents, METH_NOARGS, "Returns the number of scheduled events."},
+    {"_waitCalls", (PyCFunction)Server_waitCalls, METH_O, "Waits for deferred calls and returns them. For internal use only."},
+    {"getCallStats", (PyCFunction)Server_getCallStats, METH_NOARGS, "Returns the counters of the deferred calls queue."},
+    {"resetCallStats", (PyCFunction)Server_resetCallStats, METH_NOARGS, "Resets the counters of the deferred calls queue."},
+    {"setWorkers", (PyCFunction)Server_setWorkers, METH_O, "Sets the number of threads computing the processing lanes."},
+    {"getWorkers", (PyCFunction)Server_getWorkers, METH_NOARGS, "Returns the number of threads computing the processing lanes."},
+    {"setAutoSleep", (PyCFunction)Server_setAutoSleep, METH_O, "Allows or forbids the automatic sleep of silent streams."},
+    {"getAutoSleep", (PyCFunction)Server_getAutoSleep, METH_NOARGS, "Returns True if silent streams are allowed to sleep."},
+    {"getWorkerLoad", (PyCFunction)Server_getWorkerLoad, METH_NOARGS, "Returns the number of blocks and the busy time of every thread since the last reset."},
+    {"resetWorkerLoad", (PyCFunction)Server_resetWorkerLoad, METH_NOARGS, "Resets the busy time of every thread."},
+    {"getProfile", (PyCFunction)Server_getProfile, METH_NOARGS, "Returns the number of blocks, late blocks, total and maximum block time recorded by the profiler."},
+    {"resetProfile", (PyCFunction)Server_resetProfile, METH_NOARGS, "Resets the profiler's counters, including the ones of every stream."},
     {"setVerbosity", (PyCFunction)Server_setVerbosity, METH_O, "Sets the verbosity."},
     {"setStartOffset", (PyCFunction)Server_setStartOffset, METH_O, "Sets starting time offset."},
     {"boot", (PyCFunction)Server_boot, METH_O, "Setup and boot the server."},
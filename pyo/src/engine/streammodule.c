@@ -26,7 +26,13 @@
 #include "streammodule.h"
 #undef __STREAM_MODULE
 
+/* Common head of the audio objects, used by the control-rate mode. */
+typedef struct {
+    pyo_audio_HEAD
+} PyoAudioObject;
+
 int stream_id = 1;
+int stream_autosleep = 1;
 
 int 
 Stream_getNewStreamId() 
@@ -38,6 +44,7 @@ static int
 Stream_traverse(Stream *self, visitproc visit, void *arg)
 {
     Py_VISIT(self->streamobject);    
+    Py_VISIT(self->sleepinput);
     return 0;
 }
 
@@ -45,6 +52,7 @@ static int
 Stream_clear(Stream *self)
 {
     Py_CLEAR(self->streamobject);    
+    Py_CLEAR(self->sleepinput);
     return 0;
 }
 
@@ -80,6 +88,12 @@ Stream_getStreamToDac(Stream *self)
     return self->todac;
 }
 
+int
+Stream_getLane(Stream *self)
+{
+    return self->lane;
+}
+
 int
 Stream_getBufferCountWait(Stream *self)
 {
@@ -109,9 +123,143 @@ void Stream_setFunctionPtr(Stream *self, void *ptr)
     self->funcptr = ptr;
 }
 
-void Stream_callFunction(Stream *self)
+/* Control-rate mode: the object computes one value every `krate` samples. 
+   Its buffer size and sampling rate are scaled down for the call, so time 
+   keeps running at the right speed, and the values are then spread over 
+   the buffer, held or linearly ramped from the previous one. Converters 
+   read their input every `kstride` samples. */
+
+static void
+Stream_computeControl(Stream *self)
 {
+    int i, k, start, end, num;
+    MYFLT value, last, inc;
+    PyoAudioObject *obj = (PyoAudioObject *)self->streamobject;
+    int bufsize = obj->bufsize;
+    double sr = obj->sr;
+    int krate = self->krate;
+
+    num = (bufsize + krate - 1) / krate;
+    obj->bufsize = num;
+    obj->sr = sr * num / bufsize;
+    obj->kstride = krate;
     (*self->funcptr)(self->streamobject);
+    obj->bufsize = bufsize;
+    obj->sr = sr;
+    obj->kstride = 1;
+
+    /* The object stopped itself (an envelope reaching its end), STOP only 
+       cleared the values, the whole buffer must be silent. */
+    if (! Stream_getStreamActive(self)) {
+        for (i=0; i<bufsize; i++)
+            self->data[i] = 0.0;
+        self->klast = 0.0;
+        return;
+    }
+
+    /* Spreads from the end, value k is never overwritten before it is read. */
+    last = self->klast;
+    self->klast = self->data[num-1];
+    for (k=num-1; k>=0; k--) {
+        value = self->data[k];
+        start = k * krate;
+        end = start + krate;
+        if (end > bufsize)
+            end = bufsize;
+        if (self->kramp) {
+            if (k > 0)
+                inc = self->data[k-1];
+            else
+                inc = last;
+            inc = (value - inc) / (end - start);
+            for (i=end-1; i>=start; i--) {
+                self->data[i] = value;
+                value -= inc;
+            }
+        }
+        else {
+            for (i=start; i<end; i++)
+                self->data[i] = value;
+        }
+    }
+}
+
+static void
+Stream_compute(Stream *self)
+{
+    if (self->krate > 1)
+        Stream_computeControl(self);
+    else
+        (*self->funcptr)(self->streamobject);
+}
+
+/* Automatic sleep: a stream watching an input stops computing its samples 
+   when the input and its own output stayed under the threshold for 
+   `sleepwait` buffers, which also covers the tail of its delay lines. It 
+   outputs zeros until the input is no longer silent. */
+
+void Stream_setAutoSleep(int x)
+{
+    stream_autosleep = x;
+}
+
+int Stream_getAutoSleep()
+{
+    return stream_autosleep;
+}
+
+static int
+Stream_isSilent(MYFLT *data, int size, MYFLT thresh)
+{
+    int i;
+    for (i=0; i<size; i++) {
+        if (MYFABS(data[i]) >= thresh)
+            return 0;
+    }
+    return 1;
+}
+
+static void
+Stream_callFunctionSleep(Stream *self)
+{
+    int silent;
+
+    if (!stream_autosleep) {
+        if (self->sleeping) {
+            self->sleeping = 0;
+            self->wakes++;
+        }
+        self->silentcount = 0;
+        Stream_compute(self);
+        return;
+    }
+
+    silent = Stream_isSilent(Stream_getData((Stream *)self->sleepinput), self->bufsize, self->sleepthresh);
+    if (self->sleeping) {
+        if (silent)
+            return;
+        self->sleeping = 0;
+        self->wakes++;
+        self->silentcount = 0;
+    }
+    Stream_compute(self);
+    if (silent && Stream_isSilent(self->data, self->bufsize, self->sleepthresh)) {
+        if (++self->silentcount >= self->sleepwait) {
+            self->sleeping = 1;
+            self->sleeps++;
+            memset(self->data, 0, self->bufsize * sizeof(MYFLT));
+        }
+    }
+    else
+        self->silentcount = 0;
+}
+
+void Stream_callFunction(Stream *self)
+{
+    if (self->sleepinput == NULL)
+        Stream_compute(self);
+    else
+        Stream_callFunctionSleep(self);
 }    
 
 void Stream_IncrementBufferCount(Stream *self) 
@@ -132,6 +280,97 @@ void Stream_IncrementDurationCount(Stream *self)
     }
 }
 
+void Stream_addProfileTime(Stream *self, double elapsed)
+{
+    self->cpuTime += elapsed;
+    self->numCalls++;
+}
+
+static PyObject *
+Stream_getProfile(Stream *self) {
+    return Py_BuildValue("dk", self->cpuTime, self->numCalls);
+}
+
+static PyObject *
+Stream_resetProfile(Stream *self) {
+    self->cpuTime = 0.0;
+    self->numCalls = 0;
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+Stream_setLane(Stream *self, PyObject *arg) {
+    if (arg != NULL && PyInt_Check(arg))
+        self->lane = PyInt_AsLong(arg);
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+Stream_getLaneNumber(Stream *self) {
+    return PyInt_FromLong(self->lane);
+}
+
+static PyObject *
+Stream_setSleep(Stream *self, PyObject *args) {
+    PyObject *input;
+    MYFLT thresh;
+    int wait;
+
+    if (! PyArg_ParseTuple(args, "O" TYPE_F "i", &input, &thresh, &wait))
+        return NULL;
+
+    if (input == Py_None || wait <= 0) {
+        Py_CLEAR(self->sleepinput);
+    }
+    else {
+        if (! PyObject_TypeCheck(input, &StreamType)) {
+            PyErr_SetString(PyExc_TypeError, "setSleep: input must be a Stream object.");
+            return NULL;
+        }
+        Py_INCREF(input);
+        Py_XDECREF(self->sleepinput);
+        self->sleepinput = input;
+    }
+    self->sleepthresh = thresh;
+    self->sleepwait = wait;
+    self->silentcount = self->sleeping = 0;
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+Stream_setControlRate(Stream *self, PyObject *args) {
+    int krate, kramp = 0;
+
+    if (! PyArg_ParseTuple(args, "i|i", &krate, &kramp))
+        return NULL;
+
+    if (krate < 1)
+        krate = 1;
+    else if (krate > self->bufsize)
+        krate = self->bufsize;
+    self->krate = krate;
+    self->kramp = kramp != 0;
+    if (krate > 1)
+        self->klast = self->data[self->bufsize-1];
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+Stream_getControlRate(Stream *self) {
+    return Py_BuildValue("ii", self->krate, self->kramp);
+}
+
+static PyObject *
+Stream_getSleepStats(Stream *self) {
+    return Py_BuildValue("kki", self->sleeps, self->wakes, self->sleeping);
+}
+
+static PyObject *
+Stream_resetSleepStats(Stream *self) {
+    self->sleeps = self->wakes = 0;
+    Py_RETURN_NONE;
+}
+
 static PyObject *
 Stream_getValue(Stream *self) {
     return Py_BuildValue(TYPE_F, self->data[self->bufsize-1]);
@@ -173,6 +412,15 @@ static PyMethodDef Stream_methods[] = {
 {"getStreamObject", (PyCFunction)Stream_getStreamObject, METH_NOARGS, "Returns the object associated with this stream."},
 {"isPlaying", (PyCFunction)Stream_isPlaying, METH_NOARGS, "Returns True if the stream is playing, otherwise, returns False."},
 {"isOutputting", (PyCFunction)Stream_isOutputting, METH_NOARGS, "Returns True if the stream outputs to dac, otherwise, returns False."},
+{"getProfile", (PyCFunction)Stream_getProfile, METH_NOARGS, "Returns the processing time, in seconds, and the number of calls recorded by the server's profiler."},
+{"setLane", (PyCFunction)Stream_setLane, METH_O, "Sets the processing lane of the stream, 0 means the callback thread."},
+{"getLane", (PyCFunction)Stream_getLaneNumber, METH_NOARGS, "Returns the processing lane of the stream."},
+{"resetProfile", (PyCFunction)Stream_resetProfile, METH_NOARGS, "Resets the processing time and the number of calls recorded by the server's profiler."},
+{"setSleep", (PyCFunction)Stream_setSleep, METH_VARARGS, "Sets the input stream, the threshold and the number of silent buffers of the automatic sleep. None as input disables it."},
+{"setControlRate", (PyCFunction)Stream_setControlRate, METH_VARARGS, "Sets the number of samples per computed value (1 means audio rate) and whether the values are ramped."},
+{"getControlRate", (PyCFunction)Stream_getControlRate, METH_NOARGS, "Returns the number of samples per computed value and whether the values are ramped."},
+{"getSleepStats", (PyCFunction)Stream_getSleepStats, METH_NOARGS, "Returns the number of times the stream went to sleep, woke up, and whether it is sleeping."},
+{"resetSleepStats", (PyCFunction)Stream_resetSleepStats, METH_NOARGS, "Resets the sleep and wake counters."},
 {NULL}  /* Sentinel */
 };
 
@@ -31,6 +31,7 @@
 #include "wind.h"
 #include "pyomodule.h"
 #include <math.h>
+#include <stdlib.h>
 
 void gen_window(MYFLT *window, int size, int wintype) {
     int i;
@@ -123,3 +124,69 @@ void gen_window(MYFLT *window, int size, int wintype) {
     return;
 }
 
+/* Windows shared by the spectral objects, keyed by size and type. Tables 
+   no longer used are kept for the next object asking for them, there is 
+   one at most per size and window type. Used with the GIL held. */
+typedef struct {
+    int size;
+    int wintype;
+    int refcount;
+    MYFLT *window;
+} WindowEntry;
+
+static WindowEntry *window_cache = NULL;
+static int window_cache_len = 0;
+static long window_hits = 0;
+static long window_misses = 0;
+
+MYFLT * acquire_window(int size, int wintype) {
+    int i;
+    WindowEntry *entry;
+
+    for (i=0; i<window_cache_len; i++) {
+        entry = &window_cache[i];
+        if (entry->size == size && entry->wintype == wintype) {
+            entry->refcount++;
+            window_hits++;
+            return entry->window;
+        }
+    }
+    window_misses++;
+    window_cache = (WindowEntry *)realloc(window_cache, (window_cache_len + 1) * sizeof(WindowEntry));
+    entry = &window_cache[window_cache_len++];
+    entry->size = size;
+    entry->wintype = wintype;
+    entry->refcount = 1;
+    entry->window = (MYFLT *)malloc(size * sizeof(MYFLT));
+    gen_window(entry->window, size, wintype);
+    return entry->window;
+}
+
+void release_window(MYFLT *window) {
+    int i;
+
+    if (window == NULL)
+        return;
+    for (i=0; i<window_cache_len; i++) {
+        if (window_cache[i].window == window) {
+            window_cache[i].refcount--;
+            return;
+        }
+    }
+}
+
+/* stats: number of tables, tables in use, hits and misses. */
+void window_cache_stats(long *stats, int reset) {
+    int i;
+
+    stats[0] = window_cache_len;
+    stats[1] = 0;
+    for (i=0; i<window_cache_len; i++) {
+        if (window_cache[i].refcount > 0)
+            stats[1]++;
+    }
+    stats[2] = window_hits;
+    stats[3] = window_misses;
+    if (reset)
+        window_hits = window_misses = 0;
+}
@@ -4036,3 +4036,493 @@ M_Tanh_members,                                 /* tp_members */
 0,                                              /* tp_alloc */
 M_Tanh_new,                                     /* tp_new */
 };
+
+/************/
+/* M_Fuse */
+/************/
+/* Opcodes of a fused expression program, must match _FUSE_OPCODES in pyolib/arithmetic.py. */
+enum {
+    FUSE_INPUT = 0, FUSE_CONST,
+    FUSE_ADD, FUSE_SUB, FUSE_MUL, FUSE_DIV,
+    FUSE_ADDC, FUSE_SUBC, FUSE_RSUBC, FUSE_MULC,
+    FUSE_POW, FUSE_ATAN2, FUSE_WRAP,
+    FUSE_LT, FUSE_LE, FUSE_GT, FUSE_GE, FUSE_EQ, FUSE_NE,
+    FUSE_SIN, FUSE_COS, FUSE_TAN, FUSE_ABS, FUSE_SQRT, FUSE_LOG, FUSE_LOG2, FUSE_LOG10,
+    FUSE_FLOOR, FUSE_CEIL, FUSE_ROUND, FUSE_TANH,
+    FUSE_NUM_OPCODES
+};
+
+/* Number of stack slots popped and pushed by each opcode. */
+static const int FUSE_POPS[FUSE_NUM_OPCODES] = {0, 0, 2, 2, 2, 2, 1, 1, 1, 1, 2, 2, 3,
+                                                2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1};
+
+typedef struct {
+    pyo_audio_HEAD
+    PyObject *inputs;
+    Stream **input_streams;
+    int num_inputs;
+    int *opcodes;
+    MYFLT *args;
+    int num_ops;
+    int depth;
+    MYFLT *scratch;
+    MYFLT **slots;
+    int modebuffer[2]; // need at least 2 slots for mul & add
+} M_Fuse;
+
+static void
+M_Fuse_process(M_Fuse *self) {
+    int i, j, sp = 0;
+    MYFLT val, mi, ma, rng, tmp;
+    MYFLT *a, *b, *c, *in;
+
+    for (j=0; j<self->num_ops; j++) {
+        switch (self->opcodes[j]) {
+            case FUSE_INPUT:
+                a = self->slots[sp++];
+                in = Stream_getData(self->input_streams[(int)self->args[j]]);
+                memcpy(a, in, self->bufsize * sizeof(MYFLT));
+                break;
+            case FUSE_CONST:
+                a = self->slots[sp++];
+                val = self->args[j];
+                for (i=0; i<self->bufsize; i++) { a[i] = val; }
+                break;
+            case FUSE_ADDC:
+                a = self->slots[sp-1]; val = self->args[j];
+                for (i=0; i<self->bufsize; i++) { a[i] += val; }
+                break;
+            case FUSE_SUBC:
+                a = self->slots[sp-1]; val = self->args[j];
+                for (i=0; i<self->bufsize; i++) { a[i] -= val; }
+                break;
+            case FUSE_RSUBC:
+                a = self->slots[sp-1]; val = self->args[j];
+                for (i=0; i<self->bufsize; i++) { a[i] = val - a[i]; }
+                break;
+            case FUSE_MULC:
+                a = self->slots[sp-1]; val = self->args[j];
+                for (i=0; i<self->bufsize; i++) { a[i] *= val; }
+                break;
+            case FUSE_WRAP:
+                /* Same algorithm as the Wrap object. */
+                sp -= 2;
+                a = self->slots[sp-1]; b = self->slots[sp]; c = self->slots[sp+1];
+                for (i=0; i<self->bufsize; i++) {
+                    val = a[i]; mi = b[i]; ma = c[i];
+                    if (mi >= ma)
+                        a[i] = (mi + ma) * 0.5;
+                    else {
+                        rng = ma - mi;
+                        tmp = (val - mi) / rng;
+                        if (tmp >= 1.0) {
+                            tmp -= (int)tmp;
+                            val = tmp * rng + mi;
+                        }
+                        else if (tmp < 0) {
+                            tmp += (int)(-tmp) + 1;
+                            val = tmp * rng + mi;
+                            if (val == ma)
+                                val = mi;
+                        }
+                        a[i] = val;
+                    }
+                }
+                break;
+            default:
+                if (FUSE_POPS[self->opcodes[j]] == 2) {
+                    sp--;
+                    a = self->slots[sp-1]; b = self->slots[sp];
+                    switch (self->opcodes[j]) {
+                        case FUSE_ADD: for (i=0; i<self->bufsize; i++) { a[i] += b[i]; } break;
+                        case FUSE_SUB: for (i=0; i<self->bufsize; i++) { a[i] -= b[i]; } break;
+                        case FUSE_MUL: for (i=0; i<self->bufsize; i++) { a[i] *= b[i]; } break;
+                        case FUSE_DIV:
+                            /* Same divisor clipping as the audio rate division of Dummy. */
+                            for (i=0; i<self->bufsize; i++) {
+                                tmp = b[i];
+                                if (tmp < 0.00001 && tmp > -0.00001)
+                                    tmp = 0.00001;
+                                a[i] /= tmp;
+                            }
+                            break;
+                        case FUSE_POW: for (i=0; i<self->bufsize; i++) { a[i] = MYPOW(a[i], b[i]); } break;
+                        case FUSE_ATAN2: for (i=0; i<self->bufsize; i++) { a[i] = MYATAN2(a[i], b[i]); } break;
+                        case FUSE_LT: for (i=0; i<self->bufsize; i++) { a[i] = a[i] < b[i] ? 1.0 : 0.0; } break;
+                        case FUSE_LE: for (i=0; i<self->bufsize; i++) { a[i] = a[i] <= b[i] ? 1.0 : 0.0; } break;
+                        case FUSE_GT: for (i=0; i<self->bufsize; i++) { a[i] = a[i] > b[i] ? 1.0 : 0.0; } break;
+                        case FUSE_GE: for (i=0; i<self->bufsize; i++) { a[i] = a[i] >= b[i] ? 1.0 : 0.0; } break;
+                        case FUSE_EQ:
+                            for (i=0; i<self->bufsize; i++) { a[i] = (a[i] >= (b[i] - 0.0001) && a[i] <= (b[i] + 0.0001)) ? 1.0 : 0.0; }
+                            break;
+                        case FUSE_NE:
+                            for (i=0; i<self->bufsize; i++) { a[i] = (a[i] <= (b[i] - 0.0001) || a[i] >= (b[i] + 0.0001)) ? 1.0 : 0.0; }
+                            break;
+                    }
+                }
+                else {
+                    a = self->slots[sp-1];
+                    switch (self->opcodes[j]) {
+                        case FUSE_SIN: for (i=0; i<self->bufsize; i++) { a[i] = MYSIN(a[i]); } break;
+                        case FUSE_COS: for (i=0; i<self->bufsize; i++) { a[i] = MYCOS(a[i]); } break;
+                        case FUSE_TAN: for (i=0; i<self->bufsize; i++) { a[i] = MYTAN(a[i]); } break;
+                        case FUSE_ABS: for (i=0; i<self->bufsize; i++) { if (a[i] < 0.0) a[i] = -a[i]; } break;
+                        case FUSE_SQRT: for (i=0; i<self->bufsize; i++) { a[i] = a[i] < 0.0 ? 0.0 : MYSQRT(a[i]); } break;
+                        case FUSE_LOG: for (i=0; i<self->bufsize; i++) { a[i] = a[i] <= 0.0 ? 0.0 : MYLOG(a[i]); } break;
+                        case FUSE_LOG2: for (i=0; i<self->bufsize; i++) { a[i] = a[i] <= 0.0 ? 0.0 : MYLOG2(a[i]); } break;
+                        case FUSE_LOG10: for (i=0; i<self->bufsize; i++) { a[i] = a[i] <= 0.0 ? 0.0 : MYLOG10(a[i]); } break;
+                        case FUSE_FLOOR: for (i=0; i<self->bufsize; i++) { a[i] = MYFLOOR(a[i]); } break;
+                        case FUSE_CEIL: for (i=0; i<self->bufsize; i++) { a[i] = MYCEIL(a[i]); } break;
+                        case FUSE_ROUND: for (i=0; i<self->bufsize; i++) { a[i] = MYROUND(a[i]); } break;
+                        case FUSE_TANH: for (i=0; i<self->bufsize; i++) { a[i] = MYTANH(a[i]); } break;
+                    }
+                }
+                break;
+        }
+    }
+}
+
+static void M_Fuse_postprocessing_ii(M_Fuse *self) { POST_PROCESSING_II };
+static void M_Fuse_postprocessing_ai(M_Fuse *self) { POST_PROCESSING_AI };
+static void M_Fuse_postprocessing_ia(M_Fuse *self) { POST_PROCESSING_IA };
+static void M_Fuse_postprocessing_aa(M_Fuse *self) { POST_PROCESSING_AA };
+static void M_Fuse_postprocessing_ireva(M_Fuse *self) { POST_PROCESSING_IREVA };
+static void M_Fuse_postprocessing_areva(M_Fuse *self) { POST_PROCESSING_AREVA };
+static void M_Fuse_postprocessing_revai(M_Fuse *self) { POST_PROCESSING_REVAI };
+static void M_Fuse_postprocessing_revaa(M_Fuse *self) { POST_PROCESSING_REVAA };
+static void M_Fuse_postprocessing_revareva(M_Fuse *self) { POST_PROCESSING_REVAREVA };
+
+static void
+M_Fuse_setProcMode(M_Fuse *self)
+{
+    int muladdmode;
+    muladdmode = self->modebuffer[0] + self->modebuffer[1] * 10;
+    
+    self->proc_func_ptr = M_Fuse_process;
+ 
+	switch (muladdmode) {
+        case 0:        
+            self->muladd_func_ptr = M_Fuse_postprocessing_ii;
+            break;
+        case 1:    
+            self->muladd_func_ptr = M_Fuse_postprocessing_ai;
+            break;
+        case 2:    
+            self->muladd_func_ptr = M_Fuse_postprocessing_revai;
+            break;
+        case 10:        
+            self->muladd_func_ptr = M_Fuse_postprocessing_ia;
+            break;
+        case 11:    
+            self->muladd_func_ptr = M_Fuse_postprocessing_aa;
+            break;
+        case 12:    
+            self->muladd_func_ptr = M_Fuse_postprocessing_revaa;
+            break;
+        case 20:        
+            self->muladd_func_ptr = M_Fuse_postprocessing_ireva;
+            break;
+        case 21:    
+            self->muladd_func_ptr = M_Fuse_postprocessing_areva;
+            break;
+        case 22:    
+            self->muladd_func_ptr = M_Fuse_postprocessing_revareva;
+            break;
+    }   
+}
+
+static void
+M_Fuse_compute_next_data_frame(M_Fuse *self)
+{
+    (*self->proc_func_ptr)(self); 
+    (*self->muladd_func_ptr)(self);
+}
+
+static int
+M_Fuse_traverse(M_Fuse *self, visitproc visit, void *arg)
+{
+    pyo_VISIT
+    Py_VISIT(self->inputs);
+    return 0;
+}
+
+static int 
+M_Fuse_clear(M_Fuse *self)
+{
+    pyo_CLEAR
+    Py_CLEAR(self->inputs);
+    return 0;
+}
+
+static void
+M_Fuse_dealloc(M_Fuse* self)
+{
+    int i;
+    pyo_DEALLOC
+    for (i=0; i<self->num_inputs; i++) {
+        Py_XDECREF(self->input_streams[i]);
+    }
+    free(self->input_streams);
+    free(self->opcodes);
+    free(self->args);
+    free(self->scratch);
+    free(self->slots);
+    M_Fuse_clear(self);
+    self->ob_type->tp_free((PyObject*)self);
+}
+
+/* Validates the program, computes its stack depth and allocates the stack slots. */
+static int
+M_Fuse_setProgram(M_Fuse *self, PyObject *program)
+{
+    int i, op, sp = 0, depth = 0;
+    PyObject *item;
+
+    if (! PyList_Check(program)) {
+        PyErr_SetString(PyExc_TypeError, "M_Fuse program must be a list of (opcode, argument) tuples.");
+        return -1;
+    }
+
+    self->num_ops = PyList_Size(program);
+    self->opcodes = (int *)realloc(self->opcodes, self->num_ops * sizeof(int));
+    self->args = (MYFLT *)realloc(self->args, self->num_ops * sizeof(MYFLT));
+
+    for (i=0; i<self->num_ops; i++) {
+        item = PyList_GET_ITEM(program, i);
+        if (! PyTuple_Check(item) || PyTuple_Size(item) != 2) {
+            PyErr_SetString(PyExc_TypeError, "M_Fuse program must be a list of (opcode, argument) tuples.");
+            return -1;
+        }
+        op = PyInt_AsLong(PyTuple_GET_ITEM(item, 0));
+        if (op < 0 || op >= FUSE_NUM_OPCODES) {
+            PyErr_SetString(PyExc_ValueError, "M_Fuse program contains an unknown opcode.");
+            return -1;
+        }
+        self->opcodes[i] = op;
+        self->args[i] = PyFloat_AsDouble(PyTuple_GET_ITEM(item, 1));
+        if (op == FUSE_INPUT && (self->args[i] < 0 || (int)self->args[i] >= self->num_inputs)) {
+            PyErr_SetString(PyExc_ValueError, "M_Fuse program refers to an unknown input.");
+            return -1;
+        }
+        if (op == FUSE_INPUT || op == FUSE_CONST)
+            sp++;
+        else if (sp < FUSE_POPS[op]) {
+            PyErr_SetString(PyExc_ValueError, "M_Fuse program stack underflow.");
+            return -1;
+        }
+        else
+            sp -= FUSE_POPS[op] - 1;
+        if (sp > depth)
+            depth = sp;
+    }
+
+    if (sp != 1) {
+        PyErr_SetString(PyExc_ValueError, "M_Fuse program must leave exactly one value on the stack.");
+        return -1;
+    }
+
+    /* The bottom of the stack is the output buffer itself. */
+    self->depth = depth;
+    if (depth > 1)
+        self->scratch = (MYFLT *)realloc(self->scratch, (depth - 1) * self->bufsize * sizeof(MYFLT));
+    self->slots = (MYFLT **)realloc(self->slots, depth * sizeof(MYFLT *));
+    self->slots[0] = self->data;
+    for (i=1; i<depth; i++) {
+        self->slots[i] = self->scratch + (i - 1) * self->bufsize;
+    }
+    return 0;
+}
+
+static PyObject *
+M_Fuse_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
+{
+    int i;
+    PyObject *inputstmp, *programtmp, *streamtmp, *multmp=NULL, *addtmp=NULL;
+    M_Fuse *self;
+    self = (M_Fuse *)type->tp_alloc(type, 0);
+
+	self->modebuffer[0] = 0;
+	self->modebuffer[1] = 0;
+    
+    INIT_OBJECT_COMMON
+    Stream_setFunctionPtr(self->stream, M_Fuse_compute_next_data_frame);
+    self->mode_func_ptr = M_Fuse_setProcMode;
+
+    static char *kwlist[] = {"inputs", "program", "mul", "add", NULL};
+    
+    if (! PyArg_ParseTupleAndKeywords(args, kwds, "OO|OO", kwlist, &inputstmp, &programtmp, &multmp, &addtmp))
+        Py_RETURN_NONE;
+
+    if (! PyList_Check(inputstmp)) {
+        PyErr_SetString(PyExc_TypeError, "M_Fuse inputs must be a list of audio objects.");
+        Py_DECREF(self);
+        return NULL;
+    }
+
+    Py_INCREF(inputstmp);
+    Py_XDECREF(self->inputs);
+    self->inputs = inputstmp;
+    self->num_inputs = PyList_Size(inputstmp);
+    self->input_streams = (Stream **)realloc(self->input_streams, self->num_inputs * sizeof(Stream *));
+    for (i=0; i<self->num_inputs; i++) {
+        streamtmp = PyObject_CallMethod(PyList_GET_ITEM(inputstmp, i), "_getStream", NULL);
+        if (streamtmp == NULL) {
+            self->num_inputs = i;
+            Py_DECREF(self);
+            return NULL;
+        }
+        self->input_streams[i] = (Stream *)streamtmp;
+    }
+
+    if (M_Fuse_setProgram(self, programtmp) < 0) {
+        Py_DECREF(self);
+        return NULL;
+    }
+    
+    if (multmp) {
+        PyObject_CallMethod((PyObject *)self, "setMul", "O", multmp);
+    }
+    
+    if (addtmp) {
+        PyObject_CallMethod((PyObject *)self, "setAdd", "O", addtmp);
+    }
+    
+    PyObject_CallMethod(self->server, "addStream", "O", self->stream);
+    
+    (*self->mode_func_ptr)(self);
+
+    return (PyObject *)self;
+}
+
+static PyObject * M_Fuse_getServer(M_Fuse* self) { GET_SERVER };
+static PyObject * M_Fuse_getStream(M_Fuse* self) { GET_STREAM };
+static PyObject * M_Fuse_setMul(M_Fuse *self, PyObject *arg) { SET_MUL };	
+static PyObject * M_Fuse_setAdd(M_Fuse *self, PyObject *arg) { SET_ADD };	
+static PyObject * M_Fuse_setSub(M_Fuse *self, PyObject *arg) { SET_SUB };	
+static PyObject * M_Fuse_setDiv(M_Fuse *self, PyObject *arg) { SET_DIV };	
+
+static PyObject * M_Fuse_play(M_Fuse *self, PyObject *args, PyObject *kwds) { PLAY };
+static PyObject * M_Fuse_out(M_Fuse *self, PyObject *args, PyObject *kwds) { OUT };
+static PyObject * M_Fuse_stop(M_Fuse *self) { STOP };
+
+static PyObject * M_Fuse_multiply(M_Fuse *self, PyObject *arg) { MULTIPLY };
+static PyObject * M_Fuse_inplace_multiply(M_Fuse *self, PyObject *arg) { INPLACE_MULTIPLY };
+static PyObject * M_Fuse_add(M_Fuse *self, PyObject *arg) { ADD };
+static PyObject * M_Fuse_inplace_add(M_Fuse *self, PyObject *arg) { INPLACE_ADD };
+static PyObject * M_Fuse_sub(M_Fuse *self, PyObject *arg) { SUB };
+static PyObject * M_Fuse_inplace_sub(M_Fuse *self, PyObject *arg) { INPLACE_SUB };
+static PyObject * M_Fuse_div(M_Fuse *self, PyObject *arg) { DIV };
+static PyObject * M_Fuse_inplace_div(M_Fuse *self, PyObject *arg) { INPLACE_DIV };
+
+static PyObject *
+M_Fuse_getDepth(M_Fuse *self)
+{
+    return PyInt_FromLong(self->depth);
+}
+
+static PyMemberDef M_Fuse_members[] = {
+{"server", T_OBJECT_EX, offsetof(M_Fuse, server), 0, "Pyo server."},
+{"stream", T_OBJECT_EX, offsetof(M_Fuse, stream), 0, "Stream object."},
+{"inputs", T_OBJECT_EX, offsetof(M_Fuse, inputs), 0, "List of input sound objects."},
+{"mul", T_OBJECT_EX, offsetof(M_Fuse, mul), 0, "Mul factor."},
+{"add", T_OBJECT_EX, offsetof(M_Fuse, add), 0, "Add factor."},
+{NULL}  /* Sentinel */
+};
+
+static PyMethodDef M_Fuse_methods[] = {
+{"getServer", (PyCFunction)M_Fuse_getServer, METH_NOARGS, "Returns server object."},
+{"_getStream", (PyCFunction)M_Fuse_getStream, METH_NOARGS, "Returns stream object."},
+{"play", (PyCFunction)M_Fuse_play, METH_VARARGS|METH_KEYWORDS, "Starts computing without sending sound to soundcard."},
+{"stop", (PyCFunction)M_Fuse_stop, METH_NOARGS, "Stops computing."},
+{"out", (PyCFunction)M_Fuse_out, METH_VARARGS|METH_KEYWORDS, "Starts computing and sends sound to soundcard channel speficied by argument."},
+{"getDepth", (PyCFunction)M_Fuse_getDepth, METH_NOARGS, "Returns the number of buffers used to evaluate the expression."},
+{"setMul", (PyCFunction)M_Fuse_setMul, METH_O, "Sets oscillator mul factor."},
+{"setAdd", (PyCFunction)M_Fuse_setAdd, METH_O, "Sets oscillator add factor."},
+{"setSub", (PyCFunction)M_Fuse_setSub, METH_O, "Sets inverse add factor."},
+{"setDiv", (PyCFunction)M_Fuse_setDiv, METH_O, "Sets inverse mul factor."},
+{NULL}  /* Sentinel */
+};
+
+static PyNumberMethods M_Fuse_as_number = {
+(binaryfunc)M_Fuse_add,                         /*nb_add*/
+(binaryfunc)M_Fuse_sub,                         /*nb_subtract*/
+(binaryfunc)M_Fuse_multiply,                    /*nb_multiply*/
+(binaryfunc)M_Fuse_div,                                              /*nb_divide*/
+0,                                              /*nb_remainder*/
+0,                                              /*nb_divmod*/
+0,                                              /*nb_power*/
+0,                                              /*nb_neg*/
+0,                                              /*nb_pos*/
+0,                                              /*(unaryfunc)array_abs,*/
+0,                                              /*nb_nonzero*/
+0,                                              /*nb_invert*/
+0,                                              /*nb_lshift*/
+0,                                              /*nb_rshift*/
+0,                                              /*nb_and*/
+0,                                              /*nb_xor*/
+0,                                              /*nb_or*/
+0,                                              /*nb_coerce*/
+0,                                              /*nb_int*/
+0,                                              /*nb_long*/
+0,                                              /*nb_float*/
+0,                                              /*nb_oct*/
+0,                                              /*nb_hex*/
+(binaryfunc)M_Fuse_inplace_add,                 /*inplace_add*/
+(binaryfunc)M_Fuse_inplace_sub,                 /*inplace_subtract*/
+(binaryfunc)M_Fuse_inplace_multiply,            /*inplace_multiply*/
+(binaryfunc)M_Fuse_inplace_div,                                              /*inplace_divide*/
+0,                                              /*inplace_remainder*/
+0,                                              /*inplace_power*/
+0,                                              /*inplace_lshift*/
+0,                                              /*inplace_rshift*/
+0,                                              /*inplace_and*/
+0,                                              /*inplace_xor*/
+0,                                              /*inplace_or*/
+0,                                              /*nb_floor_divide*/
+0,                                              /*nb_true_divide*/
+0,                                              /*nb_inplace_floor_divide*/
+0,                                              /*nb_inplace_true_divide*/
+0,                                              /* nb_index */
+};
+
+PyTypeObject M_FuseType = {
+PyObject_HEAD_INIT(NULL)
+0,                                              /*ob_size*/
+"_pyo.M_Fuse_base",                                   /*tp_name*/
+sizeof(M_Fuse),                                 /*tp_basicsize*/
+0,                                              /*tp_itemsize*/
+(destructor)M_Fuse_dealloc,                     /*tp_dealloc*/
+0,                                              /*tp_print*/
+0,                                              /*tp_getattr*/
+0,                                              /*tp_setattr*/
+0,                                              /*tp_compare*/
+0,                                              /*tp_repr*/
+&M_Fuse_as_number,                              /*tp_as_number*/
+0,                                              /*tp_as_sequence*/
+0,                                              /*tp_as_mapping*/
+0,                                              /*tp_hash */
+0,                                              /*tp_call*/
+0,                                              /*tp_str*/
+0,                                              /*tp_getattro*/
+0,                                              /*tp_setattro*/
+0,                                              /*tp_as_buffer*/
+Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC | Py_TPFLAGS_CHECKTYPES, /*tp_flags*/
+"M_Fuse objects. Evaluates a fused arithmetic expression on audio samples.",           /* tp_doc */
+(traverseproc)M_Fuse_traverse,                  /* tp_traverse */
+(inquiry)M_Fuse_clear,                          /* tp_clear */
+0,                                              /* tp_richcompare */
+0,                                              /* tp_weaklistoffset */
+0,                                              /* tp_iter */
+0,                                              /* tp_iternext */
+M_Fuse_methods,                                 /* tp_methods */
+M_Fuse_members,                                 /* tp_members */
+0,                                              /* tp_getset */
+0,                                              /* tp_base */
+0,                                              /* tp_dict */
+0,                                              /* tp_descr_get */
+0,                                              /* tp_descr_set */
+0,                                              /* tp_dictoffset */
+0,                          /* tp_init */
+0,                                              /* tp_alloc */
+M_Fuse_new,                                     /* tp_new */
+};
@@ -25,6 +25,7 @@
 #include "streammodule.h"
 #include "servermodule.h"
 #include "dummymodule.h"
+#include "tablemodule.h"
 
 typedef struct {
     pyo_audio_HEAD
@@ -1333,3 +1334,698 @@ PyTypeObject FourBandType = {
     0,                         /* tp_alloc */
     FourBand_new,                 /* tp_new */
 };
+
+/************************************************************************************************/
+/* FilterBank main object */
+/************************************************************************************************/
+typedef struct {
+    pyo_audio_HEAD
+    PyObject *input;
+    Stream *input_stream;
+    int bands;
+    int filtertype;
+    int summed;
+    MYFLT nyquist;
+    MYFLT TwoPiOnSr;
+    MYFLT *freqs;
+    MYFLT *qs;
+    // input memories, shared by all the bands
+    MYFLT x1;
+    MYFLT x2;
+    // output memories, one per band
+    MYFLT *y1;
+    MYFLT *y2;
+    // coefficients, one per band, already divided by a0
+    MYFLT *b0;
+    MYFLT *b1;
+    MYFLT *b2;
+    MYFLT *a1;
+    MYFLT *a2;
+    // interleaved outputs, sample i of band j at [i * bands + j], or the sum of the bands
+    MYFLT *buffer_streams;
+} FilterBanker;
+
+static void
+FilterBanker_compute_coeffs(FilterBanker *self, int j)
+{
+    MYFLT freq, q, w0, c, alpha, a0, b0, b1, b2, a1, a2;
+
+    freq = self->freqs[j];
+    q = self->qs[j];
+    if (freq <= 1)
+        freq = 1;
+    else if (freq >= self->nyquist)
+        freq = self->nyquist;
+    if (q < 0.1)
+        q = 0.1;
+
+    w0 = self->TwoPiOnSr * freq;
+    c = MYCOS(w0);
+    alpha = MYSIN(w0) / (2 * q);
+    a0 = 1 + alpha;
+    a1 = -2 * c;
+    a2 = 1 - alpha;
+
+    switch (self->filtertype) {
+        case 0: /* lowpass */
+            b0 = b2 = (1 - c) / 2;
+            b1 = 1 - c;
+            break;
+        case 1: /* highpass */
+            b0 = b2 = (1 + c) / 2;
+            b1 = -(1 + c);
+            break;
+        case 3: /* bandstop */
+            b0 = b2 = 1;
+            b1 = a1;
+            break;
+        case 4: /* allpass */
+            b0 = a2;
+            b1 = a1;
+            b2 = a0;
+            break;
+        default: /* bandpass */
+            b0 = alpha;
+            b1 = 0;
+            b2 = -alpha;
+            break;
+    }
+
+    self->b0[j] = b0 / a0;
+    self->b1[j] = b1 / a0;
+    self->b2[j] = b2 / a0;
+    self->a1[j] = a1 / a0;
+    self->a2[j] = a2 / a0;
+}
+
+/* Copies the values given by `arg` (a number, a list of numbers or a 
+   table object) in `dest`, one per band, wrapping around a shorter list 
+   or table. Returns -1 and sets an error if `arg` can't be read. */
+static int
+FilterBanker_readValues(FilterBanker *self, PyObject *arg, MYFLT *dest)
+{
+    int j, size;
+    MYFLT value, *data;
+    PyObject *tablestream;
+
+    if (PyNumber_Check(arg)) {
+        value = PyFloat_AsDouble(arg);
+        for (j=0; j<self->bands; j++)
+            dest[j] = value;
+    }
+    else if (PyList_Check(arg) && PyList_Size(arg) > 0) {
+        size = PyList_Size(arg);
+        for (j=0; j<self->bands; j++)
+            dest[j] = PyFloat_AsDouble(PyList_GET_ITEM(arg, j % size));
+        if (PyErr_Occurred())
+            return -1;
+    }
+    else if (PyObject_HasAttrString(arg, "getTableStream")) {
+        tablestream = PyObject_CallMethod(arg, "getTableStream", "");
+        size = TableStream_getSize(tablestream);
+        data = TableStream_getData(tablestream);
+        for (j=0; j<self->bands; j++)
+            dest[j] = data[j % size];
+        Py_DECREF(tablestream);
+    }
+    else {
+        PyErr_SetString(PyExc_TypeError, "FilterBank values must be a number, a list of numbers or a PyoTableObject.");
+        return -1;
+    }
+    return 0;
+}
+
+/* The bands are computed in the inner loop: the coefficients and the 
+   memories are contiguous arrays and the bands don't depend on each 
+   other, so the compiler can process several bands per instruction. */
+static void
+FilterBanker_filters(FilterBanker *self) {
+    int i, j, bands = self->bands;
+    MYFLT x, x1, x2, val;
+    MYFLT *b0 = self->b0, *b1 = self->b1, *b2 = self->b2, *a1 = self->a1, *a2 = self->a2;
+    MYFLT *y1 = self->y1, *y2 = self->y2, *out;
+    MYFLT *in = Stream_getData((Stream *)self->input_stream);
+
+    x1 = self->x1;
+    x2 = self->x2;
+    for (i=0; i<self->bufsize; i++) {
+        x = in[i];
+        out = self->buffer_streams + i * bands;
+        for (j=0; j<bands; j++) {
+            val = b0[j] * x + b1[j] * x1 + b2[j] * x2 - a1[j] * y1[j] - a2[j] * y2[j];
+            y2[j] = y1[j];
+            y1[j] = val;
+            out[j] = val;
+        }
+        x2 = x1;
+        x1 = x;
+    }
+    self->x1 = x1;
+    self->x2 = x2;
+}
+
+static void
+FilterBanker_filters_sum(FilterBanker *self) {
+    int i, j, bands = self->bands;
+    MYFLT x, x1, x2, val, sum;
+    MYFLT *b0 = self->b0, *b1 = self->b1, *b2 = self->b2, *a1 = self->a1, *a2 = self->a2;
+    MYFLT *y1 = self->y1, *y2 = self->y2;
+    MYFLT *in = Stream_getData((Stream *)self->input_stream);
+
+    x1 = self->x1;
+    x2 = self->x2;
+    for (i=0; i<self->bufsize; i++) {
+        x = in[i];
+        sum = 0.0;
+        for (j=0; j<bands; j++) {
+            val = b0[j] * x + b1[j] * x1 + b2[j] * x2 - a1[j] * y1[j] - a2[j] * y2[j];
+            y2[j] = y1[j];
+            y1[j] = val;
+            sum += val;
+        }
+        self->buffer_streams[i] = sum;
+        x2 = x1;
+        x1 = x;
+    }
+    self->x1 = x1;
+    self->x2 = x2;
+}
+
+/* Copies the samples of band `chnl`, or the sum of the bands, in `dest`. */
+void
+FilterBanker_getSamples(FilterBanker *self, int chnl, MYFLT *dest)
+{
+    int i;
+    if (self->summed) {
+        memcpy(dest, self->buffer_streams, self->bufsize * sizeof(MYFLT));
+    }
+    else {
+        for (i=0; i<self->bufsize; i++) {
+            dest[i] = self->buffer_streams[i * self->bands + chnl];
+        }
+    }
+}
+
+static void
+FilterBanker_setProcMode(FilterBanker *self)
+{
+    if (self->summed)
+        self->proc_func_ptr = FilterBanker_filters_sum;
+    else
+        self->proc_func_ptr = FilterBanker_filters;
+}
+
+static void
+FilterBanker_compute_next_data_frame(FilterBanker *self)
+{
+    (*self->proc_func_ptr)(self); 
+}
+
+static int
+FilterBanker_traverse(FilterBanker *self, visitproc visit, void *arg)
+{
+    pyo_VISIT
+    Py_VISIT(self->input);
+    Py_VISIT(self->input_stream);
+    return 0;
+}
+
+static int 
+FilterBanker_clear(FilterBanker *self)
+{
+    pyo_CLEAR
+    Py_CLEAR(self->input);
+    Py_CLEAR(self->input_stream);
+    return 0;
+}
+
+static void
+FilterBanker_dealloc(FilterBanker* self)
+{
+    pyo_DEALLOC
+    free(self->freqs);
+    free(self->qs);
+    free(self->y1);
+    free(self->y2);
+    free(self->b0);
+    free(self->b1);
+    free(self->b2);
+    free(self->a1);
+    free(self->a2);
+    free(self->buffer_streams);
+    FilterBanker_clear(self);
+    self->ob_type->tp_free((PyObject*)self);
+}
+
+static PyObject *
+FilterBanker_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
+{
+    int i, j;
+    PyObject *inputtmp, *input_streamtmp, *freqstmp, *qstmp=NULL;
+    FilterBanker *self;
+    self = (FilterBanker *)type->tp_alloc(type, 0);
+
+    self->bands = 1;
+    self->filtertype = 2;
+    self->summed = 0;
+    self->x1 = self->x2 = 0.0;
+
+    INIT_OBJECT_COMMON
+    Stream_setFunctionPtr(self->stream, FilterBanker_compute_next_data_frame);
+    self->mode_func_ptr = FilterBanker_setProcMode;
+
+    self->nyquist = self->sr * 0.49;
+    self->TwoPiOnSr = TWOPI / self->sr;
+
+    static char *kwlist[] = {"input", "bands", "freqs", "q", "type", "sum", NULL};
+
+    if (! PyArg_ParseTupleAndKeywords(args, kwds, "OiO|Oii", kwlist, &inputtmp, &self->bands, &freqstmp, &qstmp, &self->filtertype, &self->summed))
+        Py_RETURN_NONE;
+
+    if (self->bands < 1)
+        self->bands = 1;
+
+    INIT_INPUT_STREAM
+
+    self->freqs = (MYFLT *)realloc(self->freqs, self->bands * sizeof(MYFLT));
+    self->qs = (MYFLT *)realloc(self->qs, self->bands * sizeof(MYFLT));
+    self->y1 = (MYFLT *)realloc(self->y1, self->bands * sizeof(MYFLT));
+    self->y2 = (MYFLT *)realloc(self->y2, self->bands * sizeof(MYFLT));
+    self->b0 = (MYFLT *)realloc(self->b0, self->bands * sizeof(MYFLT));
+    self->b1 = (MYFLT *)realloc(self->b1, self->bands * sizeof(MYFLT));
+    self->b2 = (MYFLT *)realloc(self->b2, self->bands * sizeof(MYFLT));
+    self->a1 = (MYFLT *)realloc(self->a1, self->bands * sizeof(MYFLT));
+    self->a2 = (MYFLT *)realloc(self->a2, self->bands * sizeof(MYFLT));
+    if (self->summed)
+        self->buffer_streams = (MYFLT *)realloc(self->buffer_streams, self->bufsize * sizeof(MYFLT));
+    else
+        self->buffer_streams = (MYFLT *)realloc(self->buffer_streams, self->bands * self->bufsize * sizeof(MYFLT));
+
+    for (j=0; j<self->bands; j++) {
+        self->qs[j] = 10.0;
+        self->y1[j] = self->y2[j] = 0.0;
+    }
+
+    if (FilterBanker_readValues(self, freqstmp, self->freqs) < 0) {
+        Py_DECREF(self);
+        return NULL;
+    }
+    if (qstmp && FilterBanker_readValues(self, qstmp, self->qs) < 0) {
+        Py_DECREF(self);
+        return NULL;
+    }
+    for (j=0; j<self->bands; j++)
+        FilterBanker_compute_coeffs(self, j);
+
+    PyObject_CallMethod(self->server, "addStream", "O", self->stream);
+
+    (*self->mode_func_ptr)(self);
+
+    return (PyObject *)self;
+}
+
+static PyObject *
+FilterBanker_setFreqs(FilterBanker *self, PyObject *arg)
+{
+    int j;
+
+    if (FilterBanker_readValues(self, arg, self->freqs) < 0)
+        return NULL;
+    for (j=0; j<self->bands; j++)
+        FilterBanker_compute_coeffs(self, j);
+
+	Py_INCREF(Py_None);
+	return Py_None;
+}
+
+static PyObject *
+FilterBanker_setQ(FilterBanker *self, PyObject *arg)
+{
+    int j;
+
+    if (FilterBanker_readValues(self, arg, self->qs) < 0)
+        return NULL;
+    for (j=0; j<self->bands; j++)
+        FilterBanker_compute_coeffs(self, j);
+
+	Py_INCREF(Py_None);
+	return Py_None;
+}
+
+static PyObject *
+FilterBanker_setType(FilterBanker *self, PyObject *arg)
+{
+    int j;
+
+    if (PyInt_Check(arg)) {
+        self->filtertype = PyInt_AsLong(arg);
+        for (j=0; j<self->bands; j++)
+            FilterBanker_compute_coeffs(self, j);
+    }
+
+	Py_INCREF(Py_None);
+	return Py_None;
+}
+
+static PyObject *
+FilterBanker_getFreqs(FilterBanker *self)
+{
+    int j;
+    PyObject *freqs = PyList_New(self->bands);
+    for (j=0; j<self->bands; j++)
+        PyList_SET_ITEM(freqs, j, PyFloat_FromDouble(self->freqs[j]));
+    return freqs;
+}
+
+static PyObject *
+FilterBanker_reset(FilterBanker *self)
+{
+    int j;
+    self->x1 = self->x2 = 0.0;
+    for (j=0; j<self->bands; j++)
+        self->y1[j] = self->y2[j] = 0.0;
+
+	Py_INCREF(Py_None);
+	return Py_None;
+}
+
+static PyObject * FilterBanker_getServer(FilterBanker* self) { GET_SERVER };
+static PyObject * FilterBanker_getStream(FilterBanker* self) { GET_STREAM };
+
+static PyObject * FilterBanker_play(FilterBanker *self, PyObject *args, PyObject *kwds) { PLAY };
+static PyObject * FilterBanker_stop(FilterBanker *self) { STOP };
+
+static PyMemberDef FilterBanker_members[] = {
+{"server", T_OBJECT_EX, offsetof(FilterBanker, server), 0, "Pyo server."},
+{"stream", T_OBJECT_EX, offsetof(FilterBanker, stream), 0, "Stream object."},
+{"input", T_OBJECT_EX, offsetof(FilterBanker, input), 0, "Input sound object."},
+{NULL}  /* Sentinel */
+};
+
+static PyMethodDef FilterBanker_methods[] = {
+{"getServer", (PyCFunction)FilterBanker_getServer, METH_NOARGS, "Returns server object."},
+{"_getStream", (PyCFunction)FilterBanker_getStream, METH_NOARGS, "Returns stream object."},
+{"setFreqs", (PyCFunction)FilterBanker_setFreqs, METH_O, "Sets the frequencies of the bands."},
+{"setQ", (PyCFunction)FilterBanker_setQ, METH_O, "Sets the Q of the bands."},
+{"setType", (PyCFunction)FilterBanker_setType, METH_O, "Sets the type of the filters."},
+{"getFreqs", (PyCFunction)FilterBanker_getFreqs, METH_NOARGS, "Returns the frequencies of the bands."},
+{"reset", (PyCFunction)FilterBanker_reset, METH_NOARGS, "Resets the memories of the filters."},
+{"play", (PyCFunction)FilterBanker_play, METH_VARARGS|METH_KEYWORDS, "Starts computing without sending sound to soundcard."},
+{"stop", (PyCFunction)FilterBanker_stop, METH_NOARGS, "Stops computing."},
+{NULL}  /* Sentinel */
+};
+
+PyTypeObject FilterBankerType = {
+PyObject_HEAD_INIT(NULL)
+0,                                              /*ob_size*/
+"_pyo.FilterBanker_base",                                   /*tp_name*/
+sizeof(FilterBanker),                                 /*tp_basicsize*/
+0,                                              /*tp_itemsize*/
+(destructor)FilterBanker_dealloc,                     /*tp_dealloc*/
+0,                                              /*tp_print*/
+0,                                              /*tp_getattr*/
+0,                                              /*tp_setattr*/
+0,                                              /*tp_compare*/
+0,                                              /*tp_repr*/
+0,                              /*tp_as_number*/
+0,                                              /*tp_as_sequence*/
+0,                                              /*tp_as_mapping*/
+0,                                              /*tp_hash */
+0,                                              /*tp_call*/
+0,                                              /*tp_str*/
+0,                                              /*tp_getattro*/
+0,                                              /*tp_setattro*/
+0,                                              /*tp_as_buffer*/
+Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC | Py_TPFLAGS_CHECKTYPES, /*tp_flags*/
+"FilterBanker objects. Bank of second-order filters processing the same signal.",           /* tp_doc */
+(traverseproc)FilterBanker_traverse,                  /* tp_traverse */
+(inquiry)FilterBanker_clear,                          /* tp_clear */
+0,                                              /* tp_richcompare */
+0,                                              /* tp_weaklistoffset */
+0,                                              /* tp_iter */
+0,                                              /* tp_iternext */
+FilterBanker_methods,                                 /* tp_methods */
+FilterBanker_members,                                 /* tp_members */
+0,                                              /* tp_getset */
+0,                                              /* tp_base */
+0,                                              /* tp_dict */
+0,                                              /* tp_descr_get */
+0,                                              /* tp_descr_set */
+0,                                              /* tp_dictoffset */
+0,                          /* tp_init */
+0,                                              /* tp_alloc */
+FilterBanker_new,                                     /* tp_new */
+};
+
+/************************************************************************************************/
+/* FilterBank streamer object */
+/************************************************************************************************/
+typedef struct {
+    pyo_audio_HEAD
+    FilterBanker *mainBank;
+    int modebuffer[2];
+    int chnl; 
+} FilterBank;
+
+static void FilterBank_postprocessing_ii(FilterBank *self) { POST_PROCESSING_II };
+static void FilterBank_postprocessing_ai(FilterBank *self) { POST_PROCESSING_AI };
+static void FilterBank_postprocessing_ia(FilterBank *self) { POST_PROCESSING_IA };
+static void FilterBank_postprocessing_aa(FilterBank *self) { POST_PROCESSING_AA };
+static void FilterBank_postprocessing_ireva(FilterBank *self) { POST_PROCESSING_IREVA };
+static void FilterBank_postprocessing_areva(FilterBank *self) { POST_PROCESSING_AREVA };
+static void FilterBank_postprocessing_revai(FilterBank *self) { POST_PROCESSING_REVAI };
+static void FilterBank_postprocessing_revaa(FilterBank *self) { POST_PROCESSING_REVAA };
+static void FilterBank_postprocessing_revareva(FilterBank *self) { POST_PROCESSING_REVAREVA };
+
+static void
+FilterBank_setProcMode(FilterBank *self)
+{
+    int muladdmode;
+    muladdmode = self->modebuffer[0] + self->modebuffer[1] * 10;
+    
+	switch (muladdmode) {
+        case 0:        
+            self->muladd_func_ptr = FilterBank_postprocessing_ii;
+            break;
+        case 1:    
+            self->muladd_func_ptr = FilterBank_postprocessing_ai;
+            break;
+        case 2:    
+            self->muladd_func_ptr = FilterBank_postprocessing_revai;
+            break;
+        case 10:        
+            self->muladd_func_ptr = FilterBank_postprocessing_ia;
+            break;
+        case 11:    
+            self->muladd_func_ptr = FilterBank_postprocessing_aa;
+            break;
+        case 12:    
+            self->muladd_func_ptr = FilterBank_postprocessing_revaa;
+            break;
+        case 20:        
+            self->muladd_func_ptr = FilterBank_postprocessing_ireva;
+            break;
+        case 21:    
+            self->muladd_func_ptr = FilterBank_postprocessing_areva;
+            break;
+        case 22:    
+            self->muladd_func_ptr = FilterBank_postprocessing_revareva;
+            break;
+    }
+}
+
+static void
+FilterBank_compute_next_data_frame(FilterBank *self)
+{
+    FilterBanker_getSamples((FilterBanker *)self->mainBank, self->chnl, self->data);
+    (*self->muladd_func_ptr)(self);
+}
+
+static int
+FilterBank_traverse(FilterBank *self, visitproc visit, void *arg)
+{
+    pyo_VISIT
+    Py_VISIT(self->mainBank);
+    return 0;
+}
+
+static int 
+FilterBank_clear(FilterBank *self)
+{
+    pyo_CLEAR
+    Py_CLEAR(self->mainBank);    
+    return 0;
+}
+
+static void
+FilterBank_dealloc(FilterBank* self)
+{
+    pyo_DEALLOC
+    FilterBank_clear(self);
+    self->ob_type->tp_free((PyObject*)self);
+}
+
+static PyObject *
+FilterBank_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
+{
+    int i;
+    PyObject *maintmp=NULL, *multmp=NULL, *addtmp=NULL;
+    FilterBank *self;
+    self = (FilterBank *)type->tp_alloc(type, 0);
+    
+    self->chnl = 0;
+	self->modebuffer[0] = 0;
+	self->modebuffer[1] = 0;
+    
+    INIT_OBJECT_COMMON
+    Stream_setFunctionPtr(self->stream, FilterBank_compute_next_data_frame);
+    self->mode_func_ptr = FilterBank_setProcMode;
+
+    static char *kwlist[] = {"mainBank", "chnl", "mul", "add", NULL};
+    
+    if (! PyArg_ParseTupleAndKeywords(args, kwds, "O|iOO", kwlist, &maintmp, &self->chnl, &multmp, &addtmp))
+        Py_RETURN_NONE;
+    
+    Py_XDECREF(self->mainBank);
+    Py_INCREF(maintmp);
+    self->mainBank = (FilterBanker *)maintmp;
+    
+    if (multmp) {
+        PyObject_CallMethod((PyObject *)self, "setMul", "O", multmp);
+    }
+    
+    if (addtmp) {
+        PyObject_CallMethod((PyObject *)self, "setAdd", "O", addtmp);
+    }
+    
+    PyObject_CallMethod(self->server, "addStream", "O", self->stream);
+    
+    (*self->mode_func_ptr)(self);
+    
+    return (PyObject *)self;
+}
+
+static PyObject * FilterBank_getServer(FilterBank* self) { GET_SERVER };
+static PyObject * FilterBank_getStream(FilterBank* self) { GET_STREAM };
+static PyObject * FilterBank_setMul(FilterBank *self, PyObject *arg) { SET_MUL };	
+static PyObject * FilterBank_setAdd(FilterBank *self, PyObject *arg) { SET_ADD };	
+static PyObject * FilterBank_setSub(FilterBank *self, PyObject *arg) { SET_SUB };	
+static PyObject * FilterBank_setDiv(FilterBank *self, PyObject *arg) { SET_DIV };	
+
+static PyObject * FilterBank_play(FilterBank *self, PyObject *args, PyObject *kwds) { PLAY };
+static PyObject * FilterBank_out(FilterBank *self, PyObject *args, PyObject *kwds) { OUT };
+static PyObject * FilterBank_stop(FilterBank *self) { STOP };
+
+static PyObject * FilterBank_multiply(FilterBank *self, PyObject *arg) { MULTIPLY };
+static PyObject * FilterBank_inplace_multiply(FilterBank *self, PyObject *arg) { INPLACE_MULTIPLY };
+static PyObject * FilterBank_add(FilterBank *self, PyObject *arg) { ADD };
+static PyObject * FilterBank_inplace_add(FilterBank *self, PyObject *arg) { INPLACE_ADD };
+static PyObject * FilterBank_sub(FilterBank *self, PyObject *arg) { SUB };
+static PyObject * FilterBank_inplace_sub(FilterBank *self, PyObject *arg) { INPLACE_SUB };
+static PyObject * FilterBank_div(FilterBank *self, PyObject *arg) { DIV };
+static PyObject * FilterBank_inplace_div(FilterBank *self, PyObject *arg) { INPLACE_DIV };
+
+static PyMemberDef FilterBank_members[] = {
+{"server", T_OBJECT_EX, offsetof(FilterBank, server), 0, "Pyo server."},
+{"stream", T_OBJECT_EX, offsetof(FilterBank, stream), 0, "Stream object."},
+{"mul", T_OBJECT_EX, offsetof(FilterBank, mul), 0, "Mul factor."},
+{"add", T_OBJECT_EX, offsetof(FilterBank, add), 0, "Add factor."},
+{NULL}  /* Sentinel */
+};
+
+static PyMethodDef FilterBank_methods[] = {
+{"getServer", (PyCFunction)FilterBank_getServer, METH_NOARGS, "Returns server object."},
+{"_getStream", (PyCFunction)FilterBank_getStream, METH_NOARGS, "Returns stream object."},
+{"play", (PyCFunction)FilterBank_play, METH_VARARGS|METH_KEYWORDS, "Starts computing without sending sound to soundcard."},
+{"out", (PyCFunction)FilterBank_out, METH_VARARGS|METH_KEYWORDS, "Starts computing and sends sound to soundcard channel speficied by argument."},
+{"stop", (PyCFunction)FilterBank_stop, METH_NOARGS, "Stops computing."},
+{"setMul", (PyCFunction)FilterBank_setMul, METH_O, "Sets FilterBank mul factor."},
+{"setAdd", (PyCFunction)FilterBank_setAdd, METH_O, "Sets FilterBank add factor."},
+{"setSub", (PyCFunction)FilterBank_setSub, METH_O, "Sets inverse add factor."},
+{"setDiv", (PyCFunction)FilterBank_setDiv, METH_O, "Sets inverse mul factor."},
+{NULL}  /* Sentinel */
+};
+
+static PyNumberMethods FilterBank_as_number = {
+(binaryfunc)FilterBank_add,                      /*nb_add*/
+(binaryfunc)FilterBank_sub,                 /*nb_subtract*/
+(binaryfunc)FilterBank_multiply,                 /*nb_multiply*/
+(binaryfunc)FilterBank_div,                   /*nb_divide*/
+0,                /*nb_remainder*/
+0,                   /*nb_divmod*/
+0,                   /*nb_power*/
+0,                  /*nb_neg*/
+0,                /*nb_pos*/
+0,                  /*(unaryfunc)array_abs,*/
+0,                    /*nb_nonzero*/
+0,                    /*nb_invert*/
+0,               /*nb_lshift*/
+0,              /*nb_rshift*/
+0,              /*nb_and*/
+0,              /*nb_xor*/
+0,               /*nb_or*/
+0,                                          /*nb_coerce*/
+0,                       /*nb_int*/
+0,                      /*nb_long*/
+0,                     /*nb_float*/
+0,                       /*nb_oct*/
+0,                       /*nb_hex*/
+(binaryfunc)FilterBank_inplace_add,              /*inplace_add*/
+(binaryfunc)FilterBank_inplace_sub,         /*inplace_subtract*/
+(binaryfunc)FilterBank_inplace_multiply,         /*inplace_multiply*/
+(binaryfunc)FilterBank_inplace_div,           /*inplace_divide*/
+0,        /*inplace_remainder*/
+0,           /*inplace_power*/
+0,       /*inplace_lshift*/
+0,      /*inplace_rshift*/
+0,      /*inplace_and*/
+0,      /*inplace_xor*/
+0,       /*inplace_or*/
+0,             /*nb_floor_divide*/
+0,              /*nb_true_divide*/
+0,     /*nb_inplace_floor_divide*/
+0,      /*nb_inplace_true_divide*/
+0,                     /* nb_index */
+};
+
+PyTypeObject FilterBankType = {
+PyObject_HEAD_INIT(NULL)
+0,                         /*ob_size*/
+"_pyo.FilterBank_base",         /*tp_name*/
+sizeof(FilterBank),         /*tp_basicsize*/
+0,                         /*tp_itemsize*/
+(destructor)FilterBank_dealloc, /*tp_dealloc*/
+0,                         /*tp_print*/
+0,                         /*tp_getattr*/
+0,                         /*tp_setattr*/
+0,                         /*tp_compare*/
+0,                         /*tp_repr*/
+&FilterBank_as_number,             /*tp_as_number*/
+0,                         /*tp_as_sequence*/
+0,                         /*tp_as_mapping*/
+0,                         /*tp_hash */
+0,                         /*tp_call*/
+0,                         /*tp_str*/
+0,                         /*tp_getattro*/
+0,                         /*tp_setattro*/
+0,                         /*tp_as_buffer*/
+Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC | Py_TPFLAGS_CHECKTYPES,  /*tp_flags*/
+"FilterBank objects. Reads one band, or the sum of the bands, from a FilterBanker process.",           /* tp_doc */
+(traverseproc)FilterBank_traverse,   /* tp_traverse */
+(inquiry)FilterBank_clear,           /* tp_clear */
+0,		               /* tp_richcompare */
+0,		               /* tp_weaklistoffset */
+0,		               /* tp_iter */
+0,		               /* tp_iternext */
+FilterBank_methods,             /* tp_methods */
+FilterBank_members,             /* tp_members */
+0,                      /* tp_getset */
+0,                         /* tp_base */
+0,                         /* tp_dict */
+0,                         /* tp_descr_get */
+0,                         /* tp_descr_set */
+0,                         /* tp_dictoffset */
+0,      /* tp_init */
+0,                         /* tp_alloc */
+FilterBank_new,                 /* tp_new */
+};
@@ -52,6 +52,9 @@ Fader_generate_auto(Fader *self) {
     MYFLT val;
     int i;
 
+    /* the sampling rate is scaled down in control-rate mode */
+    self->sampleToSec = 1. / self->sr;
+
     for (i=0; i<self->bufsize; i++) {
         if (self->currentTime <= self->attack)
             val = self->currentTime / self->attack;
@@ -73,6 +76,9 @@ static void
 Fader_generate_wait(Fader *self) {
     MYFLT val;
     int i;
+
+    /* the sampling rate is scaled down in control-rate mode */
+    self->sampleToSec = 1. / self->sr;
     
     for (i=0; i<self->bufsize; i++) {
         if (self->fademode == 0) {
@@ -419,6 +425,9 @@ static void
 Adsr_generate_auto(Adsr *self) {
     MYFLT val, invatt, invdec, invrel;
     int i;
+
+    /* the sampling rate is scaled down in control-rate mode */
+    self->sampleToSec = 1. / self->sr;
     
     invatt = 1.0 / self->attack;
     invdec = 1.0 / self->decay;
@@ -448,6 +457,9 @@ Adsr_generate_wait(Adsr *self) {
     MYFLT val, invatt, invdec, invrel;
     int i;
 
+    /* the sampling rate is scaled down in control-rate mode */
+    self->sampleToSec = 1. / self->sr;
+
     if (self->fademode == 1 && self->currentTime > self->release)
         Adsr_internal_stop((Adsr *)self);
     
@@ -861,6 +873,9 @@ Linseg_reinit(Linseg *self) {
 static void
 Linseg_generate(Linseg *self) {
     int i;
+
+    /* the sampling rate is scaled down in control-rate mode */
+    self->sampleToSec = 1. / self->sr;
     
     for (i=0; i<self->bufsize; i++) {
         if (self->flag == 1) {
@@ -1250,6 +1265,9 @@ static void
 Expseg_generate(Expseg *self) {
     int i;
     double scl;
+
+    /* the sampling rate is scaled down in control-rate mode */
+    self->sampleToSec = 1. / self->sr;
     
     for (i=0; i<self->bufsize; i++) {
         if (self->flag == 1) {
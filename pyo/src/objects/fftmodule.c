@@ -28,6 +28,7 @@
 #include "fft.h"
 #include "wind.h"
 #include "sndfile.h"
+#include <sys/stat.h>
 
 static int 
 isPowerOfTwo(int x) {
@@ -47,15 +48,16 @@ typedef struct {
     MYFLT *outframe;
     MYFLT *window;
     MYFLT **twiddle;
+    RealFFTPlan *plan; /* only with algo 1 */
+    int algo;
     MYFLT *twiddle2;
     MYFLT *buffer_streams;
 } FFTMain;
 
 static void
 FFTMain_realloc_memories(FFTMain *self) {
-    int i, n8;
+    int i;
     self->hsize = self->size / 2;
-    n8 = self->size >> 3;
     self->inframe = (MYFLT *)realloc(self->inframe, self->size * sizeof(MYFLT));
     self->outframe = (MYFLT *)realloc(self->outframe, self->size * sizeof(MYFLT));    
     for (i=0; i<self->size; i++)
@@ -63,14 +65,14 @@ FFTMain_realloc_memories(FFTMain *self) {
     self->buffer_streams = (MYFLT *)realloc(self->buffer_streams, 3 * self->bufsize * sizeof(MYFLT));
     for (i=0; i<(self->bufsize*3); i++)
         self->buffer_streams[i] = 0.0;
-    self->twiddle = (MYFLT **)realloc(self->twiddle, 4 * sizeof(MYFLT *));
-    for(i=0; i<4; i++)
-        self->twiddle[i] = (MYFLT *)malloc(n8 * sizeof(MYFLT));
-    fft_compute_split_twiddle(self->twiddle, self->size);
-    self->twiddle2 = (MYFLT *)realloc(self->twiddle2, self->size * sizeof(MYFLT));
-    fft_compute_radix2_twiddle(self->twiddle2, self->size);
-    self->window = (MYFLT *)realloc(self->window, self->size * sizeof(MYFLT));
-    gen_window(self->window, self->size, self->wintype);
+    fft_release_split_twiddle(self->twiddle);
+    self->twiddle = fft_acquire_split_twiddle(self->size);
+    fft_release_real_plan(self->plan);
+    self->plan = self->algo ? fft_acquire_real_plan(self->size) : NULL;
+    fft_release_radix2_twiddle(self->twiddle2);
+    self->twiddle2 = fft_acquire_radix2_twiddle(self->size);
+    release_window(self->window);
+    self->window = acquire_window(self->size, self->wintype);
     self->incount = -self->hopsize;
 }
 
@@ -100,7 +102,10 @@ FFTMain_filters(FFTMain *self) {
         incount++;
         if (incount >= self->size) {
             incount -= self->size;      
-            realfft_split(self->inframe, self->outframe, self->size, self->twiddle);
+            if (self->plan != NULL)
+                realfft_batched(self->inframe, self->outframe, self->plan);
+            else
+                realfft_split(self->inframe, self->outframe, self->size, self->twiddle);
         }
     } 
 
@@ -165,17 +170,14 @@ FFTMain_clear(FFTMain *self)
 static void
 FFTMain_dealloc(FFTMain* self)
 {
-    int i;
     pyo_DEALLOC
     free(self->inframe);
     free(self->outframe);
-    free(self->window);
+    release_window(self->window);
     free(self->buffer_streams);
-    for(i=0; i<4; i++) {
-        free(self->twiddle[i]);
-    }
-    free(self->twiddle);
-    free(self->twiddle2);
+    fft_release_split_twiddle(self->twiddle);
+    fft_release_radix2_twiddle(self->twiddle2);
+    fft_release_real_plan(self->plan);
     FFTMain_clear(self);
     self->ob_type->tp_free((PyObject*)self);
 }
@@ -194,9 +196,9 @@ FFTMain_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
     Stream_setFunctionPtr(self->stream, FFTMain_compute_next_data_frame);
     self->mode_func_ptr = FFTMain_setProcMode;
 
-    static char *kwlist[] = {"input", "size", "hopsize", "wintype", NULL};
+    static char *kwlist[] = {"input", "size", "hopsize", "wintype", "algo", NULL};
     
-    if (! PyArg_ParseTupleAndKeywords(args, kwds, "O|iii", kwlist, &inputtmp, &self->size, &self->hopsize, &self->wintype))
+    if (! PyArg_ParseTupleAndKeywords(args, kwds, "O|iiii", kwlist, &inputtmp, &self->size, &self->hopsize, &self->wintype, &self->algo))
         Py_RETURN_NONE;
 
     INIT_INPUT_STREAM
@@ -244,7 +246,21 @@ FFTMain_setWinType(FFTMain *self, PyObject *arg)
 {    
     if (PyLong_Check(arg) || PyInt_Check(arg)) {
         self->wintype = PyLong_AsLong(arg);
-        gen_window(self->window, self->size, self->wintype);
+        release_window(self->window);
+        self->window = acquire_window(self->size, self->wintype);
+    }    
+    
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject *
+FFTMain_setAlgo(FFTMain *self, PyObject *arg)
+{    
+    if (PyLong_Check(arg) || PyInt_Check(arg)) {
+        self->algo = PyInt_AsLong(arg);
+        fft_release_real_plan(self->plan);
+        self->plan = self->algo ? fft_acquire_real_plan(self->size) : NULL;
     }    
     
     Py_INCREF(Py_None);
@@ -265,6 +281,7 @@ static PyMethodDef FFTMain_methods[] = {
 {"stop", (PyCFunction)FFTMain_stop, METH_NOARGS, "Stops computing."},
 {"setSize", (PyCFunction)FFTMain_setSize, METH_VARARGS|METH_KEYWORDS, "Sets a new FFT size."},
 {"setWinType", (PyCFunction)FFTMain_setWinType, METH_O, "Sets a new window."},
+{"setAlgo", (PyCFunction)FFTMain_setAlgo, METH_O, "Sets the FFT algorithm."},
 {NULL}  /* Sentinel */
 };
 
@@ -581,27 +598,28 @@ typedef struct {
     MYFLT *outframe;    
     MYFLT *window;
     MYFLT **twiddle;
+    RealFFTPlan *plan; /* only with algo 1 */
+    int algo;
     MYFLT *twiddle2;
     int modebuffer[2];
 } IFFT;
 
 static void
 IFFT_realloc_memories(IFFT *self) {
-    int i, n8;
+    int i;
     self->hsize = self->size / 2;
-    n8 = self->size >> 3;
     self->inframe = (MYFLT *)realloc(self->inframe, self->size * sizeof(MYFLT));
     self->outframe = (MYFLT *)realloc(self->outframe, self->size * sizeof(MYFLT));    
     for (i=0; i<self->size; i++)
         self->inframe[i] = self->outframe[i] = 0.0;
-    self->twiddle = (MYFLT **)realloc(self->twiddle, 4 * sizeof(MYFLT *));
-    for(i=0; i<4; i++)
-        self->twiddle[i] = (MYFLT *)malloc(n8 * sizeof(MYFLT));
-    fft_compute_split_twiddle(self->twiddle, self->size);
-    self->twiddle2 = (MYFLT *)realloc(self->twiddle2, self->size * sizeof(MYFLT));
-    fft_compute_radix2_twiddle(self->twiddle2, self->size);
-    self->window = (MYFLT *)realloc(self->window, self->size * sizeof(MYFLT));
-    gen_window(self->window, self->size, self->wintype);
+    fft_release_split_twiddle(self->twiddle);
+    self->twiddle = fft_acquire_split_twiddle(self->size);
+    fft_release_real_plan(self->plan);
+    self->plan = self->algo ? fft_acquire_real_plan(self->size) : NULL;
+    fft_release_radix2_twiddle(self->twiddle2);
+    self->twiddle2 = fft_acquire_radix2_twiddle(self->size);
+    release_window(self->window);
+    self->window = acquire_window(self->size, self->wintype);
     self->incount = -self->hopsize;
 }
 
@@ -628,7 +646,10 @@ IFFT_filters(IFFT *self) {
         incount++;
         if (incount >= self->size) {
             incount -= self->size;      
-            irealfft_split(self->inframe, self->outframe, self->size, self->twiddle);
+            if (self->plan != NULL)
+                irealfft_batched(self->inframe, self->outframe, self->plan);
+            else
+                irealfft_split(self->inframe, self->outframe, self->size, self->twiddle);
         }
     }
     /*
@@ -731,16 +752,13 @@ IFFT_clear(IFFT *self)
 static void
 IFFT_dealloc(IFFT* self)
 {
-    int i;
     pyo_DEALLOC
     free(self->inframe);
     free(self->outframe);
-    free(self->window);
-    for(i=0; i<4; i++) {
-        free(self->twiddle[i]);
-    }
-    free(self->twiddle);
-    free(self->twiddle2);
+    release_window(self->window);
+    fft_release_split_twiddle(self->twiddle);
+    fft_release_radix2_twiddle(self->twiddle2);
+    fft_release_real_plan(self->plan);
     IFFT_clear(self);
     self->ob_type->tp_free((PyObject*)self);
 }
@@ -762,9 +780,9 @@ IFFT_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
     Stream_setFunctionPtr(self->stream, IFFT_compute_next_data_frame);
     self->mode_func_ptr = IFFT_setProcMode;
 
-    static char *kwlist[] = {"inreal", "inimag", "size", "hopsize", "wintype", "mul", "add", NULL};
+    static char *kwlist[] = {"inreal", "inimag", "size", "hopsize", "wintype", "algo", "mul", "add", NULL};
 
-    if (! PyArg_ParseTupleAndKeywords(args, kwds, "OO|iiiOO", kwlist, &inrealtmp, &inimagtmp, &self->size, &self->hopsize, &self->wintype, &multmp, &addtmp))
+    if (! PyArg_ParseTupleAndKeywords(args, kwds, "OO|iiiiOO", kwlist, &inrealtmp, &inimagtmp, &self->size, &self->hopsize, &self->wintype, &self->algo, &multmp, &addtmp))
         Py_RETURN_NONE;
 
     Py_XDECREF(self->inimag);
@@ -846,7 +864,21 @@ IFFT_setWinType(IFFT *self, PyObject *arg)
 {    
     if (PyLong_Check(arg) || PyInt_Check(arg)) {
         self->wintype = PyLong_AsLong(arg);
-        gen_window(self->window, self->size, self->wintype);
+        release_window(self->window);
+        self->window = acquire_window(self->size, self->wintype);
+    }    
+    
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject *
+IFFT_setAlgo(IFFT *self, PyObject *arg)
+{    
+    if (PyLong_Check(arg) || PyInt_Check(arg)) {
+        self->algo = PyInt_AsLong(arg);
+        fft_release_real_plan(self->plan);
+        self->plan = self->algo ? fft_acquire_real_plan(self->size) : NULL;
     }    
     
     Py_INCREF(Py_None);
@@ -871,6 +903,7 @@ static PyMethodDef IFFT_methods[] = {
     {"stop", (PyCFunction)IFFT_stop, METH_NOARGS, "Stops computing."},
     {"setSize", (PyCFunction)IFFT_setSize, METH_VARARGS|METH_KEYWORDS, "Sets a new IFFT size."},
     {"setWinType", (PyCFunction)IFFT_setWinType, METH_O, "Sets a new window."},
+    {"setAlgo", (PyCFunction)IFFT_setAlgo, METH_O, "Sets the FFT algorithm."},
     {"setMul", (PyCFunction)IFFT_setMul, METH_O, "Sets oscillator mul factor."},
     {"setAdd", (PyCFunction)IFFT_setAdd, METH_O, "Sets oscillator add factor."},
     {"setSub", (PyCFunction)IFFT_setSub, METH_O, "Sets inverse add factor."},
@@ -3238,6 +3271,74 @@ PyTypeObject VectralType = {
     Vectral_new,                 /* tp_new */
 };
 
+/* Impulse responses already analysed, shared by the CvlVerb objects. An 
+   entry is identified by the file (path and modification time), the 
+   channel and the partition layout. Created and released with the GIL. */
+typedef struct {
+    char *path;
+    time_t mtime;
+    int chnl;
+    int size;
+    int first;
+    int num;
+    int refcount;
+    IRSpectra *spectra;
+} CvlVerbIR;
+
+static CvlVerbIR **cvlverb_cache = NULL;
+static int cvlverb_cache_len = 0;
+
+static CvlVerbIR *
+CvlVerbIR_find(char *path, time_t mtime, int chnl, int size, int first, int num) {
+    int i;
+    CvlVerbIR *ir;
+
+    for (i=0; i<cvlverb_cache_len; i++) {
+        ir = cvlverb_cache[i];
+        if (ir->mtime == mtime && ir->chnl == chnl && ir->size == size && 
+            ir->first == first && ir->num == num && strcmp(ir->path, path) == 0) {
+            ir->refcount++;
+            return ir;
+        }
+    }
+    return NULL;
+}
+
+static CvlVerbIR *
+CvlVerbIR_add(char *path, time_t mtime, int chnl, int size, int first, int num, MYFLT *impulse, int len) {
+    CvlVerbIR *ir = (CvlVerbIR *)malloc(sizeof(CvlVerbIR));
+
+    ir->path = (char *)malloc(strlen(path) + 1);
+    strcpy(ir->path, path);
+    ir->mtime = mtime;
+    ir->chnl = chnl;
+    ir->size = size;
+    ir->first = first;
+    ir->num = num;
+    ir->refcount = 1;
+    ir->spectra = IRSpectra_new(impulse, len, size, first, num);
+    cvlverb_cache = (CvlVerbIR **)realloc(cvlverb_cache, (cvlverb_cache_len + 1) * sizeof(CvlVerbIR *));
+    cvlverb_cache[cvlverb_cache_len++] = ir;
+    return ir;
+}
+
+static void
+CvlVerbIR_release(CvlVerbIR *ir) {
+    int i;
+
+    if (ir == NULL || --ir->refcount > 0)
+        return;
+    for (i=0; i<cvlverb_cache_len; i++) {
+        if (cvlverb_cache[i] == ir) {
+            cvlverb_cache[i] = cvlverb_cache[--cvlverb_cache_len];
+            break;
+        }
+    }
+    IRSpectra_free(ir->spectra);
+    free(ir->path);
+    free(ir);
+}
+
 typedef struct {
     pyo_audio_HEAD
     PyObject *input;
@@ -3247,56 +3348,20 @@ typedef struct {
     char *impulse_path;
     int chnl;
     int size;
-    int size2;
-    int hsize;
-    int incount;
-    int num_iter;
-    int current_iter;
-    int impulse_len;
-    MYFLT *inframe;
-    MYFLT *outframe;
-    MYFLT *last_half_frame;
-    MYFLT **twiddle;
-    MYFLT *input_buffer;
-    MYFLT *output_buffer;
-    MYFLT **impulse_real;
-    MYFLT **impulse_imag;
-    MYFLT **accum_real;
-    MYFLT **accum_imag;
-    MYFLT *real;
-    MYFLT *imag;
+    int tailsize;
+    CvlVerbIR *head_ir;
+    CvlVerbIR *tail_ir;
+    PartConv *conv;
     int modebuffer[3];
 } CvlVerb;
 
-static void
-CvlVerb_alloc_memories(CvlVerb *self) {
-    int i, n8;
-    self->hsize = self->size / 2;
-    self->size2 = self->size * 2;
-    n8 = self->size2 >> 3;
-    self->real = (MYFLT *)realloc(self->real, self->size * sizeof(MYFLT));    
-    self->imag = (MYFLT *)realloc(self->imag, self->size * sizeof(MYFLT));    
-    self->inframe = (MYFLT *)realloc(self->inframe, self->size2 * sizeof(MYFLT));
-    self->outframe = (MYFLT *)realloc(self->outframe, self->size2 * sizeof(MYFLT));       
-    self->last_half_frame = (MYFLT *)realloc(self->last_half_frame, self->size * sizeof(MYFLT));    
-    self->input_buffer = (MYFLT *)realloc(self->output_buffer, self->size * sizeof(MYFLT));    
-    self->output_buffer = (MYFLT *)realloc(self->output_buffer, self->size2 * sizeof(MYFLT));    
-    for (i=0; i<self->size2; i++)
-        self->inframe[i] = self->outframe[i] = self->output_buffer[i] = 0.0;
-    for (i=0; i<self->size; i++)
-        self->last_half_frame[i] = self->input_buffer[i] = 0.0;
-    self->twiddle = (MYFLT **)realloc(self->twiddle, 4 * sizeof(MYFLT *));
-    for(i=0; i<4; i++)
-        self->twiddle[i] = (MYFLT *)malloc(n8 * sizeof(MYFLT));
-    fft_compute_split_twiddle(self->twiddle, self->size2);
-}
-
 static void
 CvlVerb_analyse_impulse(CvlVerb *self) {
     SNDFILE *sf;
     SF_INFO info;
-    int i, j, snd_size, snd_sr, snd_chnls, num_items, num;
-    MYFLT *tmp, *tmp2, *inframe, *outframe;
+    struct stat st;
+    int i, snd_size, snd_chnls, hnum, tnum;
+    MYFLT *tmp = NULL, *impulse = NULL;
 
     info.format = 0;
     sf = sf_open(self->impulse_path, SFM_READ, &info);
@@ -3305,74 +3370,66 @@ CvlVerb_analyse_impulse(CvlVerb *self) {
         return;
     }
     snd_size = info.frames;
-    snd_sr = info.samplerate;
     snd_chnls = info.channels;
-    num_items = snd_size * snd_chnls;
     
-    if (snd_sr != self->sr) {
+    if (info.samplerate != self->sr) {
         printf("CvlVerb warning : Impulse sampling rate does't match the sampling rate of the server.\n");
     }
 
-    self->num_iter = (int)MYCEIL((MYFLT)snd_size / self->size);
-    self->impulse_len = self->num_iter * self->size;
-
-    tmp = (MYFLT *)malloc(num_items * sizeof(MYFLT));
-    tmp2 = (MYFLT *)malloc(self->impulse_len * sizeof(MYFLT));
-
-    sf_seek(sf, 0, SEEK_SET);
-    num = SF_READ(sf, tmp, num_items);
-    sf_close(sf);
-    for (i=0; i<snd_size; i++) {
-        tmp2[i] = tmp[i*snd_chnls+self->chnl];
-    }
-    for (i=snd_size; i<self->impulse_len; i++) {
-        tmp2[i] = 0.0;
+    /* Without at least one tail partition, use uniform partitions. */
+    if (self->tailsize > 0 && snd_size <= 2 * self->tailsize)
+        self->tailsize = 0;
+
+    hnum = (snd_size + self->size - 1) / self->size;
+    if (hnum < 1)
+        hnum = 1;
+    tnum = 0;
+    if (self->tailsize > 0) {
+        hnum = 2 * self->tailsize / self->size;
+        tnum = (snd_size + self->tailsize - 1) / self->tailsize - 2;
     }
 
-    self->impulse_real = (MYFLT **)realloc(self->impulse_real, self->num_iter * sizeof(MYFLT *));
-    self->impulse_imag = (MYFLT **)realloc(self->impulse_imag, self->num_iter * sizeof(MYFLT *));
-    self->accum_real = (MYFLT **)realloc(self->accum_real, self->num_iter * sizeof(MYFLT *));    
-    self->accum_imag = (MYFLT **)realloc(self->accum_imag, self->num_iter * sizeof(MYFLT *)); 
-    for(i=0; i<self->num_iter; i++) {
-        self->impulse_real[i] = (MYFLT *)malloc(self->size * sizeof(MYFLT));
-        self->impulse_imag[i] = (MYFLT *)malloc(self->size * sizeof(MYFLT));
-        self->accum_real[i] = (MYFLT *)malloc(self->size * sizeof(MYFLT));
-        self->accum_imag[i] = (MYFLT *)malloc(self->size * sizeof(MYFLT));
-        for (j=0; j<self->size; j++) {
-            self->accum_real[i][j] = 0.0;
-            self->accum_imag[i][j] = 0.0;
+    if (stat(self->impulse_path, &st) != 0)
+        st.st_mtime = 0;
+    self->head_ir = CvlVerbIR_find(self->impulse_path, st.st_mtime, self->chnl, self->size, 0, hnum);
+    if (tnum > 0)
+        self->tail_ir = CvlVerbIR_find(self->impulse_path, st.st_mtime, self->chnl, self->tailsize, 2, tnum);
+
+    if (self->head_ir == NULL || (tnum > 0 && self->tail_ir == NULL)) {
+        tmp = (MYFLT *)malloc(snd_size * snd_chnls * sizeof(MYFLT));
+        impulse = (MYFLT *)malloc(snd_size * sizeof(MYFLT));
+        sf_seek(sf, 0, SEEK_SET);
+        SF_READ(sf, tmp, snd_size * snd_chnls);
+        for (i=0; i<snd_size; i++) {
+            impulse[i] = tmp[i*snd_chnls+self->chnl];
         }
+        if (self->head_ir == NULL)
+            self->head_ir = CvlVerbIR_add(self->impulse_path, st.st_mtime, self->chnl, self->size, 0, hnum, impulse, snd_size);
+        if (tnum > 0 && self->tail_ir == NULL)
+            self->tail_ir = CvlVerbIR_add(self->impulse_path, st.st_mtime, self->chnl, self->tailsize, 2, tnum, impulse, snd_size);
+        free(tmp);
+        free(impulse);
     }
+    sf_close(sf);
 
-    inframe = (MYFLT *)malloc(self->size2 * sizeof(MYFLT));
-    outframe = (MYFLT *)malloc(self->size2 * sizeof(MYFLT));
-    
-    for (j=0; j<self->num_iter; j++) {
-        num = j * self->size;
-        for (i=0; i<self->size; i++) {
-            inframe[i] = tmp2[num+i];
-        }
-        for (i=self->size; i<self->size2; i++) {
-            inframe[i] = 0.0;
-        }        
-        realfft_split(inframe, outframe, self->size2, self->twiddle);
-        self->impulse_real[j][0] = outframe[0];
-        self->impulse_imag[j][0] = 0.0;
-        for (i=1; i<self->size; i++) {
-            self->impulse_real[j][i] = outframe[i];
-            self->impulse_imag[j][i] = outframe[self->size2 - i];
-        }
+    self->conv = PartConv_new(self->head_ir->spectra, tnum > 0 ? self->tail_ir->spectra : NULL, snd_size);
+}
+
+static void
+CvlVerb_convolve(CvlVerb *self, MYFLT *in) {
+    int i;
+
+    if (self->conv != NULL)
+        PartConv_process(self->conv, in, self->data, self->bufsize);
+    else {
+        for (i=0; i<self->bufsize; i++)
+            self->data[i] = 0.0;
     }
-    
-    free(tmp);
-    free(tmp2);
-    free(inframe);
-    free(outframe);
 }
 
 static void
 CvlVerb_process_i(CvlVerb *self) {
-    int i, j, k;
+    int i;
     MYFLT gdry;
     MYFLT *in = Stream_getData((Stream *)self->input_stream);
     MYFLT bal = PyFloat_AS_DOUBLE(self->bal);
@@ -3382,64 +3439,20 @@ CvlVerb_process_i(CvlVerb *self) {
         bal = 1.0;
     gdry = 1.0 - bal;
 
+    CvlVerb_convolve(self, in);
     for (i=0; i<self->bufsize; i++) {
-        self->input_buffer[self->incount] = in[i];
-        self->data[i] = (self->output_buffer[self->incount] * 100 * bal) + (in[i] * gdry);
-        
-        self->incount++;
-        if (self->incount == self->size) {
-            self->incount = 0;
-            
-            k = self->current_iter - 1;
-            if (k < 0)
-                k += self->num_iter;
-            for (i=0; i<self->size; i++) {
-                self->accum_real[k][i] = self->accum_imag[k][i] = 0.0;
-                self->inframe[i] = self->last_half_frame[i];
-                self->inframe[i+self->size] = self->last_half_frame[i] = self->input_buffer[i];
-            }
-            realfft_split(self->inframe, self->outframe, self->size2, self->twiddle);
-            self->real[0] = self->outframe[0];
-            self->imag[0] = 0.0;
-            for (i=1; i<self->size; i++) {
-                self->real[i] = self->outframe[i];
-                self->imag[i] = self->outframe[self->size2 - i];
-            }
-            for (j=0; j<self->num_iter; j++) {
-                k = self->current_iter + j;
-                if (k >= self->num_iter)
-                    k -= self->num_iter;
-                for (i=0; i<self->size; i++) {
-                    self->accum_real[k][i] += self->real[i] * self->impulse_real[j][i] - self->imag[i] * self->impulse_imag[j][i];
-                    self->accum_imag[k][i] += self->real[i] * self->impulse_imag[j][i] + self->imag[i] * self->impulse_real[j][i];
-                }
-            }
-            self->inframe[0] = self->accum_real[self->current_iter][0];
-            self->inframe[self->size] = 0.0;
-            for (i=1; i<self->size; i++) {
-                self->inframe[i] = self->accum_real[self->current_iter][i];
-                self->inframe[self->size2 - i] = self->accum_imag[self->current_iter][i];
-            }
-            irealfft_split(self->inframe, self->outframe, self->size2, self->twiddle);
-
-            for (i=0; i<self->size; i++) {
-                self->output_buffer[i] = self->outframe[i+self->size];
-            }
-
-            self->current_iter++;
-            if (self->current_iter == self->num_iter)
-                self->current_iter = 0;
-        }
+        self->data[i] = (self->data[i] * 100 * bal) + (in[i] * gdry);
     } 
 }
 
 static void
 CvlVerb_process_a(CvlVerb *self) {
-    int i, j, k;
+    int i;
     MYFLT gwet, gdry;
     MYFLT *in = Stream_getData((Stream *)self->input_stream);
     MYFLT *bal = Stream_getData((Stream *)self->bal_stream);
 
+    CvlVerb_convolve(self, in);
     for (i=0; i<self->bufsize; i++) {
         gwet = bal[i];
         if (gwet < 0)
@@ -3447,53 +3460,7 @@ CvlVerb_process_a(CvlVerb *self) {
         else if (gwet > 1)
             gwet = 1.0;
         gdry = 1.0 - gwet;
-        self->input_buffer[self->incount] = in[i];
-        self->data[i] = (self->output_buffer[self->incount] * 100 * gwet) + in[i] * gdry;
-        
-        self->incount++;
-        if (self->incount == self->size) {
-            self->incount = 0;
-            
-            k = self->current_iter - 1;
-            if (k < 0)
-                k += self->num_iter;
-            for (i=0; i<self->size; i++) {
-                self->accum_real[k][i] = self->accum_imag[k][i] = 0.0;
-                self->inframe[i] = self->last_half_frame[i];
-                self->inframe[i+self->size] = self->last_half_frame[i] = self->input_buffer[i];
-            }
-            realfft_split(self->inframe, self->outframe, self->size2, self->twiddle);
-            self->real[0] = self->outframe[0];
-            self->imag[0] = 0.0;
-            for (i=1; i<self->size; i++) {
-                self->real[i] = self->outframe[i];
-                self->imag[i] = self->outframe[self->size2 - i];
-            }
-            for (j=0; j<self->num_iter; j++) {
-                k = self->current_iter + j;
-                if (k >= self->num_iter)
-                    k -= self->num_iter;
-                for (i=0; i<self->size; i++) {
-                    self->accum_real[k][i] += self->real[i] * self->impulse_real[j][i] - self->imag[i] * self->impulse_imag[j][i];
-                    self->accum_imag[k][i] += self->real[i] * self->impulse_imag[j][i] + self->imag[i] * self->impulse_real[j][i];
-                }
-            }
-            self->inframe[0] = self->accum_real[self->current_iter][0];
-            self->inframe[self->size] = 0.0;
-            for (i=1; i<self->size; i++) {
-                self->inframe[i] = self->accum_real[self->current_iter][i];
-                self->inframe[self->size2 - i] = self->accum_imag[self->current_iter][i];
-            }
-            irealfft_split(self->inframe, self->outframe, self->size2, self->twiddle);
-
-            for (i=0; i<self->size; i++) {
-                self->output_buffer[i] = self->outframe[i+self->size];
-            }
-
-            self->current_iter++;
-            if (self->current_iter == self->num_iter)
-                self->current_iter = 0;
-        }
+        self->data[i] = (self->data[i] * 100 * gwet) + in[i] * gdry;
     } 
 }
 
@@ -3586,29 +3553,10 @@ CvlVerb_clear(CvlVerb *self)
 static void
 CvlVerb_dealloc(CvlVerb* self)
 {
-    int i;
     pyo_DEALLOC
-    free(self->inframe);
-    free(self->outframe);
-    free(self->input_buffer);
-    free(self->output_buffer);
-    free(self->last_half_frame);
-    for(i=0; i<4; i++) {
-        free(self->twiddle[i]);
-    }
-    free(self->twiddle);
-    for(i=0; i<self->num_iter; i++) {
-        free(self->impulse_real[i]);
-        free(self->impulse_imag[i]);
-        free(self->accum_real[i]);
-        free(self->accum_imag[i]);
-    }    
-    free(self->impulse_real);
-    free(self->impulse_imag);
-    free(self->accum_real);
-    free(self->accum_imag);
-    free(self->real);
-    free(self->imag);
+    PartConv_free(self->conv);
+    CvlVerbIR_release(self->head_ir);
+    CvlVerbIR_release(self->tail_ir);
     CvlVerb_clear(self);
     self->ob_type->tp_free((PyObject*)self);
 }
@@ -3624,15 +3572,14 @@ CvlVerb_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
     self->bal = PyFloat_FromDouble(0.25);
     self->size = 1024;
     self->chnl = 0;
-    self->incount = 0;
-    self->current_iter = 0;
+    self->tailsize = 0;
     INIT_OBJECT_COMMON
     Stream_setFunctionPtr(self->stream, CvlVerb_compute_next_data_frame);
     self->mode_func_ptr = CvlVerb_setProcMode;
 
-    static char *kwlist[] = {"input", "impulse", "bal", "size", "chnl", "mul", "add", NULL};
+    static char *kwlist[] = {"input", "impulse", "bal", "size", "chnl", "tailsize", "mul", "add", NULL};
     
-    if (! PyArg_ParseTupleAndKeywords(args, kwds, "Os|OiiOO", kwlist, &inputtmp, &self->impulse_path, &baltmp, &self->size, &self->chnl, &multmp, &addtmp))
+    if (! PyArg_ParseTupleAndKeywords(args, kwds, "Os|OiiiOO", kwlist, &inputtmp, &self->impulse_path, &baltmp, &self->size, &self->chnl, &self->tailsize, &multmp, &addtmp))
         Py_RETURN_NONE;
 
     if (self->size < self->bufsize) {
@@ -3645,6 +3592,15 @@ CvlVerb_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
         k <<= 1;
     self->size = k;
 
+    if (self->tailsize > self->size) {
+        k = self->size;
+        while (k < self->tailsize)
+            k <<= 1;
+        self->tailsize = k;
+    }
+    else
+        self->tailsize = 0;
+
     INIT_INPUT_STREAM
 
     if (baltmp) {
@@ -3661,7 +3617,6 @@ CvlVerb_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
  
     PyObject_CallMethod(self->server, "addStream", "O", self->stream);
     
-    CvlVerb_alloc_memories(self);
     CvlVerb_analyse_impulse(self);
 
     (*self->mode_func_ptr)(self);
@@ -3861,9 +3816,8 @@ typedef struct {
 
 static void
 Spectrum_realloc_memories(Spectrum *self) {
-    int i, n8;
+    int i;
     self->hsize = self->size / 2;
-    n8 = self->size >> 3;
     self->input_buffer = (MYFLT *)realloc(self->input_buffer, self->size * sizeof(MYFLT));
     self->inframe = (MYFLT *)realloc(self->inframe, self->size * sizeof(MYFLT));
     self->outframe = (MYFLT *)realloc(self->outframe, self->size * sizeof(MYFLT));    
@@ -3874,12 +3828,10 @@ Spectrum_realloc_memories(Spectrum *self) {
     self->tmpmag = (MYFLT *)realloc(self->tmpmag, (self->hsize+6) * sizeof(MYFLT));    
     for (i=0; i<self->hsize; i++)
         self->magnitude[i] = self->last_magnitude[i] = self->tmpmag[i+3] = 0.0;
-    self->twiddle = (MYFLT **)realloc(self->twiddle, 4 * sizeof(MYFLT *));
-    for(i=0; i<4; i++)
-        self->twiddle[i] = (MYFLT *)malloc(n8 * sizeof(MYFLT));
-    fft_compute_split_twiddle(self->twiddle, self->size);
-    self->window = (MYFLT *)realloc(self->window, self->size * sizeof(MYFLT));
-    gen_window(self->window, self->size, self->wintype);
+    fft_release_split_twiddle(self->twiddle);
+    self->twiddle = fft_acquire_split_twiddle(self->size);
+    release_window(self->window);
+    self->window = acquire_window(self->size, self->wintype);
     self->incount = self->hsize;
     self->freqPerBin = self->sr / self->size;
 }
@@ -4040,19 +3992,15 @@ Spectrum_clear(Spectrum *self)
 static void
 Spectrum_dealloc(Spectrum* self)
 {
-    int i;
     pyo_DEALLOC
     free(self->input_buffer);
     free(self->inframe);
     free(self->outframe);
-    free(self->window);
+    release_window(self->window);
     free(self->magnitude);
     free(self->last_magnitude);
     free(self->tmpmag);
-    for(i=0; i<4; i++) {
-        free(self->twiddle[i]);
-    }
-    free(self->twiddle);
+    fft_release_split_twiddle(self->twiddle);
     Spectrum_clear(self);
     self->ob_type->tp_free((PyObject*)self);
 }
@@ -4134,7 +4082,8 @@ Spectrum_setWinType(Spectrum *self, PyObject *arg)
 {    
     if (PyLong_Check(arg) || PyInt_Check(arg)) {
         self->wintype = PyLong_AsLong(arg);
-        gen_window(self->window, self->size, self->wintype);
+        release_window(self->window);
+        self->window = acquire_window(self->size, self->wintype);
     }    
     
     Py_INCREF(Py_None);
@@ -46,6 +46,8 @@ typedef struct {
     MYFLT x2;
     MYFLT y1;
     MYFLT y2;
+    MYFLT last_freq;
+    MYFLT last_q;
     // variables
     MYFLT c;
     MYFLT w0;
@@ -112,6 +114,11 @@ Biquad_compute_coeffs_ap(Biquad *self)
 static void
 Biquad_compute_variables(Biquad *self, MYFLT freq, MYFLT q)
 {    
+    if (freq == self->last_freq && q == self->last_q)
+        return;
+    self->last_freq = freq;
+    self->last_q = q;
+
     if (freq <= 1) 
         freq = 1;
     else if (freq >= self->nyquist)
@@ -237,6 +244,7 @@ Biquad_setProcMode(Biquad *self)
     int procmode, muladdmode;
     procmode = self->modebuffer[2] + self->modebuffer[3] * 10;
     muladdmode = self->modebuffer[0] + self->modebuffer[1] * 10;
+    self->last_freq = self->last_q = -1.0;
 
     switch (self->filtertype) {
         case 0:
@@ -636,6 +644,8 @@ typedef struct {
     MYFLT *x2;
     MYFLT *y1;
     MYFLT *y2;
+    MYFLT last_freq;
+    MYFLT last_q;
     // variables
     MYFLT c;
     MYFLT w0;
@@ -712,6 +722,11 @@ Biquadx_compute_coeffs_ap(Biquadx *self)
 static void
 Biquadx_compute_variables(Biquadx *self, MYFLT freq, MYFLT q)
 {    
+    if (freq == self->last_freq && q == self->last_q)
+        return;
+    self->last_freq = freq;
+    self->last_q = q;
+
     if (freq <= 1) 
         freq = 1;
     else if (freq >= self->nyquist)
@@ -861,6 +876,7 @@ Biquadx_setProcMode(Biquadx *self)
     int procmode, muladdmode;
     procmode = self->modebuffer[2] + self->modebuffer[3] * 10;
     muladdmode = self->modebuffer[0] + self->modebuffer[1] * 10;
+    self->last_freq = self->last_q = -1.0;
     
     switch (self->filtertype) {
         case 0:
@@ -1707,6 +1723,9 @@ typedef struct {
     MYFLT x2;
     MYFLT y1;
     MYFLT y2;
+    MYFLT last_freq;
+    MYFLT last_q;
+    MYFLT last_boost;
     // variables
     MYFLT A;
     MYFLT c;
@@ -1767,6 +1786,12 @@ EQ_compute_coeffs_highshelf(EQ *self)
 static void
 EQ_compute_variables(EQ *self, MYFLT freq, MYFLT q, MYFLT boost)
 {    
+    if (freq == self->last_freq && q == self->last_q && boost == self->last_boost)
+        return;
+    self->last_freq = freq;
+    self->last_q = q;
+    self->last_boost = boost;
+
     if (freq <= 1) 
         freq = 1;
     else if (freq >= self->nyquist)
@@ -1998,6 +2023,7 @@ EQ_setProcMode(EQ *self)
     int procmode, muladdmode;
     procmode = self->modebuffer[2] + self->modebuffer[3] * 10 + self->modebuffer[4] * 100;
     muladdmode = self->modebuffer[0] + self->modebuffer[1] * 10;
+    self->last_freq = self->last_q = self->last_boost = -1.0;
     
     switch (self->filtertype) {
         case 0:
@@ -2459,7 +2485,7 @@ direction(Port *self, MYFLT val)
     
 static void
 Port_filters_ii(Port *self) {
-    MYFLT val;
+    MYFLT x, val;
     int i;
     MYFLT *in = Stream_getData((Stream *)self->input_stream);
     MYFLT risetime = PyFloat_AS_DOUBLE(self->risetime);
@@ -2469,8 +2495,9 @@ Port_filters_ii(Port *self) {
     MYFLT factors[2] = {fallfactor, risefactor};
 
     for (i=0; i<self->bufsize; i++) {
-        direction(self, in[i]);
-        val = self->y1 + (in[i] - self->y1) * factors[self->dir];
+        x = in[i*self->kstride];
+        direction(self, x);
+        val = self->y1 + (x - self->y1) * factors[self->dir];
         self->y1 = val;
         self->data[i] = val;
     }
@@ -2478,7 +2505,7 @@ Port_filters_ii(Port *self) {
 
 static void
 Port_filters_ai(Port *self) {
-    MYFLT val, risefactor;
+    MYFLT x, val, risefactor;
     int i;
     MYFLT *in = Stream_getData((Stream *)self->input_stream);
     MYFLT *risetime = Stream_getData((Stream *)self->risetime_stream);
@@ -2486,12 +2513,13 @@ Port_filters_ai(Port *self) {
     MYFLT fallfactor = 1. / ((falltime + 0.001) * self->sr);
     
     for (i=0; i<self->bufsize; i++) {
-        direction(self, in[i]);
+        x = in[i*self->kstride];
+        direction(self, x);
         risefactor = (*risetime++ + 0.001) * self->sr;  
         if (self->dir == 1)
-            val = self->y1 + (*in++ - self->y1) / risefactor;
+            val = self->y1 + (x - self->y1) / risefactor;
         else
-            val = self->y1 + (*in++ - self->y1) * fallfactor;
+            val = self->y1 + (x - self->y1) * fallfactor;
         self->y1 = val;
         self->data[i] = val;
     }
@@ -2499,7 +2527,7 @@ Port_filters_ai(Port *self) {
 
 static void
 Port_filters_ia(Port *self) {
-    MYFLT val, fallfactor;
+    MYFLT x, val, fallfactor;
     int i;
     MYFLT *in = Stream_getData((Stream *)self->input_stream);
     MYFLT *falltime = Stream_getData((Stream *)self->falltime_stream);
@@ -2507,12 +2535,13 @@ Port_filters_ia(Port *self) {
     MYFLT risefactor = 1. / ((risetime + 0.001) * self->sr);
     
     for (i=0; i<self->bufsize; i++) {
-        direction(self, in[i]);
+        x = in[i*self->kstride];
+        direction(self, x);
         fallfactor = (*falltime++ + 0.001) * self->sr;  
         if (self->dir == 1)
-            val = self->y1 + (*in++ - self->y1) * risefactor;
+            val = self->y1 + (x - self->y1) * risefactor;
         else
-            val = self->y1 + (*in++ - self->y1) / fallfactor;
+            val = self->y1 + (x - self->y1) / fallfactor;
         self->y1 = val;
         self->data[i] = val;
     }
@@ -2520,20 +2549,21 @@ Port_filters_ia(Port *self) {
 
 static void
 Port_filters_aa(Port *self) {
-    MYFLT val, risefactor, fallfactor;
+    MYFLT x, val, risefactor, fallfactor;
     int i;
     MYFLT *in = Stream_getData((Stream *)self->input_stream);
     MYFLT *risetime = Stream_getData((Stream *)self->risetime_stream);
     MYFLT *falltime = Stream_getData((Stream *)self->falltime_stream);
     
     for (i=0; i<self->bufsize; i++) {
-        direction(self, in[i]);
+        x = in[i*self->kstride];
+        direction(self, x);
         risefactor = (*risetime++ + 0.001) * self->sr;  
         fallfactor = (*falltime++ + 0.001) * self->sr;  
         if (self->dir == 1)
-            val = self->y1 + (*in++ - self->y1) / risefactor;
+            val = self->y1 + (x - self->y1) / risefactor;
         else
-            val = self->y1 + (*in++ - self->y1) / fallfactor;
+            val = self->y1 + (x - self->y1) / fallfactor;
         self->y1 = val;
         self->data[i] = val;
     }
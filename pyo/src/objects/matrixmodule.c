@@ -24,6 +24,7 @@
 #include "servermodule.h"
 #include "streammodule.h"
 #include "dummymodule.h"
+#include "tablemodule.h"
 
 #define __MATRIX_MODULE
 #include "matrixmodule.h"
@@ -121,6 +122,34 @@ MatrixStream_setHeight(MatrixStream *self, int size)
     self->height = size;
 }    
 
+static PyObject *
+MatrixStream_fromBuffer(MatrixStream *self, PyObject *arg)
+{
+    int i;
+    Py_buffer view;
+
+    if (PyoBuffer_getFloatBuffer(arg, &view) < 0)
+        return NULL;
+
+    if ((view.len / view.itemsize) != (self->width * self->height)) {
+        PyBuffer_Release(&view);
+        PyErr_SetString(PyExc_ValueError, "The buffer must contain exactly width * height samples.");
+        return NULL;
+    }
+
+    for (i=0; i<self->height; i++) {
+        PyoBuffer_copyToMYFLT(&view, i * self->width, self->data[i], self->width);
+    }
+
+    PyBuffer_Release(&view);
+    Py_RETURN_NONE;
+}
+
+static PyMethodDef MatrixStream_methods[] = {
+{"fromBuffer", (PyCFunction)MatrixStream_fromBuffer, METH_O, "Copies samples from a contiguous float or double buffer (height * width) into the matrix."},
+{NULL}  /* Sentinel */
+};
+
 PyTypeObject MatrixStreamType = {
 PyObject_HEAD_INIT(NULL)
 0, /*ob_size*/
@@ -150,7 +179,7 @@ Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE, /*tp_flags*/
 0, /* tp_weaklistoffset */
 0, /* tp_iter */
 0, /* tp_iternext */
-0, /* tp_methods */
+MatrixStream_methods, /* tp_methods */
 0, /* tp_members */
 0, /* tp_getset */
 0, /* tp_base */
@@ -214,10 +243,8 @@ NewMatrix_clear(NewMatrix *self)
 static void
 NewMatrix_dealloc(NewMatrix* self)
 {
-    int i;
-    for (i=0; i<(self->height+1); i++) {
-        free(self->data[i]);
-    }    
+    if (self->data != NULL)
+        free(self->data[0]);
     free(self->data);
     NewMatrix_clear(self);
     self->ob_type->tp_free((PyObject*)self);
@@ -227,6 +254,7 @@ static PyObject *
 NewMatrix_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
 {
     int i, j;
+    MYFLT *block;
     PyObject *inittmp=NULL;
     NewMatrix *self;
     
@@ -243,10 +271,12 @@ NewMatrix_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
     if (! PyArg_ParseTupleAndKeywords(args, kwds, "ii|O", kwlist, &self->width, &self->height, &inittmp))
         Py_RETURN_NONE; 
     
+    /* Rows are stored in a single contiguous block so the matrix can be shared as a 2-D buffer. */
+    block = (MYFLT *)malloc((self->height + 1) * (self->width + 1) * sizeof(MYFLT));
     self->data = (MYFLT **)realloc(self->data, (self->height + 1) * sizeof(MYFLT *));
     
     for (i=0; i<(self->height+1); i++) {
-        self->data[i] = (MYFLT *)malloc((self->width + 1) * sizeof(MYFLT));
+        self->data[i] = block + i * (self->width + 1);
     }
     
     for(i=0; i<(self->height+1); i++) {
@@ -417,6 +447,58 @@ static PyMethodDef NewMatrix_methods[] = {
 {NULL}  /* Sentinel */
 };
 
+/* Exposes the matrix memory, without copy, as a 2-D (height, width) array 
+   of MYFLT. The view holds the matrix object, which owns the memory, and 
+   the matrix refuses to be resized while views exist (CHECK_BUFFER_EXPORTS). */
+static int
+NewMatrix_getbuffer(NewMatrix *self, Py_buffer *view, int flags)
+{
+    MatrixStream *stream = self->matrixstream;
+
+    if (self->data == NULL) {
+        PyErr_SetString(PyExc_BufferError, "Matrix has no data.");
+        return -1;
+    }
+    if ((flags & PyBUF_STRIDES) != PyBUF_STRIDES) {
+        PyErr_SetString(PyExc_BufferError, "Matrix rows are padded, a strided buffer must be requested.");
+        return -1;
+    }
+    stream->shape[0] = self->height;
+    stream->shape[1] = self->width;
+    stream->strides[0] = (self->width + 1) * sizeof(MYFLT);
+    stream->strides[1] = sizeof(MYFLT);
+
+    view->obj = (PyObject *)self;
+    Py_INCREF(self);
+    view->buf = (void *)self->data[0];
+    view->len = self->height * self->width * sizeof(MYFLT);
+    view->readonly = 0;
+    view->itemsize = sizeof(MYFLT);
+    view->format = (flags & PyBUF_FORMAT) ? MYFLT_BUFFER_FORMAT : NULL;
+    view->ndim = 2;
+    view->shape = stream->shape;
+    view->strides = stream->strides;
+    view->suboffsets = NULL;
+    view->internal = NULL;
+    self->exports++;
+    return 0;
+}
+
+static void
+NewMatrix_releasebuffer(NewMatrix *self, Py_buffer *view)
+{
+    self->exports--;
+}
+
+static PyBufferProcs NewMatrix_as_buffer = {
+(readbufferproc)0, /*bf_getreadbuffer*/
+(writebufferproc)0, /*bf_getwritebuffer*/
+(segcountproc)0, /*bf_getsegcount*/
+(charbufferproc)0, /*bf_getcharbuffer*/
+(getbufferproc)NewMatrix_getbuffer, /*bf_getbuffer*/
+(releasebufferproc)NewMatrix_releasebuffer, /*bf_releasebuffer*/
+};
+
 PyTypeObject NewMatrixType = {
 PyObject_HEAD_INIT(NULL)
 0,                         /*ob_size*/
@@ -437,8 +519,8 @@ sizeof(NewMatrix),         /*tp_basicsize*/
 0,                         /*tp_str*/
 0,                         /*tp_getattro*/
 0,                         /*tp_setattro*/
-0,                         /*tp_as_buffer*/
-Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC, /*tp_flags*/
+&NewMatrix_as_buffer,                         /*tp_as_buffer*/
+Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC | Py_TPFLAGS_HAVE_NEWBUFFER, /*tp_flags*/
 "NewMatrix objects. Generates an empty matrix.",  /* tp_doc */
 (traverseproc)NewMatrix_traverse,   /* tp_traverse */
 (inquiry)NewMatrix_clear,           /* tp_clear */
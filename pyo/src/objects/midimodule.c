@@ -32,6 +32,7 @@ typedef struct {
     PyObject *callable;
     int ctlnumber;
     int toprint;
+    int defer;
 } CtlScan;
 
 static void
@@ -58,7 +59,8 @@ CtlScan_compute_next_data_frame(CtlScan *self)
                     self->ctlnumber = number;
                     tup = PyTuple_New(1);
                     PyTuple_SetItem(tup, 0, PyInt_FromLong(self->ctlnumber));
-                    PyObject_Call((PyObject *)self->callable, tup, NULL);
+                    Server_dispatchCall((Server *)self->server, self->callable, tup, self->defer);
+                    Py_DECREF(tup);
                 }
                 if (self->toprint == 1)
                     printf("ctl number : %i, ctl value : %i, midi channel : %i\n", self->ctlnumber, value, status - 0xB0 + 1);    
@@ -101,6 +103,7 @@ CtlScan_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
 
     self->ctlnumber = -1;
     self->toprint = 1;
+    self->defer = 0;
 
     INIT_OBJECT_COMMON
     Stream_setFunctionPtr(self->stream, CtlScan_compute_next_data_frame);
@@ -157,6 +160,16 @@ CtlScan_setToprint(CtlScan *self, PyObject *arg)
 	Py_INCREF(Py_None);
 	return Py_None;
 }
+static PyObject *
+CtlScan_setDefer(CtlScan *self, PyObject *arg)
+{
+    if (arg != NULL)
+        self->defer = PyObject_IsTrue(arg);
+
+	Py_INCREF(Py_None);
+	return Py_None;
+}
+
 static PyMemberDef CtlScan_members[] = {
     {"server", T_OBJECT_EX, offsetof(CtlScan, server), 0, "Pyo server."},
     {"stream", T_OBJECT_EX, offsetof(CtlScan, stream), 0, "Stream object."},
@@ -170,6 +183,7 @@ static PyMethodDef CtlScan_methods[] = {
     {"stop", (PyCFunction)CtlScan_stop, METH_NOARGS, "Stops computing."},
     {"setFunction", (PyCFunction)CtlScan_setFunction, METH_O, "Sets the function to be called."},
     {"setToprint", (PyCFunction)CtlScan_setToprint, METH_O, "If True, print values to the console."},
+    {"setDefer", (PyCFunction)CtlScan_setDefer, METH_O, "If True, the function is called by the server's call thread."},
     {NULL}  /* Sentinel */
 };
 
@@ -221,6 +235,7 @@ typedef struct {
     int ctlnumber;
     int midichnl;
     int toprint;
+    int defer;
 } CtlScan2;
 
 static void
@@ -250,7 +265,8 @@ CtlScan2_compute_next_data_frame(CtlScan2 *self)
                     tup = PyTuple_New(2);
                     PyTuple_SetItem(tup, 0, PyInt_FromLong(self->ctlnumber));
                     PyTuple_SetItem(tup, 1, PyInt_FromLong(self->midichnl));
-                    PyObject_Call((PyObject *)self->callable, tup, NULL);
+                    Server_dispatchCall((Server *)self->server, self->callable, tup, self->defer);
+                    Py_DECREF(tup);
                 }
                 if (self->toprint == 1)
                     printf("ctl number : %i, ctl value : %i, midi channel : %i\n", self->ctlnumber, value, midichnl);    
@@ -293,6 +309,7 @@ CtlScan2_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
     
     self->ctlnumber = self->midichnl = -1;
     self->toprint = 1;
+    self->defer = 0;
     
     INIT_OBJECT_COMMON
     Stream_setFunctionPtr(self->stream, CtlScan2_compute_next_data_frame);
@@ -349,6 +366,16 @@ CtlScan2_setToprint(CtlScan2 *self, PyObject *arg)
 	Py_INCREF(Py_None);
 	return Py_None;
 }
+static PyObject *
+CtlScan2_setDefer(CtlScan2 *self, PyObject *arg)
+{
+    if (arg != NULL)
+        self->defer = PyObject_IsTrue(arg);
+
+	Py_INCREF(Py_None);
+	return Py_None;
+}
+
 static PyMemberDef CtlScan2_members[] = {
     {"server", T_OBJECT_EX, offsetof(CtlScan2, server), 0, "Pyo server."},
     {"stream", T_OBJECT_EX, offsetof(CtlScan2, stream), 0, "Stream object."},
@@ -362,6 +389,7 @@ static PyMethodDef CtlScan2_methods[] = {
     {"stop", (PyCFunction)CtlScan2_stop, METH_NOARGS, "Stops computing."},
     {"setFunction", (PyCFunction)CtlScan2_setFunction, METH_O, "Sets the function to be called."},
     {"setToprint", (PyCFunction)CtlScan2_setToprint, METH_O, "If True, print values to the console."},
+    {"setDefer", (PyCFunction)CtlScan2_setDefer, METH_O, "If True, the function is called by the server's call thread."},
     {NULL}  /* Sentinel */
 };
 
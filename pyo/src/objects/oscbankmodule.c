@@ -26,6 +26,7 @@
 #include "servermodule.h"
 #include "dummymodule.h"
 #include "tablemodule.h"
+#include "fft.h"
 
 /*******************/
 /***** OscBank ******/
@@ -922,3 +923,417 @@ PyTypeObject OscBankType = {
     OscBank_new,                                     /* tp_new */
 };
 
+
+/***********************/
+/***** PartialBank *****/
+/***********************/
+typedef struct {
+    pyo_audio_HEAD
+    PyObject *freqs;
+    PyObject *amps;
+    PyObject *pitch;
+    Stream *pitch_stream;
+    int num;
+    int mode;
+    PartialSynth *synth;
+    int modebuffer[3];
+} PartialBank;
+
+static void
+PartialBank_readframes(PartialBank *self) {
+    int k, fsize, asize, num = self->synth->num;
+    MYFLT pitch;
+    MYFLT *freqs = TableStream_getData(self->freqs);
+    MYFLT *amps = TableStream_getData(self->amps);
+    MYFLT *tfreq = self->synth->freq;
+    MYFLT *tamp = self->synth->amp;
+
+    if (self->modebuffer[2] == 0)
+        pitch = PyFloat_AS_DOUBLE(self->pitch);
+    else
+        pitch = Stream_getData((Stream *)self->pitch_stream)[0];
+
+    fsize = TableStream_getSize(self->freqs);
+    asize = TableStream_getSize(self->amps);
+    if (fsize > num)
+        fsize = num;
+    if (asize > num)
+        asize = num;
+    for (k=0; k<fsize; k++)
+        tfreq[k] = freqs[k] * pitch;
+    for (k=fsize; k<num; k++)
+        tfreq[k] = 0.0;
+    for (k=0; k<asize; k++)
+        tamp[k] = amps[k];
+    for (k=asize; k<num; k++)
+        tamp[k] = 0.0;
+
+    PartialSynth_process(self->synth, self->data, self->bufsize);
+}
+
+static void PartialBank_postprocessing_ii(PartialBank *self) { POST_PROCESSING_II };
+static void PartialBank_postprocessing_ai(PartialBank *self) { POST_PROCESSING_AI };
+static void PartialBank_postprocessing_ia(PartialBank *self) { POST_PROCESSING_IA };
+static void PartialBank_postprocessing_aa(PartialBank *self) { POST_PROCESSING_AA };
+static void PartialBank_postprocessing_ireva(PartialBank *self) { POST_PROCESSING_IREVA };
+static void PartialBank_postprocessing_areva(PartialBank *self) { POST_PROCESSING_AREVA };
+static void PartialBank_postprocessing_revai(PartialBank *self) { POST_PROCESSING_REVAI };
+static void PartialBank_postprocessing_revaa(PartialBank *self) { POST_PROCESSING_REVAA };
+static void PartialBank_postprocessing_revareva(PartialBank *self) { POST_PROCESSING_REVAREVA };
+
+static void
+PartialBank_setProcMode(PartialBank *self)
+{
+    int muladdmode;
+    muladdmode = self->modebuffer[0] + self->modebuffer[1] * 10;
+
+    self->proc_func_ptr = PartialBank_readframes;
+
+	switch (muladdmode) {
+        case 0:        
+            self->muladd_func_ptr = PartialBank_postprocessing_ii;
+            break;
+        case 1:    
+            self->muladd_func_ptr = PartialBank_postprocessing_ai;
+            break;
+        case 2:    
+            self->muladd_func_ptr = PartialBank_postprocessing_revai;
+            break;
+        case 10:        
+            self->muladd_func_ptr = PartialBank_postprocessing_ia;
+            break;
+        case 11:    
+            self->muladd_func_ptr = PartialBank_postprocessing_aa;
+            break;
+        case 12:    
+            self->muladd_func_ptr = PartialBank_postprocessing_revaa;
+            break;
+        case 20:        
+            self->muladd_func_ptr = PartialBank_postprocessing_ireva;
+            break;
+        case 21:    
+            self->muladd_func_ptr = PartialBank_postprocessing_areva;
+            break;
+        case 22:    
+            self->muladd_func_ptr = PartialBank_postprocessing_revareva;
+            break;
+    }   
+}
+
+static void
+PartialBank_compute_next_data_frame(PartialBank *self)
+{
+    (*self->proc_func_ptr)(self); 
+    (*self->muladd_func_ptr)(self);
+}
+
+static int
+PartialBank_traverse(PartialBank *self, visitproc visit, void *arg)
+{
+    pyo_VISIT
+    Py_VISIT(self->freqs);
+    Py_VISIT(self->amps);
+    Py_VISIT(self->pitch);    
+    Py_VISIT(self->pitch_stream);    
+    return 0;
+}
+
+static int 
+PartialBank_clear(PartialBank *self)
+{
+    pyo_CLEAR
+    Py_CLEAR(self->freqs);
+    Py_CLEAR(self->amps);
+    Py_CLEAR(self->pitch);    
+    Py_CLEAR(self->pitch_stream);    
+    return 0;
+}
+
+static void
+PartialBank_dealloc(PartialBank* self)
+{
+    pyo_DEALLOC
+    PartialSynth_free(self->synth);
+    PartialBank_clear(self);
+    self->ob_type->tp_free((PyObject*)self);
+}
+
+static PyObject *
+PartialBank_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
+{
+    int i;
+    PyObject *freqstmp, *ampstmp, *pitchtmp=NULL, *multmp=NULL, *addtmp=NULL;
+    PartialBank *self;
+    self = (PartialBank *)type->tp_alloc(type, 0);
+    
+    self->pitch = PyFloat_FromDouble(1.0);
+    self->num = 0;
+    self->mode = 0;
+	self->modebuffer[0] = 0;
+	self->modebuffer[1] = 0;
+	self->modebuffer[2] = 0;
+    
+    INIT_OBJECT_COMMON
+
+    Stream_setFunctionPtr(self->stream, PartialBank_compute_next_data_frame);
+    self->mode_func_ptr = PartialBank_setProcMode;
+
+    static char *kwlist[] = {"freqs", "amps", "pitch", "num", "mode", "mul", "add", NULL};
+    
+    if (! PyArg_ParseTupleAndKeywords(args, kwds, "OO|OiiOO", kwlist, &freqstmp, &ampstmp, &pitchtmp, &self->num, &self->mode, &multmp, &addtmp))
+        Py_RETURN_NONE;
+
+    if ( PyObject_HasAttrString((PyObject *)freqstmp, "getTableStream") == 0 ) {
+        PySys_WriteStderr("TypeError: \"freqs\" argument of PartialBank must be a PyoTableObject.\n");
+        if (PyInt_AsLong(PyObject_CallMethod(self->server, "getIsBooted", NULL))) {
+            PyObject_CallMethod(self->server, "shutdown", NULL);
+        }
+        Py_Exit(1);
+    }
+    Py_XDECREF(self->freqs);
+    self->freqs = PyObject_CallMethod((PyObject *)freqstmp, "getTableStream", "");
+
+    if ( PyObject_HasAttrString((PyObject *)ampstmp, "getTableStream") == 0 ) {
+        PySys_WriteStderr("TypeError: \"amps\" argument of PartialBank must be a PyoTableObject.\n");
+        if (PyInt_AsLong(PyObject_CallMethod(self->server, "getIsBooted", NULL))) {
+            PyObject_CallMethod(self->server, "shutdown", NULL);
+        }
+        Py_Exit(1);
+    }
+    Py_XDECREF(self->amps);
+    self->amps = PyObject_CallMethod((PyObject *)ampstmp, "getTableStream", "");
+
+    if (pitchtmp) {
+        PyObject_CallMethod((PyObject *)self, "setPitch", "O", pitchtmp);
+    }
+    
+    if (multmp) {
+        PyObject_CallMethod((PyObject *)self, "setMul", "O", multmp);
+    }
+    
+    if (addtmp) {
+        PyObject_CallMethod((PyObject *)self, "setAdd", "O", addtmp);
+    }
+    
+    PyObject_CallMethod(self->server, "addStream", "O", self->stream);
+    
+    if (self->num <= 0)
+        self->num = TableStream_getSize(self->freqs);
+    self->synth = PartialSynth_new(self->num, self->mode, self->sr);
+
+    (*self->mode_func_ptr)(self);
+
+    return (PyObject *)self;
+}
+
+static PyObject * PartialBank_getServer(PartialBank* self) { GET_SERVER };
+static PyObject * PartialBank_getStream(PartialBank* self) { GET_STREAM };
+static PyObject * PartialBank_setMul(PartialBank *self, PyObject *arg) { SET_MUL };	
+static PyObject * PartialBank_setAdd(PartialBank *self, PyObject *arg) { SET_ADD };	
+static PyObject * PartialBank_setSub(PartialBank *self, PyObject *arg) { SET_SUB };	
+static PyObject * PartialBank_setDiv(PartialBank *self, PyObject *arg) { SET_DIV };	
+
+static PyObject * PartialBank_play(PartialBank *self, PyObject *args, PyObject *kwds) { PLAY };
+static PyObject * PartialBank_out(PartialBank *self, PyObject *args, PyObject *kwds) { OUT };
+static PyObject * PartialBank_stop(PartialBank *self) { STOP };
+
+static PyObject * PartialBank_multiply(PartialBank *self, PyObject *arg) { MULTIPLY };
+static PyObject * PartialBank_inplace_multiply(PartialBank *self, PyObject *arg) { INPLACE_MULTIPLY };
+static PyObject * PartialBank_add(PartialBank *self, PyObject *arg) { ADD };
+static PyObject * PartialBank_inplace_add(PartialBank *self, PyObject *arg) { INPLACE_ADD };
+static PyObject * PartialBank_sub(PartialBank *self, PyObject *arg) { SUB };
+static PyObject * PartialBank_inplace_sub(PartialBank *self, PyObject *arg) { INPLACE_SUB };
+static PyObject * PartialBank_div(PartialBank *self, PyObject *arg) { DIV };
+static PyObject * PartialBank_inplace_div(PartialBank *self, PyObject *arg) { INPLACE_DIV };
+
+static PyObject *
+PartialBank_setFreqs(PartialBank *self, PyObject *arg)
+{
+	PyObject *tmp;
+	
+	if (arg == NULL) {
+		Py_INCREF(Py_None);
+		return Py_None;
+	}
+    
+	tmp = arg;
+	Py_DECREF(self->freqs);
+    self->freqs = PyObject_CallMethod((PyObject *)tmp, "getTableStream", "");
+    
+	Py_INCREF(Py_None);
+	return Py_None;
+}	
+
+static PyObject *
+PartialBank_setAmps(PartialBank *self, PyObject *arg)
+{
+	PyObject *tmp;
+	
+	if (arg == NULL) {
+		Py_INCREF(Py_None);
+		return Py_None;
+	}
+    
+	tmp = arg;
+	Py_DECREF(self->amps);
+    self->amps = PyObject_CallMethod((PyObject *)tmp, "getTableStream", "");
+    
+	Py_INCREF(Py_None);
+	return Py_None;
+}	
+
+static PyObject *
+PartialBank_setPitch(PartialBank *self, PyObject *arg)
+{
+	PyObject *tmp, *streamtmp;
+	
+	if (arg == NULL) {
+		Py_INCREF(Py_None);
+		return Py_None;
+	}
+    
+	int isNumber = PyNumber_Check(arg);
+	
+	tmp = arg;
+	Py_INCREF(tmp);
+	Py_DECREF(self->pitch);
+	if (isNumber == 1) {
+		self->pitch = PyNumber_Float(tmp);
+        self->modebuffer[2] = 0;
+	}
+	else {
+		self->pitch = tmp;
+        streamtmp = PyObject_CallMethod((PyObject *)self->pitch, "_getStream", NULL);
+        Py_INCREF(streamtmp);
+        Py_XDECREF(self->pitch_stream);
+        self->pitch_stream = (Stream *)streamtmp;
+		self->modebuffer[2] = 1;
+	}
+
+	Py_INCREF(Py_None);
+	return Py_None;
+}	
+
+static PyObject *
+PartialBank_setMode(PartialBank *self, PyObject *arg)
+{	
+	if (PyInt_Check(arg)) {
+        self->mode = PyInt_AS_LONG(arg);
+        PartialSynth_setMode(self->synth, self->mode);
+    }
+
+	Py_INCREF(Py_None);
+	return Py_None;
+}	
+
+static PyMemberDef PartialBank_members[] = {
+    {"server", T_OBJECT_EX, offsetof(PartialBank, server), 0, "Pyo server."},
+    {"stream", T_OBJECT_EX, offsetof(PartialBank, stream), 0, "Stream object."},
+    {"freqs", T_OBJECT_EX, offsetof(PartialBank, freqs), 0, "Frequencies table."},
+    {"amps", T_OBJECT_EX, offsetof(PartialBank, amps), 0, "Amplitudes table."},
+    {"pitch", T_OBJECT_EX, offsetof(PartialBank, pitch), 0, "Transposition factor."},
+    {"mul", T_OBJECT_EX, offsetof(PartialBank, mul), 0, "Mul factor."},
+    {"add", T_OBJECT_EX, offsetof(PartialBank, add), 0, "Add factor."},
+    {NULL}  /* Sentinel */
+};
+
+static PyMethodDef PartialBank_methods[] = {
+    {"getServer", (PyCFunction)PartialBank_getServer, METH_NOARGS, "Returns server object."},
+    {"_getStream", (PyCFunction)PartialBank_getStream, METH_NOARGS, "Returns stream object."},
+    {"play", (PyCFunction)PartialBank_play, METH_VARARGS|METH_KEYWORDS, "Starts computing without sending sound to soundcard."},
+    {"out", (PyCFunction)PartialBank_out, METH_VARARGS|METH_KEYWORDS, "Starts computing and sends sound to soundcard channel speficied by argument."},
+    {"stop", (PyCFunction)PartialBank_stop, METH_NOARGS, "Stops computing."},
+    {"setFreqs", (PyCFunction)PartialBank_setFreqs, METH_O, "Sets frequencies table."},
+    {"setAmps", (PyCFunction)PartialBank_setAmps, METH_O, "Sets amplitudes table."},
+    {"setPitch", (PyCFunction)PartialBank_setPitch, METH_O, "Sets transposition factor."},
+    {"setMode", (PyCFunction)PartialBank_setMode, METH_O, "Sets the synthesis method."},
+    {"setMul", (PyCFunction)PartialBank_setMul, METH_O, "Sets oscillator mul factor."},
+    {"setAdd", (PyCFunction)PartialBank_setAdd, METH_O, "Sets oscillator add factor."},
+    {"setSub", (PyCFunction)PartialBank_setSub, METH_O, "Sets inverse add factor."},
+    {"setDiv", (PyCFunction)PartialBank_setDiv, METH_O, "Sets inverse mul factor."},
+    {NULL}  /* Sentinel */
+};
+
+static PyNumberMethods PartialBank_as_number = {
+    (binaryfunc)PartialBank_add,                         /*nb_add*/
+    (binaryfunc)PartialBank_sub,                         /*nb_subtract*/
+    (binaryfunc)PartialBank_multiply,                    /*nb_multiply*/
+    (binaryfunc)PartialBank_div,                                              /*nb_divide*/
+    0,                                              /*nb_remainder*/
+    0,                                              /*nb_divmod*/
+    0,                                              /*nb_power*/
+    0,                                              /*nb_neg*/
+    0,                                              /*nb_pos*/
+    0,                                              /*(unaryfunc)array_abs,*/
+    0,                                              /*nb_nonzero*/
+    0,                                              /*nb_invert*/
+    0,                                              /*nb_lshift*/
+    0,                                              /*nb_rshift*/
+    0,                                              /*nb_and*/
+    0,                                              /*nb_xor*/
+    0,                                              /*nb_or*/
+    0,                                              /*nb_coerce*/
+    0,                                              /*nb_int*/
+    0,                                              /*nb_long*/
+    0,                                              /*nb_float*/
+    0,                                              /*nb_oct*/
+    0,                                              /*nb_hex*/
+    (binaryfunc)PartialBank_inplace_add,                 /*inplace_add*/
+    (binaryfunc)PartialBank_inplace_sub,                 /*inplace_subtract*/
+    (binaryfunc)PartialBank_inplace_multiply,            /*inplace_multiply*/
+    (binaryfunc)PartialBank_inplace_div,                                              /*inplace_divide*/
+    0,                                              /*inplace_remainder*/
+    0,                                              /*inplace_power*/
+    0,                                              /*inplace_lshift*/
+    0,                                              /*inplace_rshift*/
+    0,                                              /*inplace_and*/
+    0,                                              /*inplace_xor*/
+    0,                                              /*inplace_or*/
+    0,                                              /*nb_floor_divide*/
+    0,                                              /*nb_true_divide*/
+    0,                                              /*nb_inplace_floor_divide*/
+    0,                                              /*nb_inplace_true_divide*/
+    0,                                              /* nb_index */
+};
+
+PyTypeObject PartialBankType = {
+    PyObject_HEAD_INIT(NULL)
+    0,                                              /*ob_size*/
+    "_pyo.PartialBank_base",                                   /*tp_name*/
+    sizeof(PartialBank),                                 /*tp_basicsize*/
+    0,                                              /*tp_itemsize*/
+    (destructor)PartialBank_dealloc,                     /*tp_dealloc*/
+    0,                                              /*tp_print*/
+    0,                                              /*tp_getattr*/
+    0,                                              /*tp_setattr*/
+    0,                                              /*tp_compare*/
+    0,                                              /*tp_repr*/
+    &PartialBank_as_number,                              /*tp_as_number*/
+    0,                                              /*tp_as_sequence*/
+    0,                                              /*tp_as_mapping*/
+    0,                                              /*tp_hash */
+    0,                                              /*tp_call*/
+    0,                                              /*tp_str*/
+    0,                                              /*tp_getattro*/
+    0,                                              /*tp_setattro*/
+    0,                                              /*tp_as_buffer*/
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC | Py_TPFLAGS_CHECKTYPES, /*tp_flags*/
+    "PartialBank objects. Additive synthesis of sine partials.",           /* tp_doc */
+    (traverseproc)PartialBank_traverse,                  /* tp_traverse */
+    (inquiry)PartialBank_clear,                          /* tp_clear */
+    0,                                              /* tp_richcompare */
+    0,                                              /* tp_weaklistoffset */
+    0,                                              /* tp_iter */
+    0,                                              /* tp_iternext */
+    PartialBank_methods,                                 /* tp_methods */
+    PartialBank_members,                                 /* tp_members */
+    0,                                              /* tp_getset */
+    0,                                              /* tp_base */
+    0,                                              /* tp_dict */
+    0,                                              /* tp_descr_get */
+    0,                                              /* tp_descr_set */
+    0,                                              /* tp_dictoffset */
+    0,                          /* tp_init */
+    0,                                              /* tp_alloc */
+    PartialBank_new,                                     /* tp_new */
+};
@@ -931,13 +931,14 @@ typedef struct {
     PyObject *address_path;
     PyObject *callable;
     int port;
+    int defer;
 } OscDataReceive;
 
 int OscDataReceive_handler(const char *path, const char *types, lo_arg **argv, int argc,
                         void *data, void *user_data)
 {
     OscDataReceive *self = user_data;
-    PyObject *tup, *result;
+    PyObject *tup;
     tup = PyTuple_New(argc+1);
     int i, ok = 0;
     
@@ -972,12 +973,9 @@ int OscDataReceive_handler(const char *path, const char *types, lo_arg **argv, i
                     break;
             }
         }
-        result = PyObject_Call(self->callable, tup, NULL);     
-        if (result == NULL)
-            PyErr_Print();
+        Server_dispatchCall((Server *)self->server, self->callable, tup, self->defer);
     }
     Py_XDECREF(tup);
-    Py_XDECREF(result);
     return 0;
 }
 
@@ -1021,6 +1019,7 @@ OscDataReceive_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
     PyObject *pathtmp, *calltmp;
     OscDataReceive *self;
     self = (OscDataReceive *)type->tp_alloc(type, 0);
+    self->defer = 0;
     
     INIT_OBJECT_COMMON
     Stream_setFunctionPtr(self->stream, OscDataReceive_compute_next_data_frame);
@@ -1089,6 +1088,16 @@ OscDataReceive_delAddress(OscDataReceive *self, PyObject *arg) {
     return Py_None;
 }
 
+static PyObject *
+OscDataReceive_setDefer(OscDataReceive *self, PyObject *arg)
+{
+    if (arg != NULL)
+        self->defer = PyObject_IsTrue(arg);
+
+	Py_INCREF(Py_None);
+	return Py_None;
+}
+
 static PyMemberDef OscDataReceive_members[] = {
     {"server", T_OBJECT_EX, offsetof(OscDataReceive, server), 0, "Pyo server."},
     {"stream", T_OBJECT_EX, offsetof(OscDataReceive, stream), 0, "Stream object."},
@@ -1102,6 +1111,7 @@ static PyMethodDef OscDataReceive_methods[] = {
     {"stop", (PyCFunction)OscDataReceive_stop, METH_NOARGS, "Stops computing."},
     {"addAddress", (PyCFunction)OscDataReceive_addAddress, METH_O, "Add new paths to the object."},
     {"delAddress", (PyCFunction)OscDataReceive_delAddress, METH_O, "Remove path from the object."},
+    {"setDefer", (PyCFunction)OscDataReceive_setDefer, METH_O, "If True, the function is called by the server's call thread."},
     {NULL}  /* Sentinel */
 };
 
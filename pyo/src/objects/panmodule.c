@@ -25,6 +25,7 @@
 #include "streammodule.h"
 #include "servermodule.h"
 #include "dummymodule.h"
+#include "tablemodule.h"
 
 typedef struct {
     pyo_audio_HEAD
@@ -2198,6 +2199,417 @@ VoiceManager_members,                                 /* tp_members */
 VoiceManager_new,                                     /* tp_new */
 };
 
+/****************/
+/**** VoicePool *****/
+/****************/
+typedef struct {
+    pyo_audio_HEAD
+    PyObject *outputs; /* streams watched for silence */
+    PyObject *streams; /* streams of the voice, suspended while the voice sleeps */
+    int *suspended;
+    PyObject *trigger;
+    Stream *trigger_stream;
+    MYFLT threshold;
+    MYFLT time;
+    int wait; /* silent buffers before sleeping */
+    int count;
+    int hold; /* buffers, after waking, before the voice can sleep again */
+    int awake;
+    MYFLT peak;
+    int modebuffer[2]; // need at least 2 slots for mul & add 
+} VoicePool;
+
+static void
+VoicePool_sleep(VoicePool *self)
+{
+    int i;
+    Stream *stream;
+    int num = PyList_GET_SIZE(self->streams);
+
+    for (i=0; i<num; i++) {
+        stream = (Stream *)PyList_GET_ITEM(self->streams, i);
+        self->suspended[i] = Stream_getStreamActive(stream);
+        Stream_setStreamActive(stream, 0);
+    }
+    self->awake = 0;
+}
+
+static void
+VoicePool_wake(VoicePool *self)
+{
+    int i;
+    int num = PyList_GET_SIZE(self->streams);
+
+    if (! self->awake) {
+        for (i=0; i<num; i++) {
+            if (self->suspended[i])
+                Stream_setStreamActive((Stream *)PyList_GET_ITEM(self->streams, i), 1);
+            self->suspended[i] = 0;
+        }
+        self->awake = 1;
+    }
+    self->count = 0;
+    self->hold = self->wait;
+}
+
+static void
+VoicePool_generate(VoicePool *self) {
+    int i, j, num;
+    MYFLT peak, absin, val, *in;
+
+    if (self->trigger_stream != NULL) {
+        in = Stream_getData(self->trigger_stream);
+        for (i=0; i<self->bufsize; i++) {
+            if (in[i] == 1.0) {
+                VoicePool_wake(self);
+                break;
+            }
+        }
+    }
+    if (self->awake) {
+        peak = 0.0;
+        num = PyList_GET_SIZE(self->outputs);
+        for (j=0; j<num; j++) {
+            in = Stream_getData((Stream *)PyList_GET_ITEM(self->outputs, j));
+            for (i=0; i<self->bufsize; i++) {
+                absin = MYFABS(in[i]);
+                if (absin > peak)
+                    peak = absin;
+            }
+        }
+        self->peak = peak;
+        if (self->hold > 0)
+            self->hold--;
+        if (peak < self->threshold)
+            self->count++;
+        else
+            self->count = 0;
+        if (self->count >= self->wait && self->hold == 0)
+            VoicePool_sleep(self);
+    }
+
+    val = (MYFLT)self->awake;
+    for (i=0; i<self->bufsize; i++)
+        self->data[i] = val;
+}
+
+static void VoicePool_postprocessing_ii(VoicePool *self) { POST_PROCESSING_II };
+static void VoicePool_postprocessing_ai(VoicePool *self) { POST_PROCESSING_AI };
+static void VoicePool_postprocessing_ia(VoicePool *self) { POST_PROCESSING_IA };
+static void VoicePool_postprocessing_aa(VoicePool *self) { POST_PROCESSING_AA };
+static void VoicePool_postprocessing_ireva(VoicePool *self) { POST_PROCESSING_IREVA };
+static void VoicePool_postprocessing_areva(VoicePool *self) { POST_PROCESSING_AREVA };
+static void VoicePool_postprocessing_revai(VoicePool *self) { POST_PROCESSING_REVAI };
+static void VoicePool_postprocessing_revaa(VoicePool *self) { POST_PROCESSING_REVAA };
+static void VoicePool_postprocessing_revareva(VoicePool *self) { POST_PROCESSING_REVAREVA };
+
+static void
+VoicePool_setProcMode(VoicePool *self)
+{
+    int muladdmode;
+    muladdmode = self->modebuffer[0] + self->modebuffer[1] * 10;
+    
+    self->proc_func_ptr = VoicePool_generate;
+	
+    switch (muladdmode) {
+        case 0:        
+            self->muladd_func_ptr = VoicePool_postprocessing_ii;
+            break;
+        case 1:    
+            self->muladd_func_ptr = VoicePool_postprocessing_ai;
+            break;
+        case 2:    
+            self->muladd_func_ptr = VoicePool_postprocessing_revai;
+            break;
+        case 10:        
+            self->muladd_func_ptr = VoicePool_postprocessing_ia;
+            break;
+        case 11:    
+            self->muladd_func_ptr = VoicePool_postprocessing_aa;
+            break;
+        case 12:    
+            self->muladd_func_ptr = VoicePool_postprocessing_revaa;
+            break;
+        case 20:        
+            self->muladd_func_ptr = VoicePool_postprocessing_ireva;
+            break;
+        case 21:    
+            self->muladd_func_ptr = VoicePool_postprocessing_areva;
+            break;
+        case 22:    
+            self->muladd_func_ptr = VoicePool_postprocessing_revareva;
+            break;
+    }  
+}
+
+static void
+VoicePool_compute_next_data_frame(VoicePool *self)
+{
+    (*self->proc_func_ptr)(self); 
+    (*self->muladd_func_ptr)(self);
+}
+
+static int
+VoicePool_traverse(VoicePool *self, visitproc visit, void *arg)
+{
+    pyo_VISIT
+    Py_VISIT(self->outputs);
+    Py_VISIT(self->streams);
+    Py_VISIT(self->trigger);
+    Py_VISIT(self->trigger_stream);
+    return 0;
+}
+
+static int 
+VoicePool_clear(VoicePool *self)
+{
+    pyo_CLEAR
+    Py_CLEAR(self->outputs);
+    Py_CLEAR(self->streams);
+    Py_CLEAR(self->trigger);
+    Py_CLEAR(self->trigger_stream);
+    return 0;
+}
+
+static void
+VoicePool_dealloc(VoicePool* self)
+{
+    pyo_DEALLOC
+    free(self->suspended);
+    VoicePool_clear(self);
+    self->ob_type->tp_free((PyObject*)self);
+}
+
+static PyObject *
+VoicePool_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
+{
+    int i;
+    PyObject *outputstmp, *streamstmp, *triggertmp=NULL, *multmp=NULL, *addtmp=NULL;
+    VoicePool *self;
+    self = (VoicePool *)type->tp_alloc(type, 0);
+
+    self->suspended = NULL;
+    self->threshold = 0.0001;
+    self->time = 0.1;
+    self->count = 0;
+    self->awake = 1;
+    self->peak = 0.0;
+	self->modebuffer[0] = 0;
+	self->modebuffer[1] = 0;
+ 
+    INIT_OBJECT_COMMON
+    Stream_setFunctionPtr(self->stream, VoicePool_compute_next_data_frame);
+    self->mode_func_ptr = VoicePool_setProcMode;
+
+    static char *kwlist[] = {"outputs", "streams", "trigger", "thresh", "time", "mul", "add", NULL};
+
+    if (! PyArg_ParseTupleAndKeywords(args, kwds, TYPE_OO_OFFOO, kwlist, &outputstmp, &streamstmp, &triggertmp, &self->threshold, &self->time, &multmp, &addtmp))
+        Py_RETURN_NONE;
+
+    if (! PyList_Check(outputstmp) || ! PyList_Check(streamstmp)) {
+        PyErr_SetString(PyExc_TypeError, "VoicePool outputs and streams must be lists of streams.");
+        Py_RETURN_NONE;
+    }
+    Py_INCREF(outputstmp);
+    self->outputs = outputstmp;
+    Py_INCREF(streamstmp);
+    self->streams = streamstmp;
+    self->suspended = (int *)calloc(PyList_GET_SIZE(streamstmp) + 1, sizeof(int));
+
+    if (triggertmp && triggertmp != Py_None) {
+        Py_INCREF(triggertmp);
+        self->trigger = triggertmp;
+        self->trigger_stream = (Stream *)PyObject_CallMethod(triggertmp, "_getStream", NULL);
+    }
+    
+    if (multmp) {
+        PyObject_CallMethod((PyObject *)self, "setMul", "O", multmp);
+    }
+    
+    if (addtmp) {
+        PyObject_CallMethod((PyObject *)self, "setAdd", "O", addtmp);
+    }
+    
+    PyObject_CallMethod(self->server, "addStream", "O", self->stream);
+
+    PyObject_CallMethod((PyObject *)self, "setTime", "d", (double)self->time);
+    self->hold = self->wait;
+
+    (*self->mode_func_ptr)(self);
+
+    return (PyObject *)self;
+}
+
+static PyObject * VoicePool_getServer(VoicePool* self) { GET_SERVER };
+static PyObject * VoicePool_getStream(VoicePool* self) { GET_STREAM };
+static PyObject * VoicePool_setMul(VoicePool *self, PyObject *arg) { SET_MUL };	
+static PyObject * VoicePool_setAdd(VoicePool *self, PyObject *arg) { SET_ADD };	
+static PyObject * VoicePool_setSub(VoicePool *self, PyObject *arg) { SET_SUB };	
+static PyObject * VoicePool_setDiv(VoicePool *self, PyObject *arg) { SET_DIV };	
+
+static PyObject * VoicePool_play(VoicePool *self, PyObject *args, PyObject *kwds) { PLAY };
+static PyObject * VoicePool_stop(VoicePool *self) { STOP };
+
+static PyObject * VoicePool_multiply(VoicePool *self, PyObject *arg) { MULTIPLY };
+static PyObject * VoicePool_inplace_multiply(VoicePool *self, PyObject *arg) { INPLACE_MULTIPLY };
+static PyObject * VoicePool_add(VoicePool *self, PyObject *arg) { ADD };
+static PyObject * VoicePool_inplace_add(VoicePool *self, PyObject *arg) { INPLACE_ADD };
+static PyObject * VoicePool_sub(VoicePool *self, PyObject *arg) { SUB };
+static PyObject * VoicePool_inplace_sub(VoicePool *self, PyObject *arg) { INPLACE_SUB };
+static PyObject * VoicePool_div(VoicePool *self, PyObject *arg) { DIV };
+static PyObject * VoicePool_inplace_div(VoicePool *self, PyObject *arg) { INPLACE_DIV };
+
+static PyObject *
+VoicePool_setThresh(VoicePool *self, PyObject *arg)
+{
+	if (arg != NULL && PyNumber_Check(arg)) {
+        self->threshold = PyFloat_AsDouble(arg);
+    }
+
+    Py_RETURN_NONE;
+}	
+
+static PyObject *
+VoicePool_setTime(VoicePool *self, PyObject *arg)
+{
+	if (arg != NULL && PyNumber_Check(arg)) {
+        self->time = PyFloat_AsDouble(arg);
+        self->wait = (int)MYCEIL(self->time * self->sr / self->bufsize);
+        if (self->wait < 1)
+            self->wait = 1;
+    }
+
+    Py_RETURN_NONE;
+}	
+
+static PyObject *
+VoicePool_wakeUp(VoicePool *self)
+{
+    VoicePool_wake(self);
+    Py_RETURN_NONE;
+}	
+
+static PyObject *
+VoicePool_isAwake(VoicePool *self)
+{
+    return PyInt_FromLong(self->awake);
+}	
+
+static PyObject *
+VoicePool_getPeak(VoicePool *self)
+{
+    return PyFloat_FromDouble(self->awake ? self->peak : 0.0);
+}	
+
+static PyMemberDef VoicePool_members[] = {
+{"server", T_OBJECT_EX, offsetof(VoicePool, server), 0, "Pyo server."},
+{"stream", T_OBJECT_EX, offsetof(VoicePool, stream), 0, "Stream object."},
+{"mul", T_OBJECT_EX, offsetof(VoicePool, mul), 0, "Mul factor."},
+{"add", T_OBJECT_EX, offsetof(VoicePool, add), 0, "Add factor."},
+{NULL}  /* Sentinel */
+};
+
+static PyMethodDef VoicePool_methods[] = {
+{"getServer", (PyCFunction)VoicePool_getServer, METH_NOARGS, "Returns server object."},
+{"_getStream", (PyCFunction)VoicePool_getStream, METH_NOARGS, "Returns stream object."},
+{"play", (PyCFunction)VoicePool_play, METH_VARARGS|METH_KEYWORDS, "Starts computing without sending sound to soundcard."},
+{"stop", (PyCFunction)VoicePool_stop, METH_NOARGS, "Stops computing."},
+{"setThresh", (PyCFunction)VoicePool_setThresh, METH_O, "Sets the silence threshold, as an amplitude."},
+{"setTime", (PyCFunction)VoicePool_setTime, METH_O, "Sets the time of silence, in seconds, before the voice sleeps."},
+{"wake", (PyCFunction)VoicePool_wakeUp, METH_NOARGS, "Resumes the processing of the voice."},
+{"isAwake", (PyCFunction)VoicePool_isAwake, METH_NOARGS, "Returns 1 if the voice is processed, 0 if it sleeps."},
+{"getPeak", (PyCFunction)VoicePool_getPeak, METH_NOARGS, "Returns the peak amplitude of the last buffer of the voice."},
+{"setMul", (PyCFunction)VoicePool_setMul, METH_O, "Sets mul factor."},
+{"setAdd", (PyCFunction)VoicePool_setAdd, METH_O, "Sets add factor."},
+{"setSub", (PyCFunction)VoicePool_setSub, METH_O, "Sets inverse add factor."},
+{"setDiv", (PyCFunction)VoicePool_setDiv, METH_O, "Sets inverse mul factor."},
+{NULL}  /* Sentinel */
+};
+
+static PyNumberMethods VoicePool_as_number = {
+(binaryfunc)VoicePool_add,                         /*nb_add*/
+(binaryfunc)VoicePool_sub,                         /*nb_subtract*/
+(binaryfunc)VoicePool_multiply,                    /*nb_multiply*/
+(binaryfunc)VoicePool_div,                                              /*nb_divide*/
+0,                                              /*nb_remainder*/
+0,                                              /*nb_divmod*/
+0,                                              /*nb_power*/
+0,                                              /*nb_neg*/
+0,                                              /*nb_pos*/
+0,                                              /*(unaryfunc)array_abs,*/
+0,                                              /*nb_nonzero*/
+0,                                              /*nb_invert*/
+0,                                              /*nb_lshift*/
+0,                                              /*nb_rshift*/
+0,                                              /*nb_and*/
+0,                                              /*nb_xor*/
+0,                                              /*nb_or*/
+0,                                              /*nb_coerce*/
+0,                                              /*nb_int*/
+0,                                              /*nb_long*/
+0,                                              /*nb_float*/
+0,                                              /*nb_oct*/
+0,                                              /*nb_hex*/
+(binaryfunc)VoicePool_inplace_add,                 /*inplace_add*/
+(binaryfunc)VoicePool_inplace_sub,                 /*inplace_subtract*/
+(binaryfunc)VoicePool_inplace_multiply,            /*inplace_multiply*/
+(binaryfunc)VoicePool_inplace_div,                                              /*inplace_divide*/
+0,                                              /*inplace_remainder*/
+0,                                              /*inplace_power*/
+0,                                              /*inplace_lshift*/
+0,                                              /*inplace_rshift*/
+0,                                              /*inplace_and*/
+0,                                              /*inplace_xor*/
+0,                                              /*inplace_or*/
+0,                                              /*nb_floor_divide*/
+0,                                              /*nb_true_divide*/
+0,                                              /*nb_inplace_floor_divide*/
+0,                                              /*nb_inplace_true_divide*/
+0,                                              /* nb_index */
+};
+
+PyTypeObject VoicePoolType = {
+PyObject_HEAD_INIT(NULL)
+0,                                              /*ob_size*/
+"_pyo.VoicePool_base",                                   /*tp_name*/
+sizeof(VoicePool),                                 /*tp_basicsize*/
+0,                                              /*tp_itemsize*/
+(destructor)VoicePool_dealloc,                     /*tp_dealloc*/
+0,                                              /*tp_print*/
+0,                                              /*tp_getattr*/
+0,                                              /*tp_setattr*/
+0,                                              /*tp_compare*/
+0,                                              /*tp_repr*/
+&VoicePool_as_number,                              /*tp_as_number*/
+0,                                              /*tp_as_sequence*/
+0,                                              /*tp_as_mapping*/
+0,                                              /*tp_hash */
+0,                                              /*tp_call*/
+0,                                              /*tp_str*/
+0,                                              /*tp_getattro*/
+0,                                              /*tp_setattro*/
+0,                                              /*tp_as_buffer*/
+Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC | Py_TPFLAGS_CHECKTYPES, /*tp_flags*/
+"VoicePool objects. Suspends the processing of a voice while it is silent.",           /* tp_doc */
+(traverseproc)VoicePool_traverse,                  /* tp_traverse */
+(inquiry)VoicePool_clear,                          /* tp_clear */
+0,                                              /* tp_richcompare */
+0,                                              /* tp_weaklistoffset */
+0,                                              /* tp_iter */
+0,                                              /* tp_iternext */
+VoicePool_methods,                                 /* tp_methods */
+VoicePool_members,                                 /* tp_members */
+0,                                              /* tp_getset */
+0,                                              /* tp_base */
+0,                                              /* tp_dict */
+0,                                              /* tp_descr_get */
+0,                                              /* tp_descr_set */
+0,                                              /* tp_dictoffset */
+0,                          /* tp_init */
+0,                                              /* tp_alloc */
+VoicePool_new,                                     /* tp_new */
+};
+
 /****************/
 /**** Mixer *****/
 /****************/
@@ -2811,6 +3223,725 @@ PyTypeObject MixerVoiceType = {
     MixerVoice_new,                 /* tp_new */
 };
 
+/****************/
+/**** ModMatrix *****/
+/****************/
+/* Sparse routing matrix. Only the cells with a gain, or ramping toward 0, 
+   are stored and computed. A lookup table gives the cell of an input/output 
+   pair, a cell whose gain reaches 0 is removed by moving the last cell 
+   in its place. */
+typedef struct {
+    int in;
+    int out;
+    MYFLT gain;
+    MYFLT current;
+    MYFLT step;
+    long count;
+} ModMatrixCell;
+
+typedef struct {
+    pyo_audio_HEAD
+    PyObject *inputs;
+    Stream **input_streams;
+    int num_ins;
+    int num_outs;
+    int *lookup; /* num_ins * num_outs cell indexes, -1 for an empty cell */
+    ModMatrixCell *cells;
+    int num_cells;
+    int cells_size;
+    int *out_cells; /* number of cells per output */
+    MYFLT time;
+    long timeStep;
+    MYFLT *buffer_streams;
+} ModMatrix;
+
+static void
+ModMatrix_removeCell(ModMatrix *self, int index)
+{
+    ModMatrixCell *cell = &self->cells[index];
+    self->lookup[cell->in * self->num_outs + cell->out] = -1;
+    self->out_cells[cell->out]--;
+    self->num_cells--;
+    if (index != self->num_cells) {
+        *cell = self->cells[self->num_cells];
+        self->lookup[cell->in * self->num_outs + cell->out] = index;
+    }
+}
+
+static void
+ModMatrix_generate(ModMatrix *self) {
+    int i, k;
+    MYFLT current, step;
+    MYFLT *in, *out;
+    ModMatrixCell *cell;
+
+    for (k=0; k<self->num_outs; k++) {
+        if (self->out_cells[k] > 0)
+            memset(self->buffer_streams + k * self->bufsize, 0, self->bufsize * sizeof(MYFLT));
+    }
+
+    k = 0;
+    while (k < self->num_cells) {
+        cell = &self->cells[k];
+        if (cell->count >= self->timeStep && cell->gain == 0.0) {
+            /* Ramp to 0 finished in the previous buffer. */
+            ModMatrix_removeCell(self, k);
+            continue;
+        }
+        in = Stream_getData(self->input_streams[cell->in]);
+        out = self->buffer_streams + cell->out * self->bufsize;
+        if (cell->count < self->timeStep) {
+            current = cell->current;
+            step = cell->step;
+            for (i=0; i<self->bufsize; i++) {
+                if (cell->count < self->timeStep) {
+                    cell->count++;
+                    if (cell->count == self->timeStep)
+                        current = cell->gain;
+                    else
+                        current += step;
+                }
+                out[i] += in[i] * current;
+            }
+            cell->current = current;
+        }
+        else {
+            current = cell->current;
+            for (i=0; i<self->bufsize; i++)
+                out[i] += in[i] * current;
+        }
+        k++;
+    }
+}
+
+MYFLT *
+ModMatrix_getSamplesBuffer(ModMatrix *self, int out)
+{
+    if (self->out_cells[out] == 0)
+        return NULL;
+    return self->buffer_streams + out * self->bufsize;
+}    
+
+static void
+ModMatrix_setGainValue(ModMatrix *self, int in, int out, MYFLT gain)
+{
+    int index = self->lookup[in * self->num_outs + out];
+    ModMatrixCell *cell;
+
+    if (index < 0) {
+        if (gain == 0.0)
+            return;
+        if (self->num_cells == self->cells_size) {
+            self->cells_size = self->cells_size ? self->cells_size * 2 : 64;
+            self->cells = (ModMatrixCell *)realloc(self->cells, self->cells_size * sizeof(ModMatrixCell));
+        }
+        index = self->num_cells++;
+        self->lookup[in * self->num_outs + out] = index;
+        self->out_cells[out]++;
+        cell = &self->cells[index];
+        cell->in = in;
+        cell->out = out;
+        cell->current = 0.0;
+    }
+    else {
+        cell = &self->cells[index];
+        if (gain == cell->gain)
+            return;
+    }
+    cell->gain = gain;
+    if (self->timeStep > 0) {
+        cell->count = 0;
+        cell->step = (gain - cell->current) / self->timeStep;
+    }
+    else {
+        cell->count = 0;
+        cell->current = gain;
+    }
+}
+
+static void
+ModMatrix_setProcMode(ModMatrix *self)
+{
+    self->proc_func_ptr = ModMatrix_generate;
+}
+
+static void
+ModMatrix_compute_next_data_frame(ModMatrix *self)
+{
+    (*self->proc_func_ptr)(self); 
+}
+
+static int
+ModMatrix_traverse(ModMatrix *self, visitproc visit, void *arg)
+{
+    pyo_VISIT
+    Py_VISIT(self->inputs);
+    return 0;
+}
+
+static int 
+ModMatrix_clear(ModMatrix *self)
+{
+    pyo_CLEAR
+    Py_CLEAR(self->inputs);
+    return 0;
+}
+
+static void
+ModMatrix_dealloc(ModMatrix* self)
+{
+    pyo_DEALLOC
+    free(self->input_streams);
+    free(self->lookup);
+    free(self->cells);
+    free(self->out_cells);
+    free(self->buffer_streams);
+    ModMatrix_clear(self);
+    self->ob_type->tp_free((PyObject*)self);
+}
+
+static PyObject *
+ModMatrix_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
+{
+    int i;
+    PyObject *inputstmp=NULL, *timetmp=NULL;
+    ModMatrix *self;
+    self = (ModMatrix *)type->tp_alloc(type, 0);
+    
+    self->num_outs = 1;
+    self->time = 0.025;
+    self->num_cells = self->cells_size = 0;
+    
+    INIT_OBJECT_COMMON
+    Stream_setFunctionPtr(self->stream, ModMatrix_compute_next_data_frame);
+    self->mode_func_ptr = ModMatrix_setProcMode;
+
+    static char *kwlist[] = {"inputs", "outs", "time", NULL};
+        
+    if (! PyArg_ParseTupleAndKeywords(args, kwds, "O|iO", kwlist, &inputstmp, &self->num_outs, &timetmp))
+        Py_RETURN_NONE; 
+
+    if (! PyList_Check(inputstmp)) {
+        PyErr_SetString(PyExc_TypeError, "ModMatrix inputs must be a list of streams.");
+        Py_DECREF(self);
+        return NULL;
+    }
+    Py_INCREF(inputstmp);
+    Py_XDECREF(self->inputs);
+    self->inputs = inputstmp;
+    self->num_ins = PyList_Size(self->inputs);
+    if (self->num_outs < 1)
+        self->num_outs = 1;
+
+    self->input_streams = (Stream **)realloc(self->input_streams, self->num_ins * sizeof(Stream *));
+    for (i=0; i<self->num_ins; i++) {
+        self->input_streams[i] = (Stream *)PyList_GET_ITEM(self->inputs, i);
+    }
+    self->lookup = (int *)realloc(self->lookup, self->num_ins * self->num_outs * sizeof(int));
+    for (i=0; i<(self->num_ins * self->num_outs); i++) {
+        self->lookup[i] = -1;
+    }
+    self->out_cells = (int *)realloc(self->out_cells, self->num_outs * sizeof(int));
+    for (i=0; i<self->num_outs; i++) {
+        self->out_cells[i] = 0;
+    }
+    self->buffer_streams = (MYFLT *)realloc(self->buffer_streams, self->num_outs * self->bufsize * sizeof(MYFLT));
+    self->timeStep = (long)(self->time * self->sr);
+
+    if (timetmp) {
+        PyObject_CallMethod((PyObject *)self, "setTime", "O", timetmp);
+    }
+    
+    PyObject_CallMethod(self->server, "addStream", "O", self->stream);
+    
+    (*self->mode_func_ptr)(self);
+    
+    return (PyObject *)self;
+}
+
+static PyObject * ModMatrix_getServer(ModMatrix* self) { GET_SERVER };
+static PyObject * ModMatrix_getStream(ModMatrix* self) { GET_STREAM };
+
+static PyObject * ModMatrix_play(ModMatrix *self, PyObject *args, PyObject *kwds) { PLAY };
+static PyObject * ModMatrix_stop(ModMatrix *self) { STOP };
+
+static PyObject *
+ModMatrix_setTime(ModMatrix *self, PyObject *arg)
+{
+    int k;
+
+    if (arg != NULL && PyNumber_Check(arg)) {
+        self->time = PyFloat_AsDouble(arg);
+        self->timeStep = (long)(self->time * self->sr);
+        /* Ramps in progress jump to their target. */
+        for (k=0; k<self->num_cells; k++) {
+            self->cells[k].count = self->timeStep;
+            self->cells[k].current = self->cells[k].gain;
+        }
+    }
+
+    Py_INCREF(Py_None);
+    return Py_None;
+}	
+
+static int
+ModMatrix_checkCell(ModMatrix *self, int in, int out)
+{
+    if (in < 0 || in >= self->num_ins || out < 0 || out >= self->num_outs) {
+        PyErr_Format(PyExc_IndexError, "ModMatrix cell (%d, %d) out of range.", in, out);
+        return -1;
+    }
+    return 0;
+}
+
+static PyObject *
+ModMatrix_setGain(ModMatrix *self, PyObject *args)
+{
+    int in, out;
+    MYFLT gain;
+
+    if (! PyArg_ParseTuple(args, "ii" TYPE_F, &in, &out, &gain))
+        return NULL;
+    if (ModMatrix_checkCell(self, in, out) < 0)
+        return NULL;
+
+    ModMatrix_setGainValue(self, in, out, gain);
+
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject *
+ModMatrix_getGain(ModMatrix *self, PyObject *args)
+{
+    int in, out, index;
+
+    if (! PyArg_ParseTuple(args, "ii", &in, &out))
+        return NULL;
+    if (ModMatrix_checkCell(self, in, out) < 0)
+        return NULL;
+
+    index = self->lookup[in * self->num_outs + out];
+    if (index < 0)
+        return PyFloat_FromDouble(0.0);
+    return PyFloat_FromDouble(self->cells[index].gain);
+}
+
+static PyObject *
+ModMatrix_setCells(ModMatrix *self, PyObject *arg)
+{
+    int i, num, in, out;
+    MYFLT gain;
+    PyObject *seq, *item;
+
+    seq = PySequence_Fast(arg, "ModMatrix cells must be a sequence of (input, output, gain) tuples.");
+    if (seq == NULL)
+        return NULL;
+
+    /* Checks everything first, the update is all or nothing. */
+    num = PySequence_Fast_GET_SIZE(seq);
+    for (i=0; i<num; i++) {
+        item = PySequence_Fast_GET_ITEM(seq, i);
+        if (! PyArg_ParseTuple(item, "ii" TYPE_F, &in, &out, &gain) || ModMatrix_checkCell(self, in, out) < 0) {
+            Py_DECREF(seq);
+            return NULL;
+        }
+    }
+    for (i=0; i<num; i++) {
+        PyArg_ParseTuple(PySequence_Fast_GET_ITEM(seq, i), "ii" TYPE_F, &in, &out, &gain);
+        ModMatrix_setGainValue(self, in, out, gain);
+    }
+    Py_DECREF(seq);
+
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject *
+ModMatrix_setMatrix(ModMatrix *self, PyObject *arg)
+{
+    int in, out, size = self->num_ins * self->num_outs;
+    Py_buffer view;
+    MYFLT *gains;
+
+    if (PyoBuffer_getFloatBuffer(arg, &view) < 0)
+        return NULL;
+    if ((view.len / view.itemsize) != size) {
+        PyBuffer_Release(&view);
+        PyErr_Format(PyExc_ValueError, "ModMatrix buffer must hold %d values (inputs * outputs).", size);
+        return NULL;
+    }
+    gains = (MYFLT *)malloc(size * sizeof(MYFLT));
+    PyoBuffer_copyToMYFLT(&view, 0, gains, size);
+    PyBuffer_Release(&view);
+
+    for (in=0; in<self->num_ins; in++) {
+        for (out=0; out<self->num_outs; out++) {
+            ModMatrix_setGainValue(self, in, out, gains[in * self->num_outs + out]);
+        }
+    }
+    free(gains);
+
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject *
+ModMatrix_clearCells(ModMatrix *self)
+{
+    int k;
+
+    for (k=0; k<self->num_cells; k++) {
+        ModMatrix_setGainValue(self, self->cells[k].in, self->cells[k].out, 0.0);
+    }
+
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject *
+ModMatrix_getCells(ModMatrix *self)
+{
+    int k;
+    PyObject *cells = PyList_New(0);
+    PyObject *cell;
+
+    for (k=0; k<self->num_cells; k++) {
+        if (self->cells[k].gain == 0.0)
+            continue;
+        cell = Py_BuildValue("ii" TYPE_F, self->cells[k].in, self->cells[k].out, self->cells[k].gain);
+        PyList_Append(cells, cell);
+        Py_DECREF(cell);
+    }
+    return cells;
+}
+
+static PyObject *
+ModMatrix_getCellCount(ModMatrix *self)
+{
+    return PyInt_FromLong(self->num_cells);
+}
+
+static PyMemberDef ModMatrix_members[] = {
+    {"server", T_OBJECT_EX, offsetof(ModMatrix, server), 0, "Pyo server."},
+    {"stream", T_OBJECT_EX, offsetof(ModMatrix, stream), 0, "Stream object."},
+    {"inputs", T_OBJECT_EX, offsetof(ModMatrix, inputs), 0, "List of input streams."},
+    {NULL}  /* Sentinel */
+};
+
+static PyMethodDef ModMatrix_methods[] = {
+    {"getServer", (PyCFunction)ModMatrix_getServer, METH_NOARGS, "Returns server object."},
+    {"_getStream", (PyCFunction)ModMatrix_getStream, METH_NOARGS, "Returns stream object."},
+    {"play", (PyCFunction)ModMatrix_play, METH_VARARGS|METH_KEYWORDS, "Starts computing without sending sound to soundcard."},
+    {"stop", (PyCFunction)ModMatrix_stop, METH_NOARGS, "Stops computing."},
+    {"setTime", (PyCFunction)ModMatrix_setTime, METH_O, "Sets ramp time in seconds."},
+    {"setGain", (PyCFunction)ModMatrix_setGain, METH_VARARGS, "Sets the gain of an input toward an output."},
+    {"getGain", (PyCFunction)ModMatrix_getGain, METH_VARARGS, "Returns the gain of an input toward an output."},
+    {"setCells", (PyCFunction)ModMatrix_setCells, METH_O, "Sets the gains of a sequence of (input, output, gain) cells."},
+    {"setMatrix", (PyCFunction)ModMatrix_setMatrix, METH_O, "Sets all the gains from a buffer of inputs * outputs values."},
+    {"clearCells", (PyCFunction)ModMatrix_clearCells, METH_NOARGS, "Ramps all the gains to 0."},
+    {"getCells", (PyCFunction)ModMatrix_getCells, METH_NOARGS, "Returns the list of (input, output, gain) cells with a gain."},
+    {"getCellCount", (PyCFunction)ModMatrix_getCellCount, METH_NOARGS, "Returns the number of cells computed."},
+    {NULL}  /* Sentinel */
+};
+
+PyTypeObject ModMatrixType = {
+    PyObject_HEAD_INIT(NULL)
+    0,                                              /*ob_size*/
+    "_pyo.ModMatrix_base",                                   /*tp_name*/
+    sizeof(ModMatrix),                                 /*tp_basicsize*/
+    0,                                              /*tp_itemsize*/
+    (destructor)ModMatrix_dealloc,                     /*tp_dealloc*/
+    0,                                              /*tp_print*/
+    0,                                              /*tp_getattr*/
+    0,                                              /*tp_setattr*/
+    0,                                              /*tp_compare*/
+    0,                                              /*tp_repr*/
+    0,                              /*tp_as_number*/
+    0,                                              /*tp_as_sequence*/
+    0,                                              /*tp_as_mapping*/
+    0,                                              /*tp_hash */
+    0,                                              /*tp_call*/
+    0,                                              /*tp_str*/
+    0,                                              /*tp_getattro*/
+    0,                                              /*tp_setattro*/
+    0,                                              /*tp_as_buffer*/
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC, /*tp_flags*/
+    "ModMatrix objects. Sparse routing matrix from multiple inputs toward multiple outputs.",           /* tp_doc */
+    (traverseproc)ModMatrix_traverse,                  /* tp_traverse */
+    (inquiry)ModMatrix_clear,                          /* tp_clear */
+    0,                                              /* tp_richcompare */
+    0,                                              /* tp_weaklistoffset */
+    0,                                              /* tp_iter */
+    0,                                              /* tp_iternext */
+    ModMatrix_methods,                                 /* tp_methods */
+    ModMatrix_members,                                 /* tp_members */
+    0,                                              /* tp_getset */
+    0,                                              /* tp_base */
+    0,                                              /* tp_dict */
+    0,                                              /* tp_descr_get */
+    0,                                              /* tp_descr_set */
+    0,                                              /* tp_dictoffset */
+    0,                          /* tp_init */
+    0,                                              /* tp_alloc */
+    ModMatrix_new,                                     /* tp_new */
+};
+
+/************************************************************************************************/
+/* ModMatrixVoice streamer object */
+/************************************************************************************************/
+typedef struct {
+    pyo_audio_HEAD
+    ModMatrix *mainMatrix;
+    int modebuffer[2];
+    int chnl; // voice order
+} ModMatrixVoice;
+
+static void ModMatrixVoice_postprocessing_ii(ModMatrixVoice *self) { POST_PROCESSING_II };
+static void ModMatrixVoice_postprocessing_ai(ModMatrixVoice *self) { POST_PROCESSING_AI };
+static void ModMatrixVoice_postprocessing_ia(ModMatrixVoice *self) { POST_PROCESSING_IA };
+static void ModMatrixVoice_postprocessing_aa(ModMatrixVoice *self) { POST_PROCESSING_AA };
+static void ModMatrixVoice_postprocessing_ireva(ModMatrixVoice *self) { POST_PROCESSING_IREVA };
+static void ModMatrixVoice_postprocessing_areva(ModMatrixVoice *self) { POST_PROCESSING_AREVA };
+static void ModMatrixVoice_postprocessing_revai(ModMatrixVoice *self) { POST_PROCESSING_REVAI };
+static void ModMatrixVoice_postprocessing_revaa(ModMatrixVoice *self) { POST_PROCESSING_REVAA };
+static void ModMatrixVoice_postprocessing_revareva(ModMatrixVoice *self) { POST_PROCESSING_REVAREVA };
+
+static void
+ModMatrixVoice_setProcMode(ModMatrixVoice *self)
+{
+    int muladdmode;
+    muladdmode = self->modebuffer[0] + self->modebuffer[1] * 10;
+    
+	switch (muladdmode) {
+        case 0:        
+            self->muladd_func_ptr = ModMatrixVoice_postprocessing_ii;
+            break;
+        case 1:    
+            self->muladd_func_ptr = ModMatrixVoice_postprocessing_ai;
+            break;
+        case 2:    
+            self->muladd_func_ptr = ModMatrixVoice_postprocessing_revai;
+            break;
+        case 10:        
+            self->muladd_func_ptr = ModMatrixVoice_postprocessing_ia;
+            break;
+        case 11:    
+            self->muladd_func_ptr = ModMatrixVoice_postprocessing_aa;
+            break;
+        case 12:    
+            self->muladd_func_ptr = ModMatrixVoice_postprocessing_revaa;
+            break;
+        case 20:        
+            self->muladd_func_ptr = ModMatrixVoice_postprocessing_ireva;
+            break;
+        case 21:    
+            self->muladd_func_ptr = ModMatrixVoice_postprocessing_areva;
+            break;
+        case 22:    
+            self->muladd_func_ptr = ModMatrixVoice_postprocessing_revareva;
+            break;
+    }
+}
+
+static void
+ModMatrixVoice_compute_next_data_frame(ModMatrixVoice *self)
+{
+    MYFLT *tmp;
+    tmp = ModMatrix_getSamplesBuffer((ModMatrix *)self->mainMatrix, self->chnl);
+    if (tmp == NULL)
+        memset(self->data, 0, self->bufsize * sizeof(MYFLT));
+    else
+        memcpy(self->data, tmp, self->bufsize * sizeof(MYFLT));
+    (*self->muladd_func_ptr)(self);
+}
+
+static int
+ModMatrixVoice_traverse(ModMatrixVoice *self, visitproc visit, void *arg)
+{
+    pyo_VISIT
+    Py_VISIT(self->mainMatrix);
+    return 0;
+}
+
+static int 
+ModMatrixVoice_clear(ModMatrixVoice *self)
+{
+    pyo_CLEAR
+    Py_CLEAR(self->mainMatrix);    
+    return 0;
+}
+
+static void
+ModMatrixVoice_dealloc(ModMatrixVoice* self)
+{
+    pyo_DEALLOC
+    ModMatrixVoice_clear(self);
+    self->ob_type->tp_free((PyObject*)self);
+}
+
+static PyObject *
+ModMatrixVoice_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
+{
+    int i;
+    PyObject *maintmp=NULL, *multmp=NULL, *addtmp=NULL;
+    ModMatrixVoice *self;
+    self = (ModMatrixVoice *)type->tp_alloc(type, 0);
+    
+	self->modebuffer[0] = 0;
+	self->modebuffer[1] = 0;
+    
+    INIT_OBJECT_COMMON
+    Stream_setFunctionPtr(self->stream, ModMatrixVoice_compute_next_data_frame);
+    self->mode_func_ptr = ModMatrixVoice_setProcMode;
+
+    static char *kwlist[] = {"mainMatrix", "chnl", "mul", "add", NULL};
+    
+    if (! PyArg_ParseTupleAndKeywords(args, kwds, "Oi|OO", kwlist, &maintmp, &self->chnl, &multmp, &addtmp))
+        Py_RETURN_NONE; 
+    
+    Py_XDECREF(self->mainMatrix);
+    Py_INCREF(maintmp);
+    self->mainMatrix = (ModMatrix *)maintmp;
+    
+    if (multmp) {
+        PyObject_CallMethod((PyObject *)self, "setMul", "O", multmp);
+    }
+    
+    if (addtmp) {
+        PyObject_CallMethod((PyObject *)self, "setAdd", "O", addtmp);
+    }
+    
+    PyObject_CallMethod(self->server, "addStream", "O", self->stream);
+    
+    return (PyObject *)self;
+}
+
+static PyObject * ModMatrixVoice_getServer(ModMatrixVoice* self) { GET_SERVER };
+static PyObject * ModMatrixVoice_getStream(ModMatrixVoice* self) { GET_STREAM };
+static PyObject * ModMatrixVoice_setMul(ModMatrixVoice *self, PyObject *arg) { SET_MUL };	
+static PyObject * ModMatrixVoice_setAdd(ModMatrixVoice *self, PyObject *arg) { SET_ADD };	
+static PyObject * ModMatrixVoice_setSub(ModMatrixVoice *self, PyObject *arg) { SET_SUB };	
+static PyObject * ModMatrixVoice_setDiv(ModMatrixVoice *self, PyObject *arg) { SET_DIV };	
+
+static PyObject * ModMatrixVoice_play(ModMatrixVoice *self, PyObject *args, PyObject *kwds) { PLAY };
+static PyObject * ModMatrixVoice_out(ModMatrixVoice *self, PyObject *args, PyObject *kwds) { OUT };
+static PyObject * ModMatrixVoice_stop(ModMatrixVoice *self) { STOP };
+
+static PyObject * ModMatrixVoice_multiply(ModMatrixVoice *self, PyObject *arg) { MULTIPLY };
+static PyObject * ModMatrixVoice_inplace_multiply(ModMatrixVoice *self, PyObject *arg) { INPLACE_MULTIPLY };
+static PyObject * ModMatrixVoice_add(ModMatrixVoice *self, PyObject *arg) { ADD };
+static PyObject * ModMatrixVoice_inplace_add(ModMatrixVoice *self, PyObject *arg) { INPLACE_ADD };
+static PyObject * ModMatrixVoice_sub(ModMatrixVoice *self, PyObject *arg) { SUB };
+static PyObject * ModMatrixVoice_inplace_sub(ModMatrixVoice *self, PyObject *arg) { INPLACE_SUB };
+static PyObject * ModMatrixVoice_div(ModMatrixVoice *self, PyObject *arg) { DIV };
+static PyObject * ModMatrixVoice_inplace_div(ModMatrixVoice *self, PyObject *arg) { INPLACE_DIV };
+
+static PyMemberDef ModMatrixVoice_members[] = {
+    {"server", T_OBJECT_EX, offsetof(ModMatrixVoice, server), 0, "Pyo server."},
+    {"stream", T_OBJECT_EX, offsetof(ModMatrixVoice, stream), 0, "Stream object."},
+    {"mul", T_OBJECT_EX, offsetof(ModMatrixVoice, mul), 0, "Mul factor."},
+    {"add", T_OBJECT_EX, offsetof(ModMatrixVoice, add), 0, "Add factor."},
+    {NULL}  /* Sentinel */
+};
+
+static PyMethodDef ModMatrixVoice_methods[] = {
+    {"getServer", (PyCFunction)ModMatrixVoice_getServer, METH_NOARGS, "Returns server object."},
+    {"_getStream", (PyCFunction)ModMatrixVoice_getStream, METH_NOARGS, "Returns stream object."},
+    {"play", (PyCFunction)ModMatrixVoice_play, METH_VARARGS|METH_KEYWORDS, "Starts computing without sending sound to soundcard."},
+    {"out", (PyCFunction)ModMatrixVoice_out, METH_VARARGS|METH_KEYWORDS, "Starts computing and sends sound to soundcard channel speficied by argument."},
+    {"stop", (PyCFunction)ModMatrixVoice_stop, METH_NOARGS, "Stops computing."},
+    {"setMul", (PyCFunction)ModMatrixVoice_setMul, METH_O, "Sets ModMatrixVoice mul factor."},
+    {"setAdd", (PyCFunction)ModMatrixVoice_setAdd, METH_O, "Sets ModMatrixVoice add factor."},
+    {"setSub", (PyCFunction)ModMatrixVoice_setSub, METH_O, "Sets inverse add factor."},
+    {"setDiv", (PyCFunction)ModMatrixVoice_setDiv, METH_O, "Sets inverse mul factor."},
+    {NULL}  /* Sentinel */
+};
+
+static PyNumberMethods ModMatrixVoice_as_number = {
+    (binaryfunc)ModMatrixVoice_add,                      /*nb_add*/
+    (binaryfunc)ModMatrixVoice_sub,                 /*nb_subtract*/
+    (binaryfunc)ModMatrixVoice_multiply,                 /*nb_multiply*/
+    (binaryfunc)ModMatrixVoice_div,                   /*nb_divide*/
+    0,                /*nb_remainder*/
+    0,                   /*nb_divmod*/
+    0,                   /*nb_power*/
+    0,                  /*nb_neg*/
+    0,                /*nb_pos*/
+    0,                  /*(unaryfunc)array_abs,*/
+    0,                    /*nb_nonzero*/
+    0,                    /*nb_invert*/
+    0,               /*nb_lshift*/
+    0,              /*nb_rshift*/
+    0,              /*nb_and*/
+    0,              /*nb_xor*/
+    0,               /*nb_or*/
+    0,                                          /*nb_coerce*/
+    0,                       /*nb_int*/
+    0,                      /*nb_long*/
+    0,                     /*nb_float*/
+    0,                       /*nb_oct*/
+    0,                       /*nb_hex*/
+    (binaryfunc)ModMatrixVoice_inplace_add,              /*inplace_add*/
+    (binaryfunc)ModMatrixVoice_inplace_sub,         /*inplace_subtract*/
+    (binaryfunc)ModMatrixVoice_inplace_multiply,         /*inplace_multiply*/
+    (binaryfunc)ModMatrixVoice_inplace_div,           /*inplace_divide*/
+    0,        /*inplace_remainder*/
+    0,           /*inplace_power*/
+    0,       /*inplace_lshift*/
+    0,      /*inplace_rshift*/
+    0,      /*inplace_and*/
+    0,      /*inplace_xor*/
+    0,       /*inplace_or*/
+    0,             /*nb_floor_divide*/
+    0,              /*nb_true_divide*/
+    0,     /*nb_inplace_floor_divide*/
+    0,      /*nb_inplace_true_divide*/
+    0,                     /* nb_index */
+};
+
+PyTypeObject ModMatrixVoiceType = {
+    PyObject_HEAD_INIT(NULL)
+    0,                         /*ob_size*/
+    "_pyo.ModMatrixVoice_base",         /*tp_name*/
+    sizeof(ModMatrixVoice),         /*tp_basicsize*/
+    0,                         /*tp_itemsize*/
+    (destructor)ModMatrixVoice_dealloc, /*tp_dealloc*/
+    0,                         /*tp_print*/
+    0,                         /*tp_getattr*/
+    0,                         /*tp_setattr*/
+    0,                         /*tp_compare*/
+    0,                         /*tp_repr*/
+    &ModMatrixVoice_as_number,             /*tp_as_number*/
+    0,                         /*tp_as_sequence*/
+    0,                         /*tp_as_mapping*/
+    0,                         /*tp_hash */
+    0,                         /*tp_call*/
+    0,                         /*tp_str*/
+    0,                         /*tp_getattro*/
+    0,                         /*tp_setattro*/
+    0,                         /*tp_as_buffer*/
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC | Py_TPFLAGS_CHECKTYPES,  /*tp_flags*/
+    "ModMatrixVoice objects. Reads one output from a ModMatrix.",           /* tp_doc */
+    (traverseproc)ModMatrixVoice_traverse,   /* tp_traverse */
+    (inquiry)ModMatrixVoice_clear,           /* tp_clear */
+    0,		               /* tp_richcompare */
+    0,		               /* tp_weaklistoffset */
+    0,		               /* tp_iter */
+    0,		               /* tp_iternext */
+    ModMatrixVoice_methods,             /* tp_methods */
+    ModMatrixVoice_members,             /* tp_members */
+    0,                      /* tp_getset */
+    0,                         /* tp_base */
+    0,                         /* tp_dict */
+    0,                         /* tp_descr_get */
+    0,                         /* tp_descr_set */
+    0,                         /* tp_dictoffset */
+    0,      /* tp_init */
+    0,                         /* tp_alloc */
+    ModMatrixVoice_new,                 /* tp_new */
+};
+
 /****************/
 /**** Selector *****/
 /****************/
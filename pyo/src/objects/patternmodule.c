@@ -34,13 +34,14 @@ typedef struct {
     MYFLT sampleToSec;
     double currentTime;
     int init;
+    int defer;
 } Pattern;
 
 static void
 Pattern_generate_i(Pattern *self) {
     MYFLT tm;
     int i, flag;
-    PyObject *result;
+    PyObject *tuple;
     
     flag = 0;
     tm = PyFloat_AS_DOUBLE(self->time);
@@ -55,16 +56,16 @@ Pattern_generate_i(Pattern *self) {
     }
     if (flag == 1 || self->init == 1) {
         self->init = 0;
-        result = PyObject_Call((PyObject *)self->callable, PyTuple_New(0), NULL);
-        if (result == NULL)
-            PyErr_Print();
+        tuple = PyTuple_New(0);
+        Server_dispatchCall((Server *)self->server, self->callable, tuple, self->defer);
+        Py_DECREF(tuple);
     }
 }
 
 static void
 Pattern_generate_a(Pattern *self) {
     int i, flag;
-    PyObject *result;
+    PyObject *tuple;
     
     MYFLT *tm = Stream_getData((Stream *)self->time_stream);
     
@@ -79,9 +80,9 @@ Pattern_generate_a(Pattern *self) {
     }
     if (flag == 1 || self->init == 1) {
         self->init = 0;
-        result = PyObject_Call((PyObject *)self->callable, PyTuple_New(0), NULL);
-        if (result == NULL)
-            PyErr_Print();
+        tuple = PyTuple_New(0);
+        Server_dispatchCall((Server *)self->server, self->callable, tuple, self->defer);
+        Py_DECREF(tuple);
     }    
 }
 
@@ -145,6 +146,7 @@ Pattern_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
     self->time = PyFloat_FromDouble(1.);
 	self->modebuffer[0] = 0;
     self->init = 1;
+    self->defer = 0;
 
     INIT_OBJECT_COMMON
     Stream_setFunctionPtr(self->stream, Pattern_compute_next_data_frame);
@@ -241,6 +243,16 @@ Pattern_setTime(Pattern *self, PyObject *arg)
 	return Py_None;
 }	
 
+static PyObject *
+Pattern_setDefer(Pattern *self, PyObject *arg)
+{
+    if (arg != NULL)
+        self->defer = PyObject_IsTrue(arg);
+
+	Py_INCREF(Py_None);
+	return Py_None;
+}
+
 static PyMemberDef Pattern_members[] = {
 {"server", T_OBJECT_EX, offsetof(Pattern, server), 0, "Pyo server."},
 {"stream", T_OBJECT_EX, offsetof(Pattern, stream), 0, "Stream object."},
@@ -255,6 +267,7 @@ static PyMethodDef Pattern_methods[] = {
 {"stop", (PyCFunction)Pattern_stop, METH_NOARGS, "Stops computing."},
 {"setTime", (PyCFunction)Pattern_setTime, METH_O, "Sets time factor."},
 {"setFunction", (PyCFunction)Pattern_setFunction, METH_O, "Sets the function to be called."},
+{"setDefer", (PyCFunction)Pattern_setDefer, METH_O, "If True, the function is called by the server's call thread."},
 {NULL}  /* Sentinel */
 };
 
@@ -310,19 +323,33 @@ typedef struct {
     char *fname;
     char curfname[100];
     int last_value;
+    int defer;
 } Score;
 
 static void
 Score_selector(Score *self) {
     int i, inval;
+    PyObject *func, *tuple;
     
     MYFLT *in = Stream_getData((Stream *)self->input_stream);
     
     for (i=0; i<self->bufsize; i++) {
         inval = (int)in[i];
         if (inval != self->last_value) {
-            sprintf(self->curfname, "%s%i()\n", self->fname, inval);
-            PyRun_SimpleString(self->curfname);
+            func = NULL;
+            if (self->defer) {
+                sprintf(self->curfname, "%s%i", self->fname, inval);
+                func = PyDict_GetItemString(PyModule_GetDict(PyImport_AddModule("__main__")), self->curfname);
+            }
+            if (func != NULL) {
+                tuple = PyTuple_New(0);
+                Server_dispatchCall((Server *)self->server, func, tuple, 1);
+                Py_DECREF(tuple);
+            }
+            else {
+                sprintf(self->curfname, "%s%i()\n", self->fname, inval);
+                PyRun_SimpleString(self->curfname);
+            }
             self->last_value = inval;
         }    
     }
@@ -375,6 +402,7 @@ Score_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
     self = (Score *)type->tp_alloc(type, 0);
     
     self->last_value = -99;
+    self->defer = 0;
     
     INIT_OBJECT_COMMON
     Stream_setFunctionPtr(self->stream, Score_compute_next_data_frame);
@@ -400,6 +428,16 @@ static PyObject * Score_getStream(Score* self) { GET_STREAM };
 static PyObject * Score_play(Score *self, PyObject *args, PyObject *kwds) { PLAY };
 static PyObject * Score_stop(Score *self) { STOP };
 
+static PyObject *
+Score_setDefer(Score *self, PyObject *arg)
+{
+    if (arg != NULL)
+        self->defer = PyObject_IsTrue(arg);
+
+	Py_INCREF(Py_None);
+	return Py_None;
+}
+
 static PyMemberDef Score_members[] = {
 {"server", T_OBJECT_EX, offsetof(Score, server), 0, "Pyo server."},
 {"stream", T_OBJECT_EX, offsetof(Score, stream), 0, "Stream object."},
@@ -411,6 +449,7 @@ static PyMethodDef Score_methods[] = {
 {"_getStream", (PyCFunction)Score_getStream, METH_NOARGS, "Returns stream object."},
 {"play", (PyCFunction)Score_play, METH_VARARGS|METH_KEYWORDS, "Starts computing without sending sound to soundcard."},
 {"stop", (PyCFunction)Score_stop, METH_NOARGS, "Stops computing."},
+{"setDefer", (PyCFunction)Score_setDefer, METH_O, "If True, the function is called by the server's call thread."},
 {NULL}  /* Sentinel */
 };
 
@@ -459,35 +498,23 @@ Score_new,                 /* tp_new */
 /*****************/
 /*** CallAfter ***/
 /*****************/
+/* The call is an event of the server's scheduler, the stream only reports 
+   whether the call is still pending. */
 typedef struct {
     pyo_audio_HEAD
     PyObject *callable;
     PyObject *arg;
     MYFLT time;
-    MYFLT sampleToSec;
-    double currentTime;
+    long event; /* scheduler handle, 0 when no call is pending */
+    long remaining; /* samples before the call */
 } CallAfter;
 
 static void
 CallAfter_generate(CallAfter *self) {
-    int i;
-    PyObject *tuple, *result;
-
-    for (i=0; i<self->bufsize; i++) {
-        if (self->currentTime >= self->time) {
-            if (self->arg == Py_None)
-                tuple = PyTuple_New(0);
-            else {
-                tuple = PyTuple_New(1);
-                PyTuple_SET_ITEM(tuple, 0, self->arg);
-            }
-            result = PyObject_Call(self->callable, tuple, NULL);                
-            if (result == NULL)
-                PyErr_Print();
-            PyObject_CallMethod((PyObject *)self, "stop", NULL);
-            break;
-        }
-        self->currentTime += self->sampleToSec;
+    self->remaining -= self->bufsize;
+    if (self->remaining < 0) {
+        self->event = 0;
+        Stream_setStreamActive(self->stream, 0);
     }
 }
 
@@ -503,6 +530,22 @@ CallAfter_compute_next_data_frame(CallAfter *self)
     (*self->proc_func_ptr)(self);     
 }
 
+static void
+CallAfter_schedule(CallAfter *self, MYFLT delay)
+{
+    PyObject *tuple;
+
+    if (self->event != 0)
+        Server_cancelEvent((Server *)self->server, self->event);
+    if (self->arg == Py_None)
+        tuple = PyTuple_New(0);
+    else
+        tuple = PyTuple_Pack(1, self->arg);
+    self->event = Server_scheduleEvent((Server *)self->server, self->time + delay, 0, self->callable, tuple);
+    self->remaining = (long)((self->time + delay) * self->sr + 0.5);
+    Py_DECREF(tuple);
+}
+
 static int
 CallAfter_traverse(CallAfter *self, visitproc visit, void *arg)
 {
@@ -524,6 +567,8 @@ CallAfter_clear(CallAfter *self)
 static void
 CallAfter_dealloc(CallAfter* self)
 {
+    if (self->event != 0 && PyServer_get_server() != NULL)
+        Server_cancelEvent((Server *)self->server, self->event);
     pyo_DEALLOC
     CallAfter_clear(self);
     self->ob_type->tp_free((PyObject*)self);
@@ -539,14 +584,12 @@ CallAfter_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
     
     self->time = 1.;
     self->arg = Py_None;
+    self->event = 0;
     
     INIT_OBJECT_COMMON
     Stream_setFunctionPtr(self->stream, CallAfter_compute_next_data_frame);
     self->mode_func_ptr = CallAfter_setProcMode;
 
-    self->sampleToSec = 1. / self->sr;
-    self->currentTime = 0.;
-
     static char *kwlist[] = {"callable", "time", "arg", NULL};
     
     if (! PyArg_ParseTupleAndKeywords(args, kwds, TYPE_O_FO, kwlist, &calltmp, &self->time, &argtmp))
@@ -568,6 +611,8 @@ CallAfter_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
     PyObject_CallMethod(self->server, "addStream", "O", self->stream);
     
     (*self->mode_func_ptr)(self);
+
+    CallAfter_schedule(self, 0.0);
     
     return (PyObject *)self;
 }
@@ -575,8 +620,38 @@ CallAfter_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
 static PyObject * CallAfter_getServer(CallAfter* self) { GET_SERVER };
 static PyObject * CallAfter_getStream(CallAfter* self) { GET_STREAM };
 
-static PyObject * CallAfter_play(CallAfter *self, PyObject *args, PyObject *kwds) { PLAY };
-static PyObject * CallAfter_stop(CallAfter *self) { STOP };
+static PyObject *
+CallAfter_play(CallAfter *self, PyObject *args, PyObject *kwds)
+{
+    float del = 0;
+    float dur = 0;
+
+    static char *kwlist[] = {"dur", "delay", NULL};
+
+    if (! PyArg_ParseTupleAndKeywords(args, kwds, "|ff", kwlist, &dur, &del))
+        return PyInt_FromLong(-1);
+
+    CallAfter_schedule(self, del);
+    Stream_setBufferCountWait(self->stream, 0);
+    Stream_setDuration(self->stream, 0);
+    Stream_setStreamActive(self->stream, 1);
+
+    Py_INCREF(self);
+    return (PyObject *)self;
+}
+
+static PyObject *
+CallAfter_stop(CallAfter *self)
+{
+    if (self->event != 0) {
+        Server_cancelEvent((Server *)self->server, self->event);
+        self->event = 0;
+    }
+    Stream_setStreamActive(self->stream, 0);
+
+    Py_INCREF(Py_None);
+    return Py_None;
+}
 
 static PyMemberDef CallAfter_members[] = {
 {"server", T_OBJECT_EX, offsetof(CallAfter, server), 0, "Pyo server."},
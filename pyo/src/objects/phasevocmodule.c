@@ -57,6 +57,8 @@ typedef struct {
     MYFLT *imag; 
     MYFLT *lastPhase;
     MYFLT **twiddle;
+    RealFFTPlan *plan; /* only with algo 1 */
+    int algo;
     MYFLT *window;
     MYFLT **magn;
     MYFLT **freq;
@@ -66,7 +68,7 @@ typedef struct {
 
 static void
 PVAnal_realloc_memories(PVAnal *self) {
-    int i, j, n8;
+    int i, j;
     self->hsize = self->size / 2;
     self->hopsize = self->size / self->olaps;
     self->factor = self->sr / (self->hopsize * TWOPI);
@@ -74,7 +76,6 @@ PVAnal_realloc_memories(PVAnal *self) {
     self->inputLatency = self->size - self->hopsize;
     self->incount = self->inputLatency;
     self->overcount = 0;
-    n8 = self->size >> 3;
     self->input_buffer = (MYFLT *)realloc(self->input_buffer, self->size * sizeof(MYFLT));
     self->inframe = (MYFLT *)realloc(self->inframe, self->size * sizeof(MYFLT));
     self->outframe = (MYFLT *)realloc(self->outframe, self->size * sizeof(MYFLT));    
@@ -93,12 +94,12 @@ PVAnal_realloc_memories(PVAnal *self) {
     } 
     for (i=0; i<self->hsize; i++)
         self->lastPhase[i] = self->real[i] = self->imag[i] = 0.0;
-    self->twiddle = (MYFLT **)realloc(self->twiddle, 4 * sizeof(MYFLT *));
-    for(i=0; i<4; i++)
-        self->twiddle[i] = (MYFLT *)malloc(n8 * sizeof(MYFLT));
-    fft_compute_split_twiddle(self->twiddle, self->size);
-    self->window = (MYFLT *)realloc(self->window, self->size * sizeof(MYFLT));
-    gen_window(self->window, self->size, self->wintype);
+    fft_release_split_twiddle(self->twiddle);
+    self->twiddle = fft_acquire_split_twiddle(self->size);
+    fft_release_real_plan(self->plan);
+    self->plan = self->algo ? fft_acquire_real_plan(self->size) : NULL;
+    release_window(self->window);
+    self->window = acquire_window(self->size, self->wintype);
     for (i=0; i<self->bufsize; i++)
         self->count[i] = self->incount;
     PVStream_setFFTsize(self->pv_stream, self->size);
@@ -124,7 +125,10 @@ PVAnal_process(PVAnal *self) {
             for (k=0; k<self->size; k++) {
                 self->inframe[(k+mod)%self->size] = self->input_buffer[k] * self->window[k];
             }
-            realfft_split(self->inframe, self->outframe, self->size, self->twiddle);
+            if (self->plan != NULL)
+                realfft_batched(self->inframe, self->outframe, self->plan);
+            else
+                realfft_split(self->inframe, self->outframe, self->size, self->twiddle);
             self->real[0] = self->outframe[0];
             self->imag[0] = 0.0;
             for (k=1; k<self->hsize; k++) {
@@ -197,11 +201,9 @@ PVAnal_dealloc(PVAnal* self)
     free(self->real); 
     free(self->imag); 
     free(self->lastPhase);
-    for(i=0; i<4; i++) {
-        free(self->twiddle[i]);
-    }
-    free(self->twiddle);
-    free(self->window);
+    fft_release_split_twiddle(self->twiddle);
+    fft_release_real_plan(self->plan);
+    release_window(self->window);
     for(i=0; i<self->olaps; i++) {
         free(self->magn[i]);
         free(self->freq[i]);
@@ -228,9 +230,9 @@ PVAnal_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
     Stream_setFunctionPtr(self->stream, PVAnal_compute_next_data_frame);
     self->mode_func_ptr = PVAnal_setProcMode;
 
-    static char *kwlist[] = {"input", "size", "olaps", "wintype", NULL};
+    static char *kwlist[] = {"input", "size", "olaps", "wintype", "algo", NULL};
     
-    if (! PyArg_ParseTupleAndKeywords(args, kwds, "O|iii", kwlist, &inputtmp, &self->size, &self->olaps, &self->wintype))
+    if (! PyArg_ParseTupleAndKeywords(args, kwds, "O|iiii", kwlist, &inputtmp, &self->size, &self->olaps, &self->wintype, &self->algo))
         Py_RETURN_NONE;
 
     INIT_INPUT_STREAM
@@ -308,7 +310,21 @@ PVAnal_setWinType(PVAnal *self, PyObject *arg)
 {    
     if (PyLong_Check(arg) || PyInt_Check(arg)) {
         self->wintype = PyInt_AsLong(arg);
-        gen_window(self->window, self->size, self->wintype);
+        release_window(self->window);
+        self->window = acquire_window(self->size, self->wintype);
+    }    
+    
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject *
+PVAnal_setAlgo(PVAnal *self, PyObject *arg)
+{    
+    if (PyLong_Check(arg) || PyInt_Check(arg)) {
+        self->algo = PyInt_AsLong(arg);
+        fft_release_real_plan(self->plan);
+        self->plan = self->algo ? fft_acquire_real_plan(self->size) : NULL;
     }    
     
     Py_INCREF(Py_None);
@@ -332,6 +348,7 @@ static PyMethodDef PVAnal_methods[] = {
 {"setSize", (PyCFunction)PVAnal_setSize, METH_O, "Sets a new FFT size."},
 {"setOverlaps", (PyCFunction)PVAnal_setOverlaps, METH_O, "Sets a new number of overlaps."},
 {"setWinType", (PyCFunction)PVAnal_setWinType, METH_O, "Sets a new window type."},
+{"setAlgo", (PyCFunction)PVAnal_setAlgo, METH_O, "Sets the FFT algorithm."},
 {NULL}  /* Sentinel */
 };
 
@@ -403,6 +420,8 @@ typedef struct {
     MYFLT *imag; 
     MYFLT *sumPhase;
     MYFLT **twiddle;
+    RealFFTPlan *plan; /* only with algo 1 */
+    int algo;
     MYFLT *window;
     int modebuffer[2]; // need at least 2 slots for mul & add
 } PVSynth;
@@ -410,7 +429,7 @@ typedef struct {
 
 static void
 PVSynth_realloc_memories(PVSynth *self) {
-    int i, n8;
+    int i;
     self->hsize = self->size / 2;
     self->hopsize = self->size / self->olaps;
     self->factor = self->hopsize * TWOPI / self->sr;
@@ -418,7 +437,6 @@ PVSynth_realloc_memories(PVSynth *self) {
     self->inputLatency = self->size - self->hopsize;
     self->overcount = 0;
     self->ampscl = 1.0 / MYSQRT(self->olaps);
-    n8 = self->size >> 3;
     self->output_buffer = (MYFLT *)realloc(self->output_buffer, self->size * sizeof(MYFLT));
     self->inframe = (MYFLT *)realloc(self->inframe, self->size * sizeof(MYFLT));
     self->outframe = (MYFLT *)realloc(self->outframe, self->size * sizeof(MYFLT));    
@@ -432,12 +450,12 @@ PVSynth_realloc_memories(PVSynth *self) {
     self->outputAccum = (MYFLT *)realloc(self->outputAccum, (self->size+self->hopsize) * sizeof(MYFLT)); 
     for (i=0; i<(self->size+self->hopsize); i++)
         self->outputAccum[i] = 0.0;
-    self->twiddle = (MYFLT **)realloc(self->twiddle, 4 * sizeof(MYFLT *));
-    for(i=0; i<4; i++)
-        self->twiddle[i] = (MYFLT *)malloc(n8 * sizeof(MYFLT));
-    fft_compute_split_twiddle(self->twiddle, self->size);
-    self->window = (MYFLT *)realloc(self->window, self->size * sizeof(MYFLT));
-    gen_window(self->window, self->size, self->wintype);
+    fft_release_split_twiddle(self->twiddle);
+    self->twiddle = fft_acquire_split_twiddle(self->size);
+    fft_release_real_plan(self->plan);
+    self->plan = self->algo ? fft_acquire_real_plan(self->size) : NULL;
+    release_window(self->window);
+    self->window = acquire_window(self->size, self->wintype);
 }
 
 static void
@@ -475,7 +493,10 @@ PVSynth_process(PVSynth *self) {
                 self->inframe[k] = self->real[k];
                 self->inframe[self->size - k] = self->imag[k];
             }
-            irealfft_split(self->inframe, self->outframe, self->size, self->twiddle);
+            if (self->plan != NULL)
+                irealfft_batched(self->inframe, self->outframe, self->plan);
+            else
+                irealfft_split(self->inframe, self->outframe, self->size, self->twiddle);
             mod = self->hopsize * self->overcount;
             for (k=0; k<self->size; k++) {
                 self->outputAccum[k] += self->outframe[(k+mod)%self->size] * self->window[k] * self->ampscl;
@@ -581,11 +602,9 @@ PVSynth_dealloc(PVSynth* self)
     free(self->real); 
     free(self->imag); 
     free(self->sumPhase);
-    for(i=0; i<4; i++) {
-        free(self->twiddle[i]);
-    }
-    free(self->twiddle);
-    free(self->window);
+    fft_release_split_twiddle(self->twiddle);
+    fft_release_real_plan(self->plan);
+    release_window(self->window);
     PVSynth_clear(self);
     self->ob_type->tp_free((PyObject*)self);
 }
@@ -606,9 +625,9 @@ PVSynth_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
     Stream_setFunctionPtr(self->stream, PVSynth_compute_next_data_frame);
     self->mode_func_ptr = PVSynth_setProcMode;
 
-    static char *kwlist[] = {"input", "wintype", "mul", "add", NULL};
+    static char *kwlist[] = {"input", "wintype", "algo", "mul", "add", NULL};
     
-    if (! PyArg_ParseTupleAndKeywords(args, kwds, "O|iOO", kwlist, &inputtmp, &self->wintype, &multmp, &addtmp))
+    if (! PyArg_ParseTupleAndKeywords(args, kwds, "O|iiOO", kwlist, &inputtmp, &self->wintype, &self->algo, &multmp, &addtmp))
         Py_RETURN_NONE;
 
     if ( PyObject_HasAttrString((PyObject *)inputtmp, "pv_stream") == 0 ) {
@@ -675,7 +694,21 @@ PVSynth_setWinType(PVSynth *self, PyObject *arg)
 {    
     if (PyLong_Check(arg) || PyInt_Check(arg)) {
         self->wintype = PyInt_AsLong(arg);
-        gen_window(self->window, self->size, self->wintype);
+        release_window(self->window);
+        self->window = acquire_window(self->size, self->wintype);
+    }    
+    
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject *
+PVSynth_setAlgo(PVSynth *self, PyObject *arg)
+{    
+    if (PyLong_Check(arg) || PyInt_Check(arg)) {
+        self->algo = PyInt_AsLong(arg);
+        fft_release_real_plan(self->plan);
+        self->plan = self->algo ? fft_acquire_real_plan(self->size) : NULL;
     }    
     
     Py_INCREF(Py_None);
@@ -722,6 +755,7 @@ static PyMethodDef PVSynth_methods[] = {
 {"stop", (PyCFunction)PVSynth_stop, METH_NOARGS, "Stops computing."},
 {"setInput", (PyCFunction)PVSynth_setInput, METH_O, "Sets a new input object."},
 {"setWinType", (PyCFunction)PVSynth_setWinType, METH_O, "Sets a new window type."},
+{"setAlgo", (PyCFunction)PVSynth_setAlgo, METH_O, "Sets the FFT algorithm."},
 {"setMul", (PyCFunction)PVSynth_setMul, METH_O, "Sets oscillator mul factor."},
 {"setAdd", (PyCFunction)PVSynth_setAdd, METH_O, "Sets oscillator add factor."},
 {"setSub", (PyCFunction)PVSynth_setSub, METH_O, "Sets inverse add factor."},
@@ -832,6 +866,8 @@ typedef struct {
     int first;
     int inc;
     int update;
+    int mode;
+    PartialSynth *synth;
     MYFLT *ppos;
     MYFLT *amp;
     MYFLT *freq;
@@ -854,15 +890,68 @@ PVAddSynth_realloc_memories(PVAddSynth *self) {
         self->ppos[i] = self->amp[i] = 0.0;
         self->freq[i] = (i * self->inc + self->first) * self->size / self->sr;
     }
+    /* the shared partial engine is only used by modes 1 and 2 */
+    PartialSynth_free(self->synth);
+    self->synth = NULL;
+    if (self->mode == 1 || self->mode == 2)
+        self->synth = PartialSynth_new(self->num, self->mode, self->sr);
     self->outbuf = (MYFLT *)realloc(self->outbuf, self->hopsize * sizeof(MYFLT));
     for (i=0; i<self->hopsize; i++)
         self->outbuf[i] = 0.0;
 }
 
+static void
+PVAddSynth_synthesize(PVAddSynth *self, MYFLT *magn, MYFLT *freq, MYFLT pitch) {
+    int k, n, bin, ipart;
+    MYFLT tamp, tfreq, inca, incf, ratio, fpart;
+
+    ratio = 8192.0 / self->sr;
+    for (n=0; n<self->hopsize; n++) {
+        self->outbuf[n] = 0.0;
+    }
+    for (k=0; k<self->num; k++) {
+        bin = k * self->inc + self->first;
+        if (bin < self->hsize) {
+            tamp = magn[bin];
+            tfreq = freq[bin] * pitch;
+            inca = (tamp - self->amp[k]) / self->hopsize;
+            incf = (tfreq - self->freq[k]) / self->hopsize;
+            for (n=0; n<self->hopsize; n++) {
+                self->ppos[k] += self->freq[k] * ratio;
+                while (self->ppos[k] < 0.0) self->ppos[k] += 8192.0;
+                while (self->ppos[k] >= 8192.0) self->ppos[k] -= 8192.0;
+                ipart = (int)self->ppos[k];
+                fpart = self->ppos[k] - ipart;
+                self->outbuf[n] += self->amp[k] * (self->table[ipart] + (self->table[ipart+1] - self->table[ipart]) * fpart);
+                self->amp[k] += inca;
+                self->freq[k] += incf;
+            }
+        }
+    }
+}
+
+static void
+PVAddSynth_synthesize_bank(PVAddSynth *self, MYFLT *magn, MYFLT *freq, MYFLT pitch) {
+    int k, bin;
+    MYFLT *tfreq = self->synth->freq;
+    MYFLT *tamp = self->synth->amp;
+
+    for (k=0; k<self->num; k++) {
+        bin = k * self->inc + self->first;
+        if (bin < self->hsize) {
+            tamp[k] = magn[bin];
+            tfreq[k] = freq[bin] * pitch;
+        }
+        else
+            tamp[k] = 0.0;
+    }
+    PartialSynth_process(self->synth, self->outbuf, self->hopsize);
+}
+
 static void
 PVAddSynth_process_i(PVAddSynth *self) {
-    int i, k, n, bin, ipart;
-    MYFLT pitch, tamp, tfreq, inca, incf, ratio, fpart;
+    int i;
+    MYFLT pitch;
     MYFLT **magn = PVStream_getMagn((PVStream *)self->input_stream);
     MYFLT **freq = PVStream_getFreq((PVStream *)self->input_stream);
     int *count = PVStream_getCount((PVStream *)self->input_stream);
@@ -877,32 +966,13 @@ PVAddSynth_process_i(PVAddSynth *self) {
         PVAddSynth_realloc_memories(self);
     }
 
-    ratio = 8192.0 / self->sr;
     for (i=0; i<self->bufsize; i++) {
         self->data[i] = self->outbuf[count[i] - self->inputLatency];
         if (count[i] >= (self->size-1)) {
-            for (n=0; n<self->hopsize; n++) {
-                self->outbuf[n] = 0.0;
-            }
-            for (k=0; k<self->num; k++) {
-                bin = k * self->inc + self->first;
-                if (bin < self->hsize) {
-                    tamp = magn[self->overcount][bin];
-                    tfreq = freq[self->overcount][bin] * pitch;
-                    inca = (tamp - self->amp[k]) / self->hopsize;
-                    incf = (tfreq - self->freq[k]) / self->hopsize;
-                    for (n=0; n<self->hopsize; n++) {
-                        self->ppos[k] += self->freq[k] * ratio;
-                        while (self->ppos[k] < 0.0) self->ppos[k] += 8192.0;
-                        while (self->ppos[k] >= 8192.0) self->ppos[k] -= 8192.0;
-                        ipart = (int)self->ppos[k];
-                        fpart = self->ppos[k] - ipart;
-                        self->outbuf[n] += self->amp[k] * (self->table[ipart] + (self->table[ipart+1] - self->table[ipart]) * fpart);
-                        self->amp[k] += inca;
-                        self->freq[k] += incf;
-                    }
-                }
-            }
+            if (self->synth == NULL)
+                PVAddSynth_synthesize(self, magn[self->overcount], freq[self->overcount], pitch);
+            else
+                PVAddSynth_synthesize_bank(self, magn[self->overcount], freq[self->overcount], pitch);
             self->overcount++;
             if (self->overcount >= self->olaps)
                 self->overcount = 0;
@@ -912,8 +982,7 @@ PVAddSynth_process_i(PVAddSynth *self) {
 
 static void
 PVAddSynth_process_a(PVAddSynth *self) {
-    int i, k, n, bin, ipart;
-    MYFLT pitch, tamp, tfreq, inca, incf, ratio, fpart;
+    int i;
     MYFLT **magn = PVStream_getMagn((PVStream *)self->input_stream);
     MYFLT **freq = PVStream_getFreq((PVStream *)self->input_stream);
     int *count = PVStream_getCount((PVStream *)self->input_stream);
@@ -928,33 +997,13 @@ PVAddSynth_process_a(PVAddSynth *self) {
         PVAddSynth_realloc_memories(self);
     }
 
-    ratio = 8192.0 / self->sr;
     for (i=0; i<self->bufsize; i++) {
         self->data[i] = self->outbuf[count[i] - self->inputLatency];
         if (count[i] >= (self->size-1)) {
-            pitch = pit[i];
-            for (n=0; n<self->hopsize; n++) {
-                self->outbuf[n] = 0.0;
-            }
-            for (k=0; k<self->num; k++) {
-                bin = k * self->inc + self->first;
-                if (bin < self->hsize) {
-                    tamp = magn[self->overcount][bin];
-                    tfreq = freq[self->overcount][bin] * pitch;
-                    inca = (tamp - self->amp[k]) / self->hopsize;
-                    incf = (tfreq - self->freq[k]) / self->hopsize;
-                    for (n=0; n<self->hopsize; n++) {
-                        self->ppos[k] += self->freq[k] * ratio;
-                        while (self->ppos[k] < 0.0) self->ppos[k] += 8192.0;
-                        while (self->ppos[k] >= 8192.0) self->ppos[k] -= 8192.0;
-                        ipart = (int)self->ppos[k];
-                        fpart = self->ppos[k] - ipart;
-                        self->outbuf[n] += self->amp[k] * (self->table[ipart] + (self->table[ipart+1] - self->table[ipart]) * fpart);
-                        self->amp[k] += inca;
-                        self->freq[k] += incf;
-                    }
-                }
-            }
+            if (self->synth == NULL)
+                PVAddSynth_synthesize(self, magn[self->overcount], freq[self->overcount], pit[i]);
+            else
+                PVAddSynth_synthesize_bank(self, magn[self->overcount], freq[self->overcount], pit[i]);
             self->overcount++;
             if (self->overcount >= self->olaps)
                 self->overcount = 0;
@@ -1051,6 +1100,7 @@ static void
 PVAddSynth_dealloc(PVAddSynth* self)
 {
     pyo_DEALLOC
+    PartialSynth_free(self->synth);
     free(self->ppos);
     free(self->outbuf);
     free(self->table);
@@ -1073,6 +1123,7 @@ PVAddSynth_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
     self->first = 0;
     self->inc = 1;
     self->update = 0;
+    self->mode = 0;
 	self->modebuffer[0] = 0;
 	self->modebuffer[1] = 0;
 	self->modebuffer[2] = 0;
@@ -1081,9 +1132,9 @@ PVAddSynth_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
     Stream_setFunctionPtr(self->stream, PVAddSynth_compute_next_data_frame);
     self->mode_func_ptr = PVAddSynth_setProcMode;
 
-    static char *kwlist[] = {"input", "pitch", "num", "first", "inc", "mul", "add", NULL};
+    static char *kwlist[] = {"input", "pitch", "num", "first", "inc", "mode", "mul", "add", NULL};
     
-    if (! PyArg_ParseTupleAndKeywords(args, kwds, "O|OiiiOO", kwlist, &inputtmp, &pitchtmp, &self->num, &self->first, &self->inc, &multmp, &addtmp))
+    if (! PyArg_ParseTupleAndKeywords(args, kwds, "O|OiiiiOO", kwlist, &inputtmp, &pitchtmp, &self->num, &self->first, &self->inc, &self->mode, &multmp, &addtmp))
         Py_RETURN_NONE;
 
     if ( PyObject_HasAttrString((PyObject *)inputtmp, "pv_stream") == 0 ) {
@@ -1236,6 +1287,20 @@ PVAddSynth_setInc(PVAddSynth *self, PyObject *arg)
     return Py_None;
 }
 
+static PyObject *
+PVAddSynth_setMode(PVAddSynth *self, PyObject *arg)
+{    
+    if (PyLong_Check(arg) || PyInt_Check(arg)) {
+        self->mode = PyInt_AsLong(arg);
+        if (self->mode < 0 || self->mode > 2)
+            self->mode = 0;
+        self->update = 1;
+    }    
+    
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
 static PyObject * PVAddSynth_getServer(PVAddSynth* self) { GET_SERVER };
 static PyObject * PVAddSynth_getStream(PVAddSynth* self) { GET_STREAM };
 static PyObject * PVAddSynth_setMul(PVAddSynth *self, PyObject *arg) { SET_MUL };	
@@ -1277,6 +1342,7 @@ static PyMethodDef PVAddSynth_methods[] = {
 {"setNum", (PyCFunction)PVAddSynth_setNum, METH_O, "Sets the number of oscillators."},
 {"setFirst", (PyCFunction)PVAddSynth_setFirst, METH_O, "Sets the first bin to synthesize."},
 {"setInc", (PyCFunction)PVAddSynth_setInc, METH_O, "Sets the synthesized bin increment."},
+{"setMode", (PyCFunction)PVAddSynth_setMode, METH_O, "Sets the synthesis method."},
 {"setMul", (PyCFunction)PVAddSynth_setMul, METH_O, "Sets oscillator mul factor."},
 {"setAdd", (PyCFunction)PVAddSynth_setAdd, METH_O, "Sets oscillator add factor."},
 {"setSub", (PyCFunction)PVAddSynth_setSub, METH_O, "Sets inverse add factor."},
@@ -301,6 +301,7 @@ typedef struct {
     long count;
     long time;
     long size;
+    long popped; /* points already returned by popData */
     MYFLT *buffer;
 } ControlRec;
 
@@ -418,6 +419,8 @@ static PyObject * ControlRec_getStream(ControlRec* self) { GET_STREAM };
 
 static PyObject * ControlRec_play(ControlRec *self, PyObject *args, PyObject *kwds) { 
     self->count = self->time = 0;
+    if (self->dur > 0.0)
+        self->popped = 0;
     PLAY 
 };
 
@@ -443,7 +446,7 @@ ControlRec_getData(ControlRec *self) {
         Py_ssize_t size = PyList_Size(self->tmp_list);
         data = PyList_New(size);
         for (i=0; i<size; i++) {
-            time = i * timescl;
+            time = (i + self->popped) * timescl;
             point = PyTuple_New(2);
             PyTuple_SET_ITEM(point, 0, PyFloat_FromDouble(time));
             PyTuple_SET_ITEM(point, 1, PyList_GET_ITEM(self->tmp_list, i));
@@ -453,6 +456,40 @@ ControlRec_getData(ControlRec *self) {
 	return data;
 }
 
+/* Returns the points recorded since the last call as two lists, times 
+   and values. Without duration, the points are also released. */
+static PyObject *
+ControlRec_popData(ControlRec *self) {
+    long i, start, size;
+    PyObject *times, *values, *value;
+    MYFLT timescl = 1.0 / self->rate;
+
+    if (self->dur > 0.0) {
+        start = self->popped;
+        size = self->count - start;
+        values = PyList_New(size);
+        for (i=0; i<size; i++) {
+            PyList_SET_ITEM(values, i, PyFloat_FromDouble(self->buffer[start+i]));
+        }
+    }
+    else {
+        start = self->popped;
+        size = PyList_Size(self->tmp_list);
+        values = PyList_GetSlice(self->tmp_list, 0, size);
+        PyList_SetSlice(self->tmp_list, 0, size, NULL);
+    }
+    times = PyList_New(size);
+    for (i=0; i<size; i++) {
+        PyList_SET_ITEM(times, i, PyFloat_FromDouble((start + i) * timescl));
+    }
+    self->popped += size;
+
+    value = PyTuple_Pack(2, times, values);
+    Py_DECREF(times);
+    Py_DECREF(values);
+    return value;
+}
+
 static PyMemberDef ControlRec_members[] = {
     {"server", T_OBJECT_EX, offsetof(ControlRec, server), 0, "Pyo server."},
     {"stream", T_OBJECT_EX, offsetof(ControlRec, stream), 0, "Stream object."},
@@ -466,6 +503,7 @@ static PyMethodDef ControlRec_methods[] = {
     {"play", (PyCFunction)ControlRec_play, METH_VARARGS|METH_KEYWORDS, "Starts computing without sending sound to soundcard."},
     {"stop", (PyCFunction)ControlRec_stop, METH_NOARGS, "Stops computing."},
     {"getData", (PyCFunction)ControlRec_getData, METH_NOARGS, "Returns list of sampled points."},
+    {"popData", (PyCFunction)ControlRec_popData, METH_NOARGS, "Returns the times and values sampled since the last call."},
     {NULL}  /* Sentinel */
 };
 
@@ -1071,6 +1109,22 @@ NoteinRec_getData(NoteinRec *self) {
 	return data;
 }
 
+/* Returns the notes recorded since the last call as three lists, times, 
+   pitches and velocities, and releases them. */
+static PyObject *
+NoteinRec_popData(NoteinRec *self) {
+    PyObject *data;
+    Py_ssize_t size = PyList_Size(self->tmp_list_p);
+
+    data = Py_BuildValue("(NNN)", PyList_GetSlice(self->tmp_list_t, 0, size),
+                                  PyList_GetSlice(self->tmp_list_p, 0, size),
+                                  PyList_GetSlice(self->tmp_list_v, 0, size));
+    PyList_SetSlice(self->tmp_list_t, 0, size, NULL);
+    PyList_SetSlice(self->tmp_list_p, 0, size, NULL);
+    PyList_SetSlice(self->tmp_list_v, 0, size, NULL);
+    return data;
+}
+
 static PyMemberDef NoteinRec_members[] = {
     {"server", T_OBJECT_EX, offsetof(NoteinRec, server), 0, "Pyo server."},
     {"stream", T_OBJECT_EX, offsetof(NoteinRec, stream), 0, "Stream object."},
@@ -1085,6 +1139,7 @@ static PyMethodDef NoteinRec_methods[] = {
     {"play", (PyCFunction)NoteinRec_play, METH_VARARGS|METH_KEYWORDS, "Starts computing without sending sound to soundcard."},
     {"stop", (PyCFunction)NoteinRec_stop, METH_NOARGS, "Stops computing."},
     {"getData", (PyCFunction)NoteinRec_getData, METH_NOARGS, "Returns list of sampled points."},
+    {"popData", (PyCFunction)NoteinRec_popData, METH_NOARGS, "Returns the times, pitches and velocities recorded since the last call."},
     {NULL}  /* Sentinel */
 };
 
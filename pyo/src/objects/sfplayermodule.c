@@ -27,6 +27,391 @@
 #include "dummymodule.h"
 #include "sndfile.h"
 #include "interpolation.h"
+#include <pthread.h>
+
+/******************************************************************/
+/* DiskStream: read-ahead cache shared by the soundfile players   */
+/******************************************************************/
+/* DiskStream_seek/DiskStream_read mirror sf_seek/SF_READ. Without 
+   prefetch, they read the file from the audio thread, as before. With 
+   prefetch, the file is cut in blocks that a pool of I/O threads, shared 
+   by all players, loads ahead of the playback head. A read not covered 
+   by the loaded blocks (an underrun) is counted and falls back on a 
+   direct read, so the output is the same in both modes. */
+
+#define DISK_BLOCK_FRAMES 16384
+
+enum { DISK_BLOCK_EMPTY = 0, DISK_BLOCK_REQUESTED, DISK_BLOCK_READY };
+
+typedef struct {
+    volatile sf_count_t index; /* block number in the file */
+    volatile int state; /* only the I/O threads write REQUESTED blocks */
+    int frames; /* frames loaded, less than a block at the end of the file */
+    MYFLT *data;
+} DiskBlock;
+
+typedef struct {
+    SNDFILE *sf; /* the player's handle, used by direct reads */
+    SNDFILE *io_sf; /* private handle used by the I/O threads */
+    char *path;
+    int chnls;
+    sf_count_t frames;
+    sf_count_t pos; /* read position, in frames, when prefetching */
+    int nblocks; /* 0 means no prefetch */
+    DiskBlock *blocks;
+    int queued;
+    int active;
+    unsigned long underruns;
+} DiskStream;
+
+static pthread_mutex_t disk_mutex = PTHREAD_MUTEX_INITIALIZER;
+static pthread_cond_t disk_work_cond = PTHREAD_COND_INITIALIZER;
+static pthread_cond_t disk_idle_cond = PTHREAD_COND_INITIALIZER;
+static DiskStream **disk_queue = NULL;
+static int disk_queue_len = 0;
+static int disk_streams = 0; /* streams with prefetch, the queue never holds more */
+static int disk_threads = 2; /* size of the I/O thread pool */
+static int disk_running = 0;
+
+static void
+DiskStream_load(DiskStream *ds) {
+    int i, num;
+    DiskBlock *block;
+
+    for (i=0; i<ds->nblocks; i++) {
+        block = &ds->blocks[i];
+        if (block->state != DISK_BLOCK_REQUESTED)
+            continue;
+        __sync_synchronize();
+        num = 0;
+        if (sf_seek(ds->io_sf, block->index * DISK_BLOCK_FRAMES, SEEK_SET) >= 0)
+            num = SF_READ(ds->io_sf, block->data, DISK_BLOCK_FRAMES * ds->chnls) / ds->chnls;
+        block->frames = num;
+        __sync_synchronize();
+        block->state = DISK_BLOCK_READY;
+    }
+}
+
+static void *
+DiskStream_worker(void *arg) {
+    int i;
+    DiskStream *ds;
+
+    pthread_mutex_lock(&disk_mutex);
+    while (disk_running <= disk_threads) {
+        ds = NULL;
+        /* Oldest request first, skipping streams already being served. */
+        for (i=0; i<disk_queue_len; i++) {
+            if (disk_queue[i]->active == 0) {
+                ds = disk_queue[i];
+                memmove(&disk_queue[i], &disk_queue[i+1], (disk_queue_len - i - 1) * sizeof(DiskStream *));
+                disk_queue_len--;
+                break;
+            }
+        }
+        if (ds == NULL) {
+            pthread_cond_wait(&disk_work_cond, &disk_mutex);
+            continue;
+        }
+        ds->queued = 0;
+        ds->active = 1;
+        pthread_mutex_unlock(&disk_mutex);
+        DiskStream_load(ds);
+        pthread_mutex_lock(&disk_mutex);
+        ds->active = 0;
+        pthread_cond_broadcast(&disk_idle_cond);
+        if (ds->queued)
+            pthread_cond_signal(&disk_work_cond);
+    }
+    disk_running--;
+    pthread_mutex_unlock(&disk_mutex);
+    return NULL;
+}
+
+/* Must be called with disk_mutex held. */
+static void
+DiskStream_startThreads(void) {
+    pthread_t thread;
+
+    while (disk_running < disk_threads) {
+        if (pthread_create(&thread, NULL, DiskStream_worker, NULL) != 0) {
+            printf("Failed to start a disk streaming thread.\n");
+            break;
+        }
+        pthread_detach(thread);
+        disk_running++;
+    }
+}
+
+void
+DiskStream_setThreads(int num) {
+    pthread_mutex_lock(&disk_mutex);
+    disk_threads = num < 1 ? 1 : num;
+    if (disk_streams > 0)
+        DiskStream_startThreads();
+    /* Extra threads exit as soon as they are idle. */
+    pthread_cond_broadcast(&disk_work_cond);
+    pthread_mutex_unlock(&disk_mutex);
+}
+
+int
+DiskStream_getThreads(void) {
+    return disk_threads;
+}
+
+/* Removes the stream from the I/O queue and waits for the thread loading 
+   its blocks, if any. Called from Python, never from the audio thread. */
+static void
+DiskStream_detach(DiskStream *ds) {
+    int i;
+
+    pthread_mutex_lock(&disk_mutex);
+    for (i=0; i<disk_queue_len; i++) {
+        if (disk_queue[i] == ds) {
+            memmove(&disk_queue[i], &disk_queue[i+1], (disk_queue_len - i - 1) * sizeof(DiskStream *));
+            disk_queue_len--;
+            break;
+        }
+    }
+    ds->queued = 0;
+    while (ds->active)
+        pthread_cond_wait(&disk_idle_cond, &disk_mutex);
+    pthread_mutex_unlock(&disk_mutex);
+}
+
+static void
+DiskStream_freeBlocks(DiskStream *ds) {
+    int i;
+
+    if (ds->nblocks == 0)
+        return;
+    DiskStream_detach(ds);
+    for (i=0; i<ds->nblocks; i++) {
+        free(ds->blocks[i].data);
+    }
+    free(ds->blocks);
+    ds->blocks = NULL;
+    ds->nblocks = 0;
+    if (ds->io_sf != NULL) {
+        sf_close(ds->io_sf);
+        ds->io_sf = NULL;
+    }
+    pthread_mutex_lock(&disk_mutex);
+    disk_streams--;
+    pthread_mutex_unlock(&disk_mutex);
+}
+
+/* Allocates `num` blocks and opens the I/O handle. */
+static void
+DiskStream_allocBlocks(DiskStream *ds, int num) {
+    int i;
+    SF_INFO info;
+
+    if (ds->sf == NULL || num <= 0)
+        return;
+    info.format = 0;
+    ds->io_sf = sf_open(ds->path, SFM_READ, &info);
+    if (ds->io_sf == NULL) {
+        printf("Failed to open the file for disk streaming.\n");
+        return;
+    }
+    ds->blocks = (DiskBlock *)malloc(num * sizeof(DiskBlock));
+    for (i=0; i<num; i++) {
+        ds->blocks[i].index = -1;
+        ds->blocks[i].state = DISK_BLOCK_EMPTY;
+        ds->blocks[i].frames = 0;
+        ds->blocks[i].data = (MYFLT *)malloc(DISK_BLOCK_FRAMES * ds->chnls * sizeof(MYFLT));
+    }
+    ds->nblocks = num;
+    ds->pos = 0;
+    pthread_mutex_lock(&disk_mutex);
+    disk_streams++;
+    disk_queue = (DiskStream **)realloc(disk_queue, disk_streams * sizeof(DiskStream *));
+    DiskStream_startThreads();
+    pthread_mutex_unlock(&disk_mutex);
+}
+
+/* Points the stream at a newly opened sound. */
+static void
+DiskStream_setFile(DiskStream *ds, SNDFILE *sf, char *path, SF_INFO *info) {
+    int num = ds->nblocks;
+
+    DiskStream_freeBlocks(ds);
+    free(ds->path);
+    ds->path = NULL;
+    ds->sf = sf;
+    if (sf == NULL)
+        return;
+    ds->path = strdup(path);
+    ds->chnls = info->channels;
+    ds->frames = info->frames;
+    DiskStream_allocBlocks(ds, num);
+}
+
+/* Sets the amount of sound, in frames, to keep loaded ahead of the playback head. */
+static void
+DiskStream_setPrefetch(DiskStream *ds, sf_count_t frames) {
+    int num = 0;
+
+    if (frames > 0) 
+        num = (int)((frames + DISK_BLOCK_FRAMES - 1) / DISK_BLOCK_FRAMES) + 1;
+    DiskStream_freeBlocks(ds);
+    DiskStream_allocBlocks(ds, num);
+}
+
+static void
+DiskStream_close(DiskStream *ds) {
+    DiskStream_freeBlocks(ds);
+    free(ds->path);
+    ds->path = NULL;
+    ds->sf = NULL;
+}
+
+static sf_count_t
+DiskStream_seek(DiskStream *ds, sf_count_t pos) {
+    if (ds->nblocks == 0)
+        return sf_seek(ds->sf, pos, SEEK_SET);
+    if (pos < 0 || pos > ds->frames)
+        return -1;
+    ds->pos = pos;
+    return pos;
+}
+
+static DiskBlock *
+DiskStream_findBlock(DiskStream *ds, sf_count_t index) {
+    int i;
+
+    for (i=0; i<ds->nblocks; i++) {
+        if (ds->blocks[i].state == DISK_BLOCK_READY && ds->blocks[i].index == index) {
+            __sync_synchronize();
+            return &ds->blocks[i];
+        }
+    }
+    return NULL;
+}
+
+static sf_count_t
+DiskStream_read(DiskStream *ds, MYFLT *buffer, sf_count_t items) {
+    sf_count_t frames, start, end, index, first, last, num;
+    DiskBlock *block;
+
+    if (ds->nblocks == 0)
+        return SF_READ(ds->sf, buffer, items);
+
+    start = ds->pos;
+    frames = items / ds->chnls;
+    if ((start + frames) > ds->frames)
+        frames = ds->frames - start;
+    end = start + frames;
+
+    for (index=start/DISK_BLOCK_FRAMES; (index*DISK_BLOCK_FRAMES) < end; index++) {
+        block = DiskStream_findBlock(ds, index);
+        last = (index + 1) * DISK_BLOCK_FRAMES;
+        if (last > end)
+            last = end;
+        if (block == NULL || (index*DISK_BLOCK_FRAMES + block->frames) < last)
+            break;
+    }
+
+    if ((index*DISK_BLOCK_FRAMES) < end) {
+        ds->underruns++;
+        sf_seek(ds->sf, start, SEEK_SET);
+        num = SF_READ(ds->sf, buffer, frames * ds->chnls);
+        ds->pos += num / ds->chnls;
+        return num;
+    }
+
+    for (index=start/DISK_BLOCK_FRAMES; (index*DISK_BLOCK_FRAMES) < end; index++) {
+        block = DiskStream_findBlock(ds, index);
+        first = index * DISK_BLOCK_FRAMES;
+        last = first + DISK_BLOCK_FRAMES;
+        if (first < start)
+            first = start;
+        if (last > end)
+            last = end;
+        memcpy(buffer + (first - start) * ds->chnls, 
+               block->data + (first - index * DISK_BLOCK_FRAMES) * ds->chnls,
+               (last - first) * ds->chnls * sizeof(MYFLT));
+    }
+    ds->pos = end;
+    return frames * ds->chnls;
+}
+
+/* Requests the blocks the player will read next, nearest first: from `pos`,
+   in direction `dir`, up to `end`, then from `wrap` (if positive) up to 
+   the end (or the beginning) of the file. Called from the audio thread. */
+static void
+DiskStream_prefetch(DiskStream *ds, sf_count_t pos, int dir, sf_count_t end, sf_count_t wrap) {
+    int i, j, found, nwanted = 0, requested = 0;
+    int wrapped = 0;
+    sf_count_t index;
+
+    if (ds->nblocks == 0)
+        return;
+
+    sf_count_t wanted[ds->nblocks];
+    char keep[ds->nblocks];
+
+    if (end < 0 || end > ds->frames)
+        end = dir > 0 ? ds->frames : 0;
+    while (nwanted < ds->nblocks) {
+        if (pos < 0 || pos >= ds->frames || (dir > 0 && pos >= end) || (dir < 0 && pos < end)) {
+            if (wrapped || wrap < 0 || wrap >= ds->frames)
+                break;
+            pos = wrap;
+            end = dir > 0 ? ds->frames : 0;
+            wrapped = 1;
+        }
+        index = pos / DISK_BLOCK_FRAMES;
+        for (j=0; j<nwanted; j++) {
+            if (wanted[j] == index)
+                break;
+        }
+        if (j == nwanted)
+            wanted[nwanted++] = index;
+        if (dir > 0)
+            pos = (index + 1) * DISK_BLOCK_FRAMES;
+        else
+            pos = index * DISK_BLOCK_FRAMES - 1;
+    }
+
+    for (i=0; i<ds->nblocks; i++) {
+        keep[i] = 0;
+    }
+    for (j=0; j<nwanted; j++) {
+        found = 0;
+        for (i=0; i<ds->nblocks; i++) {
+            if (ds->blocks[i].state != DISK_BLOCK_EMPTY && ds->blocks[i].index == wanted[j]) {
+                keep[i] = found = 1;
+                break;
+            }
+        }
+        if (found)
+            continue;
+        /* Recycle a block that is not wanted anymore. */
+        for (i=0; i<ds->nblocks; i++) {
+            if (keep[i] == 0 && ds->blocks[i].state != DISK_BLOCK_REQUESTED) {
+                ds->blocks[i].index = wanted[j];
+                __sync_synchronize();
+                ds->blocks[i].state = DISK_BLOCK_REQUESTED;
+                keep[i] = requested = 1;
+                break;
+            }
+        }
+        if (i == ds->nblocks)
+            break;
+    }
+
+    if (requested) {
+        pthread_mutex_lock(&disk_mutex);
+        if (ds->queued == 0) {
+            ds->queued = 1;
+            disk_queue[disk_queue_len++] = ds;
+        }
+        pthread_cond_signal(&disk_work_cond);
+        pthread_mutex_unlock(&disk_mutex);
+    }
+}
 
 /* SfPlayer object */
 typedef struct {
@@ -36,6 +421,7 @@ typedef struct {
     int modebuffer[1];
     SNDFILE *sf;
     SF_INFO info;
+    DiskStream disk;
     char *path;
     int loop;
     int interp; /* 0 = default to 2, 1 = nointerp, 2 = linear, 3 = cos, 4 = cubic */
@@ -76,6 +462,25 @@ MYFLT min_arr(MYFLT *a,int n)
     return m;
 }
 
+static void
+SfPlayer_prefetch(SfPlayer *self, MYFLT sp) {
+    sf_count_t pos = (sf_count_t)self->pointerPos;
+    sf_count_t wrap = -1;
+
+    if (sp > 0) {
+        if (self->loop)
+            wrap = (sf_count_t)self->startPos;
+        DiskStream_prefetch(&self->disk, pos, 1, self->sndSize, wrap);
+    }
+    else if (sp < 0) {
+        if (pos == 0)
+            pos = self->sndSize - 1;
+        if (self->loop)
+            wrap = self->startPos == 0. ? self->sndSize - 1 : (sf_count_t)self->startPos;
+        DiskStream_prefetch(&self->disk, pos, -1, 0, wrap);
+    }
+}
+
 static void
 SfPlayer_readframes_i(SfPlayer *self) {
     MYFLT sp, frac, bufpos, delta, startPos;
@@ -108,14 +513,14 @@ SfPlayer_readframes_i(SfPlayer *self) {
             }
         }        
         index = (int)self->pointerPos;
-        sf_seek(self->sf, index, SEEK_SET); /* sets position pointer in the file */
+        DiskStream_seek(&self->disk, index); /* sets position pointer in the file */
 
         /* fill a buffer with enough samples to satisfy speed reading */
         /* if not enough samples left in the file */
         if ((index+buflen) > self->sndSize) {   
             shortbuflen = self->sndSize - index;
             pad = (buflen-shortbuflen)*self->sndChnls;
-            SF_READ(self->sf, buffer, shortbuflen*self->sndChnls);
+            DiskStream_read(&self->disk, buffer, shortbuflen*self->sndChnls);
             if (self->loop == 0) { /* with zero padding if noloop */
                 for (i=0; i<pad; i++) {
                     buffer[i+shortbuflen*self->sndChnls] = 0.;
@@ -123,15 +528,15 @@ SfPlayer_readframes_i(SfPlayer *self) {
             }
             else { /* wrap around and read new samples if loop */
                 MYFLT buftemp[pad];
-                sf_seek(self->sf, (int)self->startPos, SEEK_SET);
-                SF_READ(self->sf, buftemp, pad);
+                DiskStream_seek(&self->disk, (int)self->startPos);
+                DiskStream_read(&self->disk, buftemp, pad);
                 for (i=0; i<(pad); i++) {
                     buffer[i+shortbuflen*self->sndChnls] = buftemp[i];
                 }
             }    
         }
         else /* without zero padding */
-            SF_READ(self->sf, buffer, totlen);
+            DiskStream_read(&self->disk, buffer, totlen);
     
         /* de-interleave samples */
         for (i=0; i<totlen; i++) {
@@ -189,23 +594,23 @@ SfPlayer_readframes_i(SfPlayer *self) {
             }
             else { /* wrap around and read new samples if loop */
                 MYFLT buftemp[padlen];
-                sf_seek(self->sf, (int)startPos-pad, SEEK_SET);
-                SF_READ(self->sf, buftemp, padlen);
+                DiskStream_seek(&self->disk, (int)startPos-pad);
+                DiskStream_read(&self->disk, buftemp, padlen);
                 for (i=0; i<padlen; i++) {
                     buffer[i] = buftemp[i];
                 }
             }
             
             MYFLT buftemp2[shortbuflen*self->sndChnls];
-            sf_seek(self->sf, 0, SEEK_SET); /* sets position pointer in the file */
-            SF_READ(self->sf, buftemp2, shortbuflen*self->sndChnls);
+            DiskStream_seek(&self->disk, 0); /* sets position pointer in the file */
+            DiskStream_read(&self->disk, buftemp2, shortbuflen*self->sndChnls);
             for (i=0; i<(shortbuflen*self->sndChnls); i++) {
                 buffer[i+padlen] = buftemp2[i];
             }    
         }
         else /* without zero padding */
-            sf_seek(self->sf, index-buflen, SEEK_SET); /* sets position pointer in the file */
-            SF_READ(self->sf, buffer, totlen);
+            DiskStream_seek(&self->disk, index-buflen); /* sets position pointer in the file */
+            DiskStream_read(&self->disk, buffer, totlen);
         
         /* de-interleave samples */
         for (i=0; i<totlen; i++) {
@@ -247,6 +652,7 @@ SfPlayer_readframes_i(SfPlayer *self) {
             self->samplesBuffer[i] = 0.0;
         }
     }
+    SfPlayer_prefetch(self, sp);
 }    
 
 static void
@@ -285,6 +691,7 @@ static void
 SfPlayer_dealloc(SfPlayer* self)
 {
     pyo_DEALLOC
+    DiskStream_close(&self->disk);
     if (self->sf != NULL)
         sf_close(self->sf);
     free(self->trigsBuffer);
@@ -334,6 +741,7 @@ SfPlayer_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
     {
         printf("Failed to open the file.\n");
     }
+    DiskStream_setFile(&self->disk, self->sf, self->path, &self->info);
     self->sndSize = self->info.frames;
     self->sndSr = self->info.samplerate;
     self->sndChnls = self->info.channels;
@@ -366,6 +774,7 @@ static PyObject * SfPlayer_play(SfPlayer *self, PyObject *args, PyObject *kwds)
 { 
     self->init = 1;
     self->pointerPos = self->startPos;
+    SfPlayer_prefetch(self, self->modebuffer[0] == 0 ? PyFloat_AS_DOUBLE(self->speed) : 1.0);
     PLAY
 };
 
@@ -373,6 +782,7 @@ static PyObject * SfPlayer_out(SfPlayer *self, PyObject *args, PyObject *kwds)
 {
     self->init = 1;
     self->pointerPos = self->startPos;
+    SfPlayer_prefetch(self, self->modebuffer[0] == 0 ? PyFloat_AS_DOUBLE(self->speed) : 1.0);
     OUT
 };
 
@@ -432,6 +842,7 @@ SfPlayer_setSound(SfPlayer *self, PyObject *arg)
     {
         printf("Failed to open the file.\n");
     }
+    DiskStream_setFile(&self->disk, self->sf, self->path, &self->info);
     self->sndSize = self->info.frames;
     self->sndSr = self->info.samplerate;
     //self->sndChnls = self->info.channels;
@@ -500,6 +911,38 @@ SfPlayer_setInterp(SfPlayer *self, PyObject *arg)
     return Py_None;
 }
 
+static PyObject *
+SfPlayer_setPrefetch(SfPlayer *self, PyObject *arg)
+{
+	if (arg == NULL) {
+		Py_INCREF(Py_None);
+		return Py_None;
+	}
+    
+    int isNumber = PyNumber_Check(arg);
+    
+	if (isNumber == 1) {
+        DiskStream_setPrefetch(&self->disk, (sf_count_t)(PyFloat_AsDouble(arg) * self->sndSr));
+    }  
+    
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject *
+SfPlayer_getUnderruns(SfPlayer *self)
+{
+    return PyLong_FromUnsignedLong(self->disk.underruns);
+}
+
+static PyObject *
+SfPlayer_resetUnderruns(SfPlayer *self)
+{
+    self->disk.underruns = 0;
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
 MYFLT *
 SfPlayer_getSamplesBuffer(SfPlayer *self)
 {
@@ -526,6 +969,9 @@ static PyMethodDef SfPlayer_methods[] = {
 {"setLoop", (PyCFunction)SfPlayer_setLoop, METH_O, "Sets sfplayer loop mode (0 = no loop, 1 = loop)."},
 {"setOffset", (PyCFunction)SfPlayer_setOffset, METH_O, "Sets sfplayer start position."},
 {"setInterp", (PyCFunction)SfPlayer_setInterp, METH_O, "Sets sfplayer interpolation mode."},
+{"setPrefetch", (PyCFunction)SfPlayer_setPrefetch, METH_O, "Sets the amount of sound, in seconds, loaded ahead by the disk streaming threads."},
+{"getUnderruns", (PyCFunction)SfPlayer_getUnderruns, METH_NOARGS, "Returns the number of reads the disk streaming threads did not prepare in time."},
+{"resetUnderruns", (PyCFunction)SfPlayer_resetUnderruns, METH_NOARGS, "Resets the underrun counter."},
 {NULL}  /* Sentinel */
 };
 
@@ -840,6 +1286,7 @@ typedef struct {
     int modebuffer[1];
     SNDFILE *sf;
     SF_INFO info;
+    DiskStream disk;
     char *path;
     int interp; /* 0 = default to 2, 1 = nointerp, 2 = linear, 3 = cos, 4 = cubic */
     int sndSize; /* number of frames */
@@ -893,26 +1340,26 @@ SfMarkerShuffler_readframes_i(SfMarkerShuffler *self) {
             self->lastDir = 1;
         }
         index = (int)self->pointerPos;
-        sf_seek(self->sf, index, SEEK_SET); /* sets position pointer in the file */
+        DiskStream_seek(&self->disk, index); /* sets position pointer in the file */
         
         /* fill a buffer with enough samples to satisfy speed reading */
         /* if not enough samples to read in the file */
         if ((index+buflen) > self->endPos) {
             shortbuflen = self->endPos - index;
-            SF_READ(self->sf, buffer, shortbuflen*self->sndChnls);
+            DiskStream_read(&self->disk, buffer, shortbuflen*self->sndChnls);
 
             /* wrap around and read new samples from new marker */
             int pad = buflen - shortbuflen;
             int padlen = pad*self->sndChnls;
             MYFLT buftemp[padlen];
-            sf_seek(self->sf, (int)self->nextStartPos, SEEK_SET);
-            SF_READ(self->sf, buftemp, padlen);
+            DiskStream_seek(&self->disk, (int)self->nextStartPos);
+            DiskStream_read(&self->disk, buftemp, padlen);
             for (i=0; i<padlen; i++) {
                 buffer[i+shortbuflen*self->sndChnls] = buftemp[i];
             }
         }
         else /* without wraparound */
-            SF_READ(self->sf, buffer, totlen);
+            DiskStream_read(&self->disk, buffer, totlen);
         
         /* de-interleave samples */
         for (i=0; i<totlen; i++) {
@@ -934,6 +1381,7 @@ SfMarkerShuffler_readframes_i(SfMarkerShuffler *self) {
             SfMarkerShuffler_chooseNewMark((SfMarkerShuffler *)self, 1);
             self->pointerPos = self->startPos + off;
         }
+        DiskStream_prefetch(&self->disk, (sf_count_t)self->pointerPos, 1, (sf_count_t)self->endPos, (sf_count_t)self->nextStartPos);
     }
     else if (sp < 0) { /* reading backward */
         if (self->startPos == -1 || self->lastDir != -1) {
@@ -952,22 +1400,22 @@ SfMarkerShuffler_readframes_i(SfMarkerShuffler *self) {
 
             /* wrap around and read new samples from new marker */
             MYFLT buftemp[padlen];
-            sf_seek(self->sf, (int)self->nextStartPos-pad, SEEK_SET);
-            SF_READ(self->sf, buftemp, padlen);
+            DiskStream_seek(&self->disk, (int)self->nextStartPos-pad);
+            DiskStream_read(&self->disk, buftemp, padlen);
             for (i=0; i<padlen; i++) {
                 buffer[i] = buftemp[i];
             }
             
             MYFLT buftemp2[shortbuflen*self->sndChnls];
-            sf_seek(self->sf, self->endPos, SEEK_SET); /* sets position pointer in the file */
-            SF_READ(self->sf, buftemp2, shortbuflen*self->sndChnls);
+            DiskStream_seek(&self->disk, self->endPos); /* sets position pointer in the file */
+            DiskStream_read(&self->disk, buftemp2, shortbuflen*self->sndChnls);
             for (i=0; i<(shortbuflen*self->sndChnls); i++) {
                 buffer[i+padlen] = buftemp2[i];
             }    
         }
         else { /* without wraparound */
-            sf_seek(self->sf, index-buflen, SEEK_SET); /* sets position pointer in the file */
-            SF_READ(self->sf, buffer, totlen);
+            DiskStream_seek(&self->disk, index-buflen); /* sets position pointer in the file */
+            DiskStream_read(&self->disk, buffer, totlen);
         }
         /* de-interleave samples */
         for (i=0; i<totlen; i++) {
@@ -1001,6 +1449,7 @@ SfMarkerShuffler_readframes_i(SfMarkerShuffler *self) {
             SfMarkerShuffler_chooseNewMark((SfMarkerShuffler *)self, 0);
             self->pointerPos = self->startPos - off;
         }
+        DiskStream_prefetch(&self->disk, (sf_count_t)self->pointerPos, -1, (sf_count_t)self->endPos, (sf_count_t)self->nextStartPos);
     }
     else { /* speed == 0 */
         self->lastDir = 0;
@@ -1094,6 +1543,7 @@ static void
 SfMarkerShuffler_dealloc(SfMarkerShuffler* self)
 {
     pyo_DEALLOC
+    DiskStream_close(&self->disk);
     if (self->sf != NULL)
         sf_close(self->sf);
     free(self->samplesBuffer);
@@ -1152,6 +1602,7 @@ SfMarkerShuffler_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
         printf("Failed to open the file.\n");
         Py_RETURN_NONE;
     }
+    DiskStream_setFile(&self->disk, self->sf, self->path, &self->info);
     self->sndSize = self->info.frames;
     self->sndSr = self->info.samplerate;
     self->sndChnls = self->info.channels;
@@ -1237,6 +1688,38 @@ SfMarkerShuffler_setInterp(SfMarkerShuffler *self, PyObject *arg)
     return Py_None;
 }
 
+static PyObject *
+SfMarkerShuffler_setPrefetch(SfMarkerShuffler *self, PyObject *arg)
+{
+	if (arg == NULL) {
+		Py_INCREF(Py_None);
+		return Py_None;
+	}
+    
+    int isNumber = PyNumber_Check(arg);
+    
+	if (isNumber == 1) {
+        DiskStream_setPrefetch(&self->disk, (sf_count_t)(PyFloat_AsDouble(arg) * self->sndSr));
+    }  
+    
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject *
+SfMarkerShuffler_getUnderruns(SfMarkerShuffler *self)
+{
+    return PyLong_FromUnsignedLong(self->disk.underruns);
+}
+
+static PyObject *
+SfMarkerShuffler_resetUnderruns(SfMarkerShuffler *self)
+{
+    self->disk.underruns = 0;
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
 MYFLT *
 SfMarkerShuffler_getSamplesBuffer(SfMarkerShuffler *self)
 {
@@ -1258,6 +1741,9 @@ static PyMethodDef SfMarkerShuffler_methods[] = {
 {"stop", (PyCFunction)SfMarkerShuffler_stop, METH_NOARGS, "Stops computing."},
 {"setSpeed", (PyCFunction)SfMarkerShuffler_setSpeed, METH_O, "Sets sfplayer reading speed."},
 {"setInterp", (PyCFunction)SfMarkerShuffler_setInterp, METH_O, "Sets sfplayer interpolation mode."},
+{"setPrefetch", (PyCFunction)SfMarkerShuffler_setPrefetch, METH_O, "Sets the amount of sound, in seconds, loaded ahead by the disk streaming threads."},
+{"getUnderruns", (PyCFunction)SfMarkerShuffler_getUnderruns, METH_NOARGS, "Returns the number of reads the disk streaming threads did not prepare in time."},
+{"resetUnderruns", (PyCFunction)SfMarkerShuffler_resetUnderruns, METH_NOARGS, "Resets the underrun counter."},
 {NULL}  /* Sentinel */
 };
 
@@ -1574,6 +2060,7 @@ typedef struct {
     int modebuffer[2];
     SNDFILE *sf;
     SF_INFO info;
+    DiskStream disk;
     char *path;
     int interp; /* 0 = default to 2, 1 = nointerp, 2 = linear, 3 = cos, 4 = cubic */
     int sndSize; /* number of frames */
@@ -1628,26 +2115,26 @@ SfMarkerLooper_readframes_i(SfMarkerLooper *self) {
             self->lastDir = 1;
         }
         index = (int)self->pointerPos;
-        sf_seek(self->sf, index, SEEK_SET); /* sets position pointer in the file */
+        DiskStream_seek(&self->disk, index); /* sets position pointer in the file */
         
         /* fill a buffer with enough samples to satisfy speed reading */
         /* if not enough samples to read in the file */
         if ((index+buflen) > self->endPos) {
             shortbuflen = self->endPos - index;
-            SF_READ(self->sf, buffer, shortbuflen*self->sndChnls);
+            DiskStream_read(&self->disk, buffer, shortbuflen*self->sndChnls);
             
             /* wrap around and read new samples if loop */
             int pad = buflen - shortbuflen;
             int padlen = pad*self->sndChnls;
             MYFLT buftemp[padlen];
-            sf_seek(self->sf, (int)self->nextStartPos, SEEK_SET);
-            SF_READ(self->sf, buftemp, padlen);
+            DiskStream_seek(&self->disk, (int)self->nextStartPos);
+            DiskStream_read(&self->disk, buftemp, padlen);
             for (i=0; i<(padlen); i++) {
                 buffer[i+shortbuflen*self->sndChnls] = buftemp[i];
             }
         }
         else /* without zero padding */
-            SF_READ(self->sf, buffer, totlen);
+            DiskStream_read(&self->disk, buffer, totlen);
         
         /* de-interleave samples */
         for (i=0; i<totlen; i++) {
@@ -1669,6 +2156,7 @@ SfMarkerLooper_readframes_i(SfMarkerLooper *self) {
             SfMarkerLooper_chooseNewMark((SfMarkerLooper *)self, 1);
             self->pointerPos = self->startPos + off;
         }
+        DiskStream_prefetch(&self->disk, (sf_count_t)self->pointerPos, 1, (sf_count_t)self->endPos, (sf_count_t)self->nextStartPos);
     }
     else if (sp < 0) { /* reading backward */
         if (self->startPos == -1 || self->lastDir != -1) {
@@ -1687,22 +2175,22 @@ SfMarkerLooper_readframes_i(SfMarkerLooper *self) {
             
             /* wrap around and read new samples if loop */
             MYFLT buftemp[padlen];
-            sf_seek(self->sf, (int)self->nextStartPos-pad, SEEK_SET);
-            SF_READ(self->sf, buftemp, padlen);
+            DiskStream_seek(&self->disk, (int)self->nextStartPos-pad);
+            DiskStream_read(&self->disk, buftemp, padlen);
             for (i=0; i<padlen; i++) {
                 buffer[i] = buftemp[i];
             }
             
             MYFLT buftemp2[shortbuflen*self->sndChnls];
-            sf_seek(self->sf, self->endPos, SEEK_SET); /* sets position pointer in the file */
-            SF_READ(self->sf, buftemp2, shortbuflen*self->sndChnls);
+            DiskStream_seek(&self->disk, self->endPos); /* sets position pointer in the file */
+            DiskStream_read(&self->disk, buftemp2, shortbuflen*self->sndChnls);
             for (i=0; i<(shortbuflen*self->sndChnls); i++) {
                 buffer[i+padlen] = buftemp2[i];
             }    
         }
         else { /* without zero padding */
-            sf_seek(self->sf, index-buflen, SEEK_SET); /* sets position pointer in the file */
-            SF_READ(self->sf, buffer, totlen);
+            DiskStream_seek(&self->disk, index-buflen); /* sets position pointer in the file */
+            DiskStream_read(&self->disk, buffer, totlen);
         }
         /* de-interleave samples */
         for (i=0; i<totlen; i++) {
@@ -1736,6 +2224,7 @@ SfMarkerLooper_readframes_i(SfMarkerLooper *self) {
             SfMarkerLooper_chooseNewMark((SfMarkerLooper *)self, 0);
             self->pointerPos = self->startPos - off;
         }
+        DiskStream_prefetch(&self->disk, (sf_count_t)self->pointerPos, -1, (sf_count_t)self->endPos, (sf_count_t)self->nextStartPos);
     }
     else { /* speed == 0 */
         self->lastDir = 0;
@@ -1840,6 +2329,7 @@ static void
 SfMarkerLooper_dealloc(SfMarkerLooper* self)
 {
     pyo_DEALLOC
+    DiskStream_close(&self->disk);
     if (self->sf != NULL)
         sf_close(self->sf);
     free(self->samplesBuffer);
@@ -1906,6 +2396,7 @@ SfMarkerLooper_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
         printf("Failed to open the file.\n");
         Py_RETURN_NONE;
     }
+    DiskStream_setFile(&self->disk, self->sf, self->path, &self->info);
     self->sndSize = self->info.frames;
     self->sndSr = self->info.samplerate;
     self->sndChnls = self->info.channels;
@@ -2021,6 +2512,38 @@ SfMarkerLooper_setInterp(SfMarkerLooper *self, PyObject *arg)
     return Py_None;
 }
 
+static PyObject *
+SfMarkerLooper_setPrefetch(SfMarkerLooper *self, PyObject *arg)
+{
+	if (arg == NULL) {
+		Py_INCREF(Py_None);
+		return Py_None;
+	}
+    
+    int isNumber = PyNumber_Check(arg);
+    
+	if (isNumber == 1) {
+        DiskStream_setPrefetch(&self->disk, (sf_count_t)(PyFloat_AsDouble(arg) * self->sndSr));
+    }  
+    
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject *
+SfMarkerLooper_getUnderruns(SfMarkerLooper *self)
+{
+    return PyLong_FromUnsignedLong(self->disk.underruns);
+}
+
+static PyObject *
+SfMarkerLooper_resetUnderruns(SfMarkerLooper *self)
+{
+    self->disk.underruns = 0;
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
 MYFLT *
 SfMarkerLooper_getSamplesBuffer(SfMarkerLooper *self)
 {
@@ -2044,6 +2567,9 @@ static PyMethodDef SfMarkerLooper_methods[] = {
     {"setSpeed", (PyCFunction)SfMarkerLooper_setSpeed, METH_O, "Sets sfplayer reading speed."},
     {"setMark", (PyCFunction)SfMarkerLooper_setMark, METH_O, "Sets marker to loop."},
     {"setInterp", (PyCFunction)SfMarkerLooper_setInterp, METH_O, "Sets sfplayer interpolation mode."},
+    {"setPrefetch", (PyCFunction)SfMarkerLooper_setPrefetch, METH_O, "Sets the amount of sound, in seconds, loaded ahead by the disk streaming threads."},
+    {"getUnderruns", (PyCFunction)SfMarkerLooper_getUnderruns, METH_NOARGS, "Returns the number of reads the disk streaming threads did not prepare in time."},
+    {"resetUnderruns", (PyCFunction)SfMarkerLooper_resetUnderruns, METH_NOARGS, "Resets the underrun counter."},
     {NULL}  /* Sentinel */
 };
 
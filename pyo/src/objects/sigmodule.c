@@ -30,6 +30,13 @@ typedef struct {
     PyObject *value;
     Stream *value_stream;
     int modebuffer[3];
+    /* values scheduled on the server for the current buffer */
+    int *event_offsets;
+    MYFLT *event_values;
+    int event_count;
+    int event_capacity;
+    int event_mode; /* value mode before the first event */
+    MYFLT event_last; /* value before the first event */
 } Sig;
 
 static void Sig_postprocessing_ii(Sig *self) { POST_PROCESSING_II };
@@ -79,11 +86,75 @@ Sig_setProcMode(Sig *self)
     }
 }
 
+static void
+Sig_compute_events(Sig *self)
+{
+    int i, j, end;
+    MYFLT val, *vals;
+
+    end = self->event_offsets[0];
+    if (self->event_mode == 0) {
+        for (i=0; i<end; i++) {
+            self->data[i] = self->event_last;
+        }
+    }
+    else {
+        vals = Stream_getData((Stream *)self->value_stream);
+        for (i=0; i<end; i++) {
+            self->data[i] = vals[i];
+        }
+    }
+    for (j=0; j<self->event_count; j++) {
+        val = self->event_values[j];
+        end = (j + 1) < self->event_count ? self->event_offsets[j+1] : self->bufsize;
+        for (i=self->event_offsets[j]; i<end; i++) {
+            self->data[i] = val;
+        }
+    }
+    self->event_count = 0;
+}
+
+/* Called by the server, before the streams are computed, for every value 
+   scheduled inside the next buffer. Events come in time order. The value is 
+   the Sig's value from then on, the buffer switches to it at `offset`. */
+void
+Sig_addEvent(PyObject *obj, int offset, MYFLT value)
+{
+    Sig *self = (Sig *)obj;
+
+    if (offset < 0)
+        offset = 0;
+    else if (offset >= self->bufsize)
+        offset = self->bufsize - 1;
+
+    if (Stream_getStreamActive(self->stream)) {
+        if (self->event_count == 0) {
+            self->event_mode = self->modebuffer[2];
+            if (self->event_mode == 0)
+                self->event_last = PyFloat_AS_DOUBLE(self->value);
+        }
+        if (self->event_count == self->event_capacity) {
+            self->event_capacity = self->event_capacity ? self->event_capacity * 2 : 8;
+            self->event_offsets = (int *)realloc(self->event_offsets, self->event_capacity * sizeof(int));
+            self->event_values = (MYFLT *)realloc(self->event_values, self->event_capacity * sizeof(MYFLT));
+        }
+        self->event_offsets[self->event_count] = offset;
+        self->event_values[self->event_count++] = value;
+    }
+
+    Py_DECREF(self->value);
+    self->value = PyFloat_FromDouble(value);
+    self->modebuffer[2] = 0;
+}
+
 static void
 Sig_compute_next_data_frame(Sig *self)
 {
     int i;
-    if (self->modebuffer[2] == 0) {
+    if (self->event_count > 0) {
+        Sig_compute_events(self);
+    }
+    else if (self->modebuffer[2] == 0) {
         MYFLT val = PyFloat_AS_DOUBLE(self->value);
         for (i=0; i<self->bufsize; i++) {
             self->data[i] = val;
@@ -120,6 +191,8 @@ static void
 Sig_dealloc(Sig* self)
 {
     pyo_DEALLOC
+    free(self->event_offsets);
+    free(self->event_values);
     Sig_clear(self);
     self->ob_type->tp_free((PyObject*)self);
 }
@@ -136,6 +209,9 @@ Sig_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
 	self->modebuffer[0] = 0;
 	self->modebuffer[1] = 0;
 	self->modebuffer[2] = 0;
+    self->event_offsets = NULL;
+    self->event_values = NULL;
+    self->event_count = self->event_capacity = 0;
 
     INIT_OBJECT_COMMON
     Stream_setFunctionPtr(self->stream, Sig_compute_next_data_frame);
@@ -376,13 +452,13 @@ SigTo_generates_i(SigTo *self) {
         MYFLT *vals = Stream_getData((Stream *)self->value_stream);        
         if (self->timeStep <= 0) {
             for (i=0; i<self->bufsize; i++) {
-                value = vals[i];
+                value = vals[i*self->kstride];
                 self->data[i] = self->currentValue = self->lastValue = value;
             }
         }
         else {
             for (i=0; i<self->bufsize; i++) {
-                value = vals[i];
+                value = vals[i*self->kstride];
                 if (value != self->lastValue) {
                     self->timeCount = 0;
                     self->timeStep = (long)(self->time * self->sr);
@@ -28,6 +28,13 @@
 #include "sndfile.h"
 #include "wind.h"
 
+#if !defined(_WIN32)
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <fcntl.h>
+#include <unistd.h>
+#endif
+
 #define __TABLE_MODULE
 #include "tablemodule.h"
 #undef __TABLE_MODULE
@@ -83,7 +90,96 @@ void
 TableStream_setSamplingRate(TableStream *self, double sr)
 {
     self->samplingRate = sr;
-}    
+}
+
+/* Returns 'f' or 'd' for a native single or double precision format, 0 otherwise. */
+static char
+PyoBuffer_getFormat(Py_buffer *view)
+{
+    char *format = view->format;
+    if (format == NULL)
+        return 0;
+    if (format[0] == '@' || format[0] == '=')
+        format++;
+    if (format[0] == 'f' && format[1] == '\0' && view->itemsize == sizeof(float))
+        return 'f';
+    else if (format[0] == 'd' && format[1] == '\0' && view->itemsize == sizeof(double))
+        return 'd';
+    return 0;
+}
+
+int
+PyoBuffer_getFloatBuffer(PyObject *obj, Py_buffer *view)
+{
+    if (PyObject_GetBuffer(obj, view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) < 0)
+        return -1;
+    if (PyoBuffer_getFormat(view) == 0) {
+        PyBuffer_Release(view);
+        PyErr_SetString(PyExc_TypeError, "The buffer must be a contiguous array of floats or doubles.");
+        return -1;
+    }
+    return 0;
+}
+
+void
+PyoBuffer_copyToMYFLT(Py_buffer *view, Py_ssize_t start, MYFLT *dest, Py_ssize_t count)
+{
+    Py_ssize_t i;
+    float *fsrc;
+    double *dsrc;
+
+    if (PyoBuffer_getFormat(view) == MYFLT_BUFFER_FORMAT[0]) {
+        memmove(dest, (MYFLT *)view->buf + start, count * sizeof(MYFLT));
+    }
+    else if (view->itemsize == sizeof(float)) {
+        fsrc = (float *)view->buf + start;
+        for (i=0; i<count; i++) {
+            dest[i] = (MYFLT)fsrc[i];
+        }
+    }
+    else {
+        dsrc = (double *)view->buf + start;
+        for (i=0; i<count; i++) {
+            dest[i] = (MYFLT)dsrc[i];
+        }
+    }
+}
+
+static PyObject *
+TableStream_fromBuffer(TableStream *self, PyObject *args, PyObject *kwds)
+{
+    Py_buffer view;
+    Py_ssize_t count;
+    PyObject *buftmp;
+    int pos = 0;
+
+    static char *kwlist[] = {"buffer", "pos", NULL};
+
+    if (! PyArg_ParseTupleAndKeywords(args, kwds, "O|i", kwlist, &buftmp, &pos))
+        return NULL;
+
+    if (pos < 0 || pos > self->size) {
+        PyErr_SetString(PyExc_IndexError, "Position outside of the table.");
+        return NULL;
+    }
+
+    if (PyoBuffer_getFloatBuffer(buftmp, &view) < 0)
+        return NULL;
+
+    count = view.len / view.itemsize;
+    if (count > (self->size - pos))
+        count = self->size - pos;
+    PyoBuffer_copyToMYFLT(&view, 0, self->data + pos, count);
+    self->data[self->size] = self->data[0];
+
+    PyBuffer_Release(&view);
+    return PyInt_FromLong((long)count);
+}
+
+static PyMethodDef TableStream_methods[] = {
+{"fromBuffer", (PyCFunction)TableStream_fromBuffer, METH_VARARGS|METH_KEYWORDS, "Copies samples from a contiguous float or double buffer into the table."},
+{NULL}  /* Sentinel */
+};
 
 PyTypeObject TableStreamType = {
 PyObject_HEAD_INIT(NULL)
@@ -114,7 +210,7 @@ Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE, /*tp_flags*/
 0, /* tp_weaklistoffset */
 0, /* tp_iter */
 0, /* tp_iternext */
-0, /* tp_methods */
+TableStream_methods, /* tp_methods */
 0, /* tp_members */
 0, /* tp_getset */
 0, /* tp_base */
@@ -127,6 +223,57 @@ Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE, /*tp_flags*/
 TableStream_new, /* tp_new */
 };
 
+/*************************/
+/* Table buffer protocol */
+/*************************/
+/* Exposes the table memory, without copy, as a 1-D array of MYFLT. The 
+   view holds the table object, which owns the memory, and the table 
+   refuses to be resized while views exist (CHECK_BUFFER_EXPORTS). */
+typedef struct {
+    pyo_table_HEAD
+} PyoTableHead;
+
+static int
+PyoTable_getbuffer(PyoTableHead *self, Py_buffer *view, int flags)
+{
+    if (self->data == NULL) {
+        PyErr_SetString(PyExc_BufferError, "Table has no data.");
+        return -1;
+    }
+    self->tablestream->shape[0] = self->size;
+    self->tablestream->strides[0] = sizeof(MYFLT);
+
+    view->obj = (PyObject *)self;
+    Py_INCREF(self);
+    view->buf = (void *)self->data;
+    view->len = self->size * sizeof(MYFLT);
+    view->readonly = 0;
+    view->itemsize = sizeof(MYFLT);
+    view->format = (flags & PyBUF_FORMAT) ? MYFLT_BUFFER_FORMAT : NULL;
+    view->ndim = 1;
+    view->shape = (flags & PyBUF_ND) ? self->tablestream->shape : NULL;
+    view->strides = ((flags & PyBUF_STRIDES) == PyBUF_STRIDES) ? self->tablestream->strides : NULL;
+    view->suboffsets = NULL;
+    view->internal = NULL;
+    self->exports++;
+    return 0;
+}
+
+static void
+PyoTable_releasebuffer(PyoTableHead *self, Py_buffer *view)
+{
+    self->exports--;
+}
+
+static PyBufferProcs PyoTable_as_buffer = {
+(readbufferproc)0, /*bf_getreadbuffer*/
+(writebufferproc)0, /*bf_getwritebuffer*/
+(segcountproc)0, /*bf_getsegcount*/
+(charbufferproc)0, /*bf_getcharbuffer*/
+(getbufferproc)PyoTable_getbuffer, /*bf_getbuffer*/
+(releasebufferproc)PyoTable_releasebuffer, /*bf_releasebuffer*/
+};
+
 /***********************/
 /* HarmTable structure */
 /***********************/
@@ -248,6 +395,8 @@ static PyObject * HarmTable_get(HarmTable *self, PyObject *args, PyObject *kwds)
 static PyObject *
 HarmTable_setSize(HarmTable *self, PyObject *value)
 {
+    CHECK_BUFFER_EXPORTS
+
     if (value == NULL) {
         PyErr_SetString(PyExc_TypeError, "Cannot delete the size attribute.");
         return PyInt_FromLong(-1);
@@ -352,8 +501,8 @@ sizeof(HarmTable),         /*tp_basicsize*/
 0,                         /*tp_str*/
 0,                         /*tp_getattro*/
 0,                         /*tp_setattro*/
-0,                         /*tp_as_buffer*/
-Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC, /*tp_flags*/
+&PyoTable_as_buffer,                         /*tp_as_buffer*/
+Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC | Py_TPFLAGS_HAVE_NEWBUFFER, /*tp_flags*/
 "HarmTable objects. Generates a table filled with a waveform whose harmonic content correspond to a given amplitude list values.",  /* tp_doc */
 (traverseproc)HarmTable_traverse,   /* tp_traverse */
 (inquiry)HarmTable_clear,           /* tp_clear */
@@ -536,6 +685,8 @@ static PyObject * ChebyTable_get(ChebyTable *self, PyObject *args, PyObject *kwd
 static PyObject *
 ChebyTable_setSize(ChebyTable *self, PyObject *value)
 {
+    CHECK_BUFFER_EXPORTS
+
     if (value == NULL) {
         PyErr_SetString(PyExc_TypeError, "Cannot delete the size attribute.");
         return PyInt_FromLong(-1);
@@ -714,8 +865,8 @@ sizeof(ChebyTable),         /*tp_basicsize*/
 0,                         /*tp_str*/
 0,                         /*tp_getattro*/
 0,                         /*tp_setattro*/
-0,                         /*tp_as_buffer*/
-Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC, /*tp_flags*/
+&PyoTable_as_buffer,                         /*tp_as_buffer*/
+Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC | Py_TPFLAGS_HAVE_NEWBUFFER, /*tp_flags*/
 "ChebyTable objects. Generates a table filled with a waveform whose harmonic content correspond to a given amplitude list values.",  /* tp_doc */
 (traverseproc)ChebyTable_traverse,   /* tp_traverse */
 (inquiry)ChebyTable_clear,           /* tp_clear */
@@ -832,6 +983,8 @@ static PyObject * HannTable_get(HannTable *self, PyObject *args, PyObject *kwds)
 static PyObject *
 HannTable_setSize(HannTable *self, PyObject *value)
 {
+    CHECK_BUFFER_EXPORTS
+
     if (value == NULL) {
         PyErr_SetString(PyExc_TypeError, "Cannot delete the size attribute.");
         return PyInt_FromLong(-1);
@@ -911,8 +1064,8 @@ sizeof(HannTable),         /*tp_basicsize*/
 0,                         /*tp_str*/
 0,                         /*tp_getattro*/
 0,                         /*tp_setattro*/
-0,                         /*tp_as_buffer*/
-Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC, /*tp_flags*/
+&PyoTable_as_buffer,                         /*tp_as_buffer*/
+Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC | Py_TPFLAGS_HAVE_NEWBUFFER, /*tp_flags*/
 "HannTable objects. Generates a table filled with a hanning function.",  /* tp_doc */
 (traverseproc)HannTable_traverse,   /* tp_traverse */
 (inquiry)HannTable_clear,           /* tp_clear */
@@ -1084,6 +1237,8 @@ SincTable_setWindowed(SincTable *self, PyObject *value)
 static PyObject *
 SincTable_setSize(SincTable *self, PyObject *value)
 {
+    CHECK_BUFFER_EXPORTS
+
     if (value == NULL) {
         PyErr_SetString(PyExc_TypeError, "Cannot delete the size attribute.");
         return PyInt_FromLong(-1);
@@ -1165,8 +1320,8 @@ PyTypeObject SincTableType = {
     0,                         /*tp_str*/
     0,                         /*tp_getattro*/
     0,                         /*tp_setattro*/
-    0,                         /*tp_as_buffer*/
-    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC, /*tp_flags*/
+    &PyoTable_as_buffer,                         /*tp_as_buffer*/
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC | Py_TPFLAGS_HAVE_NEWBUFFER, /*tp_flags*/
     "SincTable objects. Generates a table filled with a sinc function.",  /* tp_doc */
     (traverseproc)SincTable_traverse,   /* tp_traverse */
     (inquiry)SincTable_clear,           /* tp_clear */
@@ -1276,6 +1431,8 @@ static PyObject * WinTable_get(WinTable *self, PyObject *args, PyObject *kwds) {
 static PyObject *
 WinTable_setSize(WinTable *self, PyObject *value)
 {
+    CHECK_BUFFER_EXPORTS
+
     if (value == NULL) {
         PyErr_SetString(PyExc_TypeError, "Cannot delete the size attribute.");
         return PyInt_FromLong(-1);
@@ -1377,8 +1534,8 @@ sizeof(WinTable),         /*tp_basicsize*/
 0,                         /*tp_str*/
 0,                         /*tp_getattro*/
 0,                         /*tp_setattro*/
-0,                         /*tp_as_buffer*/
-Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC, /*tp_flags*/
+&PyoTable_as_buffer,                         /*tp_as_buffer*/
+Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC | Py_TPFLAGS_HAVE_NEWBUFFER, /*tp_flags*/
 "WinTable objects. Generates a table filled with a hanning function.",  /* tp_doc */
 (traverseproc)WinTable_traverse,   /* tp_traverse */
 (inquiry)WinTable_clear,           /* tp_clear */
@@ -1502,6 +1659,8 @@ static PyObject * ParaTable_get(ParaTable *self, PyObject *args, PyObject *kwds)
 static PyObject *
 ParaTable_setSize(ParaTable *self, PyObject *value)
 {
+    CHECK_BUFFER_EXPORTS
+
     if (value == NULL) {
         PyErr_SetString(PyExc_TypeError, "Cannot delete the size attribute.");
         return PyInt_FromLong(-1);
@@ -1581,8 +1740,8 @@ PyTypeObject ParaTableType = {
     0,                         /*tp_str*/
     0,                         /*tp_getattro*/
     0,                         /*tp_setattro*/
-    0,                         /*tp_as_buffer*/
-    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC, /*tp_flags*/
+    &PyoTable_as_buffer,                         /*tp_as_buffer*/
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC | Py_TPFLAGS_HAVE_NEWBUFFER, /*tp_flags*/
     "ParaTable objects. Generates a parabola table.",  /* tp_doc */
     (traverseproc)ParaTable_traverse,   /* tp_traverse */
     (inquiry)ParaTable_clear,           /* tp_clear */
@@ -1740,6 +1899,8 @@ static PyObject * LinTable_get(LinTable *self, PyObject *args, PyObject *kwds) {
 static PyObject *
 LinTable_setSize(LinTable *self, PyObject *value)
 {
+    CHECK_BUFFER_EXPORTS
+
     Py_ssize_t i;
     PyObject *tup, *x2;
     int old_size, x1;
@@ -1875,8 +2036,8 @@ sizeof(LinTable),         /*tp_basicsize*/
 0,                         /*tp_str*/
 0,                         /*tp_getattro*/
 0,                         /*tp_setattro*/
-0,                         /*tp_as_buffer*/
-Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC, /*tp_flags*/
+&PyoTable_as_buffer,                         /*tp_as_buffer*/
+Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC | Py_TPFLAGS_HAVE_NEWBUFFER, /*tp_flags*/
 "LinTable objects. Generates a table filled with one or more straight lines.",  /* tp_doc */
 (traverseproc)LinTable_traverse,   /* tp_traverse */
 (inquiry)LinTable_clear,           /* tp_clear */
@@ -2058,6 +2219,8 @@ static PyObject * LogTable_get(LogTable *self, PyObject *args, PyObject *kwds) {
 static PyObject *
 LogTable_setSize(LogTable *self, PyObject *value)
 {
+    CHECK_BUFFER_EXPORTS
+
     Py_ssize_t i;
     PyObject *tup, *x2;
     int old_size, x1;
@@ -2193,8 +2356,8 @@ PyTypeObject LogTableType = {
     0,                         /*tp_str*/
     0,                         /*tp_getattro*/
     0,                         /*tp_setattro*/
-    0,                         /*tp_as_buffer*/
-    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC, /*tp_flags*/
+    &PyoTable_as_buffer,                         /*tp_as_buffer*/
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC | Py_TPFLAGS_HAVE_NEWBUFFER, /*tp_flags*/
     "LogTable objects. Generates a table filled with one or more logarothmic lines.",  /* tp_doc */
     (traverseproc)LogTable_traverse,   /* tp_traverse */
     (inquiry)LogTable_clear,           /* tp_clear */
@@ -2354,6 +2517,8 @@ static PyObject * CosTable_get(CosTable *self, PyObject *args, PyObject *kwds) {
 static PyObject *
 CosTable_setSize(CosTable *self, PyObject *value)
 {
+    CHECK_BUFFER_EXPORTS
+
     Py_ssize_t i;
     PyObject *tup, *x2;
     int old_size, x1;
@@ -2489,8 +2654,8 @@ sizeof(CosTable),         /*tp_basicsize*/
 0,                         /*tp_str*/
 0,                         /*tp_getattro*/
 0,                         /*tp_setattro*/
-0,                         /*tp_as_buffer*/
-Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC, /*tp_flags*/
+&PyoTable_as_buffer,                         /*tp_as_buffer*/
+Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC | Py_TPFLAGS_HAVE_NEWBUFFER, /*tp_flags*/
 "CosTable objects. Generates a table filled with one or more straight lines.",  /* tp_doc */
 (traverseproc)CosTable_traverse,   /* tp_traverse */
 (inquiry)CosTable_clear,           /* tp_clear */
@@ -2674,6 +2839,8 @@ static PyObject * CosLogTable_get(CosLogTable *self, PyObject *args, PyObject *k
 static PyObject *
 CosLogTable_setSize(CosLogTable *self, PyObject *value)
 {
+    CHECK_BUFFER_EXPORTS
+
     Py_ssize_t i;
     PyObject *tup, *x2;
     int old_size, x1;
@@ -2809,8 +2976,8 @@ PyTypeObject CosLogTableType = {
     0,                         /*tp_str*/
     0,                         /*tp_getattro*/
     0,                         /*tp_setattro*/
-    0,                         /*tp_as_buffer*/
-    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC, /*tp_flags*/
+    &PyoTable_as_buffer,                         /*tp_as_buffer*/
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC | Py_TPFLAGS_HAVE_NEWBUFFER, /*tp_flags*/
     "CosLogTable objects. Generates a table filled with one or more Cosine-logarithmic lines.",  /* tp_doc */
     (traverseproc)CosLogTable_traverse,   /* tp_traverse */
     (inquiry)CosLogTable_clear,           /* tp_clear */
@@ -3039,6 +3206,8 @@ CurveTable_setBias(CurveTable *self, PyObject *value)
 static PyObject *
 CurveTable_setSize(CurveTable *self, PyObject *value)
 {
+    CHECK_BUFFER_EXPORTS
+
     Py_ssize_t i;
     PyObject *tup, *x2;
     int old_size, x1;
@@ -3176,8 +3345,8 @@ sizeof(CurveTable),         /*tp_basicsize*/
 0,                         /*tp_str*/
 0,                         /*tp_getattro*/
 0,                         /*tp_setattro*/
-0,                         /*tp_as_buffer*/
-Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC, /*tp_flags*/
+&PyoTable_as_buffer,                         /*tp_as_buffer*/
+Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC | Py_TPFLAGS_HAVE_NEWBUFFER, /*tp_flags*/
 "CurveTable objects. Generates a table filled with one or more straight lines.",  /* tp_doc */
 (traverseproc)CurveTable_traverse,   /* tp_traverse */
 (inquiry)CurveTable_clear,           /* tp_clear */
@@ -3403,6 +3572,8 @@ ExpTable_setInverse(ExpTable *self, PyObject *value)
 static PyObject *
 ExpTable_setSize(ExpTable *self, PyObject *value)
 {
+    CHECK_BUFFER_EXPORTS
+
     Py_ssize_t i;
     PyObject *tup, *x2;
     int old_size, x1;
@@ -3539,8 +3710,8 @@ sizeof(ExpTable),         /*tp_basicsize*/
 0,                         /*tp_str*/
 0,                         /*tp_getattro*/
 0,                         /*tp_setattro*/
-0,                         /*tp_as_buffer*/
-Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC, /*tp_flags*/
+&PyoTable_as_buffer,                         /*tp_as_buffer*/
+Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC | Py_TPFLAGS_HAVE_NEWBUFFER, /*tp_flags*/
 "ExpTable objects. Generates a table filled with one or more straight lines.",  /* tp_doc */
 (traverseproc)ExpTable_traverse,   /* tp_traverse */
 (inquiry)ExpTable_clear,           /* tp_clear */
@@ -3574,15 +3745,41 @@ typedef struct {
     MYFLT stop;
     MYFLT crossfade;
     MYFLT insertPos;
+    int mapped; /* 1 if data is a private mapping of a decoded cache file */
+    size_t mapsize;
 } SndTable;
 
+/* Releases a memory-mapped sound. If `keep` is 1, the samples are first 
+   copied to a heap buffer so the table can be resized or edited. */
+static void
+SndTable_unmap(SndTable *self, int keep) {
+    MYFLT *tmp = NULL;
+    MYFLT *old = self->data;
+
+    if (! self->mapped)
+        return;
+    if (keep) {
+        tmp = (MYFLT *)malloc((self->size + 1) * sizeof(MYFLT));
+        memcpy(tmp, old, (self->size + 1) * sizeof(MYFLT));
+    }
+    self->data = tmp;
+    TableStream_setData(self->tablestream, self->data);
+#if !defined(_WIN32)
+    munmap(old, self->mapsize);
+#endif
+    self->mapped = 0;
+    self->mapsize = 0;
+}
+
 static void
 SndTable_loadSound(SndTable *self) {
     SNDFILE *sf;
     SF_INFO info;
     unsigned int i, num, num_items, num_chnls, snd_size, start, stop;
     unsigned int num_count = 0;
+    size_t oldsize = 0;
     MYFLT *tmp;
+    MYFLT *old = NULL;
         
     info.format = 0;
     sf = sf_open(self->path, SFM_READ, &info);
@@ -3608,6 +3805,14 @@ SndTable_loadSound(SndTable *self) {
     self->size = stop - start;
     num_items = self->size * num_chnls;
     
+    if (self->mapped) {
+        old = self->data;
+        oldsize = self->mapsize;
+        self->data = NULL;
+        self->mapped = 0;
+        self->mapsize = 0;
+    }
+
     /* Allocate space for the data to be read, then read it. */
     self->data = (MYFLT *)realloc(self->data, (self->size + 1) * sizeof(MYFLT));
 
@@ -3647,6 +3852,150 @@ SndTable_loadSound(SndTable *self) {
     TableStream_setSize(self->tablestream, self->size);
     TableStream_setSamplingRate(self->tablestream, self->sndSr);
     TableStream_setData(self->tablestream, self->data);
+#if !defined(_WIN32)
+    if (old != NULL)
+        munmap(old, oldsize);
+#endif
+}
+
+/* Decodes the selected channel and range into `cache` (once) and maps the 
+   cache file instead of loading the samples in RAM. The file holds exactly 
+   the table data, guard point included, so the kernel pages it in on read. 
+   The mapping is private: in-place edits are copy-on-write and never 
+   reach the cache file. */
+static void
+SndTable_loadMappedSound(SndTable *self, char *cache) {
+#if defined(_WIN32)
+    printf("SndTable: memory-mapping is not available on this platform, loading in RAM.\n");
+    SndTable_loadSound(self);
+#else
+    SNDFILE *sf;
+    SF_INFO info;
+    FILE *fp;
+    struct stat st;
+    int fd;
+    unsigned int i, num, num_chnls, snd_size, start, stop, size;
+    unsigned int j = 0, frames = 0, written = 0;
+    unsigned int chunk = 65536;
+    size_t mapsize, oldsize;
+    MYFLT first = 0.0;
+    MYFLT *tmp, *samples, *old;
+    void *map;
+    char *partial;
+
+    info.format = 0;
+    sf = sf_open(self->path, SFM_READ, &info);
+    if (sf == NULL)
+    {
+        printf("SndTable failed to open the file.\n");
+        return;
+    }
+    snd_size = info.frames;
+    self->sndSr = info.samplerate;
+    num_chnls = info.channels;
+
+    if (self->stop <= 0 || self->stop <= self->start || (self->stop*self->sndSr) > snd_size)
+        stop = snd_size;
+    else
+        stop = (unsigned int)(self->stop * self->sndSr);
+
+    if (self->start < 0 || (self->start*self->sndSr) > snd_size)
+        start = 0;
+    else
+        start = (unsigned int)(self->start * self->sndSr);
+
+    size = stop - start;
+    mapsize = (size + 1) * sizeof(MYFLT);
+
+    /* A cache file of the right size is a previous decode of the same range. */
+    if (stat(cache, &st) != 0 || (size_t)st.st_size != mapsize) {
+        /* Unique temporary name, processes decoding the same sound at the 
+           same time must not write in the same file. */
+        partial = (char *)malloc(strlen(cache) + 8);
+        sprintf(partial, "%s.XXXXXX", cache);
+        fd = mkstemp(partial);
+        if (fd != -1)
+            fchmod(fd, 0644); /* mkstemp creates it readable by the owner only */
+        fp = fd == -1 ? NULL : fdopen(fd, "wb");
+        if (fp == NULL) {
+            printf("SndTable failed to create the cache file %s.\n", partial);
+            if (fd != -1) {
+                close(fd);
+                remove(partial);
+            }
+            free(partial);
+            sf_close(sf);
+            return;
+        }
+        tmp = (MYFLT *)malloc(chunk * num_chnls * sizeof(MYFLT));
+        samples = (MYFLT *)calloc(chunk, sizeof(MYFLT));
+        sf_seek(sf, start, SEEK_SET);
+        while (written < size) {
+            frames = size - written;
+            if (frames > chunk)
+                frames = chunk;
+            num = SF_READ(sf, tmp, frames * num_chnls) / num_chnls;
+            for (i=0; i<frames; i++) {
+                if (i < num && self->chnl < num_chnls)
+                    samples[i] = tmp[i*num_chnls+self->chnl];
+                else
+                    samples[i] = 0.0;
+            }
+            if (written == 0)
+                first = samples[0];
+            j = fwrite(samples, sizeof(MYFLT), frames, fp);
+            written += frames;
+            if (j != frames)
+                break;
+        }
+        samples[0] = first;
+        if (fwrite(samples, sizeof(MYFLT), 1, fp) != 1 || written != size || j != frames) {
+            printf("SndTable failed to write the cache file %s.\n", partial);
+            fclose(fp);
+            remove(partial);
+            free(partial);
+            free(tmp);
+            free(samples);
+            sf_close(sf);
+            return;
+        }
+        fclose(fp);
+        rename(partial, cache);
+        free(partial);
+        free(tmp);
+        free(samples);
+    }
+    sf_close(sf);
+
+    fd = open(cache, O_RDONLY);
+    if (fd < 0) {
+        printf("SndTable failed to open the cache file %s.\n", cache);
+        return;
+    }
+    map = mmap(NULL, mapsize, PROT_READ | PROT_WRITE, MAP_PRIVATE, fd, 0);
+    close(fd);
+    if (map == MAP_FAILED) {
+        printf("SndTable failed to map the cache file %s.\n", cache);
+        return;
+    }
+
+    /* Swap the new samples in before releasing the old ones. */
+    old = self->data;
+    oldsize = self->mapsize;
+    self->size = size;
+    self->data = (MYFLT *)map;
+    TableStream_setSize(self->tablestream, self->size);
+    TableStream_setSamplingRate(self->tablestream, self->sndSr);
+    TableStream_setData(self->tablestream, self->data);
+    if (self->mapped)
+        munmap(old, oldsize);
+    else
+        free(old);
+    self->mapped = 1;
+    self->mapsize = mapsize;
+    self->start = 0.0;
+    self->stop = -1.0;
+#endif
 }
 
 static void
@@ -3664,6 +4013,7 @@ SndTable_appendSound(SndTable *self) {
         printf("SndTable failed to open the file.\n");
         return;
     }
+    SndTable_unmap(self, 1);
     snd_size = info.frames;
     self->sndSr = info.samplerate;
     num_chnls = info.channels;
@@ -3761,6 +4111,7 @@ SndTable_prependSound(SndTable *self) {
         printf("SndTable failed to open the file.\n");
         return;
     }
+    SndTable_unmap(self, 1);
     snd_size = info.frames;
     self->sndSr = info.samplerate;
     num_chnls = info.channels;
@@ -3855,6 +4206,7 @@ SndTable_insertSound(SndTable *self) {
         printf("SndTable failed to open the file.\n");
         return;
     }
+    SndTable_unmap(self, 1);
     snd_size = info.frames;
     self->sndSr = info.samplerate;
     num_chnls = info.channels;
@@ -3968,7 +4320,10 @@ SndTable_clear(SndTable *self)
 static void
 SndTable_dealloc(SndTable* self)
 {
-    free(self->data);
+    if (self->mapped)
+        SndTable_unmap(self, 0);
+    else
+        free(self->data);
     SndTable_clear(self);
     self->ob_type->tp_free((PyObject*)self);
 }
@@ -3988,6 +4343,8 @@ SndTable_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
     self->stop = -1.0;
     self->crossfade = 0.0;
     self->insertPos = 0.0;
+    self->mapped = 0;
+    self->mapsize = 0;
 
     MAKE_NEW_TABLESTREAM(self->tablestream, &TableStreamType, NULL);
 
@@ -4183,6 +4540,8 @@ SndTable_setSound(SndTable *self, PyObject *args, PyObject *kwds)
     
     MYFLT stoptmp = -1.0;
     
+    CHECK_BUFFER_EXPORTS
+
     if (! PyArg_ParseTupleAndKeywords(args, kwds, TYPE_S_IFF, kwlist, &self->path, &self->chnl, &self->start, &stoptmp)) {
         Py_INCREF(Py_None);
         return Py_None;
@@ -4195,6 +4554,34 @@ SndTable_setSound(SndTable *self, PyObject *args, PyObject *kwds)
     return Py_None;
 }
 
+static PyObject *
+SndTable_mapSound(SndTable *self, PyObject *args, PyObject *kwds)
+{    
+    static char *kwlist[] = {"path", "cache", "chnl", "start", "stop", NULL};
+    
+    char *cache;
+    MYFLT stoptmp = -1.0;
+    
+    CHECK_BUFFER_EXPORTS
+
+    if (! PyArg_ParseTupleAndKeywords(args, kwds, TYPE_SS_IFF, kwlist, &self->path, &cache, &self->chnl, &self->start, &stoptmp)) {
+        Py_INCREF(Py_None);
+        return Py_None;
+    }    
+    
+    self->stop = stoptmp;
+    SndTable_loadMappedSound(self, cache);
+    
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject *
+SndTable_isMapped(SndTable *self)
+{
+    return PyInt_FromLong(self->mapped);
+};
+
 static PyObject *
 SndTable_append(SndTable *self, PyObject *args, PyObject *kwds)
 {    
@@ -4203,6 +4590,8 @@ SndTable_append(SndTable *self, PyObject *args, PyObject *kwds)
     MYFLT stoptmp = -1.0;
     MYFLT crosstmp = 0.0;
     
+    CHECK_BUFFER_EXPORTS
+
     if (! PyArg_ParseTupleAndKeywords(args, kwds, TYPE_S_FIFF, kwlist, &self->path, &crosstmp, &self->chnl, &self->start, &stoptmp)) {
         Py_INCREF(Py_None);
         return Py_None;
@@ -4229,6 +4618,8 @@ SndTable_insert(SndTable *self, PyObject *args, PyObject *kwds)
     MYFLT crosstmp = 0.0;
     MYFLT postmp = 0.0;
     
+    CHECK_BUFFER_EXPORTS
+
     if (! PyArg_ParseTupleAndKeywords(args, kwds, TYPE_S_FFIFF, kwlist, &self->path, &postmp, &crosstmp, &self->chnl, &self->start, &stoptmp)) {
         Py_INCREF(Py_None);
         return Py_None;
@@ -4258,6 +4649,9 @@ SndTable_setSize(SndTable *self, PyObject *value)
 {
     Py_ssize_t i;
 
+    CHECK_BUFFER_EXPORTS
+
+    SndTable_unmap(self, 1);
     self->size = PyInt_AsLong(value); 
 
     self->data = (MYFLT *)realloc(self->data, (self->size+1) * sizeof(MYFLT));
@@ -4317,6 +4711,8 @@ static PyMethodDef SndTable_methods[] = {
 {"put", (PyCFunction)SndTable_put, METH_VARARGS|METH_KEYWORDS, "Puts a value at specified position in the table."},
 {"get", (PyCFunction)SndTable_get, METH_VARARGS|METH_KEYWORDS, "Gets the value at specified position in the table."},
 {"setSound", (PyCFunction)SndTable_setSound, METH_VARARGS|METH_KEYWORDS, "Load a new sound in the table."},
+{"mapSound", (PyCFunction)SndTable_mapSound, METH_VARARGS|METH_KEYWORDS, "Memory-map a new sound in the table through a decoded cache file."},
+{"isMapped", (PyCFunction)SndTable_isMapped, METH_NOARGS, "Returns 1 if the table data is memory-mapped."},
 {"append", (PyCFunction)SndTable_append, METH_VARARGS|METH_KEYWORDS, "Append a sound in the table."},
 {"insert", (PyCFunction)SndTable_insert, METH_VARARGS|METH_KEYWORDS, "Insert a sound in the table."},
 {"setSize", (PyCFunction)SndTable_setSize, METH_O, "Sets the size of the table in samples"},
@@ -4345,8 +4741,8 @@ sizeof(SndTable),         /*tp_basicsize*/
 0,                         /*tp_str*/
 0,                         /*tp_getattro*/
 0,                         /*tp_setattro*/
-0,                         /*tp_as_buffer*/
-Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC, /*tp_flags*/
+&PyoTable_as_buffer,                         /*tp_as_buffer*/
+Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC | Py_TPFLAGS_HAVE_NEWBUFFER, /*tp_flags*/
 "SndTable objects. Generates a table filled with a soundfile.",  /* tp_doc */
 (traverseproc)SndTable_traverse,   /* tp_traverse */
 (inquiry)SndTable_clear,           /* tp_clear */
@@ -4689,8 +5085,8 @@ sizeof(NewTable),         /*tp_basicsize*/
 0,                         /*tp_str*/
 0,                         /*tp_getattro*/
 0,                         /*tp_setattro*/
-0,                         /*tp_as_buffer*/
-Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC, /*tp_flags*/
+&PyoTable_as_buffer,                         /*tp_as_buffer*/
+Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC | Py_TPFLAGS_HAVE_NEWBUFFER, /*tp_flags*/
 "NewTable objects. Generates an empty table.",  /* tp_doc */
 (traverseproc)NewTable_traverse,   /* tp_traverse */
 (inquiry)NewTable_clear,           /* tp_clear */
@@ -4872,8 +5268,8 @@ PyTypeObject DataTableType = {
     0,                         /*tp_str*/
     0,                         /*tp_getattro*/
     0,                         /*tp_setattro*/
-    0,                         /*tp_as_buffer*/
-    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC, /*tp_flags*/
+    &PyoTable_as_buffer,                         /*tp_as_buffer*/
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC | Py_TPFLAGS_HAVE_NEWBUFFER, /*tp_flags*/
     "DataTable objects. Generates an empty table.",  /* tp_doc */
     (traverseproc)DataTable_traverse,   /* tp_traverse */
     (inquiry)DataTable_clear,           /* tp_clear */
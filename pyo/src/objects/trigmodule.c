@@ -1263,32 +1263,23 @@ typedef struct {
     Stream *input_stream;
     PyObject *arg;
     PyObject *func;
+    int defer;
 } TrigFunc;
 
 static void
 TrigFunc_generate(TrigFunc *self) {
     int i;
-    PyObject *tuple, *result;
+    PyObject *tuple;
     MYFLT *in = Stream_getData((Stream *)self->input_stream);
     
     for (i=0; i<self->bufsize; i++) {
         if (in[i] == 1) {
-            if (self->arg == Py_None) {
-                result = PyObject_Call(self->func, PyTuple_New(0), NULL);
-                if (result == NULL) {
-                    PyErr_Print();
-                    return;
-                }
-            }
-            else {
-                tuple = PyTuple_New(1);
-                PyTuple_SET_ITEM(tuple, 0, self->arg);
-                result = PyObject_Call(self->func, tuple, NULL);                
-                if (result == NULL) {
-                    PyErr_Print();
-                    return;
-                }
-            }
+            if (self->arg == Py_None)
+                tuple = PyTuple_New(0);
+            else
+                tuple = PyTuple_Pack(1, self->arg);
+            Server_dispatchCall((Server *)self->server, self->func, tuple, self->defer);
+            Py_DECREF(tuple);
         }    
     }
 }
@@ -1338,6 +1329,7 @@ TrigFunc_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
     self = (TrigFunc *)type->tp_alloc(type, 0);
 
     self->arg = Py_None;
+    self->defer = 0;
 
     INIT_OBJECT_COMMON
     Stream_setFunctionPtr(self->stream, TrigFunc_compute_next_data_frame);
@@ -1402,6 +1394,16 @@ TrigFunc_setArg(TrigFunc *self, PyObject *arg)
 	return Py_None;
 }	
 
+static PyObject *
+TrigFunc_setDefer(TrigFunc *self, PyObject *arg)
+{
+    if (arg != NULL)
+        self->defer = PyObject_IsTrue(arg);
+
+	Py_INCREF(Py_None);
+	return Py_None;
+}
+
 static PyMemberDef TrigFunc_members[] = {
 {"server", T_OBJECT_EX, offsetof(TrigFunc, server), 0, "Pyo server."},
 {"stream", T_OBJECT_EX, offsetof(TrigFunc, stream), 0, "Stream object."},
@@ -1416,6 +1418,7 @@ static PyMethodDef TrigFunc_methods[] = {
 {"stop", (PyCFunction)TrigFunc_stop, METH_NOARGS, "Stops computing."},
 {"setFunction", (PyCFunction)TrigFunc_setFunction, METH_O, "Sets function to be called."},
 {"setArg", (PyCFunction)TrigFunc_setArg, METH_O, "Sets function's argument."},
+{"setDefer", (PyCFunction)TrigFunc_setDefer, METH_O, "If True, the function is called by the server's call thread."},
 {NULL}  /* Sentinel */
 };
 
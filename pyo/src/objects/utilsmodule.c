@@ -278,6 +278,242 @@ Print_members,                                 /* tp_members */
 Print_new,                                     /* tp_new */
 };
 
+/*********************************************************************************************/
+/* Capture ***********************************************************************************/
+/*********************************************************************************************/
+/* Single producer (audio callback), single consumer (Python) ring buffer. The capacity is a
+power of two so the free running positions can wrap around safely. */
+typedef struct {
+    pyo_audio_HEAD
+    PyObject *input;
+    Stream *input_stream;
+    MYFLT length;
+    MYFLT *ring;
+    unsigned long capacity;
+    unsigned long mask;
+    volatile unsigned long writepos;
+    volatile unsigned long readpos;
+    unsigned long overruns;
+} Capture;
+
+static void
+Capture_process(Capture *self) {
+    unsigned long start, first;
+    MYFLT *in = Stream_getData((Stream *)self->input_stream);
+
+    if ((self->capacity - (self->writepos - self->readpos)) < (unsigned long)self->bufsize) {
+        self->overruns++;
+        return;
+    }
+
+    start = self->writepos & self->mask;
+    first = self->capacity - start;
+    if (first > (unsigned long)self->bufsize)
+        first = self->bufsize;
+    memcpy(self->ring + start, in, first * sizeof(MYFLT));
+    if (first < (unsigned long)self->bufsize)
+        memcpy(self->ring, in + first, (self->bufsize - first) * sizeof(MYFLT));
+
+    self->writepos += self->bufsize;
+}
+
+static void
+Capture_compute_next_data_frame(Capture *self)
+{
+    Capture_process(self);
+}
+
+static int
+Capture_traverse(Capture *self, visitproc visit, void *arg)
+{
+    pyo_VISIT
+    Py_VISIT(self->input);
+    Py_VISIT(self->input_stream);
+    return 0;
+}
+
+static int 
+Capture_clear(Capture *self)
+{
+    pyo_CLEAR
+    Py_CLEAR(self->input);
+    Py_CLEAR(self->input_stream);
+    return 0;
+}
+
+static void
+Capture_dealloc(Capture* self)
+{
+    pyo_DEALLOC
+    free(self->ring);
+    Capture_clear(self);
+    self->ob_type->tp_free((PyObject*)self);
+}
+
+static PyObject *
+Capture_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
+{
+    int i;
+    unsigned long size;
+    PyObject *inputtmp, *input_streamtmp;
+    Capture *self;
+    self = (Capture *)type->tp_alloc(type, 0);
+
+    self->length = 1.0;
+    self->writepos = self->readpos = 0;
+    self->overruns = 0;
+
+    INIT_OBJECT_COMMON
+    Stream_setFunctionPtr(self->stream, Capture_compute_next_data_frame);
+
+    static char *kwlist[] = {"input", "length", NULL};
+    
+    if (! PyArg_ParseTupleAndKeywords(args, kwds, TYPE_O_F, kwlist, &inputtmp, &self->length))
+        Py_RETURN_NONE;
+    
+    INIT_INPUT_STREAM
+
+    size = (unsigned long)(self->length * self->sr);
+    if (size < (unsigned long)(self->bufsize * 2))
+        size = self->bufsize * 2;
+    self->capacity = 1;
+    while (self->capacity < size)
+        self->capacity <<= 1;
+    self->mask = self->capacity - 1;
+    self->ring = (MYFLT *)realloc(self->ring, self->capacity * sizeof(MYFLT));
+
+    PyObject_CallMethod(self->server, "addStream", "O", self->stream);
+    
+    return (PyObject *)self;
+}
+
+static PyObject * Capture_getServer(Capture* self) { GET_SERVER };
+static PyObject * Capture_getStream(Capture* self) { GET_STREAM };
+
+static PyObject * Capture_play(Capture *self, PyObject *args, PyObject *kwds) { PLAY };
+static PyObject * Capture_stop(Capture *self) { STOP };
+
+static PyObject *
+Capture_readInto(Capture *self, PyObject *arg)
+{
+    unsigned long count, start, first;
+    Py_buffer view;
+
+    if (PyObject_GetBuffer(arg, &view, PyBUF_WRITABLE | PyBUF_FORMAT | PyBUF_C_CONTIGUOUS) < 0)
+        return NULL;
+
+    if (view.itemsize != sizeof(MYFLT) || view.format == NULL || view.format[0] != MYFLT_BUFFER_FORMAT[0]) {
+        PyBuffer_Release(&view);
+        PyErr_SetString(PyExc_TypeError, "Capture can only read into a contiguous buffer of the engine's float type.");
+        return NULL;
+    }
+
+    count = self->writepos - self->readpos;
+    if (count > (unsigned long)(view.len / view.itemsize))
+        count = view.len / view.itemsize;
+
+    start = self->readpos & self->mask;
+    first = self->capacity - start;
+    if (first > count)
+        first = count;
+    memcpy(view.buf, self->ring + start, first * sizeof(MYFLT));
+    if (first < count)
+        memcpy((MYFLT *)view.buf + first, self->ring, (count - first) * sizeof(MYFLT));
+
+    self->readpos += count;
+
+    PyBuffer_Release(&view);
+    return PyInt_FromLong((long)count);
+}
+
+static PyObject *
+Capture_getAvailable(Capture *self)
+{
+    return PyInt_FromLong((long)(self->writepos - self->readpos));
+}
+
+static PyObject *
+Capture_getOverruns(Capture *self)
+{
+    return PyInt_FromLong((long)self->overruns);
+}
+
+static PyObject *
+Capture_getCapacity(Capture *self)
+{
+    return PyInt_FromLong((long)self->capacity);
+}
+
+static PyObject *
+Capture_reset(Capture *self)
+{
+    self->readpos = self->writepos;
+    self->overruns = 0;
+    Py_RETURN_NONE;
+}
+
+static PyMemberDef Capture_members[] = {
+{"server", T_OBJECT_EX, offsetof(Capture, server), 0, "Pyo server."},
+{"stream", T_OBJECT_EX, offsetof(Capture, stream), 0, "Stream object."},
+{"input", T_OBJECT_EX, offsetof(Capture, input), 0, "Input sound object."},
+{NULL}  /* Sentinel */
+};
+
+static PyMethodDef Capture_methods[] = {
+{"getServer", (PyCFunction)Capture_getServer, METH_NOARGS, "Returns server object."},
+{"_getStream", (PyCFunction)Capture_getStream, METH_NOARGS, "Returns stream object."},
+{"play", (PyCFunction)Capture_play, METH_VARARGS|METH_KEYWORDS, "Starts computing without sending sound to soundcard."},
+{"stop", (PyCFunction)Capture_stop, METH_NOARGS, "Stops computing."},
+{"readInto", (PyCFunction)Capture_readInto, METH_O, "Moves the oldest captured samples into a writable buffer. Returns the number of samples read."},
+{"getAvailable", (PyCFunction)Capture_getAvailable, METH_NOARGS, "Returns the number of samples waiting to be read."},
+{"getOverruns", (PyCFunction)Capture_getOverruns, METH_NOARGS, "Returns the number of buffers dropped because the ring was full."},
+{"getCapacity", (PyCFunction)Capture_getCapacity, METH_NOARGS, "Returns the size of the ring in samples."},
+{"reset", (PyCFunction)Capture_reset, METH_NOARGS, "Discards pending samples and clears the overrun counter."},
+{NULL}  /* Sentinel */
+};
+
+PyTypeObject CaptureType = {
+PyObject_HEAD_INIT(NULL)
+0,                                              /*ob_size*/
+"_pyo.Capture_base",                                   /*tp_name*/
+sizeof(Capture),                                 /*tp_basicsize*/
+0,                                              /*tp_itemsize*/
+(destructor)Capture_dealloc,                     /*tp_dealloc*/
+0,                                              /*tp_print*/
+0,                                              /*tp_getattr*/
+0,                                              /*tp_setattr*/
+0,                                              /*tp_compare*/
+0,                                              /*tp_repr*/
+0,                                              /*tp_as_number*/
+0,                                              /*tp_as_sequence*/
+0,                                              /*tp_as_mapping*/
+0,                                              /*tp_hash */
+0,                                              /*tp_call*/
+0,                                              /*tp_str*/
+0,                                              /*tp_getattro*/
+0,                                              /*tp_setattro*/
+0,                                              /*tp_as_buffer*/
+Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC | Py_TPFLAGS_CHECKTYPES, /*tp_flags*/
+"Capture objects. Copies every buffer of the input object into a ring buffer.",           /* tp_doc */
+(traverseproc)Capture_traverse,                  /* tp_traverse */
+(inquiry)Capture_clear,                          /* tp_clear */
+0,                                              /* tp_richcompare */
+0,                                              /* tp_weaklistoffset */
+0,                                              /* tp_iter */
+0,                                              /* tp_iternext */
+Capture_methods,                                 /* tp_methods */
+Capture_members,                                 /* tp_members */
+0,                                              /* tp_getset */
+0,                                              /* tp_base */
+0,                                              /* tp_dict */
+0,                                              /* tp_descr_get */
+0,                                              /* tp_descr_set */
+0,                                              /* tp_dictoffset */
+0,                          /* tp_init */
+0,                                              /* tp_alloc */
+Capture_new,                                     /* tp_new */
+};
+
 /*********************************************************************************************/
 /* Snap ********************************************************************************/
 /*********************************************************************************************/
@@ -2897,7 +3133,7 @@ DBToA_process(DBToA *self) {
     MYFLT *in = Stream_getData((Stream *)self->input_stream);
     
     for (i=0; i<self->bufsize; i++) {
-        db = in[i];
+        db = in[i*self->kstride];
         if (db <= -120.0) {
             self->data[i] = self->currentamp = 0.0;
             self->lastdb = -120.0;
@@ -3177,7 +3413,7 @@ AToDB_process(AToDB *self) {
     MYFLT *in = Stream_getData((Stream *)self->input_stream);
     
     for (i=0; i<self->bufsize; i++) {
-        amp = in[i];
+        amp = in[i*self->kstride];
         if (amp <= 0.000001) {
             self->data[i] = self->currentdb = -120.0;
             self->lastamp = 0.000001;
@@ -3532,25 +3768,25 @@ Scale_generate(Scale *self) {
     else if (exp == 1.0) {
         if (inrev == 0 && outrev == 0) {
             for (i=0; i<self->bufsize; i++) {
-                normin = (_scale_clip(in[i], inmin, inmax) - inmin) / inrange;
+                normin = (_scale_clip(in[i*self->kstride], inmin, inmax) - inmin) / inrange;
                 self->data[i] = normin * outrange + outmin;
             }            
         }
         else if (inrev == 1 && outrev == 0) {
             for (i=0; i<self->bufsize; i++) {
-                normin = 1.0 - ((_scale_clip(in[i], inmin, inmax) - inmin) / inrange);
+                normin = 1.0 - ((_scale_clip(in[i*self->kstride], inmin, inmax) - inmin) / inrange);
                 self->data[i] = normin * outrange + outmin;
             }
         }
         else if (inrev == 0 && outrev == 1) {
             for (i=0; i<self->bufsize; i++) {
-                normin = (_scale_clip(in[i], inmin, inmax) - inmin) / inrange;
+                normin = (_scale_clip(in[i*self->kstride], inmin, inmax) - inmin) / inrange;
                 self->data[i] = outmax - (normin * outrange);
             }
         }
         else if (inrev == 1 && outrev == 1) {
             for (i=0; i<self->bufsize; i++) {
-                normin = 1.0 - ((_scale_clip(in[i], inmin, inmax) - inmin) / inrange);
+                normin = 1.0 - ((_scale_clip(in[i*self->kstride], inmin, inmax) - inmin) / inrange);
                 self->data[i] = outmax - (normin * outrange);
             }
         }
@@ -3559,25 +3795,25 @@ Scale_generate(Scale *self) {
     else {
         if (inrev == 0 && outrev == 0) {
             for (i=0; i<self->bufsize; i++) {
-                normin = MYPOW((_scale_clip(in[i], inmin, inmax) - inmin) / inrange, exp);
+                normin = MYPOW((_scale_clip(in[i*self->kstride], inmin, inmax) - inmin) / inrange, exp);
                 self->data[i] = normin * outrange + outmin;
             }            
         }
         else if (inrev == 1 && outrev == 0) {
             for (i=0; i<self->bufsize; i++) {
-                normin = MYPOW(1.0 - ((_scale_clip(in[i], inmin, inmax) - inmin) / inrange), exp);
+                normin = MYPOW(1.0 - ((_scale_clip(in[i*self->kstride], inmin, inmax) - inmin) / inrange), exp);
                 self->data[i] = normin * outrange + outmin;
             }
         }
         else if (inrev == 0 && outrev == 1) {
             for (i=0; i<self->bufsize; i++) {
-                normin = MYPOW((_scale_clip(in[i], inmin, inmax) - inmin) / inrange, exp);
+                normin = MYPOW((_scale_clip(in[i*self->kstride], inmin, inmax) - inmin) / inrange, exp);
                 self->data[i] = outmax - (normin * outrange);
             }
         }
         else if (inrev == 1 && outrev == 1) {
             for (i=0; i<self->bufsize; i++) {
-                normin = MYPOW(1.0 - ((_scale_clip(in[i], inmin, inmax) - inmin) / inrange), exp);
+                normin = MYPOW(1.0 - ((_scale_clip(in[i*self->kstride], inmin, inmax) - inmin) / inrange), exp);
                 self->data[i] = outmax - (normin * outrange);
             }
         }
@@ -4073,7 +4309,7 @@ CentsToTranspo_process(CentsToTranspo *self) {
     MYFLT *in = Stream_getData((Stream *)self->input_stream);
     
     for (i=0; i<self->bufsize; i++) {
-        cents = in[i];
+        cents = in[i*self->kstride];
         if (cents != self->lastcents) {
             self->data[i] = self->curtranspo = MYPOW(2.0, cents / 1200.);
             self->lastcents = cents;
@@ -4349,7 +4585,7 @@ TranspoToCents_process(TranspoToCents *self) {
     MYFLT *in = Stream_getData((Stream *)self->input_stream);
     
     for (i=0; i<self->bufsize; i++) {
-        transpo = in[i];
+        transpo = in[i*self->kstride];
         if (transpo != self->lasttranspo) {
             self->data[i] = self->curcents = 1200.0 * MYLOG2(transpo);
             self->lasttranspo = transpo;
@@ -4625,7 +4861,7 @@ MToF_process(MToF *self) {
     MYFLT *in = Stream_getData((Stream *)self->input_stream);
     
     for (i=0; i<self->bufsize; i++) {
-        midi = in[i];
+        midi = in[i*self->kstride];
         if (midi != self->lastmidi) {
             self->data[i] = self->curfreq = 8.1757989156437 * MYPOW(1.0594630943593, midi);
             self->lastmidi = midi;
@@ -4902,7 +5138,7 @@ MToT_process(MToT *self) {
     MYFLT *in = Stream_getData((Stream *)self->input_stream);
     
     for (i=0; i<self->bufsize; i++) {
-        midi = in[i];
+        midi = in[i*self->kstride];
         if (midi != self->lastmidi) {
             self->data[i] = self->curfreq = MYPOW(1.0594630943593, midi - self->centralkey);
             self->lastmidi = midi;